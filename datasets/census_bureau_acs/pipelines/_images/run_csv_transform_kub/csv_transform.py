@@ -12,12 +12,17 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import csv
+import concurrent.futures
+import functools
+import gzip
+import hashlib
 import json
 import logging
 import os
 import pathlib
 import sys
+import threading
+import time
 import typing
 
 import numpy as np
@@ -25,6 +30,7 @@ import pandas as pd
 import requests
 from google.api_core.exceptions import NotFound
 from google.cloud import bigquery, storage
+from pandas.api.types import union_categoricals
 
 
 def main(
@@ -48,6 +54,10 @@ def main(
     rename_mappings_list: dict,
     input_csv_headers: typing.List[str],
     output_csv_headers: typing.List[str],
+    max_concurrent_requests: str,
+    requests_per_second: str,
+    api_response_mode: str,
+    api_response_dir: str,
 ) -> None:
     logging.info("Creating 'files' folder")
     pathlib.Path("./files").mkdir(parents=True, exist_ok=True)
@@ -72,6 +82,10 @@ def main(
         dataset_id=dataset_id,
         destination_table=table_id,
         schema_path=schema_path,
+        max_concurrent_requests=int(max_concurrent_requests),
+        requests_per_second=float(requests_per_second),
+        api_response_mode=api_response_mode,
+        api_response_dir=api_response_dir,
     )
     logging.info(f"{pipeline_name} --> ETL process completed")
 
@@ -96,15 +110,31 @@ def execute_pipeline(
     dataset_id: str,
     destination_table: str,
     schema_path: str,
+    max_concurrent_requests: int = 8,
+    requests_per_second: float = 10,
+    api_response_mode: str = "",
+    api_response_dir: str = "",
 ) -> None:
     json_obj_group_id = open("group_ids.json")
     group_id = json.load(json_obj_group_id)
     json_obj_state_code = open("state_codes.json")
     state_code = json.load(json_obj_state_code)
     logging.info("Extracting the data from API and loading into dataframe...")
+    fetch_api_data = functools.partial(
+        fetch_api_data_to_df,
+        destination_table=destination_table,
+        max_concurrent_requests=max_concurrent_requests,
+        requests_per_second=requests_per_second,
+        api_response_mode=api_response_mode,
+        api_response_dir=api_response_dir,
+    )
     if report_level == "national_level":
         df = extract_data_and_convert_to_df_national_level(
-            group_id, year_report, api_naming_convention, source_url, destination_table
+            group_id,
+            year_report,
+            api_naming_convention,
+            source_url,
+            fetch_api_data=fetch_api_data,
         )
     elif report_level == "state_level":
         df = extract_data_and_convert_to_df_state_level(
@@ -113,10 +143,10 @@ def execute_pipeline(
             year_report,
             api_naming_convention,
             source_url,
-            destination_table,
+            fetch_api_data=fetch_api_data,
         )
     save_to_new_file(df, source_file, sep=",")
-    process_source_file(
+    target_columns = process_source_file(
         source_file=source_file,
         target_file=target_file,
         chunksize=chunksize,
@@ -131,7 +161,7 @@ def execute_pipeline(
         state_code=state_code,
     )
     if os.path.exists(target_file):
-        upload_file_to_gcs(
+        target_uri = upload_file_to_gcs(
             file_path=target_file,
             target_gcs_bucket=target_gcs_bucket,
             target_gcs_path=target_gcs_path,
@@ -143,6 +173,7 @@ def execute_pipeline(
             table_id=destination_table,
             schema_filepath=schema_path,
             bucket_name=target_gcs_bucket,
+            table_columns=target_columns,
             drop_table="N",
         )
         if table_exists:
@@ -151,6 +182,7 @@ def execute_pipeline(
                 dataset_id=dataset_id,
                 table_id=destination_table,
                 file_path=target_file,
+                source_uris=target_uri,
                 truncate_table=True,
                 field_delimiter="|",
             )
@@ -176,95 +208,37 @@ def process_source_file(
     output_csv_headers: typing.List[str],
     group_id: str,
     state_code: str,
-) -> None:
+) -> typing.List[str]:
     logging.info(f"Opening source file {source_file}")
-    csv.field_size_limit(512 << 10)
-    csv.register_dialect("TabDialect", quotechar='"', delimiter=",", strict=True)
-    with open(source_file) as reader:
-        data = []
-        chunk_number = 1
-        for index, line in enumerate(csv.reader(reader, "TabDialect"), 0):
-            data.append(line)
-            if index % int(chunksize) == 0 and index > 0:
-                process_dataframe_chunk(
-                    data=data,
-                    input_headers=input_headers,
-                    target_file=target_file,
+    kpi_values = []
+    with pd.read_csv(
+        source_file,
+        names=input_headers,
+        header=0,
+        dtype=str,
+        keep_default_na=False,
+        chunksize=int(chunksize),
+    ) as reader:
+        for chunk_number, df in enumerate(reader, 1):
+            kpi_values.append(
+                process_chunk(
+                    df=df,
                     chunk_number=chunk_number,
-                    data_dtypes=data_dtypes,
                     geography=geography,
                     rename_mappings_list=rename_mappings_list,
                     concat_col_list=concat_col_list,
-                    input_csv_headers=input_csv_headers,
-                    output_csv_headers=output_csv_headers,
                     group_id=group_id,
-                    state_code=state_code,
                 )
-                data = []
-                chunk_number += 1
-        if index % int(chunksize) != 0 and index > 0:
-            process_dataframe_chunk(
-                data=data,
-                input_headers=input_headers,
-                target_file=target_file,
-                chunk_number=chunk_number,
-                data_dtypes=data_dtypes,
-                geography=geography,
-                rename_mappings_list=rename_mappings_list,
-                concat_col_list=concat_col_list,
-                input_csv_headers=input_csv_headers,
-                output_csv_headers=output_csv_headers,
-                group_id=group_id,
-                state_code=state_code,
             )
-    dfcolumns = list(target_df.columns)
-    i = 0
-    while i < (len(output_csv_headers)):
-        if output_csv_headers[i] not in dfcolumns:
-            output_csv_headers.pop(i)
-            i -= 1
-        i += 1
+    # every geo_id/KPI pair is pivoted once here, so a geography whose rows
+    # span chunks still ends up on a single output row
+    target_df = pivot_kpi_values(kpi_values)
+    output_csv_headers = [col for col in output_csv_headers if col in target_df.columns]
     logging.info("Reordering headers...")
     final_df = target_df[output_csv_headers]
-    save_to_new_file(final_df, target_file, sep="|")
-    print("final df -->")
-    print(final_df)
-    print("Opening final file  -->")
-    print(pd.read_csv(target_file, sep="|"))
-
-
-def process_dataframe_chunk(
-    data: typing.List[str],
-    input_headers: typing.List[str],
-    target_file: str,
-    chunk_number: int,
-    data_dtypes: dict,
-    geography: str,
-    rename_mappings_list: dict,
-    concat_col_list: typing.List[str],
-    input_csv_headers: typing.List[str],
-    output_csv_headers: typing.List[str],
-    group_id: str,
-    state_code: str,
-) -> None:
-    df = pd.DataFrame(data, columns=input_headers)
-    target_file_batch = str(target_file).replace(
-        ".csv", "-" + str(chunk_number) + ".csv"
-    )
-    process_chunk(
-        df=df,
-        chunk_number=chunk_number,
-        target_file_batch=target_file_batch,
-        target_file=target_file,
-        skip_header=0,
-        geography=geography,
-        rename_mappings_list=rename_mappings_list,
-        concat_col_list=concat_col_list,
-        input_csv_headers=input_csv_headers,
-        output_csv_headers=output_csv_headers,
-        group_id=group_id,
-        state_code=state_code,
-    )
+    with open_target_file(target_file) as target_file_handle:
+        append_to_target_file(final_df, target_file_handle, include_header=True)
+    return output_csv_headers
 
 
 def set_df_datatypes(df: pd.DataFrame, data_dtypes: dict) -> pd.DataFrame:
@@ -277,32 +251,28 @@ def set_df_datatypes(df: pd.DataFrame, data_dtypes: dict) -> pd.DataFrame:
 def process_chunk(
     df: pd.DataFrame,
     chunk_number: int,
-    target_file_batch: str,
-    target_file: str,
-    skip_header: bool,
     geography: str,
     rename_mappings_list: dict,
     concat_col_list: typing.List[str],
-    input_csv_headers: typing.List[str],
-    output_csv_headers: typing.List[str],
-    group_id: str,
-    state_code: str,
-) -> None:
-    logging.info(f"Processing batch file {target_file_batch}")
+    group_id: dict,
+) -> pd.DataFrame:
+    logging.info(f"Processing chunk #{chunk_number}")
     logging.info("Replacing values...")
-    df = df.replace(to_replace={"KPI_Name": group_id})
+    df["KPI_Name"] = df["KPI_Name"].map(group_id).fillna(df["KPI_Name"])
     rename_headers(df, rename_mappings_list)
     if geography == "censustract" or geography == "blockgroup":
-        df["tract"] = df["tract"].apply(pad_zeroes_to_the_left, args=(6,))
-        df["state"] = df["state"].apply(pad_zeroes_to_the_left, args=(2,))
-        df["county"] = df["county"].apply(pad_zeroes_to_the_left, args=(3,))
+        df["tract"] = df["tract"].str.zfill(6)
+        df["state"] = df["state"].str.zfill(2)
+        df["county"] = df["county"].str.zfill(3)
     df = create_geo_id(df, concat_col_list)
-    df = pivot_dataframe(df)
-    save_to_new_file(df, file_path=str(target_file_batch), sep="|")
-    df = append_batch_file(
-        df, chunk_number, target_file_batch, target_file, skip_header, not (skip_header)
+    logging.info(f"Processing chunk #{chunk_number} completed")
+    return pd.DataFrame(
+        {
+            "geo_id": df["geo_id"].astype("category"),
+            "KPI_Name": df["KPI_Name"].astype("category"),
+            "KPI_Value": pd.to_numeric(df["KPI_Value"], errors="coerce"),
+        }
     )
-    logging.info(f"Processing batch file {target_file_batch} completed")
 
 
 def load_data_to_bq(
@@ -312,6 +282,7 @@ def load_data_to_bq(
     file_path: str,
     truncate_table: bool,
     field_delimiter: str = "|",
+    source_uris: typing.Union[str, typing.List[str]] = "",
 ) -> None:
     logging.info(
         f"Loading data from {file_path} into {project_id}.{dataset_id}.{table_id} started"
@@ -327,8 +298,13 @@ def load_data_to_bq(
         job_config.write_disposition = "WRITE_APPEND"
     job_config.skip_leading_rows = 1
     job_config.autodetect = False
-    with open(file_path, "rb") as source_file:
-        job = client.load_table_from_file(source_file, table_ref, job_config=job_config)
+    if source_uris:
+        job = client.load_table_from_uri(source_uris, table_ref, job_config=job_config)
+    else:
+        with open(file_path, "rb") as source_file:
+            job = client.load_table_from_file(
+                source_file, table_ref, job_config=job_config
+            )
     job.result()
     logging.info(
         f"Loading data from {file_path} into {project_id}.{dataset_id}.{table_id} completed"
@@ -341,6 +317,7 @@ def create_dest_table(
     table_id: str,
     schema_filepath: list,
     bucket_name: str,
+    table_columns: typing.List[str],
     drop_table: bool = False,
 ) -> bool:
     table_ref = f"{project_id}.{dataset_id}.{table_id}"
@@ -364,7 +341,9 @@ def create_dest_table(
             )
         )
         if check_gcs_file_exists(schema_filepath, bucket_name):
-            schema = create_table_schema([], bucket_name, schema_filepath)
+            schema = create_table_schema(
+                [], table_columns, bucket_name, schema_filepath
+            )
             table = bigquery.Table(table_ref, schema=schema)
             client.create_table(table)
             print(f"Table {table_ref} was created".format(table_id))
@@ -390,6 +369,7 @@ def check_gcs_file_exists(file_path: str, bucket_name: str) -> bool:
 
 def create_table_schema(
     schema_structure: list,
+    table_columns: typing.List[str],
     bucket_name: str = "",
     schema_filepath: str = "",
 ) -> list:
@@ -403,7 +383,7 @@ def create_table_schema(
         blob = bucket.blob(schema_filepath)
         schema_struct = json.loads(blob.download_as_string(client=None))
     i = 0
-    dfcolumns = list(target_df.columns)
+    dfcolumns = list(table_columns)
     while i < len(schema_struct):
         if schema_struct[i].get("name") not in dfcolumns:
             schema_struct.pop(i)
@@ -425,13 +405,25 @@ def create_table_schema(
     return schema
 
 
-def pivot_dataframe(df: pd.DataFrame) -> pd.DataFrame:
+def pivot_kpi_values(kpi_values: typing.List[pd.DataFrame]) -> pd.DataFrame:
     logging.info("Pivoting the dataframe...")
-    df = df[["geo_id", "KPI_Name", "KPI_Value"]]
-    df = df.pivot_table(
-        index="geo_id", columns="KPI_Name", values="KPI_Value", aggfunc=np.sum
-    ).reset_index()
-    return df
+    # the chunks are recoded onto shared, sorted categories so each pair is an
+    # integer (geo_id, KPI) coordinate and only the pairs present are summed
+    geo_ids = union_categoricals(
+        [df["geo_id"] for df in kpi_values], sort_categories=True
+    )
+    kpi_names = union_categoricals(
+        [df["KPI_Name"] for df in kpi_values], sort_categories=True
+    )
+    kpi_sums = (
+        pd.Series(np.concatenate([df["KPI_Value"].to_numpy() for df in kpi_values]))
+        .groupby([geo_ids.codes, kpi_names.codes])
+        .sum(min_count=1)
+        .unstack()
+    )
+    kpi_sums.index = geo_ids.categories[kpi_sums.index]
+    kpi_sums.columns = kpi_names.categories[kpi_sums.columns]
+    return kpi_sums.rename_axis(index="geo_id", columns=None).reset_index()
 
 
 def string_replace(source_url, replace: dict) -> str:
@@ -445,44 +437,16 @@ def extract_data_and_convert_to_df_national_level(
     year_report: str,
     api_naming_convention: str,
     source_url: str,
-    destination_table: str,
+    fetch_api_data: typing.Callable[..., pd.DataFrame],
 ) -> pd.DataFrame:
-    list_temp = []
-    flag = 0
+    api_requests = []
     for key in group_id:
-        logging.info(f"reading data from API for KPI {key}...")
         str1 = source_url.replace("~year_report~", year_report)
         str2 = str1.replace("~group_id~", key[0:-3])
         str3 = str2.replace("~row_position~", key[-3:])
         source_url_new = str3.replace("~api_naming_convention~", api_naming_convention)
-        try:
-            r = requests.get(source_url_new, stream=True, verify=False, timeout=200)
-            if r.status_code == 200:
-                logging.info("Data source valid for at least one entity")
-                flag = 1
-                text = r.json()
-                frame = load_nested_list_into_df_without_headers(text)
-                frame["KPI_Name"] = key
-                list_temp.append(frame)
-            elif 400 >= r.status_code <= 499:
-                logging.info(r.status_code)
-            else:
-                logging.info(f"Source url : {source_url_new}")
-                logging.info(f"status code : {r.status_code}")
-        except OSError as e:
-            logging.info(f"error : {e}")
-    if flag == 0:
-        logging.info(f"Data not available for {destination_table} yet")
-        sys.exit(0)
-    logging.info("creating the dataframe...")
-    df = pd.concat(list_temp)
-    return df
-
-
-def load_nested_list_into_df_without_headers(text: typing.List) -> pd.DataFrame:
-    frame = pd.DataFrame(text)
-    frame = frame.iloc[1:, :]
-    return frame
+        api_requests.append((key, source_url_new))
+    return fetch_api_data(api_requests)
 
 
 def extract_data_and_convert_to_df_state_level(
@@ -491,60 +455,184 @@ def extract_data_and_convert_to_df_state_level(
     year_report: str,
     api_naming_convention: str,
     source_url: str,
-    destination_table: str,
+    fetch_api_data: typing.Callable[..., pd.DataFrame],
 ) -> pd.DataFrame:
-    list_temp = []
-    flag = 0
+    api_requests = []
     for key in group_id:
         for sc in state_code:
-            logging.info(f"reading data from API for KPI {key}...")
-            logging.info(f"reading data from API for KPI {sc}...")
             str1 = source_url.replace("~year_report~", year_report)
             str2 = str1.replace("~group_id~", key[0:-3])
             str3 = str2.replace("~row_position~", key[-3:])
             str4 = str3.replace("~api_naming_convention~", api_naming_convention)
             source_url_new = str4.replace("~state_code~", sc)
-            try:
-                r = requests.get(source_url_new, stream=True, verify=False, timeout=200)
-                if r.status_code == 200:
-                    logging.info("Data source valid for at least one entity")
-                    flag = 1
-                    text = r.json()
-                    frame = load_nested_list_into_df_without_headers(text)
-                    frame["KPI_Name"] = key
-                    list_temp.append(frame)
-                elif 400 >= r.status_code <= 499:
-                    logging.info(r.status_code)
-                else:
-                    logging.info(f"Source url : {source_url_new}")
-                    logging.info(f"status code : {r.status_code}")
-
-            except OSError as e:
-                logging.info(f"error : {e}")
-    if flag == 0:
+            api_requests.append((key, source_url_new))
+    return fetch_api_data(api_requests)
+
+
+def fetch_api_data_to_df(
+    api_requests: typing.List[typing.Tuple[str, str]],
+    destination_table: str,
+    max_concurrent_requests: int = 8,
+    requests_per_second: float = 10,
+    api_response_mode: str = "",
+    api_response_dir: str = "",
+    no_of_retries: int = 5,
+) -> pd.DataFrame:
+    logging.info(
+        f"Reading {len(api_requests)} API responses using {max_concurrent_requests} connections (mode={api_response_mode or 'live'})"
+    )
+    if api_response_mode == "record":
+        pathlib.Path(api_response_dir).mkdir(parents=True, exist_ok=True)
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(
+        pool_connections=1, pool_maxsize=max_concurrent_requests
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    fetch_response = functools.partial(
+        fetch_api_response,
+        session=session,
+        throttle=api_request_throttle(requests_per_second),
+        api_response_mode=api_response_mode,
+        api_response_dir=api_response_dir,
+        no_of_retries=no_of_retries,
+    )
+    # parsed rows go straight into one list per column, so the table is built
+    # once at the end rather than from thousands of tiny concatenated frames
+    columns = {}
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=max_concurrent_requests
+    ) as executor:
+        responses = executor.map(
+            fetch_response, [source_url for _, source_url in api_requests]
+        )
+        for response_no, ((key, source_url), response) in enumerate(
+            zip(api_requests, responses), 1
+        ):
+            if response:
+                append_rows_to_columns(columns, response, key, source_url)
+            if (response_no % 500) == 0:
+                logging.info(f"Read {response_no} of {len(api_requests)} responses")
+    session.close()
+    if not columns:
         logging.info(f"Data not available for {destination_table} yet")
         sys.exit(0)
     logging.info("creating the dataframe...")
-    df = pd.concat(list_temp)
-    return df
+    return pd.DataFrame(columns)
+
+
+def append_rows_to_columns(
+    columns: typing.Dict[typing.Union[int, str], list],
+    response: list,
+    key: str,
+    source_url: str,
+) -> None:
+    # the first row of a response is its header; zip would silently drop the
+    # cells of a ragged row, so every row has to be exactly as wide
+    if not isinstance(response, list) or not all(
+        isinstance(row, list) for row in response
+    ):
+        raise ValueError(
+            f"Unexpected API response from {source_url}: {response!r:.200}"
+        )
+    header, rows = response[0], response[1:]
+    width = len(columns) - 1 if columns else len(header)
+    if len(header) != width:
+        raise ValueError(
+            f"API response from {source_url} has {len(header)} columns, expected {width}: {header}"
+        )
+    for row_no, row in enumerate(rows, 1):
+        if len(row) != width:
+            raise ValueError(
+                f"Row {row_no} of the API response from {source_url} has {len(row)} columns, expected {width}: {row}"
+            )
+    if not rows:
+        return
+    if not columns:
+        columns.update({col: [] for col in range(width)})
+        columns["KPI_Name"] = []
+    for col, values in enumerate(zip(*rows)):
+        columns[col].extend(values)
+    columns["KPI_Name"].extend([key] * len(rows))
+
+
+def fetch_api_response(
+    source_url: str,
+    session: requests.Session,
+    throttle: typing.Callable[[], None],
+    api_response_mode: str = "",
+    api_response_dir: str = "",
+    no_of_retries: int = 5,
+) -> typing.Optional[list]:
+    if api_response_mode == "replay":
+        return replay_api_response(source_url, api_response_dir)
+    for retries in range(1, no_of_retries + 1):
+        throttle()
+        try:
+            r = session.get(source_url, verify=False, timeout=200)
+            if r.status_code == 429 or r.status_code >= 500:
+                logging.info(
+                    f"Source url : {source_url} status code : {r.status_code}.  Retry {retries} of {no_of_retries}"
+                )
+            elif r.status_code == 200:
+                if api_response_mode == "record":
+                    record_api_response(source_url, api_response_dir, r.content)
+                return r.json()
+            else:
+                logging.info(f"Source url : {source_url}")
+                logging.info(f"status code : {r.status_code}")
+                return None
+        except (OSError, ValueError) as e:
+            logging.info(f"error : {e}.  Retry {retries} of {no_of_retries}")
+        time.sleep(min(2**retries, 60))
+    return None
+
+
+def api_response_path(source_url: str, api_response_dir: str) -> str:
+    url_hash = hashlib.sha1(source_url.encode("utf-8")).hexdigest()
+    return os.path.join(api_response_dir, f"{url_hash}.json")
+
+
+def record_api_response(source_url: str, api_response_dir: str, body: bytes) -> None:
+    with open(api_response_path(source_url, api_response_dir), "wb") as f:
+        f.write(body)
+
+
+def replay_api_response(
+    source_url: str, api_response_dir: str
+) -> typing.Optional[list]:
+    response_file = api_response_path(source_url, api_response_dir)
+    if not os.path.exists(response_file):
+        return None
+    with open(response_file, "rb") as f:
+        return json.load(f)
+
+
+def api_request_throttle(requests_per_second: float) -> typing.Callable[[], None]:
+    # the API quota is per key rather than per connection, so the fetch threads
+    # take turns claiming evenly spaced start times
+    if requests_per_second <= 0:
+        return lambda: None
+    interval = 1 / requests_per_second
+    lock = threading.Lock()
+    next_slot = time.monotonic()
+
+    def wait_for_slot() -> None:
+        nonlocal next_slot
+        with lock:
+            slot = max(next_slot, time.monotonic())
+            next_slot = slot + interval
+        time.sleep(max(0.0, slot - time.monotonic()))
+
+    return wait_for_slot
 
 
 def create_geo_id(df: pd.DataFrame, concat_col: str) -> pd.DataFrame:
     logging.info("Creating column geo_id...")
-    df = df.drop(0, axis=0)
-    df["geo_id"] = ""
-    for col in concat_col:
-        df["geo_id"] = df["geo_id"] + df[col]
+    df["geo_id"] = df[concat_col[0]].str.cat(df[concat_col[1:]])
     return df
 
 
-def pad_zeroes_to_the_left(val: str, length: int) -> str:
-    if len(str(val)) < length:
-        return ("0" * (length - len(str(val)))) + str(val)
-    else:
-        return str(val)
-
-
 def rename_headers(df: pd.DataFrame, rename_mappings: dict) -> None:
     logging.info("Renaming headers...")
     df.rename(columns=rename_mappings, inplace=True)
@@ -555,44 +643,23 @@ def save_to_new_file(df: pd.DataFrame, file_path: str, sep: str = ",") -> None:
     df.to_csv(file_path, index=False, sep=sep)
 
 
-def append_batch_file(
+def open_target_file(target_file: str) -> typing.TextIO:
+    logging.info(f"Opening target file {target_file} for streaming output")
+    if str(target_file).endswith(".gz"):
+        return gzip.open(target_file, "wt", encoding="utf-8", newline="")
+    return open(target_file, "w", encoding="utf-8", newline="")
+
+
+def append_to_target_file(
     df: pd.DataFrame,
-    chunk_number: int,
-    batch_file_path: str,
-    target_file_path: str,
-    skip_header: bool,
-    truncate_file: bool,
-) -> pd.DataFrame:
-    global target_df
-    truncate_file = True
-    with open(batch_file_path, "r") as data_file:
-        if truncate_file:
-            open(target_file_path, "w+").close()
-        with open(target_file_path, "w"):
-            if skip_header:
-                logging.info(
-                    f"Appending batch file {batch_file_path} to {target_file_path} with skip header"
-                )
-                next(data_file)
-            else:
-                logging.info(
-                    f"Appending batch file {batch_file_path} to {target_file_path}"
-                )
-            batch_df = pd.read_csv(data_file, sep="|")
-            logging.info("Making batch df -- >")
-            if chunk_number == 1:
-                target_df = batch_df
-                target_df.to_csv(target_file_path, index=False, sep="|")
-            else:
-                batchdfcols = list(batch_df.columns)
-                targetdfcols = dict.fromkeys(list(target_df.columns))
-                logging.info(f"Removing common columns from batch : {chunk_number}")
-                for columns in batchdfcols:
-                    if columns in targetdfcols:
-                        batch_df.drop(columns, axis=1, inplace=True)
-                target_df = pd.concat([target_df, batch_df], axis=1, ignore_index=False)
-                target_df.to_csv(target_file_path, index=False, sep="|")
-        return target_df
+    target_file_handle: typing.TextIO,
+    include_header: bool,
+    sep: str = "|",
+) -> None:
+    logging.info(
+        f"Writing {len(df)} rows to {target_file_handle.name} with include_header={include_header}"
+    )
+    df.to_csv(target_file_handle, sep=sep, index=False, header=include_header)
 
 
 def upload_file_to_gcs(
@@ -600,7 +667,7 @@ def upload_file_to_gcs(
     target_gcs_bucket: str,
     target_gcs_path: str,
     project_id: str,
-) -> None:
+) -> str:
     if os.path.exists(file_path):
         logging.info(
             f"Uploading output file to gs://{target_gcs_bucket}/{target_gcs_path}"
@@ -609,10 +676,12 @@ def upload_file_to_gcs(
         bucket = storage_client.bucket(target_gcs_bucket)
         blob = bucket.blob(target_gcs_path)
         blob.upload_from_filename(file_path)
+        return f"gs://{target_gcs_bucket}/{target_gcs_path}"
     else:
         logging.info(
             f"Cannot upload file to gs://{target_gcs_bucket}/{target_gcs_path} as it does not exist."
         )
+    return ""
 
 
 if __name__ == "__main__":
@@ -638,4 +707,8 @@ if __name__ == "__main__":
         rename_mappings_list=json.loads(os.environ.get("RENAME_MAPPINGS_LIST", r"{}")),
         input_csv_headers=json.loads(os.environ.get("INPUT_CSV_HEADERS", r"[]")),
         output_csv_headers=json.loads(os.environ.get("OUTPUT_CSV_HEADERS", r"[]")),
+        max_concurrent_requests=os.environ.get("MAX_CONCURRENT_REQUESTS", "8"),
+        requests_per_second=os.environ.get("REQUESTS_PER_SECOND", "10"),
+        api_response_mode=os.environ.get("API_RESPONSE_MODE", ""),
+        api_response_dir=os.environ.get("API_RESPONSE_DIR", "./files/api_responses"),
     )
@@ -15,11 +15,9 @@
 
 import datetime
 import logging
-import math
 import os
 import pathlib
 import subprocess
-import typing
 
 import pandas as pd
 import requests
@@ -136,30 +134,40 @@ def process_chunk(df: pd.DataFrame, target_file_batch: str) -> None:
     logging.info("..Done!")
 
 
-def resolve_nan(input: typing.Union[str, float]) -> str:
-    if not input or (math.isnan(input)):
-        return ""
-    return str(input).replace("None", "")
-
-
 def removing_nan_values(df: pd.DataFrame) -> None:
     cols = ["x_coordinate", "y_coordinate", "latitude", "longitude"]
-    for cols in cols:
-        df[cols] = df[cols].apply(resolve_nan)
-
-
-def convert_to_integer_string(input: typing.Union[str, float]) -> str:
-
-    if not input or (math.isnan(input)):
-        return ""
-    return str(int(round(input, 0)))
+    for col in cols:
+        df[col] = resolve_nan(df[col])
+
+
+def resolve_nan(values: pd.Series) -> pd.Series:
+    numeric = pd.to_numeric(values, errors="coerce")
+    valid = numeric.notna() & (numeric != 0)
+    result = pd.Series("", index=values.index, dtype=object)
+    result[valid] = values[valid].astype(str).str.replace("None", "", regex=False)
+    return result
+
+
+def convert_to_integer_string(values: pd.Series) -> pd.Series:
+    numeric = pd.to_numeric(values, errors="coerce")
+    valid = numeric.notna() & (numeric != 0)
+    result = pd.Series("", index=values.index, dtype=object)
+    # values beyond the int64 range are rare; convert them one at a time
+    fits_int64 = numeric.abs() < 2**63
+    result[valid & fits_int64] = (
+        numeric[valid & fits_int64].round(0).astype("int64").astype(str)
+    )
+    result[valid & ~fits_int64] = numeric[valid & ~fits_int64].map(
+        lambda x: str(int(round(x, 0)))
+    )
+    return result
 
 
 def convert_values_to_integer_string(df: pd.DataFrame) -> None:
     cols = ["unique_key", "beat", "district", "ward", "community_area", "year"]
 
-    for cols in cols:
-        df[cols] = df[cols].apply(convert_to_integer_string)
+    for col in cols:
+        df[col] = convert_to_integer_string(df[col])
 
 
 def rename_headers(df: pd.DataFrame) -> None:
@@ -191,22 +199,30 @@ def rename_headers(df: pd.DataFrame) -> None:
     df.rename(columns=header_names, inplace=True)
 
 
-def convert_dt_format(dt_str: str) -> str:
+def convert_dt_format(values: pd.Series) -> pd.Series:
     # Old format: MM/dd/yyyy hh:mm:ss aa
     # New format: yyyy-MM-dd HH:mm:ss
-    if not dt_str:
-        return dt_str
-    else:
-        return datetime.datetime.strptime(dt_str, "%m/%d/%Y %H:%M:%S %p").strftime(
-            "%Y-%m-%d %H:%M:%S"
+    has_value = values.notna() & (values != "")
+    result = values.copy()
+    try:
+        result[has_value] = pd.to_datetime(
+            values[has_value], format="%m/%d/%Y %H:%M:%S %p"
+        ).dt.strftime("%Y-%m-%d %H:%M:%S")
+    except pd.errors.OutOfBoundsDatetime:
+        # dates outside pandas' nanosecond range, e.g. typos like year 2300
+        result[has_value] = values[has_value].map(
+            lambda x: datetime.datetime.strptime(x, "%m/%d/%Y %H:%M:%S %p").strftime(
+                "%Y-%m-%d %H:%M:%S"
+            )
         )
+    return result
 
 
 def convert_values(df: pd.DataFrame) -> None:
     dt_cols = ["date", "updated_on"]
 
     for dt_col in dt_cols:
-        df[dt_col] = df[dt_col].apply(convert_dt_format)
+        df[dt_col] = convert_dt_format(df[dt_col])
 
 
 def filter_null_rows(df: pd.DataFrame) -> None:
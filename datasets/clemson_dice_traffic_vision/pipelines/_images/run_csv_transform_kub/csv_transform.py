@@ -11,15 +11,20 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import collections
+import concurrent.futures
+import functools
 import logging
 import os
 import pathlib
 import shutil
 import subprocess
 import tarfile
+import typing
 
 import pandas as pd
 from google.cloud import storage
+from google.cloud.storage import transfer_manager
 from retrying import retry
 
 
@@ -38,6 +43,7 @@ def main(
     pipeline_name: str,
     batch_group_size: str,
     batch_ordinal: str,
+    max_concurrent_transfers: str,
 ) -> None:
     generate_folder_hierarchy(
         target_root_path=target_root_path,
@@ -86,6 +92,7 @@ def main(
             batch_gcs_path=f"{target_gcs_path}/{target_batch_folder}",
             batch_group_size=int(batch_group_size),
             batch_ordinal=int(batch_ordinal),
+            max_concurrent_transfers=int(max_concurrent_transfers),
         )
     else:
         pass
@@ -120,9 +127,10 @@ def process_batch_metadata_files(
     batch_gcs_path: str,
     batch_group_size: int,
     batch_ordinal: int,
+    max_concurrent_transfers: int = 4,
 ) -> None:
     logging.info("Collecting list of batch metadata files to process ...")
-    storage_client = storage.Client(project_id)
+    storage_client = gcs_client(project_id)
     bucket_name = target_gcs_bucket
     bucket = storage_client.bucket(bucket_name)
     file_group_ordinal = 1
@@ -139,6 +147,7 @@ def process_batch_metadata_files(
                 target_unpack_folder=target_unpack_folder,
                 target_load_folder=target_load_folder,
                 target_batch_folder=target_batch_folder,
+                max_concurrent_transfers=max_concurrent_transfers,
             )
         else:
             pass
@@ -157,46 +166,57 @@ def process_batch(
     target_unpack_folder: str,
     target_load_folder: str,
     target_batch_folder: str,
+    max_concurrent_transfers: int = 4,
 ) -> None:
     logging.info(f"Processing batch file {batch_filename} batches")
-    download_file_gcs(
+    batch_filename = download_file_gcs(
         project_id=project_id,
         source_location=f"gs://{target_gcs_bucket}/{batch_filename}",
         destination_folder=f"{target_root_path}/{target_batch_folder}",
     )
-    batch_filename = (
-        f"{target_root_path}/{target_batch_folder}/{os.path.basename(batch_filename)}"
-    )
     df_filelist = pd.read_csv(batch_filename, sep="|")
-    for gcs_source_file in df_filelist["pathname"]:
-        filename = os.path.basename(gcs_source_file)
-        guid = str(
-            df_filelist[df_filelist["pathname"] == gcs_source_file]["guid"].values[0]
-        ).strip()
-        source_json_file = f"{target_root_path}/{target_unpack_folder}/{guid}/out.log"
-        destination_json_file = f"{target_root_path}/{target_load_folder}/out{guid}.log"
-        source_tar_file = f"{target_root_path}/{target_source_folder}/{filename}"
-        download_file_gcs(
+    os.unlink(batch_filename)
+    source_files = list(df_filelist["pathname"])
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=max_concurrent_transfers
+    ) as upload_executor:
+        uploads = []
+        # the next archives download, and finished outputs upload, while the
+        # current archive is unpacked
+        for gcs_source_file, source_tar_file in prefetch_source_archives(
             project_id=project_id,
-            source_location=gcs_source_file,
+            source_locations=source_files,
             destination_folder=f"{target_root_path}/{target_source_folder}",
-        )
-        with tarfile.open(source_tar_file) as file:
-            file.extractall(path=f"{target_root_path}/{target_unpack_folder}")
-        add_id_column(
-            source_json_file=source_json_file,
-            destination_json_file=destination_json_file,
-            guid=guid,
-        )
-        upload_file_to_gcs(
-            file_path=destination_json_file,
-            gcs_bucket=target_gcs_bucket,
-            gcs_path=f"{target_gcs_path}/{target_load_folder}/out{guid}.log",
-        )
-        os.unlink(source_tar_file)
-        os.unlink(destination_json_file)
-        shutil.rmtree(f"{target_root_path}/{target_unpack_folder}/{guid}")
-        os.unlink(batch_filename)
+            max_concurrent_transfers=max_concurrent_transfers,
+        ):
+            file_entry = df_filelist[df_filelist["pathname"] == gcs_source_file]
+            guid = str(file_entry["guid"].values[0]).strip()
+            source_json_file = (
+                f"{target_root_path}/{target_unpack_folder}/{guid}/out.log"
+            )
+            destination_json_file = (
+                f"{target_root_path}/{target_load_folder}/out{guid}.log"
+            )
+            with tarfile.open(source_tar_file) as file:
+                file.extractall(path=f"{target_root_path}/{target_unpack_folder}")
+            add_id_column(
+                source_json_file=source_json_file,
+                destination_json_file=destination_json_file,
+                guid=guid,
+            )
+            uploads += [
+                upload_executor.submit(
+                    upload_file_to_gcs,
+                    file_path=destination_json_file,
+                    gcs_bucket=target_gcs_bucket,
+                    gcs_path=f"{target_gcs_path}/{target_load_folder}/out{guid}.log",
+                    delete_local_file=True,
+                )
+            ]
+            os.unlink(source_tar_file)
+            shutil.rmtree(f"{target_root_path}/{target_unpack_folder}/{guid}")
+        for upload in uploads:
+            upload.result()
 
 
 def generate_folder_hierarchy(
@@ -233,7 +253,7 @@ def generate_batch_metadata_files(
     file_type: str,
 ) -> None:
     logging.info("Collecting list of files to process ...")
-    storage_client = storage.Client(project_id)
+    storage_client = gcs_client(project_id)
     bucket_name = str.split(source_gcs_folder_path, "gs://")[1].split("/")[0]
     bucket = storage_client.bucket(bucket_name)
     df_filelist = pd.DataFrame(columns=["pathname", "guid", "batchnumber"])
@@ -286,7 +306,7 @@ def save_to_new_file(df: pd.DataFrame, file_path: str, sep: str = "|") -> None:
 def count_files_in_gcs_bucket(
     project_id: str, source_gcs_folder_path: str, file_type: str
 ) -> int:
-    storage_client = storage.Client(project_id)
+    storage_client = gcs_client(project_id)
     bucket_name = str.split(source_gcs_folder_path, "gs://")[1].split("/")[0]
     bucket = storage_client.bucket(bucket_name)
     cnt_files = 0
@@ -297,17 +317,68 @@ def count_files_in_gcs_bucket(
     return cnt_files
 
 
+@functools.lru_cache(maxsize=None)
+def gcs_client(project_id: str = "") -> storage.Client:
+    # archive downloads and log uploads run in separate thread pools; both go
+    # through this client so they reuse its connections
+    return storage.Client(project_id or None)
+
+
 def download_file_gcs(
-    project_id: str, source_location: str, destination_folder: str
-) -> None:
+    project_id: str,
+    source_location: str,
+    destination_folder: str,
+    sliced_download_threshold: int = 256 * 1024 * 1024,
+) -> str:
     object_name = os.path.basename(source_location)
     dest_object = f"{destination_folder}/{object_name}"
-    storage_client = storage.Client(project_id)
     bucket_name = str.split(source_location, "gs://")[1].split("/")[0]
-    bucket = storage_client.bucket(bucket_name)
+    bucket = gcs_client(project_id).bucket(bucket_name)
     source_object_path = str.split(source_location, f"gs://{bucket_name}/")[1]
     blob = bucket.blob(source_object_path)
-    blob.download_to_filename(dest_object)
+    blob.reload()
+    if blob.size >= sliced_download_threshold:
+        transfer_manager.download_chunks_concurrently(
+            blob,
+            dest_object,
+            chunk_size=32 * 1024 * 1024,
+            max_workers=8,
+            worker_type=transfer_manager.THREAD,
+        )
+    else:
+        blob.download_to_filename(dest_object)
+    return dest_object
+
+
+def prefetch_source_archives(
+    project_id: str,
+    source_locations: typing.List[str],
+    destination_folder: str,
+    max_concurrent_transfers: int,
+) -> typing.Iterator[typing.Tuple[str, str]]:
+    # pairs each batch entry with its local tar file, in batch order, while up
+    # to max_concurrent_transfers of the following archives download
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=max_concurrent_transfers
+    ) as executor:
+        downloads = collections.deque()
+        for source_location in source_locations:
+            downloads.append(
+                (
+                    source_location,
+                    executor.submit(
+                        download_file_gcs,
+                        project_id,
+                        source_location,
+                        destination_folder,
+                    ),
+                )
+            )
+            if len(downloads) > max_concurrent_transfers:
+                gcs_source_file, download = downloads.popleft()
+                yield gcs_source_file, download.result()
+        for gcs_source_file, download in downloads:
+            yield gcs_source_file, download.result()
 
 
 def add_id_column(source_json_file: str, destination_json_file: str, guid: str):
@@ -323,17 +394,32 @@ def add_id_column(source_json_file: str, destination_json_file: str, guid: str):
     subprocess.check_call([cmd], shell=True)
 
 
-def upload_file_to_gcs(file_path: pathlib.Path, gcs_bucket: str, gcs_path: str) -> None:
-    storage_client = storage.Client()
-    bucket = storage_client.bucket(gcs_bucket)
-    blob = bucket.blob(gcs_path)
-    blob.upload_from_filename(file_path)
+def upload_file_to_gcs(
+    file_path: pathlib.Path,
+    gcs_bucket: str,
+    gcs_path: str,
+    delete_local_file: bool = False,
+    sliced_upload_threshold: int = 256 * 1024 * 1024,
+) -> None:
+    blob = gcs_client().bucket(gcs_bucket).blob(gcs_path)
+    if os.path.getsize(file_path) >= sliced_upload_threshold:
+        transfer_manager.upload_chunks_concurrently(
+            file_path,
+            blob,
+            chunk_size=32 * 1024 * 1024,
+            max_workers=8,
+            worker_type=transfer_manager.THREAD,
+        )
+    else:
+        blob.upload_from_filename(file_path)
+    if delete_local_file:
+        os.unlink(file_path)
 
 
 def remove_gcs_path(gcs_bucket: str, gcs_path: str) -> None:
     drop_path = os.path.split(gcs_path)[0]
     logging.info(f"Removing files from GCS path {drop_path}")
-    storage_client = storage.Client()
+    storage_client = gcs_client()
     bucket = storage_client.bucket(gcs_bucket)
     bucket.delete_blobs(blobs=list(bucket.list_blobs(prefix=f"{drop_path}/")))
 
@@ -355,4 +441,5 @@ if __name__ == "__main__":
         pipeline_name=os.environ.get("PIPELINE_NAME", ""),
         batch_group_size=os.environ.get("BATCH_GROUP_SIZE", 1),
         batch_ordinal=os.environ.get("BATCH_ORDINAL", 1),
+        max_concurrent_transfers=os.environ.get("MAX_CONCURRENT_TRANSFERS", "4"),
     )
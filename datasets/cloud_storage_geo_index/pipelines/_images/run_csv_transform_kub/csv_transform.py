@@ -18,6 +18,7 @@ import json
 import logging
 import os
 import pathlib
+import shutil
 import typing
 
 import pandas as pd
@@ -122,7 +123,7 @@ def execute_pipeline(
         field_separator=input_field_delimiter,
     )
     if os.path.exists(target_file):
-        upload_file_to_gcs(
+        target_uri = upload_file_to_gcs(
             file_path=target_file,
             target_gcs_bucket=target_gcs_bucket,
             target_gcs_path=target_gcs_path,
@@ -145,6 +146,7 @@ def execute_pipeline(
                 dataset_id=dataset_id,
                 table_id=destination_table,
                 file_path=target_file,
+                source_uris=target_uri,
                 truncate_table=True,
                 field_delimiter="|",
             )
@@ -167,9 +169,8 @@ def execute_pipeline(
 
 def gz_decompress(infile: str, tofile: str, delete_zipfile: bool = False) -> None:
     logging.info(f"Decompressing {infile}")
-    with open(infile, "rb") as inf, open(tofile, "w", encoding="utf8") as tof:
-        decom_str = gzip.decompress(inf.read()).decode("utf-8")
-        tof.write(decom_str)
+    with gzip.open(infile, "rb") as inf, open(tofile, "wb") as tof:
+        shutil.copyfileobj(inf, tof, length=16 * 1024 * 1024)
     if delete_zipfile:
         os.remove(infile)
 
@@ -299,6 +300,7 @@ def load_data_to_bq(
     file_path: str,
     truncate_table: bool,
     field_delimiter: str = "|",
+    source_uris: typing.Union[str, typing.List[str]] = "",
 ) -> None:
     logging.info(
         f"Loading data from {file_path} into {project_id}.{dataset_id}.{table_id} started"
@@ -314,8 +316,13 @@ def load_data_to_bq(
         job_config.write_disposition = "WRITE_APPEND"
     job_config.skip_leading_rows = 1  # ignore the header
     job_config.autodetect = False
-    with open(file_path, "rb") as source_file:
-        job = client.load_table_from_file(source_file, table_ref, job_config=job_config)
+    if source_uris:
+        job = client.load_table_from_uri(source_uris, table_ref, job_config=job_config)
+    else:
+        with open(file_path, "rb") as source_file:
+            job = client.load_table_from_file(
+                source_file, table_ref, job_config=job_config
+            )
     job.result()
     logging.info(
         f"Loading data from {file_path} into {project_id}.{dataset_id}.{table_id} completed"
@@ -479,7 +486,7 @@ def download_file(source_url: str, source_file: pathlib.Path) -> None:
 
 def upload_file_to_gcs(
     file_path: pathlib.Path, target_gcs_bucket: str, target_gcs_path: str
-) -> None:
+) -> str:
     if os.path.exists(file_path):
         logging.info(
             f"Uploading output file to gs://{target_gcs_bucket}/{target_gcs_path}"
@@ -488,10 +495,12 @@ def upload_file_to_gcs(
         bucket = storage_client.bucket(target_gcs_bucket)
         blob = bucket.blob(target_gcs_path)
         blob.upload_from_filename(file_path)
+        return f"gs://{target_gcs_bucket}/{target_gcs_path}"
     else:
         logging.info(
             f"Cannot upload file to gs://{target_gcs_bucket}/{target_gcs_path} as it does not exist."
         )
+    return ""
 
 
 if __name__ == "__main__":
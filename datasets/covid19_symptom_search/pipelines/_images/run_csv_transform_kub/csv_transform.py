@@ -217,9 +217,8 @@ def load_source_file_to_bq(
 
 def gz_decompress(infile: str, tofile: str, delete_zipfile: bool = False) -> None:
     logging.info(f"Decompressing {infile}")
-    with open(infile, "rb") as inf, open(tofile, "w", encoding="utf8") as tof:
-        decom_str = gzip.decompress(inf.read()).decode("utf-8")
-        tof.write(decom_str)
+    with gzip.open(infile, "rb") as inf, open(tofile, "wb") as tof:
+        shutil.copyfileobj(inf, tof, length=16 * 1024 * 1024)
     if delete_zipfile:
         os.remove(infile)
 
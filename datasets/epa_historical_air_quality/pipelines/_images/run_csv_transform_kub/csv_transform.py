@@ -12,19 +12,34 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
+import concurrent.futures
+import contextlib
 import datetime
+import functools
+import gzip
+import hashlib
 import json
 import logging
 import os
 import pathlib
+import shutil
+import threading
 import typing
 import zipfile as zip
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
 import requests
 from google.cloud import bigquery, storage
 from google.cloud.exceptions import NotFound
 
+# updated by the download threads of run_periods, which all run in this process
+DOWNLOAD_CACHE_STATS = collections.Counter()
+DOWNLOAD_CACHE_STATS_LOCK = threading.Lock()
+
 
 def main(
     source_url: str,
@@ -45,6 +60,8 @@ def main(
     rename_headers_list: dict,
     output_headers: typing.List[str],
     drop_dest_table: str,
+    max_parallel_periods: str,
+    download_cache: str,
 ) -> None:
     logging.info(f"{pipeline_name} process started")
     pathlib.Path("./files").mkdir(parents=True, exist_ok=True)
@@ -68,7 +85,11 @@ def main(
         chunksize=chunksize,
         field_delimiter="|",
         drop_dest_table=drop_dest_table,
+        max_parallel_periods=int(max_parallel_periods),
+        download_cache=download_cache,
     )
+    if download_cache:
+        logging.info(f"Download cache: {download_cache_summary()}")
     logging.info(f"{pipeline_name} process completed")
 
 
@@ -91,6 +112,8 @@ def execute_pipeline(
     chunksize: str,
     field_delimiter: str,
     drop_dest_table: str = "N",
+    max_parallel_periods: int = 1,
+    download_cache: str = "",
 ) -> None:
     create_dest_table(
         project_id=project_id,
@@ -101,128 +124,225 @@ def execute_pipeline(
         drop_table=(drop_dest_table == "Y"),
     )
     end_year = datetime.datetime.today().year - 2
-    for yr in range(start_year, end_year + 1, 1):
-        process_year_data(
-            project_id=project_id,
-            dataset_id=dataset_id,
-            table_name=table_name,
-            year_field_name=year_field_name,
-            year_field_type=year_field_type,
-            year=yr,
-            continue_on_error=False,
+    periods = [(yr, False) for yr in range(start_year, end_year + 1, 1)]
+    st_year = datetime.datetime.today().year - 1
+    end_year = datetime.datetime.today().year
+    periods += [(yr, True) for yr in range(st_year, end_year + 1, 1)]
+    load_index = year_load_index(
+        project_id, dataset_id, table_name, year_field_name, year_field_type
+    )
+    periods = [
+        (yr, continue_on_error)
+        for yr, continue_on_error in periods
+        if not year_data_already_loaded(
+            load_index, project_id, dataset_id, table_name, yr
+        )
+    ]
+    run_periods(
+        periods=periods,
+        download_period=functools.partial(
+            download_year_data,
             source_url=source_url,
             dest_path=dest_path,
+            download_cache=download_cache,
+        ),
+        prepare_period=functools.partial(
+            transform_year_data,
             input_headers=input_headers,
             output_headers=output_headers,
             data_dtypes=data_dtypes,
             rename_headers_list=rename_headers_list,
             chunksize=chunksize,
             field_delimiter=field_delimiter,
+        ),
+        upload_period=functools.partial(
+            upload_year_data,
             target_gcs_bucket=target_gcs_bucket,
             target_gcs_path=target_gcs_path,
-        )
-    st_year = datetime.datetime.today().year - 1
-    end_year = datetime.datetime.today().year
-    for yr in range(st_year, end_year + 1, 1):
-        process_year_data(
+        ),
+        load_period=functools.partial(
+            load_year_data,
             project_id=project_id,
             dataset_id=dataset_id,
             table_name=table_name,
-            year_field_name=year_field_name,
-            year_field_type=year_field_type,
-            year=yr,
-            continue_on_error=True,
-            source_url=source_url,
-            dest_path=dest_path,
-            input_headers=input_headers,
-            output_headers=output_headers,
-            data_dtypes=data_dtypes,
-            rename_headers_list=rename_headers_list,
-            chunksize=chunksize,
             field_delimiter=field_delimiter,
-            target_gcs_bucket=target_gcs_bucket,
-            target_gcs_path=target_gcs_path,
-        )
+        ),
+        max_parallel_periods=max_parallel_periods,
+    )
 
 
-def process_year_data(
+def run_periods(
+    periods: typing.Iterable[typing.Any],
+    download_period: typing.Callable[[typing.Any], typing.Any],
+    prepare_period: typing.Callable[[typing.Any, typing.Any], typing.Any],
+    upload_period: typing.Callable[[typing.Any, typing.Any], typing.Any],
+    load_period: typing.Callable[[typing.Any, typing.Any], None],
+    max_parallel_periods: int,
+) -> None:
+    if max_parallel_periods <= 1:
+        for period in periods:
+            prepared = prepare_period(period, download_period(period))
+            load_period(period, upload_period(period, prepared))
+        return
+    logging.info(f"Processing up to {max_parallel_periods} periods in parallel")
+    pending_periods = iter(periods)
+    in_flight = {}
+    error = None
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=max_parallel_periods
+    ) as io_executor, concurrent.futures.ProcessPoolExecutor(
+        max_workers=max_parallel_periods
+    ) as cpu_executor:
+        # downloads and uploads run in threads, the transform in a worker process
+        stages = [(cpu_executor, prepare_period), (io_executor, upload_period)]
+        while True:
+            # capping the periods in flight also caps the files left on disk
+            while error is None and len(in_flight) < max_parallel_periods:
+                period = next(pending_periods, None)
+                if period is None:
+                    break
+                in_flight[io_executor.submit(download_period, period)] = (period, 0)
+            if not in_flight:
+                break
+            done, _ = concurrent.futures.wait(
+                in_flight, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for future in done:
+                period, stage = in_flight.pop(future)
+                try:
+                    if stage < len(stages):
+                        executor, run_stage = stages[stage]
+                        next_future = executor.submit(
+                            run_stage, period, future.result()
+                        )
+                        in_flight[next_future] = (period, stage + 1)
+                    else:
+                        # loads stay in this process, one at a time, so a
+                        # destination table never has more than one load job
+                        # running against it
+                        load_period(period, future.result())
+                except Exception as e:
+                    # no new periods are started, but the ones in flight are
+                    # still finished and loaded before the error is raised
+                    logging.error(f"Processing period {period} failed: {e}")
+                    error = error or e
+    if error:
+        raise error
+
+
+def year_data_already_loaded(
+    load_index: typing.Optional[typing.Dict[int, int]],
     project_id: str,
     dataset_id: str,
     table_name: str,
-    year_field_name: str,
-    year_field_type: str,
-    year: str,
-    continue_on_error: bool,
+    year: int,
+) -> bool:
+    if load_index is None or load_index.get(year, 0) > 0:
+        logging.info(
+            f"Table {project_id}.{dataset_id}.{table_name} has data.  Skipping load process for year {year}"
+        )
+        return True
+    return False
+
+
+def download_year_data(
+    period: typing.Tuple[int, bool],
     source_url: str,
     dest_path: str,
+    download_cache: str = "",
+) -> typing.Optional[str]:
+    year, continue_on_error = period
+    logging.info(f"Processing year {year} data.")
+    # each year unpacks into its own directory so parallel years never share files
+    year_path = f"{dest_path}/{year}"
+    pathlib.Path(year_path).mkdir(parents=True, exist_ok=True)
+    src_url = source_url.replace("YEAR_ITERATOR", str(year))
+    source_file = f"{year_path}/source_{os.path.split(src_url)[1].lower()}"
+    file_exists = download_file_http(
+        source_url=src_url,
+        source_file=source_file,
+        continue_on_error=continue_on_error,
+        download_cache=download_cache,
+    )
+    if not file_exists:
+        return None
+    return source_file
+
+
+def transform_year_data(
+    period: typing.Tuple[int, bool],
+    source_file: typing.Optional[str],
     input_headers: typing.List[str],
     output_headers: typing.List[str],
     data_dtypes: dict,
     rename_headers_list: dict,
     chunksize: str,
     field_delimiter: str,
+    remove_file: bool = True,
+) -> typing.Optional[str]:
+    if not source_file:
+        return None
+    year_path, source_name = os.path.split(source_file)
+    url_file_csv = source_name.replace("source_", "", 1).replace(".zip", ".csv")
+    source_csv_file = f"{year_path}/{url_file_csv}"
+    target_file = f"{year_path}/target_{url_file_csv}"
+    unpack_file(infile=source_file, dest_path=year_path, compression_type="zip")
+    rename_files_lowercase(dir=year_path)
+    process_source_file(
+        source_file=source_file,
+        target_file=target_file,
+        input_headers=input_headers,
+        output_headers=output_headers,
+        dtypes=data_dtypes,
+        chunksize=chunksize,
+        field_delimiter=field_delimiter,
+        rename_headers_list=rename_headers_list,
+    )
+    if remove_file:
+        os.remove(source_file)
+        os.remove(source_csv_file)
+    return target_file
+
+
+def upload_year_data(
+    period: typing.Tuple[int, bool],
+    target_file: typing.Optional[str],
     target_gcs_bucket: str,
     target_gcs_path: str,
-    remove_file: bool = True,
-):
-    logging.info(f"Processing year {year} data.")
-    table_has_data = table_has_year_data(
-        project_id, dataset_id, table_name, year_field_name, year_field_type, year
+) -> typing.Optional[typing.Tuple[str, str]]:
+    if not target_file:
+        return None
+    target_uri = upload_file_to_gcs(
+        file_path=target_file,
+        target_gcs_bucket=target_gcs_bucket,
+        target_gcs_path=target_gcs_path,
     )
-    if table_has_data or table_has_data is None:
-        logging.info(
-            f"Table {project_id}.{dataset_id}.{table_name} has data.  Skipping load process for year {year}"
-        )
-    else:
-        src_url = source_url.replace("YEAR_ITERATOR", str(year))
-        url_file = os.path.split(src_url)[1].lower()
-        url_file_csv = url_file.replace(".zip", ".csv").lower()
-        source_file = f"{dest_path}/source_{url_file}"
-        # source_file = source_file.lower()
-        source_csv_file = f"{dest_path}/{url_file_csv}"
-        # source_csv_file = source_csv_file.lower()
-        target_file = f"{dest_path}/target_{url_file_csv}"
-        # target_file = target_file.lower()
-        file_exists = download_file_http(
-            source_url=src_url,
-            source_file=source_file,
-            continue_on_error=continue_on_error,
+    return target_file, target_uri
+
+
+def load_year_data(
+    period: typing.Tuple[int, bool],
+    uploaded: typing.Optional[typing.Tuple[str, str]],
+    project_id: str,
+    dataset_id: str,
+    table_name: str,
+    field_delimiter: str,
+    remove_file: bool = True,
+) -> None:
+    year, _ = period
+    if uploaded:
+        target_file, target_uri = uploaded
+        load_data_to_bq(
+            project_id=project_id,
+            dataset_id=dataset_id,
+            table_id=table_name,
+            file_path=target_file,
+            field_delimiter=field_delimiter,
+            truncate_table=False,
+            source_uris=target_uri,
         )
-        if file_exists:
-            unpack_file(infile=source_file, dest_path=dest_path, compression_type="zip")
-            rename_files_lowercase(dir=dest_path)
-            process_source_file(
-                source_file=source_file,
-                target_file=target_file,
-                input_headers=input_headers,
-                output_headers=output_headers,
-                dtypes=data_dtypes,
-                chunksize=chunksize,
-                field_delimiter=field_delimiter,
-                rename_headers_list=rename_headers_list,
-            )
-            load_data_to_bq(
-                project_id=project_id,
-                dataset_id=dataset_id,
-                table_id=table_name,
-                file_path=target_file,
-                field_delimiter=field_delimiter,
-                truncate_table=False,
-            )
-            if os.path.exists(target_file):
-                upload_file_to_gcs(
-                    file_path=target_file,
-                    target_gcs_bucket=target_gcs_bucket,
-                    target_gcs_path=target_gcs_path,
-                )
-            if remove_file:
-                os.remove(source_file)
-                os.remove(source_csv_file)
-                os.remove(target_file)
-            else:
-                pass
-        else:
-            pass
+        if remove_file:
+            os.remove(target_file)
     logging.info(f"Processing year {year} data completed.")
 
 
@@ -233,25 +353,6 @@ def rename_files_lowercase(dir: str = "files") -> None:
         os.rename(f"{dir}/{file}", f"{dir}/{new_filename}")
 
 
-def table_has_year_data(
-    project_id: str,
-    dataset_id: str,
-    table_name: str,
-    year_field_name: str,
-    year_field_type: str,
-    year: str,
-) -> bool:
-    number_rows = number_rows_in_table(
-        project_id, dataset_id, table_name, year_field_name, year_field_type, year
-    )
-    if number_rows > 0:
-        return True
-    elif number_rows == -1:
-        return None
-    else:
-        return False
-
-
 def table_exists(project_id: str, dataset_id: str, table_name: str) -> bool:
     client = bigquery.Client(project=project_id)
     tables = client.list_tables(dataset_id)
@@ -278,35 +379,36 @@ def field_exists(
         return False
 
 
-def number_rows_in_table(
+def year_load_index(
     project_id: str,
     dataset_id: str,
     table_name: str,
     year_field_name: str,
     year_field_type: str,
-    year: str,
-) -> int:
+) -> typing.Optional[typing.Dict[int, int]]:
     check_field_exists = field_exists(
         project_id, dataset_id, table_name, year_field_name
     )
     if check_field_exists:
         client = bigquery.Client(project=project_id)
+        if year_field_type == "DATE":
+            year_expr = f"FORMAT_DATE('%Y', {year_field_name})"
+        else:
+            year_expr = year_field_name
         query = f"""
-            SELECT count(1) AS number_of_rows
+            SELECT {year_expr} AS year, count(1) AS number_of_rows
             FROM {dataset_id}.{table_name}
-            WHERE
+            GROUP BY year
         """
-        if year_field_type == "DATE":
-            query = query + f" FORMAT_DATE('%Y', {year_field_name}) = '{year}'"
-        else:
-            query = query + f" {year_field_name} = {year}"
         job_config = bigquery.QueryJobConfig()
         query_job = client.query(query, job_config=job_config)
-        for row in query_job.result():
-            count_rows = row.number_of_rows
-        return int(count_rows)
+        return {
+            int(row.year): int(row.number_of_rows)
+            for row in query_job.result()
+            if row.year is not None
+        }
     else:
-        return -1
+        return None
 
 
 def process_source_file(
@@ -320,9 +422,8 @@ def process_source_file(
     rename_headers_list: dict,
 ) -> None:
     logging.info(f"Opening batch file {source_file}")
-    with pd.read_csv(
+    with read_csv_chunks(
         source_file,  # path to main source file to load in batches
-        engine="python",
         encoding="utf-8",
         quotechar='"',  # string separator, typically double-quotes
         chunksize=int(chunksize),  # size of batch data, in no. of records
@@ -332,33 +433,235 @@ def process_source_file(
         dtype=dtypes,
         keep_default_na=True,
         na_values=[" "],
-    ) as reader:
+    ) as reader, open_target_file(target_file) as target_file_handle:
         for chunk_number, chunk in enumerate(reader):
-            target_file_batch = str(target_file).replace(
-                ".csv", "-" + str(chunk_number) + ".csv"
-            )
-            df = pd.DataFrame()
-            df = pd.concat([df, chunk])
             process_chunk(
-                df=df,
-                target_file_batch=target_file_batch,
-                target_file=target_file,
+                df=chunk,
+                target_file_handle=target_file_handle,
                 include_header=(chunk_number == 0),
-                truncate_file=(chunk_number == 0),
                 field_delimiter=field_delimiter,
                 output_headers=output_headers,
                 rename_headers_list=rename_headers_list,
             )
 
 
+@contextlib.contextmanager
+def read_csv_chunks(
+    source_file: str, chunksize: int, **read_csv_args
+) -> typing.Iterator[typing.Iterator[pd.DataFrame]]:
+    reader = iter_csv_chunks(source_file, chunksize, **read_csv_args)
+    try:
+        yield reader
+    finally:
+        reader.close()
+
+
+def iter_csv_chunks(
+    source_file: str, chunksize: int, **read_csv_args
+) -> typing.Iterator[pd.DataFrame]:
+    chunks_read = 0
+    engines = csv_engines(read_csv_args)
+    for engine in engines:
+        logging.info(f"Reading {source_file} with the {engine} CSV engine")
+        try:
+            if engine == "pyarrow":
+                reader = read_csv_chunks_pyarrow(source_file, chunksize, read_csv_args)
+            else:
+                reader = pd.read_csv(
+                    source_file,
+                    engine=engine,
+                    chunksize=chunksize,
+                    **read_csv_args,
+                    **({"float_precision": "round_trip"} if engine == "c" else {}),
+                )
+            with contextlib.closing(reader):
+                for chunk_number, chunk in enumerate(reader):
+                    # chunks already handed out by a previous engine are skipped
+                    if chunk_number >= chunks_read:
+                        chunks_read += 1
+                        yield chunk
+            return
+        except (pd.errors.ParserError, pa.ArrowInvalid, ValueError) as e:
+            if engine == engines[-1] or not is_csv_engine_error(e):
+                raise
+            logging.info(
+                f"Unable to read {source_file} with the {engine} CSV engine ({e}), falling back from chunk #{chunks_read}"
+            )
+
+
+def is_csv_engine_error(e: Exception) -> bool:
+    if isinstance(e, (pd.errors.ParserError, pa.ArrowInvalid)):
+        return True
+    # options an engine rejects before reading any data
+    return "not supported" in str(e) or "does not support" in str(e)
+
+
+def csv_engines(read_csv_args: dict) -> typing.List[str]:
+    engines = ["c", "python"]
+    if has_datetime_dtype(read_csv_args.get("dtype")):
+        # the C engine can't parse datetime dtypes, only the python engine can
+        engines = ["python"]
+    if pyarrow_csv_options(read_csv_args) is not None:
+        return ["pyarrow"] + engines
+    return engines
+
+
+def has_datetime_dtype(dtype: typing.Any) -> bool:
+    dtypes = dtype.values() if isinstance(dtype, dict) else [dtype]
+    return any(
+        col_type is not None and pd.api.types.is_datetime64_any_dtype(col_type)
+        for col_type in dtypes
+    )
+
+
+def pyarrow_csv_options(read_csv_args: dict) -> typing.Optional[dict]:
+    # Only a subset of read_csv options map onto pyarrow without changing the
+    # resulting dataframe, anything else is left to the pandas engines.
+    supported_args = {
+        "sep",
+        "quotechar",
+        "encoding",
+        "names",
+        "header",
+        "skiprows",
+        "dtype",
+        "keep_default_na",
+        "na_values",
+    }
+    if not set(read_csv_args).issubset(supported_args):
+        return None
+    sep = read_csv_args.get("sep", ",")
+    quotechar = read_csv_args.get("quotechar", '"')
+    names = read_csv_args.get("names")
+    header = read_csv_args.get("header", None if names else 0)
+    skiprows = read_csv_args.get("skiprows", 0)
+    dtype = read_csv_args.get("dtype")
+    if len(sep) != 1 or len(quotechar) != 1 or not isinstance(skiprows, int):
+        return None
+    if header is None and not names:
+        return None
+    if not (dtype in (str, "str", "object") or isinstance(dtype, dict)):
+        return None
+    null_values = list(read_csv_args.get("na_values") or [])
+    if read_csv_args.get("keep_default_na", True):
+        # the values pandas treats as missing by default
+        null_values += [
+            "",
+            "#N/A",
+            "#N/A N/A",
+            "#NA",
+            "-1.#IND",
+            "-1.#QNAN",
+            "-NaN",
+            "-nan",
+            "1.#IND",
+            "1.#QNAN",
+            "<NA>",
+            "N/A",
+            "NA",
+            "NULL",
+            "NaN",
+            "None",
+            "n/a",
+            "nan",
+            "null",
+        ]
+    return {
+        "read_options": pa_csv.ReadOptions(
+            column_names=names,
+            skip_rows=skiprows
+            + (0 if header is None else int(header) + (1 if names else 0)),
+            encoding=read_csv_args.get("encoding", "utf8"),
+        ),
+        "parse_options": pa_csv.ParseOptions(
+            delimiter=sep, quote_char=quotechar, newlines_in_values=True
+        ),
+        "null_values": null_values,
+        "dtype": dtype,
+    }
+
+
+def read_csv_chunks_pyarrow(
+    source_file: str, chunksize: int, read_csv_args: dict
+) -> typing.Iterator[pd.DataFrame]:
+    options = pyarrow_csv_options(read_csv_args)
+    with pa_csv.open_csv(
+        source_file,
+        read_options=options["read_options"],
+        parse_options=options["parse_options"],
+    ) as reader:
+        column_names = reader.schema.names
+    dtype = options["dtype"]
+    if isinstance(dtype, dict):
+        missing_columns = [col for col in column_names if col not in dtype]
+        if missing_columns:
+            raise ValueError(
+                f"The pyarrow engine does not support columns without a dtype: {missing_columns}"
+            )
+    else:
+        dtype = {col: dtype for col in column_names}
+    convert_options = pa_csv.ConvertOptions(
+        column_types={col: pa.string() for col in column_names},
+        null_values=options["null_values"],
+        strings_can_be_null=True,
+    )
+    row_number = 0
+    with pa_csv.open_csv(
+        source_file,
+        read_options=options["read_options"],
+        parse_options=options["parse_options"],
+        convert_options=convert_options,
+    ) as reader:
+        batches = []
+        batched_rows = 0
+        for batch in reader:
+            batches.append(batch)
+            batched_rows += batch.num_rows
+            while batched_rows >= chunksize:
+                table = pa.Table.from_batches(batches, schema=reader.schema)
+                df = arrow_table_to_df(table.slice(0, chunksize), dtype, row_number)
+                row_number += len(df)
+                yield df
+                remainder = table.slice(chunksize)
+                batches = remainder.to_batches()
+                batched_rows = remainder.num_rows
+        if batched_rows:
+            table = pa.Table.from_batches(batches, schema=reader.schema)
+            yield arrow_table_to_df(table, dtype, row_number)
+
+
+def arrow_table_to_df(table: pa.Table, dtype: dict, row_number: int) -> pd.DataFrame:
+    df = table.to_pandas().fillna(np.nan)
+    df.index = pd.RangeIndex(row_number, row_number + len(df))
+    converted_types = {
+        col: col_type
+        for col, col_type in dtype.items()
+        if col in df.columns and col_type not in (str, "str", "object")
+    }
+    if converted_types:
+        df = df.astype(converted_types)
+    return df
+
+
 def download_file_http(
-    source_url: str, source_file: pathlib.Path, continue_on_error: bool = False
+    source_url: str,
+    source_file: pathlib.Path,
+    continue_on_error: bool = False,
+    download_cache: str = "",
 ) -> bool:
     logging.info(f"Downloading {source_url} to {source_file}")
     try:
-        src_file = requests.get(source_url, stream=True)
+        cache_entry = read_download_cache_entry(download_cache, source_url)
+        src_file = requests.get(
+            source_url, stream=True, headers=conditional_request_headers(cache_entry)
+        )
         rtn_status_code = src_file.status_code
-        if 400 <= rtn_status_code <= 499:
+        if rtn_status_code == 304:
+            restore_cached_download(
+                download_cache, source_url, cache_entry, source_file
+            )
+            return True
+        elif 400 <= rtn_status_code <= 499:
             logging.info(
                 f"Unable to download file {source_url} (error code was {rtn_status_code})"
             )
@@ -367,6 +670,12 @@ def download_file_http(
             with open(source_file, "wb") as f:
                 for chunk in src_file:
                     f.write(chunk)
+            store_cached_download(
+                download_cache,
+                source_url,
+                source_file,
+                http_cache_validators(src_file.headers),
+            )
             return True
     except requests.exceptions.RequestException as e:
         if e == requests.exceptions.HTTPError:
@@ -383,6 +692,140 @@ def download_file_http(
         return False
 
 
+def read_download_cache_entry(download_cache: str, source_url: str) -> dict:
+    if not download_cache:
+        return {}
+    cache_entry = read_manifest(download_cache_entry_path(download_cache, source_url))
+    if cache_entry and not download_cache_object_exists(
+        download_cache_object_path(download_cache, cache_entry["md5"])
+    ):
+        return {}
+    return cache_entry
+
+
+def conditional_request_headers(cache_entry: dict) -> dict:
+    headers = {}
+    if cache_entry.get("etag"):
+        headers["If-None-Match"] = cache_entry["etag"]
+    if cache_entry.get("last_modified"):
+        headers["If-Modified-Since"] = cache_entry["last_modified"]
+    return headers
+
+
+def http_cache_validators(response_headers: typing.Mapping[str, str]) -> dict:
+    return {
+        "etag": response_headers.get("ETag", ""),
+        "last_modified": response_headers.get("Last-Modified", ""),
+    }
+
+
+def restore_cached_download(
+    download_cache: str, source_url: str, cache_entry: dict, source_file: str
+) -> None:
+    object_path = download_cache_object_path(download_cache, cache_entry["md5"])
+    if object_path.startswith("gs://"):
+        download_cache_blob(object_path).download_to_filename(str(source_file))
+    else:
+        shutil.copyfile(object_path, source_file)
+    with DOWNLOAD_CACHE_STATS_LOCK:
+        DOWNLOAD_CACHE_STATS["hits"] += 1
+    logging.info(f"Download cache hit for {source_url} ({download_cache_summary()})")
+
+
+def store_cached_download(
+    download_cache: str, source_url: str, source_file: str, validators: dict
+) -> None:
+    if not download_cache:
+        return
+    with DOWNLOAD_CACHE_STATS_LOCK:
+        DOWNLOAD_CACHE_STATS["misses"] += 1
+    logging.info(f"Download cache miss for {source_url} ({download_cache_summary()})")
+    if not any(validators.values()):
+        logging.info(f"{source_url} cannot be revalidated, not caching it")
+        return
+    content_hash = file_md5(source_file)
+    object_path = download_cache_object_path(download_cache, content_hash)
+    if not download_cache_object_exists(object_path):
+        if object_path.startswith("gs://"):
+            download_cache_blob(object_path).upload_from_filename(str(source_file))
+        else:
+            os.makedirs(os.path.dirname(object_path), exist_ok=True)
+            shutil.copyfile(source_file, f"{object_path}.tmp")
+            os.replace(f"{object_path}.tmp", object_path)
+    entry_path = download_cache_entry_path(download_cache, source_url)
+    if not entry_path.startswith("gs://"):
+        os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+    write_manifest(
+        entry_path,
+        {
+            "url": source_url,
+            "md5": content_hash,
+            "content_length": os.path.getsize(source_file),
+            **validators,
+        },
+    )
+
+
+def download_cache_entry_path(download_cache: str, source_url: str) -> str:
+    url_hash = hashlib.sha256(source_url.encode("utf-8")).hexdigest()
+    return f"{download_cache.rstrip('/')}/urls/{url_hash}.json"
+
+
+def download_cache_object_path(download_cache: str, content_hash: str) -> str:
+    return f"{download_cache.rstrip('/')}/objects/{content_hash}"
+
+
+def download_cache_object_exists(object_path: str) -> bool:
+    if object_path.startswith("gs://"):
+        return download_cache_blob(object_path).exists()
+    return os.path.exists(object_path)
+
+
+def download_cache_blob(object_path: str) -> storage.Blob:
+    bucket_name, blob_name = object_path.replace("gs://", "", 1).split("/", 1)
+    return storage.Client().bucket(bucket_name).blob(blob_name)
+
+
+def download_cache_summary() -> str:
+    return (
+        f"{DOWNLOAD_CACHE_STATS['hits']} hits, {DOWNLOAD_CACHE_STATS['misses']} misses"
+    )
+
+
+def file_md5(file_path: str) -> str:
+    md5 = hashlib.md5()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            md5.update(block)
+    return md5.hexdigest()
+
+
+def read_manifest(manifest_path: str) -> dict:
+    if not manifest_path:
+        return {}
+    if manifest_path.startswith("gs://"):
+        bucket_name, blob_name = manifest_path.replace("gs://", "", 1).split("/", 1)
+        blob = storage.Client().bucket(bucket_name).blob(blob_name)
+        if not blob.exists():
+            return {}
+        return json.loads(blob.download_as_text())
+    if not os.path.exists(manifest_path):
+        return {}
+    with open(manifest_path, "r") as f:
+        return json.load(f)
+
+
+def write_manifest(manifest_path: str, manifest: dict) -> None:
+    contents = json.dumps(manifest, indent=2, sort_keys=True)
+    if manifest_path.startswith("gs://"):
+        bucket_name, blob_name = manifest_path.replace("gs://", "", 1).split("/", 1)
+        blob = storage.Client().bucket(bucket_name).blob(blob_name)
+        blob.upload_from_string(contents, content_type="application/json")
+    else:
+        with open(manifest_path, "w") as f:
+            f.write(contents)
+
+
 def unpack_file(infile: str, dest_path: str, compression_type: str = "zip") -> None:
     if os.path.exists(infile):
         if compression_type == "zip":
@@ -405,6 +848,7 @@ def load_data_to_bq(
     file_path: str,
     truncate_table: bool,
     field_delimiter: str = "|",
+    source_uris: typing.Union[str, typing.List[str]] = "",
 ) -> None:
     logging.info(
         f"Loading data from {file_path} into {project_id}.{dataset_id}.{table_id} started"
@@ -420,8 +864,13 @@ def load_data_to_bq(
         job_config.write_disposition = "WRITE_APPEND"
     job_config.skip_leading_rows = 1  # ignore the header
     job_config.autodetect = False
-    with open(file_path, "rb") as source_file:
-        job = client.load_table_from_file(source_file, table_ref, job_config=job_config)
+    if source_uris:
+        job = client.load_table_from_uri(source_uris, table_ref, job_config=job_config)
+    else:
+        with open(file_path, "rb") as source_file:
+            job = client.load_table_from_file(
+                source_file, table_ref, job_config=job_config
+            )
     job.result()
     logging.info(
         f"Loading data from {file_path} into {project_id}.{dataset_id}.{table_id} completed"
@@ -527,10 +976,8 @@ def create_table_schema(
 
 def process_chunk(
     df: pd.DataFrame,
-    target_file_batch: str,
-    target_file: str,
+    target_file_handle: typing.TextIO,
     include_header: bool,
-    truncate_file: bool,
     field_delimiter: str,
     output_headers: typing.List[str],
     rename_headers_list: dict,
@@ -550,14 +997,13 @@ def process_chunk(
     ]
     df = resolve_date_format(df, date_fields, "%Y-%m-%d %H:%M")
     df = reorder_headers(df, output_headers)
-    save_to_new_file(df=df, file_path=str(target_file_batch), sep=field_delimiter)
-    append_batch_file(
-        batch_file_path=target_file_batch,
-        target_file_path=target_file,
+    append_to_target_file(
+        df=df,
+        target_file_handle=target_file_handle,
         include_header=include_header,
-        truncate_target_file=truncate_file,
+        sep=field_delimiter,
     )
-    logging.info(f"Processing Batch {target_file_batch} completed")
+    logging.info(f"Processing Batch of {len(df)} rows completed")
 
 
 def reorder_headers(df: pd.DataFrame, output_headers: typing.List[str]) -> pd.DataFrame:
@@ -629,43 +1075,28 @@ def convert_dt_format(dt_str: str, from_format: str, include_time: bool = True)
     return rtnval
 
 
-def save_to_new_file(df: pd.DataFrame, file_path: str, sep: str = "|") -> None:
-    logging.info(f"Saving to file {file_path} separator='{sep}'")
-    df.to_csv(file_path, sep=sep, index=False)
+def open_target_file(target_file: str) -> typing.TextIO:
+    logging.info(f"Opening target file {target_file} for streaming output")
+    if str(target_file).endswith(".gz"):
+        return gzip.open(target_file, "wt", encoding="utf-8", newline="")
+    return open(target_file, "w", encoding="utf-8", newline="")
 
 
-def append_batch_file(
-    batch_file_path: str,
-    target_file_path: str,
+def append_to_target_file(
+    df: pd.DataFrame,
+    target_file_handle: typing.TextIO,
     include_header: bool,
-    truncate_target_file: bool,
+    sep: str = "|",
 ) -> None:
     logging.info(
-        f"Appending file {batch_file_path} to file {target_file_path} with include_header={include_header} and truncate_target_file={truncate_target_file}"
+        f"Writing {len(df)} rows to {target_file_handle.name} with include_header={include_header}"
     )
-    with open(batch_file_path, "r") as data_file:
-        if truncate_target_file:
-            target_file = open(target_file_path, "w+").close()
-        with open(target_file_path, "a+") as target_file:
-            if not include_header:
-                logging.info(
-                    f"Appending batch file {batch_file_path} to {target_file_path} without header"
-                )
-                next(data_file)
-            else:
-                logging.info(
-                    f"Appending batch file {batch_file_path} to {target_file_path} with header"
-                )
-            target_file.write(data_file.read())
-            data_file.close()
-            target_file.close()
-            if os.path.exists(batch_file_path):
-                os.remove(batch_file_path)
+    df.to_csv(target_file_handle, sep=sep, index=False, header=include_header)
 
 
 def upload_file_to_gcs(
     file_path: pathlib.Path, target_gcs_bucket: str, target_gcs_path: str
-) -> None:
+) -> str:
     if os.path.exists(file_path):
         logging.info(
             f"Uploading output file {file_path} to gs://{target_gcs_bucket}/{target_gcs_path}"
@@ -674,10 +1105,12 @@ def upload_file_to_gcs(
         bucket = storage_client.bucket(target_gcs_bucket)
         blob = bucket.blob(target_gcs_path)
         blob.upload_from_filename(file_path)
+        return f"gs://{target_gcs_bucket}/{target_gcs_path}"
     else:
         logging.info(
             f"Cannot upload file to gs://{target_gcs_bucket}/{target_gcs_path} as it does not exist."
         )
+    return ""
 
 
 if __name__ == "__main__":
@@ -702,4 +1135,6 @@ if __name__ == "__main__":
         rename_headers_list=json.loads(os.environ.get("RENAME_HEADERS_LIST", r"{}")),
         output_headers=json.loads(os.environ.get("OUTPUT_CSV_HEADERS", r"[]")),
         drop_dest_table=os.environ.get("DROP_DEST_TABLE", "N"),
+        max_parallel_periods=os.environ.get("MAX_PARALLEL_PERIODS", "1"),
+        download_cache=os.environ.get("DOWNLOAD_CACHE", ""),
     )
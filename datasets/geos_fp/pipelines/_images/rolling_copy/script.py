@@ -13,43 +13,54 @@
 # limitations under the License.
 
 
+import concurrent.futures
 import logging
 import os
-import pathlib
-import subprocess
+import threading
+import time
 import typing
 from datetime import date, timedelta
 
 import bs4
 import requests
+from google.api_core.exceptions import PreconditionFailed
 from google.cloud import storage
 
 # The manifest file contains a list of files already downloaded for a given date
 MANIFEST_FILE = "manifest.txt"
 
+# Files are streamed from the source to GCS in chunks of this size, which must
+# be a multiple of 256 KiB for GCS resumable uploads
+CHUNK_SIZE = 8 * 1024 * 1024
+
+# How many times a dropped source connection is resumed before giving up
+MAX_RESUME_ATTEMPTS = 5
+
+# Stored files are written to the manifest in batches: after this many files or
+# this many seconds since the last write, whichever comes first
+MANIFEST_FLUSH_FILES = 20
+MANIFEST_FLUSH_SECONDS = 30
+
 
 def main(
     base_url: str,
     dt: date,
-    download_dir: pathlib.Path,
     target_bucket: str,
     batch_size: int,
 ) -> None:
-    # Get date prefix, e.g. Y2021/M01/D01, and create directories for them
+    # Get date prefix, e.g. Y2021/M01/D01
     date_prefix = _date_prefix(dt)
-    (download_dir / date_prefix).mkdir(parents=True, exist_ok=True)
 
     # Generate a set of all .nc4 files from the specified url and date
     all_files = get_all_files(base_url, date_prefix)
 
-    stored_files = get_stored_files(target_bucket, date_prefix, download_dir)
+    bucket = storage.Client().bucket(target_bucket)
+    manifest = Manifest(bucket, date_prefix)
 
     # Files present in the source webpage but not yet stored on GCS
-    unstored_files = all_files - stored_files
+    unstored_files = all_files - manifest.stored_files
 
-    download_and_store_new_files(
-        download_dir, date_prefix, unstored_files, batch_size, target_bucket
-    )
+    download_and_store_new_files(base_url, unstored_files, batch_size, bucket, manifest)
 
 
 def _date_prefix(dt: date) -> str:
@@ -72,23 +83,67 @@ def get_all_files(base_url: str, date_prefix: str) -> typing.Set[str]:
     return all_files
 
 
-def get_stored_files(
-    bucket_name: str, date_prefix: str, download_dir: pathlib.Path
-) -> typing.Set[str]:
-    storage_client = storage.Client()
-    bucket = storage_client.bucket(bucket_name)
-    gcs_object = f"{date_prefix}/{MANIFEST_FILE}"
-    local_object = download_dir / MANIFEST_FILE
+class Manifest:
+    """The set of files already stored on GCS for a date, kept next to them.
 
-    if storage.Blob(bucket=bucket, name=gcs_object).exists(storage_client):
-        logging.info(f"Manifest file found at gs://{bucket_name}/{gcs_object}")
-        blob = bucket.blob(gcs_object)
-        blob.download_to_filename(str(local_object))
-    else:
-        local_object.touch()
+    Stored files are collected and written out in batches, see `add` and
+    `flush`. Every rewrite of the manifest object is conditional on the
+    generation last seen, so concurrent updates are merged instead of lost and
+    readers never see a partial list. A file stored but not yet flushed when
+    the task dies is simply copied again by the next run.
+    """
 
-    with open(local_object) as f:
-        return set(f.read().splitlines())
+    def __init__(self, bucket: storage.Bucket, date_prefix: str) -> None:
+        self.bucket = bucket
+        self.object_name = f"{date_prefix}/{MANIFEST_FILE}"
+        self.lock = threading.Lock()
+        self.stored_files, self.generation = self._read()
+        self.pending_files: typing.Set[str] = set()
+        self.last_flush = time.monotonic()
+
+    def _read(self) -> typing.Tuple[typing.Set[str], int]:
+        blob = self.bucket.get_blob(self.object_name)
+        if blob is None:
+            # A generation of 0 makes the first write succeed only if no
+            # manifest has been created in the meantime
+            return set(), 0
+        logging.info(f"Manifest file found at gs://{self.bucket.name}/{blob.name}")
+        contents = blob.download_as_text(if_generation_match=blob.generation)
+        return set(contents.splitlines()), blob.generation
+
+    def add(self, file_path: str) -> None:
+        with self.lock:
+            self.pending_files.add(file_path)
+            if (
+                len(self.pending_files) >= MANIFEST_FLUSH_FILES
+                or time.monotonic() - self.last_flush >= MANIFEST_FLUSH_SECONDS
+            ):
+                self._flush()
+
+    def flush(self) -> None:
+        with self.lock:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self.pending_files:
+            return
+        stored_files = self.stored_files | self.pending_files
+        blob = self.bucket.blob(self.object_name)
+        while True:
+            try:
+                blob.upload_from_string(
+                    "\n".join(sorted(stored_files)) + "\n",
+                    if_generation_match=self.generation,
+                )
+                break
+            except PreconditionFailed:
+                remote_files, self.generation = self._read()
+                stored_files |= remote_files
+        logging.info(f"Recorded {len(self.pending_files)} files in the manifest")
+        self.stored_files = stored_files
+        self.generation = blob.generation
+        self.pending_files = set()
+        self.last_flush = time.monotonic()
 
 
 def scrape(source_path: str, webpage: bs4.BeautifulSoup) -> typing.List[str]:
@@ -106,107 +161,129 @@ def scrape(source_path: str, webpage: bs4.BeautifulSoup) -> typing.List[str]:
 
 
 def download_and_store_new_files(
-    download_dir: pathlib.Path,
-    date_prefix: str,
+    base_url: str,
     new_files: typing.Set[str],
     batch_size: int,
-    target_bucket: str,
+    bucket: storage.Bucket,
+    manifest: Manifest,
 ) -> None:
-    """In batches, download files from the source to the local filesystem
-    and upload them to the GCS target bucket
+    """Copy files from the source to the GCS target bucket, `batch_size` at a
+    time, recording them in the manifest in batches as they are stored
     """
     total_files = len(new_files)
-    logging.info(f"Downloading {total_files} files.")
-    for n, batch in enumerate(batches(list(new_files), batch_size=batch_size), 1):
-        logging.info(
-            f"Processing batch {n}: {(n - 1) * batch_size + 1} to {min(total_files, n * batch_size)}"
-        )
-        download_batch(batch, download_dir)
-        move_dir_contents_to_gcs(download_dir, target_bucket, date_prefix)
-        update_manifest_file(batch, download_dir, target_bucket, date_prefix)
-
-
-def download_batch(batch: typing.List[str], download_dir: pathlib.Path) -> None:
-    for file_path in batch:
-        logging.info(f"Downloading file to {download_dir}/{file_path}")
-        subprocess.check_call(
-            [
-                "wget",
-                f"{os.environ['BASE_URL']}/{file_path}",
-                "-O",
-                f"{download_dir}/{file_path}",
-                "-nv",
-            ]
-        )
-
-
-def move_dir_contents_to_gcs(
-    dir_: pathlib.Path, target_bucket: str, date_prefix: str
+    logging.info(f"Downloading {total_files} files, {batch_size} at a time.")
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_maxsize=batch_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    failed_files = []
+    try:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=batch_size) as executor:
+            futures = {
+                executor.submit(
+                    copy_file_to_gcs, session, base_url, file_path, bucket
+                ): file_path
+                for file_path in sorted(new_files)
+            }
+            for n, future in enumerate(concurrent.futures.as_completed(futures), 1):
+                file_path = futures[future]
+                try:
+                    future.result()
+                except (requests.RequestException, OSError) as e:
+                    logging.warning(f"Unable to copy {file_path}: {e}")
+                    failed_files.append(file_path)
+                    continue
+                manifest.add(file_path)
+                logging.info(f"Stored file {n} of {total_files}: {file_path}")
+    finally:
+        manifest.flush()
+    if failed_files:
+        # Failing the task lets its retry pick up just the files still missing
+        raise RuntimeError(f"{len(failed_files)} of {total_files} files failed")
+
+
+def copy_file_to_gcs(
+    session: requests.Session,
+    base_url: str,
+    file_path: str,
+    bucket: storage.Bucket,
 ) -> None:
-    subprocess.check_call(
-        [
-            "gsutil",
-            "-m",
-            "-o",
-            "GSUtil:parallel_composite_upload_threshold=250M",
-            "cp",
-            f"{dir_}/{date_prefix}/*.nc4",
-            f"gs://{target_bucket}/{date_prefix}",
-        ]
-    )
-    delete_temp_pcu_objects(target_bucket)
-    delete_dir_contents(dir_ / date_prefix)
-
-
-def delete_dir_contents(dir_to_delete: pathlib.Path) -> None:
-    """Delete directory contents, but not the dir itself. This is useful for keeping
-    date dirs such as Y2021/M07/D12 intact for the next batch of files to use.
-    """
-    [f.unlink() for f in dir_to_delete.glob("*") if f.is_file()]
-
-
-def delete_temp_pcu_objects(target_bucket: str) -> None:
-    """Delete temp GCS objects created by gsutil's parallel composite uploads.
-    See https://cloud.google.com/storage/docs/uploads-downloads#gsutil-pcu
+    """Stream a source file straight into its GCS object. If the source
+    connection drops part way, the download resumes with an HTTP range request
+    from the last byte written instead of starting over.
     """
-    res = subprocess.run(
-        ["gsutil", "ls", f"gs://{target_bucket}"],
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        universal_newlines=True,
-    )
-    uris = res.stdout.split()
-    for uri in uris:
-        object_name = uri.split(target_bucket + "/")[-1]
-        if not object_name.startswith("Y"):
-            subprocess.check_call(
-                ["gsutil", "rm", "-r", f"gs://{target_bucket}/{object_name}"],
-            )
-
-
-def update_manifest_file(
-    paths: typing.List[str],
-    download_dir: pathlib.Path,
-    target_bucket: str,
-    date_prefix: str,
+    url = f"{base_url}/{file_path}"
+    logging.info(f"Copying {url} to gs://{bucket.name}/{file_path}")
+    # The object only comes into existence when the writer is closed, so a
+    # failed copy aborts the writer instead and never leaves a truncated file
+    writer = bucket.blob(file_path).open("wb", chunk_size=CHUNK_SIZE)
+    try:
+        copy_url_to_writer(session, url, writer)
+        writer.close()
+    except BaseException:
+        abort_blob_writer(writer)
+        raise
+
+
+def copy_url_to_writer(
+    session: requests.Session, url: str, writer: storage.fileio.BlobWriter
 ) -> None:
-    manifest_path = download_dir / MANIFEST_FILE
-    with open(manifest_path, "a") as f:
-        f.write("\n".join(paths))
-        f.write("\n")
-    subprocess.check_call(
-        [
-            "gsutil",
-            "cp",
-            str(manifest_path),
-            f"gs://{target_bucket}/{date_prefix}/{MANIFEST_FILE}",
-        ]
-    )
-
-
-def batches(file_paths: typing.List[str], batch_size: int):
-    for i in range(0, len(file_paths), batch_size):
-        yield file_paths[i : i + batch_size]
+    bytes_written = 0
+    for attempt in range(1, MAX_RESUME_ATTEMPTS + 1):
+        headers = {"Range": f"bytes={bytes_written}-"} if bytes_written else {}
+        try:
+            with session.get(url, headers=headers, stream=True, timeout=60) as response:
+                response.raise_for_status()
+                if bytes_written and response.status_code != 206:
+                    raise requests.HTTPError(f"{url} does not support range requests")
+                total_size = content_length(response, bytes_written)
+                for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                    writer.write(chunk)
+                    bytes_written += len(chunk)
+            if total_size is None or bytes_written >= total_size:
+                return
+            logging.warning(f"{url} ended early at byte {bytes_written}, resuming")
+        except (
+            requests.ConnectionError,
+            requests.Timeout,
+            requests.exceptions.ChunkedEncodingError,
+        ) as e:
+            if attempt == MAX_RESUME_ATTEMPTS:
+                raise
+            logging.warning(f"Resuming {url} from byte {bytes_written} after: {e}")
+    raise requests.ConnectionError(f"Unable to download all of {url}")
+
+
+def abort_blob_writer(writer: storage.fileio.BlobWriter) -> None:
+    # Closing the writer, explicitly or when it is garbage collected, would
+    # commit the bytes written so far as the object. Cancel the resumable
+    # upload session instead and discard the writer's buffer. BlobWriter has
+    # no public abort, so this relies on internals of the google-cloud-storage
+    # version pinned in requirements.txt; it runs while another exception is
+    # being raised, so it only ever logs its own failures.
+    upload_and_transport = getattr(writer, "_upload_and_transport", None)
+    buffer = getattr(writer, "_buffer", None)
+    if buffer is None:
+        logging.warning("Unable to abort the upload, BlobWriter has no _buffer")
+        return
+    if upload_and_transport:
+        upload, transport = upload_and_transport
+        try:
+            transport.delete(upload.resumable_url, timeout=60)
+        except Exception as e:
+            logging.warning(f"Unable to cancel upload {upload.resumable_url}: {e}")
+    buffer.close()
+
+
+def content_length(
+    response: requests.Response, bytes_written: int
+) -> typing.Optional[int]:
+    if response.status_code == 206 and "Content-Range" in response.headers:
+        # e.g. "bytes 1000-1999/2000"
+        return int(response.headers["Content-Range"].split("/")[-1])
+    if "Content-Length" in response.headers:
+        return bytes_written + int(response.headers["Content-Length"])
+    return None
 
 
 if __name__ == "__main__":
@@ -214,13 +291,11 @@ if __name__ == "__main__":
 
     assert os.environ["BASE_URL"]
     assert os.environ["TODAY_DIFF"]
-    assert os.environ["DOWNLOAD_DIR"]
     assert os.environ["TARGET_BUCKET"]
 
     main(
         base_url=os.environ["BASE_URL"],
         dt=(date.today() - timedelta(days=int(os.environ["TODAY_DIFF"]))),
-        download_dir=pathlib.Path(os.environ["DOWNLOAD_DIR"]).expanduser(),
         target_bucket=os.environ["TARGET_BUCKET"],
         batch_size=int(os.getenv("BATCH_SIZE", 10)),
     )
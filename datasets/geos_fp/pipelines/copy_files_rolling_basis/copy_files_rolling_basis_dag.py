@@ -63,7 +63,6 @@ with DAG(
         env_vars={
             "BASE_URL": "https://portal.nccs.nasa.gov/datashare/gmao/geos-fp/das",
             "TODAY_DIFF": "0",
-            "DOWNLOAD_DIR": "/geos_fp/data",
             "TARGET_BUCKET": "{{ var.json.geos_fp.destination_bucket }}",
             "BATCH_SIZE": "10",
         },
@@ -87,7 +86,6 @@ with DAG(
         env_vars={
             "BASE_URL": "https://portal.nccs.nasa.gov/datashare/gmao/geos-fp/das",
             "TODAY_DIFF": "1",
-            "DOWNLOAD_DIR": "/geos_fp/data",
             "TARGET_BUCKET": "{{ var.json.geos_fp.destination_bucket }}",
             "BATCH_SIZE": "10",
         },
@@ -111,7 +109,6 @@ with DAG(
         env_vars={
             "BASE_URL": "https://portal.nccs.nasa.gov/datashare/gmao/geos-fp/das",
             "TODAY_DIFF": "2",
-            "DOWNLOAD_DIR": "/geos_fp/data",
             "TARGET_BUCKET": "{{ var.json.geos_fp.destination_bucket }}",
             "BATCH_SIZE": "10",
         },
@@ -135,7 +132,6 @@ with DAG(
         env_vars={
             "BASE_URL": "https://portal.nccs.nasa.gov/datashare/gmao/geos-fp/das",
             "TODAY_DIFF": "3",
-            "DOWNLOAD_DIR": "/geos_fp/data",
             "TARGET_BUCKET": "{{ var.json.geos_fp.destination_bucket }}",
             "BATCH_SIZE": "10",
         },
@@ -159,7 +155,6 @@ with DAG(
         env_vars={
             "BASE_URL": "https://portal.nccs.nasa.gov/datashare/gmao/geos-fp/das",
             "TODAY_DIFF": "4",
-            "DOWNLOAD_DIR": "/geos_fp/data",
             "TARGET_BUCKET": "{{ var.json.geos_fp.destination_bucket }}",
             "BATCH_SIZE": "10",
         },
@@ -183,7 +178,6 @@ with DAG(
         env_vars={
             "BASE_URL": "https://portal.nccs.nasa.gov/datashare/gmao/geos-fp/das",
             "TODAY_DIFF": "5",
-            "DOWNLOAD_DIR": "/geos_fp/data",
             "TARGET_BUCKET": "{{ var.json.geos_fp.destination_bucket }}",
             "BATCH_SIZE": "10",
         },
@@ -207,7 +201,6 @@ with DAG(
         env_vars={
             "BASE_URL": "https://portal.nccs.nasa.gov/datashare/gmao/geos-fp/das",
             "TODAY_DIFF": "6",
-            "DOWNLOAD_DIR": "/geos_fp/data",
             "TARGET_BUCKET": "{{ var.json.geos_fp.destination_bucket }}",
             "BATCH_SIZE": "10",
         },
@@ -231,7 +224,6 @@ with DAG(
         env_vars={
             "BASE_URL": "https://portal.nccs.nasa.gov/datashare/gmao/geos-fp/das",
             "TODAY_DIFF": "7",
-            "DOWNLOAD_DIR": "/geos_fp/data",
             "TARGET_BUCKET": "{{ var.json.geos_fp.destination_bucket }}",
             "BATCH_SIZE": "10",
         },
@@ -12,8 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
+import concurrent.futures
 import csv
 import datetime
+import functools
+import itertools
 import json
 import logging
 import os
@@ -49,6 +53,7 @@ def main(
     schema_path: str,
     # page_refresh_dummy_element: str,
     pipeline: str,
+    max_concurrent_transfers: str,
 ) -> None:
     logging.info(
         f'{pipeline} pipeline process started at {str(datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"))}'
@@ -84,6 +89,7 @@ def main(
             output_csv_headers=output_csv_headers,
             gcs_bucket=gcs_bucket,
             schema_path=schema_path,
+            max_concurrent_transfers=int(max_concurrent_transfers),
         )
     logging.info(
         f'{pipeline} pipeline process completed at {str(datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"))}'
@@ -103,6 +109,7 @@ def process_cycle_hire(
     output_csv_headers: typing.List[str],
     gcs_bucket: str,
     schema_path: str,
+    max_concurrent_transfers: int = 4,
 ):
     files_list = list_files_in_gcs_bucket(
         source_gcs_bucket=source_url["trips"].replace("gs://", ""), source_gcs_path=""
@@ -144,6 +151,10 @@ def process_cycle_hire(
     df_extract_list["bq_start_date_to"] = df_extract_list["date_to_extr"].apply(
         lambda x: f"{str(x)[:4]}-{str(x)[4:6]}-{str(x)[6:8]}"
     )
+    load_index = start_date_load_index(
+        project_id=project_id, dataset_id=dataset_id, table_name=table_id
+    )
+    files_to_load = []
     for download_file_name in df_extract_list["source_file_name"]:
         bq_start_date_from = str(
             df_extract_list.loc[
@@ -155,14 +166,7 @@ def process_cycle_hire(
                 (df_extract_list["source_file_name"] == download_file_name)
             ]["bq_start_date_to"]
         ).split("    ")[1][0:10]
-        number_rows = count_number_rows_between_date(
-            project_id=project_id,
-            dataset_id=dataset_id,
-            table_name=table_id,
-            start_date_from=bq_start_date_from,
-            start_date_to=bq_start_date_to,
-        )
-        if number_rows == -1:
+        if load_index is None:
             create_dest_table(
                 project_id=project_id,
                 dataset_id=dataset_id,
@@ -170,102 +174,101 @@ def process_cycle_hire(
                 schema_filepath=schema_path,
                 bucket_name=gcs_bucket,
             )
-            number_rows = 0
+            load_index = {}
+        number_rows = count_number_rows_between_date(
+            load_index=load_index,
+            start_date_from=bq_start_date_from,
+            start_date_to=bq_start_date_to,
+        )
         if number_rows == 0:
-            source_location = f"{source_url['trips']}/{download_file_name}"
-            destination_folder = os.path.dirname(source_file)
-            destination_filename = (
-                f"{destination_folder}/{os.path.basename(download_file_name)}"
-            )
-            download_file_gcs(
-                project_id=project_id,
-                source_location=source_location,
-                destination_folder=destination_folder,
-            )
-            df_journey = pd.read_csv(
-                destination_filename, sep=",", quotechar='"', dtype=data_dtypes
-            )
-            df_journey = rename_headers(df_journey, rename_mappings)
-            df_journey["duration_str"] = df_journey["duration_str"].astype(
-                "Int32", errors="ignore"
-            )
-            df_journey["bike_id"] = df_journey["bike_id"].astype(
-                "Int32", errors="ignore"
-            )
-            df_journey["start_station_id"] = df_journey["start_station_id"].astype(
-                "Int32", errors="ignore"
-            )
-            if "end_station_id" not in df_journey.columns:
-                df_journey["end_station_id"] = ""
-            else:
-                pass
-            df_journey["end_station_id"] = df_journey["end_station_id"].astype(
-                "Int32", errors="ignore"
-            )
-            if "duration_ms" in df_journey.columns:
-                df_journey["duration_str"] = df_journey["duration_ms"].apply(
-                    lambda x: x if pd.isnull(x) else round(x / 1000)
-                )
-            else:
-                df_journey["duration_ms"] = df_journey["duration_str"].apply(
-                    lambda x: x if pd.isnull(x) else round(x * 1000)
-                )
-            if "bike_model" not in df_journey.columns:
-                df_journey["bike_model"] = ""
-            else:
-                pass
-            df_journey["start_date"] = df_journey["start_date"].apply(
-                lambda x: x if len(str(x)) < 1 else f"{x}:00"
-            )
-            df_journey["start_date"] = df_journey["start_date"].apply(
-                lambda x: fix_date(x)
-            )
-            df_journey["end_date"] = df_journey["end_date"].apply(
-                lambda x: x if len(str(x)) < 1 else f"{x}:00"
-            )
-            df_journey["end_date"] = df_journey["end_date"].apply(lambda x: fix_date(x))
-            df_journey["rental_id"] = df_journey["rental_id"].apply(
-                lambda x: re.sub(r"\W+", "", str(x))
-            )
-            df_journey["duration_str"] = df_journey["duration_str"].apply(
-                lambda x: re.sub(r"\W+", "", str(x))
-            )
-            df_journey["duration_ms"] = df_journey["duration_ms"].apply(
-                lambda x: re.sub(r"\W+", "", str(x))
-            )
-            df_journey["bike_id"] = df_journey["bike_id"].apply(
-                lambda x: re.sub(r"\W+", "", str(x))
-            )
-            df_journey["start_station_id"] = df_journey["start_station_id"].apply(
-                lambda x: re.sub(r"\W+", "", str(x))
+            files_to_load += [f"{source_url['trips']}/{download_file_name}"]
+        else:
+            logging.info(f"Datafile {download_file_name} already loaded.  Skipping.")
+    # the next extracts download while the current one is transformed and loaded
+    for destination_filename in prefetch_journey_extracts(
+        project_id=project_id,
+        source_locations=files_to_load,
+        destination_folder=os.path.dirname(source_file),
+        max_concurrent_transfers=max_concurrent_transfers,
+    ):
+        df_journey = pd.read_csv(
+            destination_filename, sep=",", quotechar='"', dtype=data_dtypes
+        )
+        df_journey = rename_headers(df_journey, rename_mappings)
+        df_journey["duration_str"] = df_journey["duration_str"].astype(
+            "Int32", errors="ignore"
+        )
+        df_journey["bike_id"] = df_journey["bike_id"].astype("Int32", errors="ignore")
+        df_journey["start_station_id"] = df_journey["start_station_id"].astype(
+            "Int32", errors="ignore"
+        )
+        if "end_station_id" not in df_journey.columns:
+            df_journey["end_station_id"] = ""
+        else:
+            pass
+        df_journey["end_station_id"] = df_journey["end_station_id"].astype(
+            "Int32", errors="ignore"
+        )
+        if "duration_ms" in df_journey.columns:
+            df_journey["duration_str"] = df_journey["duration_ms"].apply(
+                lambda x: x if pd.isnull(x) else round(x / 1000)
             )
-            df_journey["end_station_id"] = df_journey["end_station_id"].apply(
-                lambda x: re.sub(r"\W+", "", str(x))
+        else:
+            df_journey["duration_ms"] = df_journey["duration_str"].apply(
+                lambda x: x if pd.isnull(x) else round(x * 1000)
             )
-            df_journey["end_station_logical_terminal"] = ""
-            df_journey["start_station_logical_terminal"] = ""
-            df_journey["end_station_priority_id"] = ""
-            df_journey.rename(columns={"duration_str": "duration"}, inplace=True)
-            df_journey[output_csv_headers].to_csv(
-                output_file, sep="|", quotechar='"', index=False
+        if "bike_model" not in df_journey.columns:
+            df_journey["bike_model"] = ""
+        else:
+            pass
+        df_journey["start_date"] = df_journey["start_date"].apply(
+            lambda x: x if len(str(x)) < 1 else f"{x}:00"
+        )
+        df_journey["start_date"] = df_journey["start_date"].apply(lambda x: fix_date(x))
+        df_journey["end_date"] = df_journey["end_date"].apply(
+            lambda x: x if len(str(x)) < 1 else f"{x}:00"
+        )
+        df_journey["end_date"] = df_journey["end_date"].apply(lambda x: fix_date(x))
+        df_journey["rental_id"] = df_journey["rental_id"].apply(
+            lambda x: re.sub(r"\W+", "", str(x))
+        )
+        df_journey["duration_str"] = df_journey["duration_str"].apply(
+            lambda x: re.sub(r"\W+", "", str(x))
+        )
+        df_journey["duration_ms"] = df_journey["duration_ms"].apply(
+            lambda x: re.sub(r"\W+", "", str(x))
+        )
+        df_journey["bike_id"] = df_journey["bike_id"].apply(
+            lambda x: re.sub(r"\W+", "", str(x))
+        )
+        df_journey["start_station_id"] = df_journey["start_station_id"].apply(
+            lambda x: re.sub(r"\W+", "", str(x))
+        )
+        df_journey["end_station_id"] = df_journey["end_station_id"].apply(
+            lambda x: re.sub(r"\W+", "", str(x))
+        )
+        df_journey["end_station_logical_terminal"] = ""
+        df_journey["start_station_logical_terminal"] = ""
+        df_journey["end_station_priority_id"] = ""
+        df_journey.rename(columns={"duration_str": "duration"}, inplace=True)
+        df_journey[output_csv_headers].to_csv(
+            output_file, sep="|", quotechar='"', index=False
+        )
+        if os.path.exists(output_file):
+            load_data_to_bq(
+                project_id=project_id,
+                dataset_id=dataset_id,
+                table_id=table_id,
+                file_path=output_file,
+                truncate_table=False,
+                field_delimiter="|",
             )
-            if os.path.exists(output_file):
-                load_data_to_bq(
-                    project_id=project_id,
-                    dataset_id=dataset_id,
-                    table_id=table_id,
-                    file_path=output_file,
-                    truncate_table=False,
-                    field_delimiter="|",
-                )
-                os.unlink(destination_filename)
-                os.unlink(output_file)
-            else:
-                logging.info(
-                    f"Informational: The data file {output_file} was not generated because no data file was available.  Continuing."
-                )
+            os.unlink(destination_filename)
+            os.unlink(output_file)
         else:
-            logging.info(f"Datafile {download_file_name} already loaded.  Skipping.")
+            logging.info(
+                f"Informational: The data file {output_file} was not generated because no data file was available.  Continuing."
+            )
 
 
 def fix_date(dt_val: str) -> str:
@@ -359,7 +362,7 @@ def create_dest_table(
 
 
 def check_gcs_file_exists(file_path: str, bucket_name: str) -> bool:
-    storage_client = storage.Client()
+    storage_client = gcs_client()
     bucket = storage_client.bucket(bucket_name)
     exists = storage.Blob(bucket=bucket, name=file_path).exists(storage_client)
     return exists
@@ -373,7 +376,7 @@ def create_table_schema(
     if not (schema_filepath):
         schema_struct = schema_structure
     else:
-        storage_client = storage.Client()
+        storage_client = gcs_client()
         bucket = storage_client.get_bucket(bucket_name)
         blob = bucket.blob(schema_filepath)
         schema_struct = json.loads(blob.download_as_bytes(client=None))
@@ -449,46 +452,94 @@ def field_exists(
         return False
 
 
-def count_number_rows_between_date(
-    project_id: str,
-    dataset_id: str,
-    table_name: str,
-    start_date_from: str,
-    start_date_to: str,
-) -> int:
+def start_date_load_index(
+    project_id: str, dataset_id: str, table_name: str
+) -> typing.Optional[typing.Dict[datetime.date, int]]:
     check_field_exists = field_exists(project_id, dataset_id, table_name, "start_date")
     if check_field_exists:
         client = bigquery.Client(project=project_id)
         query = f"""
-            SELECT count(1) AS number_of_rows
+            SELECT DATE(start_date) AS start_day, count(1) AS number_of_rows
             FROM {dataset_id}.{table_name}
-            WHERE start_date between '{start_date_from}' and '{start_date_to}'
+            GROUP BY start_day
         """
         job_config = bigquery.QueryJobConfig()
         query_job = client.query(query, job_config=job_config)
-        for row in query_job.result():
-            count_rows = row.number_of_rows
-        return int(count_rows)
+        return {
+            row.start_day: int(row.number_of_rows)
+            for row in query_job.result()
+            if row.start_day is not None
+        }
     else:
-        return -1
+        return None
+
+
+def count_number_rows_between_date(
+    load_index: typing.Dict[datetime.date, int],
+    start_date_from: str,
+    start_date_to: str,
+) -> int:
+    date_from = datetime.date.fromisoformat(start_date_from)
+    date_to = datetime.date.fromisoformat(start_date_to)
+    return sum(
+        number_of_rows
+        for start_day, number_of_rows in load_index.items()
+        if date_from <= start_day <= date_to
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def gcs_client(project_id: str = "") -> storage.Client:
+    return storage.Client(project_id or None)
 
 
 def download_file_gcs(
     project_id: str, source_location: str, destination_folder: str
-) -> None:
+) -> str:
     logging.info(f"Downloading file {source_location} to folder {destination_folder}")
     object_name = os.path.basename(source_location)
     dest_object = f"{destination_folder}/{object_name}"
-    storage_client = storage.Client(project_id)
     bucket_name = str.split(source_location, "gs://")[1].split("/")[0]
-    bucket = storage_client.bucket(bucket_name)
+    bucket = gcs_client(project_id).bucket(bucket_name)
     source_object_path = str.split(source_location, f"gs://{bucket_name}/")[1]
     blob = bucket.blob(source_object_path)
     blob.download_to_filename(dest_object)
+    return dest_object
+
+
+def prefetch_journey_extracts(
+    project_id: str,
+    source_locations: typing.List[str],
+    destination_folder: str,
+    max_concurrent_transfers: int,
+) -> typing.Iterator[str]:
+    pending_locations = iter(source_locations)
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=max_concurrent_transfers
+    ) as executor:
+        downloads = collections.deque(
+            executor.submit(download_file_gcs, project_id, location, destination_folder)
+            for location in itertools.islice(
+                pending_locations, max_concurrent_transfers
+            )
+        )
+        while downloads:
+            destination_filename = downloads.popleft().result()
+            next_location = next(pending_locations, None)
+            if next_location is not None:
+                downloads.append(
+                    executor.submit(
+                        download_file_gcs,
+                        project_id,
+                        next_location,
+                        destination_folder,
+                    )
+                )
+            yield destination_filename
 
 
 def list_files_in_gcs_bucket(source_gcs_bucket: str, source_gcs_path: str) -> list:
-    client = storage.Client()
+    client = gcs_client()
     bucket = client.get_bucket(source_gcs_bucket)
     files = bucket.list_blobs(prefix=source_gcs_path)
     file_list = []
@@ -600,7 +651,7 @@ def upload_file_to_gcs(
     target_csv_file: str, target_gcs_bucket: str, target_gcs_path: str
 ) -> None:
     logging.info(f"Uploading output file to gs://{target_gcs_bucket}/{target_gcs_path}")
-    storage_client = storage.Client()
+    storage_client = gcs_client()
     bucket = storage_client.bucket(target_gcs_bucket)
     blob = bucket.blob(target_gcs_path)
     blob.upload_from_filename(target_csv_file)
@@ -629,4 +680,5 @@ if __name__ == "__main__":
         output_csv_headers=json.loads(os.environ.get("OUTPUT_CSV_HEADERS", "[]")),
         target_gcs_path=os.environ.get("TARGET_GCS_PATH", ""),
         pipeline=os.environ.get("PIPELINE", ""),
+        max_concurrent_transfers=os.environ.get("MAX_CONCURRENT_TRANSFERS", "4"),
     )
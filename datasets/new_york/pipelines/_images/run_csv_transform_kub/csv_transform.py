@@ -168,7 +168,7 @@ def execute_pipeline(
             sep=sep,
         )
         if os.path.exists(target_file):
-            upload_file_to_gcs(
+            target_uri = upload_file_to_gcs(
                 file_path=target_file,
                 target_gcs_bucket=target_gcs_bucket,
                 target_gcs_path=target_gcs_path,
@@ -186,6 +186,7 @@ def execute_pipeline(
                     dataset_id=dataset_id,
                     table_id=destination_table,
                     file_path=target_file,
+                    source_uris=target_uri,
                     truncate_table=True,
                 )
             else:
@@ -346,6 +347,7 @@ def load_data_to_bq(
     table_id: str,
     file_path: str,
     truncate_table: bool,
+    source_uris: typing.Union[str, typing.List[str]] = "",
 ) -> None:
     logging.info(
         f"Loading data from {file_path} into {project_id}.{dataset_id}.{table_id} started"
@@ -361,8 +363,13 @@ def load_data_to_bq(
         job_config.write_disposition = "WRITE_APPEND"
     job_config.skip_leading_rows = 1  # ignore the header
     job_config.autodetect = False
-    with open(file_path, "rb") as source_file:
-        job = client.load_table_from_file(source_file, table_ref, job_config=job_config)
+    if source_uris:
+        job = client.load_table_from_uri(source_uris, table_ref, job_config=job_config)
+    else:
+        with open(file_path, "rb") as source_file:
+            job = client.load_table_from_file(
+                source_file, table_ref, job_config=job_config
+            )
     job.result()
     logging.info(
         f"Loading data from {file_path} into {project_id}.{dataset_id}.{table_id} completed"
@@ -698,7 +705,7 @@ def download_file(source_url: str, source_file: pathlib.Path) -> None:
 
 def upload_file_to_gcs(
     file_path: pathlib.Path, target_gcs_bucket: str, target_gcs_path: str
-) -> None:
+) -> str:
     if os.path.exists(file_path):
         logging.info(
             f"Uploading output file to gs://{target_gcs_bucket}/{target_gcs_path}"
@@ -707,10 +714,12 @@ def upload_file_to_gcs(
         bucket = storage_client.bucket(target_gcs_bucket)
         blob = bucket.blob(target_gcs_path)
         blob.upload_from_filename(file_path)
+        return f"gs://{target_gcs_bucket}/{target_gcs_path}"
     else:
         logging.info(
             f"Cannot upload file to gs://{target_gcs_bucket}/{target_gcs_path} as it does not exist."
         )
+    return ""
 
 
 if __name__ == "__main__":
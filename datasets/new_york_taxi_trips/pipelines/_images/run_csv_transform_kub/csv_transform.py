@@ -12,18 +12,37 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
+import concurrent.futures
+import contextlib
+import dataclasses
+import enum
+import functools
+import gzip
+import hashlib
 import json
 import logging
 import os
 import pathlib
+import shutil
+import threading
+import time
 import typing
 from datetime import datetime
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
 import requests
 from google.cloud import bigquery, storage
 from google.cloud.exceptions import NotFound
 
+# updated by the download threads of run_periods, which all run in this process
+DOWNLOAD_CACHE_STATS = collections.Counter()
+DOWNLOAD_CACHE_STATS_LOCK = threading.Lock()
+
 
 def main(
     source_url: str,
@@ -43,6 +62,9 @@ def main(
     input_headers: typing.List[str],
     data_dtypes: dict,
     output_headers: typing.List[str],
+    output_format: str,
+    max_parallel_periods: str,
+    download_cache: str,
 ) -> None:
     logging.info(f"New York taxi trips - {pipeline_name} process started")
     pathlib.Path("./files").mkdir(parents=True, exist_ok=True)
@@ -64,7 +86,12 @@ def main(
         input_headers,
         data_dtypes,
         output_headers,
+        output_format,
+        int(max_parallel_periods),
+        download_cache,
     )
+    if download_cache:
+        logging.info(f"Download cache: {download_cache_summary()}")
     logging.info(f"New York taxi trips - {pipeline_name} process completed")
 
 
@@ -86,121 +113,189 @@ def execute_pipeline(
     input_headers: typing.List[str],
     data_dtypes: dict,
     output_headers: typing.List[str],
+    output_format: str,
+    max_parallel_periods: int = 1,
+    download_cache: str = "",
 ) -> None:
+    periods = []
     for year_number in range(datetime.now().year, (start_year - 1), -1):
-        process_year_data(
-            source_url=source_url,
+        periods += list_months_to_load(
             year_number=int(year_number),
-            source_file=source_file,
-            target_file=target_file,
             project_id=project_id,
             dataset_id=dataset_id,
             table_id=table_id,
             data_file_year_field=data_file_year_field,
             data_file_month_field=data_file_month_field,
-            schema_path=schema_path,
+        )
+    target_schemas = {}
+    if output_format == "parquet":
+        for year_number in sorted({year_number for year_number, _ in periods}):
+            target_schemas[year_number] = parquet_target_schema(
+                project_id=project_id,
+                dataset_id=dataset_id,
+                table_id=f"{table_id}_{year_number}",
+                schema_path=schema_path,
+                target_gcs_bucket=target_gcs_bucket,
+                output_headers=output_headers,
+            )
+    run_periods(
+        periods=periods,
+        download_period=functools.partial(
+            download_month,
+            source_url=source_url,
+            source_file=source_file,
+            download_cache=download_cache,
+        ),
+        prepare_period=functools.partial(
+            transform_month,
+            source_file=source_file,
+            target_file=target_file,
             chunksize=chunksize,
-            target_gcs_bucket=target_gcs_bucket,
-            target_gcs_path=target_gcs_path,
-            pipeline_name=pipeline_name,
             input_headers=input_headers,
             data_dtypes=data_dtypes,
             output_headers=output_headers,
-        )
+            pipeline_name=pipeline_name,
+            output_format=output_format,
+            target_schemas=target_schemas,
+        ),
+        upload_period=functools.partial(
+            upload_month,
+            target_gcs_bucket=target_gcs_bucket,
+            target_gcs_path=target_gcs_path,
+            output_format=output_format,
+        ),
+        load_period=functools.partial(
+            load_month,
+            project_id=project_id,
+            dataset_id=dataset_id,
+            table_id=table_id,
+            schema_path=schema_path,
+            target_gcs_bucket=target_gcs_bucket,
+            output_format=output_format,
+        ),
+        max_parallel_periods=max_parallel_periods,
+    )
 
 
-def process_year_data(
-    source_url: str,
+def run_periods(
+    periods: typing.Iterable[typing.Any],
+    download_period: typing.Callable[[typing.Any], typing.Any],
+    prepare_period: typing.Callable[[typing.Any, typing.Any], typing.Any],
+    upload_period: typing.Callable[[typing.Any, typing.Any], typing.Any],
+    load_period: typing.Callable[[typing.Any, typing.Any], None],
+    max_parallel_periods: int,
+) -> None:
+    if max_parallel_periods <= 1:
+        for period in periods:
+            prepared = prepare_period(period, download_period(period))
+            load_period(period, upload_period(period, prepared))
+        return
+    logging.info(f"Processing up to {max_parallel_periods} periods in parallel")
+    pending_periods = iter(periods)
+    in_flight = {}
+    error = None
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=max_parallel_periods
+    ) as io_executor, concurrent.futures.ProcessPoolExecutor(
+        max_workers=max_parallel_periods
+    ) as cpu_executor:
+        # downloads and uploads run in threads, the transform in a worker process
+        stages = [(cpu_executor, prepare_period), (io_executor, upload_period)]
+        while True:
+            # capping the periods in flight also caps the files left on disk
+            while error is None and len(in_flight) < max_parallel_periods:
+                period = next(pending_periods, None)
+                if period is None:
+                    break
+                in_flight[io_executor.submit(download_period, period)] = (period, 0)
+            if not in_flight:
+                break
+            done, _ = concurrent.futures.wait(
+                in_flight, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for future in done:
+                period, stage = in_flight.pop(future)
+                try:
+                    if stage < len(stages):
+                        executor, run_stage = stages[stage]
+                        next_future = executor.submit(
+                            run_stage, period, future.result()
+                        )
+                        in_flight[next_future] = (period, stage + 1)
+                    else:
+                        # loads stay in this process, one at a time, so a
+                        # destination table never has more than one load job
+                        # running against it
+                        load_period(period, future.result())
+                except Exception as e:
+                    # no new periods are started, but the ones in flight are
+                    # still finished and loaded before the error is raised
+                    logging.error(f"Processing period {period} failed: {e}")
+                    error = error or e
+    if error:
+        raise error
+
+
+def period_file_path(file_path: str, period: str) -> str:
+    period_dir = pathlib.Path(file_path).parent / period
+    period_dir.mkdir(parents=True, exist_ok=True)
+    return str(period_dir / pathlib.Path(file_path).name)
+
+
+def list_months_to_load(
     year_number: int,
-    source_file: str,
-    target_file: str,
     project_id: str,
     dataset_id: str,
     table_id: str,
     data_file_year_field: str,
     data_file_month_field: str,
-    schema_path: str,
-    chunksize: str,
-    target_gcs_bucket: str,
-    target_gcs_path: str,
-    pipeline_name: str,
-    input_headers: typing.List[str],
-    data_dtypes: dict,
-    output_headers: typing.List[str],
-) -> None:
-    logging.info(f"Processing year {year_number}")
-    destination_table = f"{table_id}_{year_number}"
+) -> typing.List[typing.Tuple[int, int]]:
+    logging.info(f"Checking loaded months for year {year_number}")
+    load_index = month_load_index(
+        project_id=project_id,
+        dataset_id=dataset_id,
+        table_name=f"{table_id}_{year_number}",
+        data_file_year_field=data_file_year_field,
+        data_file_month_field=data_file_month_field,
+    )
+    months_to_load = []
     for month_number in range(1, 13):
-        padded_month = str(month_number).zfill(2)
-        process_year_month = f"{year_number}-{padded_month}"
-        logging.info(f"Processing month {process_year_month}")
-        month_data_already_loaded = table_has_month_data(
-            project_id=project_id,
-            dataset_id=dataset_id,
-            table_name=destination_table,
-            data_file_year_field=data_file_year_field,
-            year_number=year_number,
-            data_file_month_field=data_file_month_field,
-            month_number=month_number,
-        )
-        if month_data_already_loaded:
+        process_year_month = f"{year_number}-{str(month_number).zfill(2)}"
+        if load_index.get((year_number, month_number), 0) > 0:
             logging.info(f"{process_year_month} data is already loaded. Skipping.")
         else:
-            target_file_name = str.replace(
-                target_file, ".csv", f"_{year_number}-{month_number}.csv"
-            )
-            process_month(
-                source_url=source_url,
-                year_number=year_number,
-                month_number=month_number,
-                source_file=source_file,
-                target_file=target_file,
-                project_id=project_id,
-                dataset_id=dataset_id,
-                table_id=destination_table,
-                target_file_name=target_file_name,
-                schema_path=schema_path,
-                chunksize=chunksize,
-                target_gcs_bucket=target_gcs_bucket,
-                target_gcs_path=target_gcs_path,
-                input_headers=input_headers,
-                data_dtypes=data_dtypes,
-                output_headers=output_headers,
-                pipeline_name=pipeline_name,
-            )
-    logging.info(f"Processing year {year_number} completed")
+            months_to_load.append((year_number, month_number))
+    return months_to_load
 
 
-def table_has_month_data(
+def month_load_index(
     project_id: str,
     dataset_id: str,
     table_name: str,
     data_file_year_field: str,
-    year_number: int,
     data_file_month_field: str,
-    month_number: int,
-) -> bool:
-    check_field_exists = field_exists(
-        project_id, dataset_id, table_name, data_file_month_field
-    )
-    if check_field_exists:
-        client = bigquery.Client(project=project_id)
-        query = f"""
-            SELECT count(1) AS number_of_rows
-            FROM {dataset_id}.{table_name}
-            WHERE {data_file_year_field} = {year_number}
-              AND {data_file_month_field} = {month_number}
-        """
-        job_config = bigquery.QueryJobConfig()
-        query_job = client.query(query, job_config=job_config)
-        for row in query_job.result():
-            count_rows = row.number_of_rows
-        if int(count_rows) > 0:
-            return True
-        else:
-            return False
-    else:
-        return None
+) -> typing.Dict[typing.Tuple[int, int], int]:
+    client = bigquery.Client(project=project_id)
+    try:
+        tbl_schema = client.get_table(f"{dataset_id}.{table_name}").schema
+    except NotFound:
+        return {}
+    if data_file_month_field not in [field.name for field in tbl_schema]:
+        return {}
+    query = f"""
+        SELECT {data_file_year_field} AS year_number,
+               {data_file_month_field} AS month_number,
+               count(1) AS number_of_rows
+        FROM {dataset_id}.{table_name}
+        GROUP BY year_number, month_number
+    """
+    job_config = bigquery.QueryJobConfig()
+    query_job = client.query(query, job_config=job_config)
+    return {
+        (int(row.year_number), int(row.month_number)): int(row.number_of_rows)
+        for row in query_job.result()
+        if row.year_number is not None and row.month_number is not None
+    }
 
 
 def table_exists(project_id: str, dataset_id: str, table_name: str) -> bool:
@@ -213,28 +308,14 @@ def table_exists(project_id: str, dataset_id: str, table_name: str) -> bool:
     return found_table
 
 
-def field_exists(
-    project_id: str, dataset_id: str, table_name: str, field_name: str
-) -> bool:
-    if table_exists(project_id, dataset_id, table_name):
-        client = bigquery.Client(project=project_id)
-        table_ref = f"{dataset_id}.{table_name}"
-        tbl_schema = client.get_table(table_ref).schema
-        found_field = False
-        for field in tbl_schema:
-            if field.name == field_name:
-                found_field = True
-        return found_field
-    else:
-        return False
-
-
 def load_data_to_bq(
     project_id: str,
     dataset_id: str,
     table_id: str,
     file_path: str,
     field_delimiter: str,
+    source_format: str = bigquery.SourceFormat.CSV,
+    source_uris: typing.Union[str, typing.List[str]] = "",
 ) -> None:
     logging.info(
         f"Loading data from {file_path} into {project_id}.{dataset_id}.{table_id} started"
@@ -242,12 +323,18 @@ def load_data_to_bq(
     client = bigquery.Client(project=project_id)
     table_ref = client.dataset(dataset_id).table(table_id)
     job_config = bigquery.LoadJobConfig()
-    job_config.source_format = bigquery.SourceFormat.CSV
-    job_config.field_delimiter = field_delimiter
-    job_config.skip_leading_rows = 1  # ignore the header
+    job_config.source_format = source_format
+    if source_format == bigquery.SourceFormat.CSV:
+        job_config.field_delimiter = field_delimiter
+        job_config.skip_leading_rows = 1  # ignore the header
     job_config.autodetect = False
-    with open(file_path, "rb") as source_file:
-        job = client.load_table_from_file(source_file, table_ref, job_config=job_config)
+    if source_uris:
+        job = client.load_table_from_uri(source_uris, table_ref, job_config=job_config)
+    else:
+        with open(file_path, "rb") as source_file:
+            job = client.load_table_from_file(
+                source_file, table_ref, job_config=job_config
+            )
     job.result()
     logging.info(
         f"Loading data from {file_path} into {project_id}.{dataset_id}.{table_id} completed"
@@ -307,145 +394,811 @@ def create_table_schema(
     return schema
 
 
-def process_month(
+def download_month(
+    period: typing.Tuple[int, int],
     source_url: str,
-    year_number: int,
-    month_number: int,
+    source_file: str,
+    download_cache: str = "",
+) -> typing.Optional[str]:
+    year_number, month_number = period
+    process_year_month = f"{year_number}-{str(month_number).zfill(2)}"
+    logging.info(f"Processing month {process_year_month}")
+    source_url_to_process = f"{source_url}{process_year_month}.parquet"
+    source_parquet_file = period_file_path(
+        str(source_file).replace(".csv", f"_{process_year_month}.parquet"),
+        process_year_month,
+    )
+    download = download_file(
+        source_url_to_process, source_parquet_file, download_cache=download_cache
+    )
+    if download.status == DownloadStatus.NOT_FOUND:
+        logging.info(
+            f"Informational: No data was available for {process_year_month}.  Continuing."
+        )
+        return None
+    if download.status == DownloadStatus.RETRYABLE:
+        # the retries are used up, so fail the task instead of quietly leaving
+        # a gap for the month; the other in-flight months are still loaded
+        logging.error(
+            f"Unable to download {source_url_to_process} after retrying: HTTP {download.http_status} {download.detail}"
+        )
+        raise RuntimeError(
+            f"Download of {source_url_to_process} failed: {download.detail}"
+        )
+    return source_parquet_file
+
+
+def transform_month(
+    period: typing.Tuple[int, int],
+    source_parquet_file: typing.Optional[str],
     source_file: str,
     target_file: str,
-    project_id: str,
-    dataset_id: str,
-    table_id: str,
+    chunksize: str,
+    input_headers: typing.List[str],
+    data_dtypes: dict,
+    output_headers: typing.List[str],
+    pipeline_name: str,
+    output_format: str,
+    target_schemas: typing.Dict[int, pa.Schema],
+) -> typing.Optional[str]:
+    if not source_parquet_file:
+        return None
+    year_number, month_number = period
+    process_year_month = f"{year_number}-{str(month_number).zfill(2)}"
+    target_file_name = period_file_path(
+        str(target_file).replace(
+            ".csv", f"_{year_number}-{month_number}.{output_format}"
+        ),
+        process_year_month,
+    )
+    if output_format == "parquet":
+        transformed = transform_month_parquet(
+            source_parquet_file=source_parquet_file,
+            target_file_name=target_file_name,
+            target_schema=target_schemas[year_number],
+            year_number=year_number,
+            month_number=month_number,
+            chunksize=chunksize,
+            input_headers=input_headers,
+            data_dtypes=data_dtypes,
+            output_headers=output_headers,
+            pipeline_name=pipeline_name,
+        )
+    else:
+        transformed = transform_month_csv(
+            source_parquet_file=source_parquet_file,
+            source_file_to_process=period_file_path(
+                str(source_file).replace(".csv", f"_{process_year_month}.csv"),
+                process_year_month,
+            ),
+            target_file_name=target_file_name,
+            year_number=year_number,
+            month_number=month_number,
+            chunksize=chunksize,
+            input_headers=input_headers,
+            data_dtypes=data_dtypes,
+            output_headers=output_headers,
+            pipeline_name=pipeline_name,
+        )
+    if not transformed:
+        logging.info(f"Processing {process_year_month} failed")
+        return None
+    return target_file_name
+
+
+def transform_month_csv(
+    source_parquet_file: str,
+    source_file_to_process: str,
     target_file_name: str,
-    schema_path: str,
+    year_number: int,
+    month_number: int,
     chunksize: str,
-    target_gcs_bucket: str,
-    target_gcs_path: str,
     input_headers: typing.List[str],
     data_dtypes: dict,
     output_headers: typing.List[str],
     pipeline_name: str,
-) -> None:
-    padded_month = str(month_number).zfill(2)
-    process_year_month = f"{year_number}-{padded_month}"
-    source_url_to_process = f"{source_url}{process_year_month}.parquet"
-    source_parquet_file = str(source_file).replace(
-        ".csv", f"_{process_year_month}.parquet"
+) -> bool:
+    process_year_month = f"{year_number}-{str(month_number).zfill(2)}"
+    try:
+        df_parquet = pd.read_parquet(source_parquet_file)
+    except BaseException as error:
+        logging.info(f" ... Unable to obtain or read parquet file ... {error}")
+        return False
+    df_parquet.to_csv(source_file_to_process, sep="|", index=False)
+    with read_csv_chunks(
+        source_file_to_process,
+        encoding="utf-8",
+        quotechar='"',
+        chunksize=int(chunksize),
+        sep="|",
+        names=input_headers,
+        skiprows=1,
+        dtype=data_dtypes,
+    ) as reader, open_target_file(target_file_name) as target_file_handle:
+        for chunk_number, chunk in enumerate(reader):
+            logging.info(
+                f"Processing chunk #{chunk_number} of file {process_year_month} started"
+            )
+            process_chunk(
+                chunk,
+                target_file_handle,
+                chunk_number == 0,
+                output_headers,
+                pipeline_name,
+                year_number,
+                month_number,
+            )
+            logging.info(
+                f"Processing chunk #{chunk_number} of file {process_year_month} completed"
+            )
+    return True
+
+
+def transform_month_parquet(
+    source_parquet_file: str,
+    target_file_name: str,
+    target_schema: pa.Schema,
+    year_number: int,
+    month_number: int,
+    chunksize: str,
+    input_headers: typing.List[str],
+    data_dtypes: dict,
+    output_headers: typing.List[str],
+    pipeline_name: str,
+) -> bool:
+    process_year_month = f"{year_number}-{str(month_number).zfill(2)}"
+    try:
+        parquet_file = pq.ParquetFile(source_parquet_file)
+    except BaseException as error:
+        logging.info(f" ... Unable to obtain or read parquet file ... {error}")
+        return False
+    with pq.ParquetWriter(target_file_name, target_schema) as writer:
+        for batch_number, batch in enumerate(
+            parquet_file.iter_batches(batch_size=int(chunksize))
+        ):
+            logging.info(
+                f"Processing batch #{batch_number} of file {process_year_month} started"
+            )
+            df = rename_input_columns(batch.to_pandas(), input_headers)
+            df = convert_data_dtypes(df, data_dtypes)
+            df = transform_chunk(
+                df,
+                output_headers,
+                pipeline_name,
+                year_number,
+                month_number,
+                format_dates=False,
+            )
+            writer.write_table(df_to_arrow_table(df, target_schema))
+            logging.info(
+                f"Processing batch #{batch_number} of file {process_year_month} completed"
+            )
+    return True
+
+
+def upload_month(
+    period: typing.Tuple[int, int],
+    target_file_name: typing.Optional[str],
+    target_gcs_bucket: str,
+    target_gcs_path: str,
+    output_format: str,
+) -> typing.Optional[typing.Tuple[str, str]]:
+    if not target_file_name:
+        return None
+    year_number, month_number = period
+    process_year_month = f"{year_number}-{str(month_number).zfill(2)}"
+    target_uri = upload_file_to_gcs(
+        file_path=target_file_name,
+        target_gcs_bucket=target_gcs_bucket,
+        target_gcs_path=str(target_gcs_path).replace(
+            ".csv", f"_{process_year_month}.{output_format}"
+        ),
     )
-    source_file_to_process = str(source_file).replace(
-        ".csv", f"_{process_year_month}.csv"
+    return target_file_name, target_uri
+
+
+def load_month(
+    period: typing.Tuple[int, int],
+    uploaded: typing.Optional[typing.Tuple[str, str]],
+    project_id: str,
+    dataset_id: str,
+    table_id: str,
+    schema_path: str,
+    target_gcs_bucket: str,
+    output_format: str,
+) -> None:
+    if not uploaded:
+        return
+    target_file_name, target_uri = uploaded
+    year_number, month_number = period
+    process_year_month = f"{year_number}-{str(month_number).zfill(2)}"
+    destination_table = f"{table_id}_{year_number}"
+    if not table_exists(project_id, dataset_id, destination_table):
+        # Destination able doesn't exist
+        create_dest_table(
+            project_id=project_id,
+            dataset_id=dataset_id,
+            table_id=destination_table,
+            schema_filepath=schema_path,
+            bucket_name=target_gcs_bucket,
+        )
+    load_data_to_bq(
+        project_id=project_id,
+        dataset_id=dataset_id,
+        table_id=destination_table,
+        file_path=target_file_name,
+        field_delimiter="|",
+        source_format=(
+            bigquery.SourceFormat.PARQUET
+            if output_format == "parquet"
+            else bigquery.SourceFormat.CSV
+        ),
+        source_uris=target_uri,
     )
-    successful_download = download_file(source_url_to_process, source_parquet_file)
-    if successful_download:
-        try:
-            df_parquet = pd.read_parquet(source_parquet_file)
-        except BaseException as error:
-            logging.info(f" ... Unable to obtain or read parquet file ... {error}")
-            logging.info(f"Processing {process_year_month} failed")
+    logging.info(f"Processing {process_year_month} completed")
+
+
+def parquet_target_schema(
+    project_id: str,
+    dataset_id: str,
+    table_id: str,
+    schema_path: str,
+    target_gcs_bucket: str,
+    output_headers: typing.List[str],
+) -> pa.Schema:
+    if not table_exists(project_id, dataset_id, table_id):
+        create_dest_table(
+            project_id=project_id,
+            dataset_id=dataset_id,
+            table_id=table_id,
+            schema_filepath=schema_path,
+            bucket_name=target_gcs_bucket,
+        )
+    client = bigquery.Client(project=project_id)
+    table_schema = client.get_table(f"{project_id}.{dataset_id}.{table_id}").schema
+    return arrow_schema_from_bq_schema(table_schema, output_headers)
+
+
+def convert_data_dtypes(df: pd.DataFrame, data_dtypes: dict) -> pd.DataFrame:
+    # Match the column types the CSV round trip used to produce, where "str"
+    # columns hold the text form of the value and missing values stay NaN
+    for col, col_type in data_dtypes.items():
+        if col not in df.columns:
+            continue
+        if col_type in ("str", "object"):
+            df[col] = df[col].astype(str).where(df[col].notna(), np.nan)
         else:
-            df_parquet.to_csv(source_file_to_process, sep="|", index=False)
-            with pd.read_csv(
-                source_file_to_process,
-                engine="python",
-                encoding="utf-8",
-                quotechar='"',
-                chunksize=int(chunksize),
-                sep="|",
-                names=input_headers,
-                skiprows=1,
-                dtype=data_dtypes,
-            ) as reader:
-                for chunk_number, chunk in enumerate(reader):
-                    logging.info(
-                        f"Processing chunk #{chunk_number} of file {process_year_month} started"
-                    )
-                    target_file_batch = str(target_file).replace(
-                        ".csv", f"-{process_year_month}-{chunk_number}.csv"
-                    )
-                    df = pd.DataFrame()
-                    df = pd.concat([df, chunk])
-                    process_chunk(
-                        df,
-                        target_file_batch,
-                        target_file_name,
-                        month_number == 1 and chunk_number == 0,
-                        month_number == 1 and chunk_number == 0,
-                        output_headers,
-                        pipeline_name,
-                        year_number,
-                        month_number,
-                    )
-                    logging.info(
-                        f"Processing chunk #{chunk_number} of file {process_year_month} completed"
-                    )
-            if not table_exists(project_id, dataset_id, table_id):
-                # Destination able doesn't exist
-                create_dest_table(
-                    project_id=project_id,
-                    dataset_id=dataset_id,
-                    table_id=table_id,
-                    schema_filepath=schema_path,
-                    bucket_name=target_gcs_bucket,
+            df[col] = df[col].astype(col_type)
+    return df
+
+
+def arrow_schema_from_bq_schema(
+    table_schema: typing.List[bigquery.SchemaField], output_headers: typing.List[str]
+) -> pa.Schema:
+    arrow_types = {
+        "STRING": pa.string(),
+        "INTEGER": pa.int64(),
+        "INT64": pa.int64(),
+        "FLOAT": pa.float64(),
+        "FLOAT64": pa.float64(),
+        "NUMERIC": pa.decimal128(38, 9),
+        "BIGNUMERIC": pa.decimal256(76, 38),
+        "BOOLEAN": pa.bool_(),
+        "BOOL": pa.bool_(),
+        "TIMESTAMP": pa.timestamp("us", tz="UTC"),
+        "DATETIME": pa.timestamp("us"),
+        "DATE": pa.date32(),
+    }
+    field_types = {
+        field.name: arrow_types[field.field_type.upper()] for field in table_schema
+    }
+    return pa.schema([(col, field_types[col]) for col in output_headers])
+
+
+def df_to_arrow_table(df: pd.DataFrame, target_schema: pa.Schema) -> pa.Table:
+    columns = []
+    for field in target_schema:
+        values = df[field.name]
+        if pa.types.is_timestamp(field.type):
+            values = pd.to_datetime(values, errors="coerce")
+            if field.type.tz is not None:
+                values = values.dt.tz_localize(field.type.tz)
+        elif pa.types.is_date(field.type):
+            values = pd.to_datetime(values, errors="coerce").dt.date
+        elif pa.types.is_string(field.type):
+            values = values.astype(str).where(values.notna(), None)
+        elif pa.types.is_integer(field.type):
+            values = pd.to_numeric(values, errors="coerce").astype("Int64")
+        elif pa.types.is_decimal(field.type):
+            values = pd.to_numeric(values, errors="coerce").astype("float64")
+            columns.append(
+                pa.array(values, type=pa.float64(), from_pandas=True).cast(field.type)
+            )
+            continue
+        elif not pa.types.is_boolean(field.type):
+            values = pd.to_numeric(values, errors="coerce").astype("float64")
+        columns.append(pa.array(values, type=field.type, from_pandas=True))
+    return pa.Table.from_arrays(columns, schema=target_schema)
+
+
+def rename_input_columns(
+    df: pd.DataFrame, input_headers: typing.List[str]
+) -> pd.DataFrame:
+    # Columns are matched by position as read_csv(names=input_headers) did, where
+    # surplus leading columns became the (dropped) index and missing ones are empty
+    if len(df.columns) > len(input_headers):
+        df = df.iloc[:, len(df.columns) - len(input_headers) :]
+    df = df.set_axis(input_headers[: len(df.columns)], axis=1)
+    return df.reindex(columns=input_headers)
+
+
+@contextlib.contextmanager
+def read_csv_chunks(
+    source_file: str, chunksize: int, **read_csv_args
+) -> typing.Iterator[typing.Iterator[pd.DataFrame]]:
+    reader = iter_csv_chunks(source_file, chunksize, **read_csv_args)
+    try:
+        yield reader
+    finally:
+        reader.close()
+
+
+def iter_csv_chunks(
+    source_file: str, chunksize: int, **read_csv_args
+) -> typing.Iterator[pd.DataFrame]:
+    chunks_read = 0
+    engines = csv_engines(read_csv_args)
+    for engine in engines:
+        logging.info(f"Reading {source_file} with the {engine} CSV engine")
+        try:
+            if engine == "pyarrow":
+                reader = read_csv_chunks_pyarrow(source_file, chunksize, read_csv_args)
+            else:
+                reader = pd.read_csv(
+                    source_file,
+                    engine=engine,
+                    chunksize=chunksize,
+                    **read_csv_args,
+                    **({"float_precision": "round_trip"} if engine == "c" else {}),
                 )
-            load_data_to_bq(
-                project_id=project_id,
-                dataset_id=dataset_id,
-                table_id=table_id,
-                file_path=target_file_name,
-                field_delimiter="|",
+            with contextlib.closing(reader):
+                for chunk_number, chunk in enumerate(reader):
+                    # chunks already handed out by a previous engine are skipped
+                    if chunk_number >= chunks_read:
+                        chunks_read += 1
+                        yield chunk
+            return
+        except (pd.errors.ParserError, pa.ArrowInvalid, ValueError) as e:
+            if engine == engines[-1] or not is_csv_engine_error(e):
+                raise
+            logging.info(
+                f"Unable to read {source_file} with the {engine} CSV engine ({e}), falling back from chunk #{chunks_read}"
             )
-            upload_file_to_gcs(
-                file_path=target_file_name,
-                target_gcs_bucket=target_gcs_bucket,
-                target_gcs_path=str(target_gcs_path).replace(
-                    ".csv", f"_{process_year_month}.csv"
-                ),
+
+
+def is_csv_engine_error(e: Exception) -> bool:
+    if isinstance(e, (pd.errors.ParserError, pa.ArrowInvalid)):
+        return True
+    # options an engine rejects before reading any data
+    return "not supported" in str(e) or "does not support" in str(e)
+
+
+def csv_engines(read_csv_args: dict) -> typing.List[str]:
+    engines = ["c", "python"]
+    if has_datetime_dtype(read_csv_args.get("dtype")):
+        # the C engine can't parse datetime dtypes, only the python engine can
+        engines = ["python"]
+    if pyarrow_csv_options(read_csv_args) is not None:
+        return ["pyarrow"] + engines
+    return engines
+
+
+def has_datetime_dtype(dtype: typing.Any) -> bool:
+    dtypes = dtype.values() if isinstance(dtype, dict) else [dtype]
+    return any(
+        col_type is not None and pd.api.types.is_datetime64_any_dtype(col_type)
+        for col_type in dtypes
+    )
+
+
+def pyarrow_csv_options(read_csv_args: dict) -> typing.Optional[dict]:
+    # Only a subset of read_csv options map onto pyarrow without changing the
+    # resulting dataframe, anything else is left to the pandas engines.
+    supported_args = {
+        "sep",
+        "quotechar",
+        "encoding",
+        "names",
+        "header",
+        "skiprows",
+        "dtype",
+        "keep_default_na",
+        "na_values",
+    }
+    if not set(read_csv_args).issubset(supported_args):
+        return None
+    sep = read_csv_args.get("sep", ",")
+    quotechar = read_csv_args.get("quotechar", '"')
+    names = read_csv_args.get("names")
+    header = read_csv_args.get("header", None if names else 0)
+    skiprows = read_csv_args.get("skiprows", 0)
+    dtype = read_csv_args.get("dtype")
+    if len(sep) != 1 or len(quotechar) != 1 or not isinstance(skiprows, int):
+        return None
+    if header is None and not names:
+        return None
+    if not (dtype in (str, "str", "object") or isinstance(dtype, dict)):
+        return None
+    null_values = list(read_csv_args.get("na_values") or [])
+    if read_csv_args.get("keep_default_na", True):
+        # the values pandas treats as missing by default
+        null_values += [
+            "",
+            "#N/A",
+            "#N/A N/A",
+            "#NA",
+            "-1.#IND",
+            "-1.#QNAN",
+            "-NaN",
+            "-nan",
+            "1.#IND",
+            "1.#QNAN",
+            "<NA>",
+            "N/A",
+            "NA",
+            "NULL",
+            "NaN",
+            "None",
+            "n/a",
+            "nan",
+            "null",
+        ]
+    return {
+        "read_options": pa_csv.ReadOptions(
+            column_names=names,
+            skip_rows=skiprows
+            + (0 if header is None else int(header) + (1 if names else 0)),
+            encoding=read_csv_args.get("encoding", "utf8"),
+        ),
+        "parse_options": pa_csv.ParseOptions(
+            delimiter=sep, quote_char=quotechar, newlines_in_values=True
+        ),
+        "null_values": null_values,
+        "dtype": dtype,
+    }
+
+
+def read_csv_chunks_pyarrow(
+    source_file: str, chunksize: int, read_csv_args: dict
+) -> typing.Iterator[pd.DataFrame]:
+    options = pyarrow_csv_options(read_csv_args)
+    with pa_csv.open_csv(
+        source_file,
+        read_options=options["read_options"],
+        parse_options=options["parse_options"],
+    ) as reader:
+        column_names = reader.schema.names
+    dtype = options["dtype"]
+    if isinstance(dtype, dict):
+        missing_columns = [col for col in column_names if col not in dtype]
+        if missing_columns:
+            raise ValueError(
+                f"The pyarrow engine does not support columns without a dtype: {missing_columns}"
             )
-            logging.info(f"Processing {process_year_month} completed")
     else:
-        logging.info(
-            f"Informational: The data file {target_file_name} was not generated because no data was available for year {year_number}.  Continuing."
-        )
+        dtype = {col: dtype for col in column_names}
+    convert_options = pa_csv.ConvertOptions(
+        column_types={col: pa.string() for col in column_names},
+        null_values=options["null_values"],
+        strings_can_be_null=True,
+    )
+    row_number = 0
+    with pa_csv.open_csv(
+        source_file,
+        read_options=options["read_options"],
+        parse_options=options["parse_options"],
+        convert_options=convert_options,
+    ) as reader:
+        batches = []
+        batched_rows = 0
+        for batch in reader:
+            batches.append(batch)
+            batched_rows += batch.num_rows
+            while batched_rows >= chunksize:
+                table = pa.Table.from_batches(batches, schema=reader.schema)
+                df = arrow_table_to_df(table.slice(0, chunksize), dtype, row_number)
+                row_number += len(df)
+                yield df
+                remainder = table.slice(chunksize)
+                batches = remainder.to_batches()
+                batched_rows = remainder.num_rows
+        if batched_rows:
+            table = pa.Table.from_batches(batches, schema=reader.schema)
+            yield arrow_table_to_df(table, dtype, row_number)
+
+
+def arrow_table_to_df(table: pa.Table, dtype: dict, row_number: int) -> pd.DataFrame:
+    df = table.to_pandas().fillna(np.nan)
+    df.index = pd.RangeIndex(row_number, row_number + len(df))
+    converted_types = {
+        col: col_type
+        for col, col_type in dtype.items()
+        if col in df.columns and col_type not in (str, "str", "object")
+    }
+    if converted_types:
+        df = df.astype(converted_types)
+    return df
+
+
+class DownloadStatus(enum.Enum):
+    OK = "ok"
+    NOT_FOUND = "not_found"
+    RETRYABLE = "retryable"
+
+
+@dataclasses.dataclass
+class DownloadResult:
+    status: DownloadStatus
+    http_status: int = 0
+    md5: str = ""
+    detail: str = ""
 
 
-def download_file(source_url: str, source_file: pathlib.Path) -> bool:
+def download_file(
+    source_url: str,
+    source_file: pathlib.Path,
+    download_cache: str = "",
+    no_of_retries: int = 3,
+    error_content_types: typing.Tuple[str, ...] = (
+        "application/xml",
+        "text/xml",
+        "text/html",
+    ),
+) -> DownloadResult:
     logging.info(f"Downloading {source_url} into {source_file}")
-    success = True
-    r = requests.get(source_url, stream=True)
-    with open(source_file, "wb") as f:
-        for chunk in r:
-            f.write(chunk)
-    # if the file contains the string "<Code>NoSuchKey</Code>" then the url returned
-    # that it could not locate the respective file
-    if open(source_file, "rb").read().find(b"<Code>NoSuchKey</Code>") > -1:
-        success = False
-    if success:
+    for attempt in range(no_of_retries + 1):
+        if attempt:
+            time.sleep(min(2**attempt, 60))
+        result = download_file_single_try(
+            source_url, source_file, download_cache, error_content_types
+        )
+        if result.status != DownloadStatus.RETRYABLE:
+            break
+        logging.info(
+            f"Download of {source_url} failed ({result.detail}).  Retry {attempt + 1} of {no_of_retries}"
+        )
+    if result.status == DownloadStatus.OK:
         logging.info(f"Download {source_url} to {source_file} complete.")
-    else:
+    elif result.status == DownloadStatus.NOT_FOUND:
         logging.info(
-            f"Unable to download {source_url} to {source_file} at this time.  The URL may not exist."
+            f"Unable to download {source_url} to {source_file}.  The URL may not exist ({result.detail})."
         )
-    return success
+    return result
+
+
+def download_file_single_try(
+    source_url: str,
+    source_file: pathlib.Path,
+    download_cache: str,
+    error_content_types: typing.Tuple[str, ...],
+) -> DownloadResult:
+    cache_entry = read_download_cache_entry(download_cache, source_url)
+    try:
+        with requests.get(
+            source_url,
+            stream=True,
+            headers=conditional_request_headers(cache_entry),
+            timeout=(30, 300),
+        ) as r:
+            if r.status_code == 304:
+                restore_cached_download(
+                    download_cache, source_url, cache_entry, source_file
+                )
+                return DownloadResult(
+                    DownloadStatus.OK, r.status_code, md5=cache_entry["md5"]
+                )
+            # a missing month comes back as an S3 XML error document (NoSuchKey)
+            # instead of parquet, so it is rejected before anything is written
+            content_type = r.headers.get("Content-Type", "").split(";")[0].strip()
+            if r.status_code == 429 or r.status_code >= 500:
+                return DownloadResult(
+                    DownloadStatus.RETRYABLE, r.status_code, detail=r.reason
+                )
+            if r.status_code != 200 or content_type in error_content_types:
+                return DownloadResult(
+                    DownloadStatus.NOT_FOUND,
+                    r.status_code,
+                    detail=f"{r.reason} ({content_type})",
+                )
+            md5 = hashlib.md5()
+            with open(source_file, "wb") as f:
+                for chunk in r.iter_content(chunk_size=1024 * 1024):
+                    md5.update(chunk)
+                    f.write(chunk)
+    except requests.exceptions.RequestException as e:
+        return DownloadResult(DownloadStatus.RETRYABLE, detail=str(e))
+    store_cached_download(
+        download_cache,
+        source_url,
+        source_file,
+        http_cache_validators(r.headers),
+        content_hash=md5.hexdigest(),
+    )
+    return DownloadResult(DownloadStatus.OK, r.status_code, md5=md5.hexdigest())
+
+
+def read_download_cache_entry(download_cache: str, source_url: str) -> dict:
+    if not download_cache:
+        return {}
+    cache_entry = read_manifest(download_cache_entry_path(download_cache, source_url))
+    if cache_entry and not download_cache_object_exists(
+        download_cache_object_path(download_cache, cache_entry["md5"])
+    ):
+        return {}
+    return cache_entry
+
+
+def conditional_request_headers(cache_entry: dict) -> dict:
+    headers = {}
+    if cache_entry.get("etag"):
+        headers["If-None-Match"] = cache_entry["etag"]
+    if cache_entry.get("last_modified"):
+        headers["If-Modified-Since"] = cache_entry["last_modified"]
+    return headers
+
+
+def http_cache_validators(response_headers: typing.Mapping[str, str]) -> dict:
+    return {
+        "etag": response_headers.get("ETag", ""),
+        "last_modified": response_headers.get("Last-Modified", ""),
+    }
+
+
+def restore_cached_download(
+    download_cache: str, source_url: str, cache_entry: dict, source_file: str
+) -> None:
+    object_path = download_cache_object_path(download_cache, cache_entry["md5"])
+    if object_path.startswith("gs://"):
+        download_cache_blob(object_path).download_to_filename(str(source_file))
+    else:
+        shutil.copyfile(object_path, source_file)
+    with DOWNLOAD_CACHE_STATS_LOCK:
+        DOWNLOAD_CACHE_STATS["hits"] += 1
+    logging.info(f"Download cache hit for {source_url} ({download_cache_summary()})")
+
+
+def store_cached_download(
+    download_cache: str,
+    source_url: str,
+    source_file: str,
+    validators: dict,
+    content_hash: str = "",
+) -> None:
+    if not download_cache:
+        return
+    with DOWNLOAD_CACHE_STATS_LOCK:
+        DOWNLOAD_CACHE_STATS["misses"] += 1
+    logging.info(f"Download cache miss for {source_url} ({download_cache_summary()})")
+    if not any(validators.values()):
+        logging.info(f"{source_url} cannot be revalidated, not caching it")
+        return
+    content_hash = content_hash or file_md5(source_file)
+    object_path = download_cache_object_path(download_cache, content_hash)
+    if not download_cache_object_exists(object_path):
+        if object_path.startswith("gs://"):
+            download_cache_blob(object_path).upload_from_filename(str(source_file))
+        else:
+            os.makedirs(os.path.dirname(object_path), exist_ok=True)
+            shutil.copyfile(source_file, f"{object_path}.tmp")
+            os.replace(f"{object_path}.tmp", object_path)
+    entry_path = download_cache_entry_path(download_cache, source_url)
+    if not entry_path.startswith("gs://"):
+        os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+    write_manifest(
+        entry_path,
+        {
+            "url": source_url,
+            "md5": content_hash,
+            "content_length": os.path.getsize(source_file),
+            **validators,
+        },
+    )
+
+
+def download_cache_entry_path(download_cache: str, source_url: str) -> str:
+    url_hash = hashlib.sha256(source_url.encode("utf-8")).hexdigest()
+    return f"{download_cache.rstrip('/')}/urls/{url_hash}.json"
+
+
+def download_cache_object_path(download_cache: str, content_hash: str) -> str:
+    return f"{download_cache.rstrip('/')}/objects/{content_hash}"
+
+
+def download_cache_object_exists(object_path: str) -> bool:
+    if object_path.startswith("gs://"):
+        return download_cache_blob(object_path).exists()
+    return os.path.exists(object_path)
+
+
+def download_cache_blob(object_path: str) -> storage.Blob:
+    bucket_name, blob_name = object_path.replace("gs://", "", 1).split("/", 1)
+    return storage.Client().bucket(bucket_name).blob(blob_name)
+
+
+def download_cache_summary() -> str:
+    return (
+        f"{DOWNLOAD_CACHE_STATS['hits']} hits, {DOWNLOAD_CACHE_STATS['misses']} misses"
+    )
+
+
+def file_md5(file_path: str) -> str:
+    md5 = hashlib.md5()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            md5.update(block)
+    return md5.hexdigest()
+
+
+def read_manifest(manifest_path: str) -> dict:
+    if not manifest_path:
+        return {}
+    if manifest_path.startswith("gs://"):
+        bucket_name, blob_name = manifest_path.replace("gs://", "", 1).split("/", 1)
+        blob = storage.Client().bucket(bucket_name).blob(blob_name)
+        if not blob.exists():
+            return {}
+        return json.loads(blob.download_as_text())
+    if not os.path.exists(manifest_path):
+        return {}
+    with open(manifest_path, "r") as f:
+        return json.load(f)
+
+
+def write_manifest(manifest_path: str, manifest: dict) -> None:
+    contents = json.dumps(manifest, indent=2, sort_keys=True)
+    if manifest_path.startswith("gs://"):
+        bucket_name, blob_name = manifest_path.replace("gs://", "", 1).split("/", 1)
+        blob = storage.Client().bucket(bucket_name).blob(blob_name)
+        blob.upload_from_string(contents, content_type="application/json")
+    else:
+        with open(manifest_path, "w") as f:
+            f.write(contents)
 
 
 def process_chunk(
     df: pd.DataFrame,
-    target_file_batch: str,
-    target_file: str,
+    target_file_handle: typing.TextIO,
     include_header: bool,
-    truncate_file: bool,
     output_headers: typing.List[str],
     pipeline_name: str,
     year_number: int,
     month_number: int,
 ) -> None:
+    df = transform_chunk(df, output_headers, pipeline_name, year_number, month_number)
+    append_to_target_file(df, target_file_handle, include_header)
+    logging.info(f"Processing Batch of {len(df)} rows completed")
+
+
+def transform_chunk(
+    df: pd.DataFrame,
+    output_headers: typing.List[str],
+    pipeline_name: str,
+    year_number: int,
+    month_number: int,
+    format_dates: bool = True,
+) -> pd.DataFrame:
     if pipeline_name == "tlc_green_trips":
         df["distance_between_service"] = ""
         df["time_between_service"] = ""
     df["data_file_year"] = year_number
     df["data_file_month"] = month_number
-    df = format_date_time(df, "pickup_datetime", "strftime", "%Y-%m-%d %H:%M:%S")
-    df = format_date_time(df, "dropoff_datetime", "strftime", "%Y-%m-%d %H:%M:%S")
+    if format_dates:
+        df = format_date_time(df, "pickup_datetime", "strftime", "%Y-%m-%d %H:%M:%S")
+        df = format_date_time(df, "dropoff_datetime", "strftime", "%Y-%m-%d %H:%M:%S")
+    else:
+        # keep the datetimes typed, truncated to what the text format holds
+        df["pickup_datetime"] = df["pickup_datetime"].dt.floor("S")
+        df["dropoff_datetime"] = df["dropoff_datetime"].dt.floor("S")
     df["passenger_count"] = df["passenger_count"].apply(
         lambda x: str(int(float(str(x))))
         if str(x).replace(".", "", 1).isdigit()
@@ -453,9 +1206,7 @@ def process_chunk(
     )
     df = remove_null_rows(df)
     df = df[output_headers]
-    save_to_new_file(df, file_path=str(target_file_batch))
-    append_batch_file(target_file_batch, target_file, include_header, truncate_file)
-    logging.info(f"Processing Batch {target_file_batch} completed")
+    return df
 
 
 def remove_null_rows(df: pd.DataFrame) -> pd.DataFrame:
@@ -480,43 +1231,28 @@ def format_date_time(
     return df
 
 
-def save_to_new_file(df, file_path, sep="|") -> None:
-    logging.info(f"Saving to file {file_path} separator='{sep}'")
-    df.to_csv(file_path, sep=sep, index=False)
+def open_target_file(target_file: str) -> typing.TextIO:
+    logging.info(f"Opening target file {target_file} for streaming output")
+    if str(target_file).endswith(".gz"):
+        return gzip.open(target_file, "wt", encoding="utf-8", newline="")
+    return open(target_file, "w", encoding="utf-8", newline="")
 
 
-def append_batch_file(
-    batch_file_path: str,
-    target_file_path: str,
+def append_to_target_file(
+    df: pd.DataFrame,
+    target_file_handle: typing.TextIO,
     include_header: bool,
-    truncate_target_file: bool,
+    sep: str = "|",
 ) -> None:
     logging.info(
-        f"Appending file {batch_file_path} to file {target_file_path} with include_header={include_header} and truncate_target_file={truncate_target_file}"
+        f"Writing {len(df)} rows to {target_file_handle.name} with include_header={include_header}"
     )
-    data_file = open(batch_file_path, "r")
-    if truncate_target_file:
-        target_file = open(target_file_path, "w+").close()
-    target_file = open(target_file_path, "a+")
-    if not include_header:
-        logging.info(
-            f"Appending batch file {batch_file_path} to {target_file_path} without header"
-        )
-        next(data_file)
-    else:
-        logging.info(
-            f"Appending batch file {batch_file_path} to {target_file_path} with header"
-        )
-    target_file.write(data_file.read())
-    data_file.close()
-    target_file.close()
-    if os.path.exists(batch_file_path):
-        os.remove(batch_file_path)
+    df.to_csv(target_file_handle, sep=sep, index=False, header=include_header)
 
 
 def upload_file_to_gcs(
     file_path: pathlib.Path, target_gcs_bucket: str, target_gcs_path: str
-) -> None:
+) -> str:
     if os.path.exists(file_path):
         logging.info(
             f"Uploading output file {file_path} to gs://{target_gcs_bucket}/{target_gcs_path}"
@@ -525,10 +1261,12 @@ def upload_file_to_gcs(
         bucket = storage_client.bucket(target_gcs_bucket)
         blob = bucket.blob(target_gcs_path)
         blob.upload_from_filename(file_path)
+        return f"gs://{target_gcs_bucket}/{target_gcs_path}"
     else:
         logging.info(
             f"Cannot upload file {file_path} to gs://{target_gcs_bucket}/{target_gcs_path} as it does not exist."
         )
+    return ""
 
 
 if __name__ == "__main__":
@@ -552,4 +1290,7 @@ if __name__ == "__main__":
         input_headers=json.loads(os.environ.get("INPUT_CSV_HEADERS", "")),
         data_dtypes=json.loads(os.environ.get("DATA_DTYPES", "")),
         output_headers=json.loads(os.environ.get("OUTPUT_CSV_HEADERS", "")),
+        output_format=os.environ.get("OUTPUT_FORMAT", "csv"),
+        max_parallel_periods=os.environ.get("MAX_PARALLEL_PERIODS", "1"),
+        download_cache=os.environ.get("DOWNLOAD_CACHE", ""),
     )
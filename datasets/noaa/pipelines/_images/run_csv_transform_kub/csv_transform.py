@@ -12,18 +12,26 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import bz2
+import collections
+import concurrent.futures
+import contextlib
 import csv
 import ftplib
+import functools
 import glob
 import gzip
+import hashlib
+import io
 import json
 import logging
-import math
 import os
 import pathlib
+import queue
 import re
 import shutil
 import sys
+import threading
 import time
 import typing
 import zipfile
@@ -34,12 +42,17 @@ import geopandas as geo
 import numpy as np
 import pandas as pd
 import requests
+import zstandard
 from bs4 import BeautifulSoup
 from dateutil.relativedelta import relativedelta
-from google.api_core.exceptions import NotFound
+from google.api_core.exceptions import NotFound, PreconditionFailed
 from google.cloud import bigquery, storage
 from sh import sed
 
+# updated by the download threads of run_periods, which all run in this process
+DOWNLOAD_CACHE_STATS = collections.Counter()
+DOWNLOAD_CACHE_STATS_LOCK = threading.Lock()
+
 
 def main(
     pipeline_name: str,
@@ -78,6 +91,14 @@ def main(
     number_of_header_rows: str,
     int_date_list: typing.List[str],
     gen_location_list: dict,
+    max_parallel_periods: str,
+    manifest_path: str,
+    output_format: str,
+    parquet_compression: str,
+    max_concurrent_downloads: str,
+    downloads_per_second: str,
+    download_cache: str,
+    ftp_pool_size: str,
 ) -> None:
     logging.info(f"{pipeline_name} process started")
     pathlib.Path("./files").mkdir(parents=True, exist_ok=True)
@@ -118,7 +139,17 @@ def main(
         number_of_header_rows=int(number_of_header_rows),
         int_date_list=int_date_list,
         gen_location_list=gen_location_list,
+        max_parallel_periods=int(max_parallel_periods),
+        manifest_path=manifest_path,
+        output_format=output_format.lower(),
+        parquet_compression=parquet_compression,
+        max_concurrent_downloads=int(max_concurrent_downloads),
+        downloads_per_second=float(downloads_per_second),
+        download_cache=download_cache,
+        ftp_pool_size=int(ftp_pool_size),
     )
+    if download_cache:
+        logging.info(f"Download cache: {download_cache_summary()}")
     logging.info(f"{pipeline_name} process completed")
 
 
@@ -159,69 +190,77 @@ def execute_pipeline(
     number_of_header_rows: int,
     int_date_list: typing.List[str],
     gen_location_list: dict,
+    max_parallel_periods: int = 1,
+    manifest_path: str = "",
+    output_format: str = "csv",
+    parquet_compression: str = "snappy",
+    max_concurrent_downloads: int = 8,
+    downloads_per_second: float = 10,
+    download_cache: str = "",
+    ftp_pool_size: int = 1,
 ) -> None:
     if pipeline_name == "GHCND by year":
         if full_data_load == "N":
             start = str(datetime.now().year - 1)
         else:
             start = start_year
-        ftp_batch = 1
-        for yr in range(int(start), datetime.now().year + 1):
-            yr_str = str(yr)
-            source_zipfile = str.replace(str(source_file), ".csv", f"_{yr_str}.csv.gz")
-            source_file_unzipped = str.replace(str(source_zipfile), ".csv.gz", ".csv")
-            target_file_year = str.replace(str(target_file), ".csv", f"_{yr_str}.csv")
-            destination_table_year = f"{destination_table}_{yr_str}"
-            source_url_year = str.replace(
-                source_url["ghcnd_by_year"], ".csv.gz", f"{yr_str}.csv.gz"
-            )
-            target_gcs_path_year = str.replace(
-                target_gcs_path, ".csv", f"_{yr_str}.csv"
-            )
-            if ftp_batch == int(ftp_batch_size):
-                logging.info("Sleeping...")
-                time.sleep(int(ftp_batch_sleep_time))
-                ftp_batch = 1
-            else:
-                ftp_batch += 1
-            download_file_ftp(
+        run_periods(
+            periods=range(int(start), datetime.now().year + 1),
+            download_period=functools.partial(
+                download_ghcnd_year,
+                source_url=source_url,
+                source_file=source_file,
                 ftp_host=ftp_host,
                 ftp_dir=ftp_dir,
-                ftp_filename=f"{yr_str}.csv.gz",
-                local_file=source_zipfile,
-                source_url=source_url_year,
-            )
-            gz_decompress(
-                infile=source_zipfile, tofile=source_file_unzipped, delete_zipfile=True
-            )
-            process_and_load_table(
-                source_file=source_file_unzipped,
-                target_file=target_file_year,
-                pipeline_name=pipeline_name,
-                source_url=source_url_year,
-                chunksize=chunksize,
+                download_cache=download_cache,
+                ftp_pool_size=ftp_pool_size,
+                throttle=ftp_batch_throttle(
+                    ftp_batch_size=int(ftp_batch_size),
+                    ftp_batch_sleep_time=int(ftp_batch_sleep_time),
+                ),
+            ),
+            prepare_period=functools.partial(
+                prepare_ghcnd_year,
+                target_file=target_file,
+                destination_table=destination_table,
+                target_gcs_path=target_gcs_path,
+                process_file=functools.partial(
+                    process_source_file,
+                    pipeline_name=pipeline_name,
+                    chunksize=chunksize,
+                    input_field_delimiter=input_field_delimiter,
+                    input_csv_headers=input_csv_headers,
+                    data_dtypes=data_dtypes,
+                    reorder_headers_list=reorder_headers_list,
+                    null_rows_list=null_rows_list,
+                    date_format_list=date_format_list,
+                    slice_column_list=slice_column_list,
+                    regex_list=regex_list,
+                    trim_whitespace_list=trim_whitespace_list,
+                    rename_headers_list=rename_headers_list,
+                    remove_source_file=remove_source_file,
+                    int_date_list=int_date_list,
+                    gen_location_list=gen_location_list,
+                ),
+            ),
+            upload_period=functools.partial(
+                upload_period_files,
+                target_gcs_bucket=target_gcs_bucket,
+                delete_target_file=delete_target_file,
+                manifest_path=manifest_path,
+            ),
+            load_period=functools.partial(
+                post_process_period,
                 project_id=project_id,
                 dataset_id=dataset_id,
-                destination_table=destination_table_year,
                 target_gcs_bucket=target_gcs_bucket,
-                target_gcs_path=target_gcs_path_year,
                 schema_path=schema_path,
                 drop_dest_table=drop_dest_table,
-                input_field_delimiter=input_field_delimiter,
-                input_csv_headers=input_csv_headers,
-                data_dtypes=data_dtypes,
-                reorder_headers_list=reorder_headers_list,
-                null_rows_list=null_rows_list,
-                date_format_list=date_format_list,
-                slice_column_list=slice_column_list,
-                regex_list=regex_list,
-                trim_whitespace_list=trim_whitespace_list,
-                rename_headers_list=rename_headers_list,
-                remove_source_file=remove_source_file,
                 delete_target_file=delete_target_file,
-                int_date_list=int_date_list,
-                gen_location_list=gen_location_list,
-            )
+                manifest_path=manifest_path,
+            ),
+            max_parallel_periods=max_parallel_periods,
+        )
         return None
     if pipeline_name in ["NOAA GHCN-M"]:
         for file_id in source_url:
@@ -239,6 +278,7 @@ def execute_pipeline(
                 ftp_filename=src_zip_file_name,
                 local_file=source_zip_file,
                 source_url=src_url,
+                download_cache=download_cache,
             )
             logging.info(f"Unzipping source file {source_zip_file}")
             shutil.unpack_archive(filename=source_zip_file, extract_dir=src_file_path)
@@ -317,6 +357,7 @@ def execute_pipeline(
             delete_target_file=delete_target_file,
             int_date_list=int_date_list,
             gen_location_list=gen_location_list,
+            manifest_path=manifest_path,
         )
         return None
     if pipeline_name in [
@@ -362,6 +403,7 @@ def execute_pipeline(
             delete_target_file=delete_target_file,
             int_date_list=int_date_list,
             gen_location_list=gen_location_list,
+            manifest_path=manifest_path,
         )
         return None
     if pipeline_name == "NOAA GSOD By Year":
@@ -370,37 +412,61 @@ def execute_pipeline(
             start_year = int((datetime.now() - relativedelta(years=1)).strftime("%Y"))
         else:
             start_year = int(start_year)
-        for year_to_process in range(start_year, datetime.now().year + 1):
-            run_gsod_by_year(
-                year_to_process=year_to_process,
+        run_periods(
+            periods=range(start_year, datetime.now().year + 1),
+            download_period=functools.partial(
+                download_gsod_year,
                 source_url=source_url,
                 pipeline_name=pipeline_name,
                 source_file=source_file,
+                manifest_path=manifest_path,
+                max_concurrent_downloads=max_concurrent_downloads,
+                downloads_per_second=downloads_per_second,
+                download_cache=download_cache,
+            ),
+            prepare_period=functools.partial(
+                prepare_gsod_year,
                 target_file=target_file,
-                chunksize=chunksize,
+                destination_table=destination_table,
+                target_gcs_path=target_gcs_path,
+                number_of_header_rows=number_of_header_rows,
+                process_file=functools.partial(
+                    process_source_file,
+                    pipeline_name=pipeline_name,
+                    chunksize=chunksize,
+                    input_field_delimiter=input_field_delimiter,
+                    input_csv_headers=input_csv_headers,
+                    data_dtypes=data_dtypes,
+                    reorder_headers_list=reorder_headers_list,
+                    null_rows_list=null_rows_list,
+                    date_format_list=date_format_list,
+                    slice_column_list=slice_column_list,
+                    regex_list=regex_list,
+                    trim_whitespace_list=trim_whitespace_list,
+                    rename_headers_list=rename_headers_list,
+                    remove_source_file=remove_source_file,
+                    int_date_list=int_date_list,
+                    gen_location_list=gen_location_list,
+                ),
+            ),
+            upload_period=functools.partial(
+                upload_period_files,
+                target_gcs_bucket=target_gcs_bucket,
+                delete_target_file=delete_target_file,
+                manifest_path=manifest_path,
+            ),
+            load_period=functools.partial(
+                post_process_period,
                 project_id=project_id,
                 dataset_id=dataset_id,
-                destination_table=destination_table,
                 target_gcs_bucket=target_gcs_bucket,
-                target_gcs_path=target_gcs_path,
                 schema_path=schema_path,
                 drop_dest_table=drop_dest_table,
-                input_field_delimiter=input_field_delimiter,
-                input_csv_headers=input_csv_headers,
-                data_dtypes=data_dtypes,
-                reorder_headers_list=reorder_headers_list,
-                null_rows_list=null_rows_list,
-                date_format_list=date_format_list,
-                slice_column_list=slice_column_list,
-                regex_list=regex_list,
-                remove_source_file=remove_source_file,
-                trim_whitespace_list=trim_whitespace_list,
-                rename_headers_list=rename_headers_list,
                 delete_target_file=delete_target_file,
-                number_of_header_rows=number_of_header_rows,
-                int_date_list=int_date_list,
-                gen_location_list=gen_location_list,
-            )
+                manifest_path=manifest_path,
+            ),
+            max_parallel_periods=max_parallel_periods,
+        )
         return None
     if pipeline_name in ("NOAA NWS Forecast Regions"):
         src_url_root = source_url[pipeline_name.replace(" ", "_").lower()]
@@ -443,6 +509,7 @@ def execute_pipeline(
             delete_target_file=delete_target_file,
             int_date_list=int_date_list,
             gen_location_list=gen_location_list,
+            manifest_path=manifest_path,
         )
         return None
     if pipeline_name in [
@@ -486,6 +553,7 @@ def execute_pipeline(
             delete_target_file=delete_target_file,
             int_date_list=int_date_list,
             gen_location_list=gen_location_list,
+            manifest_path=manifest_path,
         )
         return None
     if pipeline_name == "GHCND hurricanes":
@@ -522,6 +590,7 @@ def execute_pipeline(
             delete_target_file=delete_target_file,
             int_date_list=int_date_list,
             gen_location_list=gen_location_list,
+            manifest_path=manifest_path,
         )
         return None
     if pipeline_name == "NOAA lightning strikes by year":
@@ -556,6 +625,7 @@ def execute_pipeline(
             number_of_header_rows=number_of_header_rows,
             int_date_list=int_date_list,
             gen_location_list=gen_location_list,
+            download_cache=download_cache,
         )
         return None
     if pipeline_name == "NOAA Storms database by year":
@@ -575,107 +645,280 @@ def execute_pipeline(
             date_format_list=date_format_list,
             rename_headers_list=rename_headers_list,
             gen_location_list=gen_location_list,
+            max_parallel_periods=max_parallel_periods,
+            output_format=output_format,
+            parquet_compression=parquet_compression,
+            download_cache=download_cache,
         )
         return None
 
 
-def run_gsod_by_year(
-    year_to_process: int,
-    source_url: str,
-    pipeline_name: str,
-    source_file: str,
-    target_file: str,
-    chunksize: str,
+def run_periods(
+    periods: typing.Iterable[typing.Any],
+    download_period: typing.Callable[[typing.Any], typing.Any],
+    prepare_period: typing.Callable[[typing.Any, typing.Any], typing.Any],
+    upload_period: typing.Callable[[typing.Any, typing.Any], typing.Any],
+    load_period: typing.Callable[[typing.Any, typing.Any], None],
+    max_parallel_periods: int,
+) -> None:
+    if max_parallel_periods <= 1:
+        for period in periods:
+            prepared = prepare_period(period, download_period(period))
+            load_period(period, upload_period(period, prepared))
+        return
+    logging.info(f"Processing up to {max_parallel_periods} periods in parallel")
+    pending_periods = iter(periods)
+    in_flight = {}
+    error = None
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=max_parallel_periods
+    ) as io_executor, concurrent.futures.ProcessPoolExecutor(
+        max_workers=max_parallel_periods
+    ) as cpu_executor:
+        # downloads and uploads run in threads, the transform in a worker process
+        stages = [(cpu_executor, prepare_period), (io_executor, upload_period)]
+        while True:
+            # capping the periods in flight also caps the files left on disk
+            while error is None and len(in_flight) < max_parallel_periods:
+                period = next(pending_periods, None)
+                if period is None:
+                    break
+                in_flight[io_executor.submit(download_period, period)] = (period, 0)
+            if not in_flight:
+                break
+            done, _ = concurrent.futures.wait(
+                in_flight, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for future in done:
+                period, stage = in_flight.pop(future)
+                try:
+                    if stage < len(stages):
+                        executor, run_stage = stages[stage]
+                        next_future = executor.submit(
+                            run_stage, period, future.result()
+                        )
+                        in_flight[next_future] = (period, stage + 1)
+                    else:
+                        # loads stay in this process, one at a time, so a
+                        # destination table never has more than one load job
+                        # running against it
+                        load_period(period, future.result())
+                except Exception as e:
+                    # no new periods are started, but the ones in flight are
+                    # still finished and loaded before the error is raised
+                    logging.error(f"Processing period {period} failed: {e}")
+                    error = error or e
+    if error:
+        raise error
+
+
+def period_file_path(file_path: str, period: str) -> str:
+    period_dir = pathlib.Path(file_path).parent / period
+    period_dir.mkdir(parents=True, exist_ok=True)
+    return str(period_dir / pathlib.Path(file_path).name)
+
+
+def ftp_batch_throttle(
+    ftp_batch_size: int, ftp_batch_sleep_time: int
+) -> typing.Callable[[], None]:
+    lock = threading.Lock()
+    ftp_batch = [1]
+
+    def throttle() -> None:
+        # sleeping while holding the lock pauses every download thread
+        with lock:
+            if ftp_batch[0] == ftp_batch_size:
+                logging.info("Sleeping...")
+                time.sleep(ftp_batch_sleep_time)
+                ftp_batch[0] = 1
+            else:
+                ftp_batch[0] += 1
+
+    return throttle
+
+
+def upload_period_files(
+    period: int,
+    period_files: typing.Optional[dict],
+    target_gcs_bucket: str,
+    delete_target_file: bool,
+    manifest_path: str = "",
+) -> typing.Optional[dict]:
+    if not period_files or not os.path.exists(period_files["target_file"]):
+        return period_files
+    target_file = period_files["target_file"]
+    content_hash = period_files.get("content_hash") or file_md5(target_file)
+    if manifest_path and unit_completed(
+        manifest_path, period_files["source_url"], content_hash
+    ):
+        logging.info(
+            f"{period_files['source_url']} was already loaded into {period_files['destination_table']}.  Skipping."
+        )
+        if delete_target_file:
+            os.remove(target_file)
+        return None
+    target_uri = upload_file_to_gcs(
+        file_path=target_file,
+        target_gcs_bucket=target_gcs_bucket,
+        target_gcs_path=period_files["target_gcs_path"],
+    )
+    return {**period_files, "content_hash": content_hash, "target_uri": target_uri}
+
+
+def post_process_period(
+    period: int,
+    period_files: typing.Optional[dict],
     project_id: str,
     dataset_id: str,
-    destination_table: str,
     target_gcs_bucket: str,
-    target_gcs_path: str,
     schema_path: str,
     drop_dest_table: str,
-    input_field_delimiter: str,
-    input_csv_headers: typing.List[str],
-    data_dtypes: dict,
-    reorder_headers_list: typing.List[str],
-    null_rows_list: typing.List[str],
-    date_format_list: typing.List[typing.List[str]],
-    slice_column_list: dict,
-    regex_list: dict,
-    remove_source_file: bool,
-    trim_whitespace_list: typing.List[str],
-    rename_headers_list: dict,
     delete_target_file: bool,
-    number_of_header_rows: int,
-    int_date_list: typing.List[str],
-    gen_location_list: dict,
+    manifest_path: str = "",
 ) -> None:
+    if not period_files:
+        return
+    post_processing(
+        project_id=project_id,
+        dataset_id=dataset_id,
+        target_gcs_bucket=target_gcs_bucket,
+        schema_path=schema_path,
+        drop_dest_table=drop_dest_table,
+        delete_target_file=delete_target_file,
+        manifest_path=manifest_path,
+        **period_files,
+    )
+    logging.info(f" ... Processing year {period} completed")
+
+
+def download_ghcnd_year(
+    yr: int,
+    source_url: dict,
+    source_file: pathlib.Path,
+    ftp_host: str,
+    ftp_dir: str,
+    download_cache: str = "",
+    ftp_pool_size: int = 1,
+    throttle: typing.Optional[typing.Callable[[], None]] = None,
+) -> dict:
+    yr_str = str(yr)
+    source_zipfile = period_file_path(
+        str.replace(str(source_file), ".csv", f"_{yr_str}.csv.gz"), yr_str
+    )
+    source_url_year = str.replace(
+        source_url["ghcnd_by_year"], ".csv.gz", f"{yr_str}.csv.gz"
+    )
+    if throttle:
+        throttle()
+    download_file_ftp(
+        ftp_host=ftp_host,
+        ftp_dir=ftp_dir,
+        ftp_filename=f"{yr_str}.csv.gz",
+        local_file=source_zipfile,
+        source_url=source_url_year,
+        download_cache=download_cache,
+        pool_size=ftp_pool_size,
+    )
+    return {"source_file": source_zipfile, "source_url": source_url_year}
+
+
+def prepare_ghcnd_year(
+    yr: int,
+    downloaded: dict,
+    target_file: pathlib.Path,
+    destination_table: str,
+    target_gcs_path: str,
+    process_file: typing.Callable[..., None],
+) -> dict:
+    yr_str = str(yr)
+    target_file_year = period_file_path(
+        str.replace(str(target_file), ".csv", f"_{yr_str}.csv"), yr_str
+    )
+    process_file(
+        source_file=downloaded["source_file"],
+        target_file=target_file_year,
+        source_url=downloaded["source_url"],
+    )
+    return {
+        "target_file": target_file_year,
+        "source_url": downloaded["source_url"],
+        "destination_table": f"{destination_table}_{yr_str}",
+        "target_gcs_path": str.replace(target_gcs_path, ".csv", f"_{yr_str}.csv"),
+    }
+
+
+def download_gsod_year(
+    year_to_process: int,
+    source_url: str,
+    pipeline_name: str,
+    source_file: str,
+    manifest_path: str = "",
+    max_concurrent_downloads: int = 8,
+    downloads_per_second: float = 10,
+    download_cache: str = "",
+) -> typing.Optional[dict]:
     logging.info(f" ... Processing year {year_to_process}")
     src_url_root = (
         f"{source_url[pipeline_name.replace(' ', '_').lower()]}{year_to_process}/"
     )
-    files = url_directory_list(source_url_path=src_url_root, file_pattern=".csv")
-    file_cnt = len(files)
-    file_ptr = 1
-    for file_name in files:
-        if file_name == files[0]:
-            source_file = str(source_file).replace("~YEAR~", str(year_to_process))
-            pathlib.Path(os.path.dirname(source_file)).mkdir(
-                parents=True, exist_ok=True
-            )
-            logging.info(f"Writing file {file_name} to {source_file} with header")
-            download_file_http(file_name, source_file, True, True)
-        else:
-            url_filename = os.path.basename(file_name).replace(".csv", "")
-            source_file_tmpname = str(source_file).replace(
-                ".csv", f"_{url_filename}.csv"
-            )
-            download_file_http(file_name, source_file_tmpname, True, True)
-            remove_header_rows(
-                source_file=source_file_tmpname,
-                number_of_header_rows=1,
-                output_file_override=source_file,
-                output_file_append=True,
-            )
-            os.unlink(source_file_tmpname)
-            time.sleep(0.5)
-        if ((file_ptr % 100) == 0) or (file_ptr == file_cnt):
-            logging.info(f"Appended {file_ptr} files of total {file_cnt} files")
-        file_ptr += 1
+    source_file = period_file_path(
+        str(source_file).replace("~YEAR~", str(year_to_process)), str(year_to_process)
+    )
+    entries = url_directory_entries(source_url_path=src_url_root, file_pattern=".csv")
+    listing_hash = directory_listing_hash(entries)
+    if listing_hash and unit_completed(manifest_path, src_url_root, listing_hash):
+        logging.info(f" ... Year {year_to_process} was already loaded.  Skipping.")
+        return None
+    download_files_http_combined(
+        source_urls=sorted(entries),
+        target_file=source_file,
+        max_concurrent_downloads=max_concurrent_downloads,
+        downloads_per_second=downloads_per_second,
+        continue_on_error=True,
+        download_cache=download_cache,
+    )
+    return {
+        "source_file": source_file,
+        "source_url": src_url_root,
+        "content_hash": listing_hash,
+    }
+
+
+def prepare_gsod_year(
+    year_to_process: int,
+    downloaded: typing.Optional[dict],
+    target_file: str,
+    destination_table: str,
+    target_gcs_path: str,
+    number_of_header_rows: int,
+    process_file: typing.Callable[..., None],
+) -> typing.Optional[dict]:
+    if not downloaded:
+        return None
+    source_file = downloaded["source_file"]
+    target_file = period_file_path(
+        str(target_file).replace("~YEAR~", str(year_to_process)), str(year_to_process)
+    )
     #  Remove bad file data
     os.system(f"sed -ni '/^\"/p' {source_file}")
     if number_of_header_rows > 0:
         remove_header_rows(source_file, number_of_header_rows=number_of_header_rows)
     else:
         pass
-    process_and_load_table(
-        source_file=str(source_file).replace("~YEAR~", str(year_to_process)),
-        target_file=str(target_file).replace("~YEAR~", str(year_to_process)),
-        pipeline_name=pipeline_name,
-        source_url=src_url_root,
-        chunksize=chunksize,
-        project_id=project_id,
-        dataset_id=dataset_id,
-        destination_table=f"{destination_table}{year_to_process}",
-        target_gcs_bucket=target_gcs_bucket,
-        target_gcs_path=target_gcs_path,
-        schema_path=schema_path,
-        drop_dest_table=drop_dest_table,
-        input_field_delimiter=input_field_delimiter,
-        input_csv_headers=input_csv_headers,
-        data_dtypes=data_dtypes,
-        reorder_headers_list=reorder_headers_list,
-        null_rows_list=null_rows_list,
-        date_format_list=date_format_list,
-        slice_column_list=slice_column_list,
-        regex_list=regex_list,
-        trim_whitespace_list=trim_whitespace_list,
-        rename_headers_list=rename_headers_list,
-        remove_source_file=remove_source_file,
-        delete_target_file=delete_target_file,
-        int_date_list=int_date_list,
-        gen_location_list=gen_location_list,
+    process_file(
+        source_file=source_file,
+        target_file=target_file,
+        source_url=downloaded["source_url"],
     )
-    logging.info(f" ... Processing year {year_to_process} completed")
+    return {
+        "target_file": target_file,
+        "source_url": downloaded["source_url"],
+        "destination_table": f"{destination_table}{year_to_process}",
+        "target_gcs_path": str.replace(
+            target_gcs_path, ".csv", f"_{year_to_process}.csv"
+        ),
+        "content_hash": downloaded["content_hash"],
+    }
 
 
 def strip_dataframe_whitespace(df: pd.DataFrame) -> pd.DataFrame:
@@ -695,16 +938,22 @@ def convert_cols_to_integer(
     logging.info("Converting Respective Columns To Integer")
     for col in convert_int_list_section:
         print(f"    column: {col}")
-        df[col] = df[col].apply(lambda x: convert_to_integer_string(x))
+        df[col] = convert_to_integer_string(df[col])
     return df
 
 
-def convert_to_integer_string(input: typing.Union[str, float]) -> str:
-    str_val = ""
-    if not input or (math.isnan(input)):
-        str_val = ""
-    else:
-        str_val = str(int(round(input, 0)))
+def convert_to_integer_string(values: pd.Series) -> pd.Series:
+    numeric = pd.to_numeric(values, errors="coerce")
+    valid = numeric.notna() & (numeric != 0)
+    str_val = pd.Series("", index=values.index, dtype=object)
+    # values beyond the int64 range are rare; convert them one at a time
+    fits_int64 = numeric.abs() < 2**63
+    str_val[valid & fits_int64] = (
+        numeric[valid & fits_int64].round(0).astype("int64").astype(str)
+    )
+    str_val[valid & ~fits_int64] = numeric[valid & ~fits_int64].map(
+        lambda x: str(int(round(x, 0)))
+    )
     return str_val
 
 
@@ -729,139 +978,261 @@ def process_ghcn_m_file(
 def download_file_gs(source_url: str, source_file: pathlib.Path) -> None:
     logging.info(f"Downloading {source_url} to {source_file}")
     with open(source_file, "wb+") as file_obj:
-        storage.Client().download_blob_to_file(source_url, file_obj)
+        gcs_client().download_blob_to_file(source_url, file_obj)
+
+
+def process_storms_database_by_year(
+    source_url: dict,
+    source_file: pathlib.Path,
+    target_file: pathlib.Path,
+    project_id: str,
+    dataset_id: str,
+    destination_table: str,
+    target_gcs_bucket: str,
+    target_gcs_path: str,
+    schema_path: str,
+    drop_dest_table: str,
+    start_year: str,
+    reorder_headers_list: typing.List[str],
+    date_format_list: typing.List[typing.List[str]],
+    rename_headers_list: dict,
+    gen_location_list: dict,
+    max_parallel_periods: int = 1,
+    output_format: str = "csv",
+    parquet_compression: str = "snappy",
+    download_cache: str = "",
+) -> None:
+    if output_format == "parquet":
+        table_schema = create_table_schema([], target_gcs_bucket, schema_path)
+    else:
+        table_schema = None
+    list_of_details_files = sorted(
+        http_list_of_files(url=source_url["root"], filter_expr="StormEvents_details")
+    )
+    list_of_locations_files = sorted(
+        http_list_of_files(url=source_url["root"], filter_expr="StormEvents_locations")
+    )
+    run_periods(
+        periods=range(int(start_year), date.today().year + 1),
+        download_period=functools.partial(
+            download_storms_year,
+            list_of_details_files=list_of_details_files,
+            list_of_locations_files=list_of_locations_files,
+            source_url=source_url,
+            source_file=source_file,
+            download_cache=download_cache,
+        ),
+        prepare_period=functools.partial(
+            prepare_storms_year,
+            target_file=target_file,
+            reorder_headers_list=reorder_headers_list,
+            date_format_list=date_format_list,
+            rename_headers_list=rename_headers_list,
+            gen_location_list=gen_location_list,
+            output_format=output_format,
+            table_schema=table_schema,
+            parquet_compression=parquet_compression,
+        ),
+        upload_period=functools.partial(
+            upload_storms_year,
+            target_gcs_bucket=target_gcs_bucket,
+            target_gcs_path=target_gcs_path,
+            output_format=output_format,
+        ),
+        load_period=functools.partial(
+            load_storms_year,
+            project_id=project_id,
+            dataset_id=dataset_id,
+            destination_table=destination_table,
+            target_gcs_bucket=target_gcs_bucket,
+            schema_path=schema_path,
+            drop_dest_table=drop_dest_table,
+            output_format=output_format,
+        ),
+        max_parallel_periods=max_parallel_periods,
+    )
+
+
+def download_storms_year(
+    year_to_process: int,
+    list_of_details_files: typing.List[str],
+    list_of_locations_files: typing.List[str],
+    source_url: dict,
+    source_file: pathlib.Path,
+    download_cache: str = "",
+) -> typing.Optional[dict]:
+    locations_file = list(
+        filter(
+            lambda x: x.startswith(
+                f"StormEvents_locations-ftp_v1.0_d{str(year_to_process)}"
+            ),
+            list_of_locations_files,
+        )
+    )
+    details_file = list(
+        filter(
+            lambda x: x.startswith(
+                f"StormEvents_details-ftp_v1.0_d{str(year_to_process)}"
+            ),
+            list_of_details_files,
+        )
+    )
+    if not details_file:
+        logging.info(f"Storms details file does not exist for year {year_to_process}")
+        return None
+    downloaded = {"locations_file": ""}
+    if locations_file:
+        http_filename = locations_file[0]
+        local_file = str(source_file).replace(
+            ".csv", f"_{str(year_to_process)}_locations.csv"
+        )
+        local_zipfile = f"{os.path.dirname(local_file)}/{http_filename}"
+        http_zipfile_path = f'{source_url["root"]}/{http_filename}'
+        logging.info("Downloading Storms Locations File  ...")
+        logging.info(
+            f"     http_filename={http_filename} local_file={local_file} local_zipfile={local_zipfile} source_url={http_zipfile_path} "
+        )
+        download_file_http(
+            source_file=local_zipfile,
+            source_url=http_zipfile_path,
+            download_cache=download_cache,
+        )
+        downloaded["locations_file"] = local_zipfile
+    else:
+        logging.info("Storms Locations File does not exist!")
+    http_filename = details_file[0]
+    local_file = str(source_file).replace(".csv", f"_{str(year_to_process)}_detail.csv")
+    local_zipfile = f"{os.path.dirname(local_file)}/{http_filename}"
+    http_zipfile_path = f'{source_url["root"]}/{http_filename}'
+    logging.info("Downloading Storms Detail File ...")
+    logging.info(
+        f"     http_filename={http_filename} local_file={local_file} local_zipfile={local_zipfile} source_url={http_zipfile_path} "
+    )
+    download_file_http(
+        source_file=local_zipfile,
+        source_url=http_zipfile_path,
+        download_cache=download_cache,
+    )
+    downloaded["details_file"] = local_zipfile
+    return downloaded
+
+
+def prepare_storms_year(
+    year_to_process: int,
+    downloaded: typing.Optional[dict],
+    target_file: pathlib.Path,
+    reorder_headers_list: typing.List[str],
+    date_format_list: typing.List[typing.List[str]],
+    rename_headers_list: dict,
+    gen_location_list: dict,
+    output_format: str = "csv",
+    table_schema: typing.Optional[typing.List[bigquery.SchemaField]] = None,
+    parquet_compression: str = "snappy",
+) -> typing.Optional[str]:
+    if not downloaded:
+        return None
+    if downloaded["locations_file"]:
+        logging.info("Processing Storms Locations File  ...")
+        df_locations = storms_file_to_df(local_file=downloaded["locations_file"])
+    else:
+        df_locations = create_storms_locations_df()
+    logging.info("Processing Storms Detail File ...")
+    df_details = storms_file_to_df(local_file=downloaded["details_file"])
+    logging.info("Merging Details and Locations files")
+    df = pd.merge(
+        df_details,
+        df_locations,
+        left_on="EVENT_ID",
+        right_on="EVENT_ID",
+        how="left",
+    )
+    df = rename_headers(df=df, rename_headers_list=rename_headers_list)
+    df["event_latitude"] = df["event_latitude"].mask(
+        df["event_latitude"] > 90, df["event_latitude"] - 60
+    )
+    df = generate_location(df, gen_location_list)
+    df = reorder_headers(df, reorder_headers_list=reorder_headers_list)
+    for dt_fld in date_format_list:
+        logging.info(f"Resolving date formats in field {dt_fld}")
+        df[dt_fld[0]] = (
+            pd.to_datetime(df[dt_fld[0]].astype(str), format="%d-%b-%y %H:%M:%S")
+            .dt.strftime("%Y-%m-%d %H:%M:%S")
+            .fillna("NaT")
+        )
+        df[dt_fld[0]] = f"{year_to_process}-" + df[dt_fld[0]].str[5:]
+    df = fix_data_anomolies_storms(df)
+    targ_file_yr = str.replace(
+        str(target_file), ".csv", f"_{year_to_process}.{output_format}"
+    )
+    save_to_new_file(
+        df=df,
+        file_path=targ_file_yr,
+        sep="|",
+        quotechar="^",
+        output_format=output_format,
+        table_schema=table_schema,
+        parquet_compression=parquet_compression,
+    )
+    if output_format == "csv":
+        sed(["-i", "s/|nan|/||/g", targ_file_yr])
+        sed(["-i", "s/|<NA>/|/g", targ_file_yr])
+    return targ_file_yr
+
+
+def upload_storms_year(
+    year_to_process: int,
+    targ_file_yr: typing.Optional[str],
+    target_gcs_bucket: str,
+    target_gcs_path: str,
+    output_format: str = "csv",
+) -> typing.Optional[typing.Tuple[str, str]]:
+    if not targ_file_yr:
+        return None
+    target_uri = upload_file_to_gcs(
+        file_path=targ_file_yr,
+        target_gcs_bucket=target_gcs_bucket,
+        target_gcs_path=str.replace(
+            target_gcs_path, ".csv", f"_{year_to_process}.{output_format}"
+        ),
+    )
+    return targ_file_yr, target_uri
 
 
-def process_storms_database_by_year(
-    source_url: dict,
-    source_file: pathlib.Path,
-    target_file: pathlib.Path,
+def load_storms_year(
+    year_to_process: int,
+    uploaded: typing.Optional[typing.Tuple[str, str]],
     project_id: str,
     dataset_id: str,
     destination_table: str,
     target_gcs_bucket: str,
-    target_gcs_path: str,
     schema_path: str,
     drop_dest_table: str,
-    start_year: str,
-    reorder_headers_list: typing.List[str],
-    date_format_list: typing.List[typing.List[str]],
-    rename_headers_list: dict,
-    gen_location_list: dict,
+    output_format: str = "csv",
 ) -> None:
-    list_of_details_files = sorted(
-        http_list_of_files(url=source_url["root"], filter_expr="StormEvents_details")
-    )
-    list_of_locations_files = sorted(
-        http_list_of_files(url=source_url["root"], filter_expr="StormEvents_locations")
+    if not uploaded:
+        return
+    targ_file_yr, target_uri = uploaded
+    drop_table = drop_dest_table == "Y"
+    table_exists = create_dest_table(
+        project_id=project_id,
+        dataset_id=dataset_id,
+        table_id=f"{destination_table}_{str(year_to_process)}",
+        schema_filepath=schema_path,
+        bucket_name=target_gcs_bucket,
+        drop_table=drop_table,
     )
-    for year_to_process in range(int(start_year), date.today().year + 1):
-        locations_file = list(
-            filter(
-                lambda x: x.startswith(
-                    f"StormEvents_locations-ftp_v1.0_d{str(year_to_process)}"
-                ),
-                list_of_locations_files,
-            )
-        )
-        details_file = list(
-            filter(
-                lambda x: x.startswith(
-                    f"StormEvents_details-ftp_v1.0_d{str(year_to_process)}"
-                ),
-                list_of_details_files,
-            )
+    if table_exists:
+        load_data_to_bq(
+            project_id=project_id,
+            dataset_id=dataset_id,
+            table_id=f"{destination_table}_{str(year_to_process)}",
+            file_path=targ_file_yr,
+            truncate_table=True,
+            field_delimiter="|",
+            quotechar="^",
+            source_uris=target_uri,
+            output_format=output_format,
         )
-        if details_file:
-            if locations_file:
-                http_filename = locations_file[0]
-                local_file = str(source_file).replace(
-                    ".csv", f"_{str(year_to_process)}_locations.csv"
-                )
-                local_zipfile = f"{os.path.dirname(local_file)}/{http_filename}"
-                http_zipfile_path = f'{source_url["root"]}/{http_filename}'
-                logging.info("Processing Storms Locations File  ...")
-                logging.info(
-                    f"     http_filename={http_filename} local_file={local_file} local_zipfile={local_zipfile} source_url={http_zipfile_path} "
-                )
-                df_locations = HTTP_to_DF(
-                    local_file=local_zipfile,
-                    source_url=http_zipfile_path,
-                )
-            else:
-                logging.info("Storms Locations File does not exist!")
-                df_locations = create_storms_locations_df()
-            http_filename = details_file[0]
-            local_file = str(source_file).replace(
-                ".csv", f"_{str(year_to_process)}_detail.csv"
-            )
-            local_zipfile = f"{os.path.dirname(local_file)}/{http_filename}"
-            http_zipfile_path = f'{source_url["root"]}/{http_filename}'
-            logging.info("Processing Storms Detail File ...")
-            logging.info(
-                f"     http_filename={http_filename} local_file={local_file} local_zipfile={local_zipfile} source_url={http_zipfile_path} "
-            )
-            df_details = HTTP_to_DF(
-                source_url=http_zipfile_path,
-                local_file=local_zipfile,
-            )
-            logging.info("Merging Details and Locations files")
-            df = pd.merge(
-                df_details,
-                df_locations,
-                left_on="EVENT_ID",
-                right_on="EVENT_ID",
-                how="left",
-            )
-            df = rename_headers(df=df, rename_headers_list=rename_headers_list)
-            df["event_latitude"] = df["event_latitude"].apply(
-                lambda x: x - 60 if x > 90 else x
-            )
-            df = generate_location(df, gen_location_list)
-            df = reorder_headers(df, reorder_headers_list=reorder_headers_list)
-            for dt_fld in date_format_list:
-                logging.info(f"Resolving date formats in field {dt_fld}")
-                df[dt_fld[0]] = df[dt_fld[0]].apply(
-                    lambda x: pd.to_datetime(str(x), format="%d-%b-%y %H:%M:%S")
-                )
-                df[dt_fld[0]] = df[dt_fld[0]].apply(
-                    lambda x: f"{year_to_process}-{str(x)[5:]}"
-                )
-            df = fix_data_anomolies_storms(df)
-            targ_file_yr = str.replace(
-                str(target_file), ".csv", f"_{year_to_process}.csv"
-            )
-            save_to_new_file(df=df, file_path=targ_file_yr, sep="|", quotechar="^")
-            sed(["-i", "s/|nan|/||/g", targ_file_yr])
-            sed(["-i", "s/|<NA>/|/g", targ_file_yr])
-            upload_file_to_gcs(
-                file_path=targ_file_yr,
-                target_gcs_bucket=target_gcs_bucket,
-                target_gcs_path=target_gcs_path,
-            )
-            drop_table = drop_dest_table == "Y"
-            table_exists = create_dest_table(
-                project_id=project_id,
-                dataset_id=dataset_id,
-                table_id=f"{destination_table}_{str(year_to_process)}",
-                schema_filepath=schema_path,
-                bucket_name=target_gcs_bucket,
-                drop_table=drop_table,
-            )
-            if table_exists:
-                load_data_to_bq(
-                    project_id=project_id,
-                    dataset_id=dataset_id,
-                    table_id=f"{destination_table}_{str(year_to_process)}",
-                    file_path=targ_file_yr,
-                    truncate_table=True,
-                    field_delimiter="|",
-                    quotechar="^",
-                )
-        else:
-            logging.info(
-                f"Storms details file does not exist for year {year_to_process}"
-            )
 
 
 def clean_source_file(source_file: str) -> None:
@@ -887,12 +1258,10 @@ def fix_data_anomolies_storms(df: pd.DataFrame) -> pd.DataFrame:
         .fillna(0)
         .astype(np.int64)
     )
-    df["event_type"] = df["event_type"].apply(lambda x: str(x).lower())
-    df["state"] = df["state"].apply(
-        lambda x: f"{str.capitalize(x)[0]}{str.lower(x)[1]}"
-    )
-    df["event_point"] = df["event_point"].apply(
-        lambda x: str(x).replace("POINT(nan nan)", "")
+    df["event_type"] = df["event_type"].astype(str).str.lower()
+    df["state"] = df["state"].str[0].str.upper() + df["state"].str[1].str.lower()
+    df["event_point"] = (
+        df["event_point"].astype(str).str.replace("POINT(nan nan)", "", regex=False)
     )
     return df
 
@@ -937,24 +1306,15 @@ def generate_location(df: pd.DataFrame, gen_location_list: dict) -> pd.DataFrame
     return df
 
 
-def HTTP_to_DF(
-    source_url: str, local_file: str, sep: str = ",", delete_zipfile: bool = True
+def storms_file_to_df(
+    local_file: str,
+    sep: str = ",",
+    delete_zipfile: bool = True,
 ) -> pd.DataFrame:
-    download_file_http(
-        source_file=local_file,
-        source_url=source_url,
-    )
     logging.info(f"Loading file {local_file} into DataFrame")
-    decompressed_source_file = local_file.replace(".gz", "")
-    gz_decompress(
-        infile=local_file,
-        tofile=decompressed_source_file,
-        delete_zipfile=delete_zipfile,
-    )
-    if "locations" in decompressed_source_file:
-        df = pd.read_csv(
-            decompressed_source_file,
-            engine="python",
+    if "locations" in local_file:
+        df = read_csv_file(
+            local_file,
             encoding="utf-8",
             quotechar='"',
             sep=sep,
@@ -963,11 +1323,20 @@ def HTTP_to_DF(
             keep_default_na=True,
             na_values=[" "],
         )
+        if delete_zipfile:
+            os.remove(local_file)
     else:
+        # the quoting clean-up below edits the file in place, so the details
+        # file still has to be decompressed first
+        decompressed_source_file = local_file.replace(".gz", "")
+        gz_decompress(
+            infile=local_file,
+            tofile=decompressed_source_file,
+            delete_zipfile=delete_zipfile,
+        )
         clean_source_file(decompressed_source_file)
-        df = pd.read_csv(
+        df = read_csv_file(
             decompressed_source_file,
-            engine="python",
             encoding="utf-8",
             quotechar='"',
             sep=sep,
@@ -978,12 +1347,36 @@ def HTTP_to_DF(
         for col in df:
             if str(df[col].dtype) == "object":
                 logging.info(f"Replacing values in column {col}")
-                df[col] = df[col].apply(lambda x: str(x).replace("|'", '"'))
+                df[col] = df[col].astype(str).str.replace("|'", '"', regex=False)
             else:
                 pass
     return df
 
 
+def read_csv_file(source_file: str, **read_csv_args) -> pd.DataFrame:
+    engines = ["c", "python"]
+    for engine in engines:
+        logging.info(f"Reading {source_file} with the {engine} CSV engine")
+        try:
+            return pd.read_csv(
+                source_file,
+                engine=engine,
+                **read_csv_args,
+                **({"float_precision": "round_trip"} if engine == "c" else {}),
+            )
+        except ValueError as e:
+            # only parse errors and options the C engine rejects are retried
+            if engine == engines[-1] or not (
+                isinstance(e, pd.errors.ParserError)
+                or "not supported" in str(e)
+                or "does not support" in str(e)
+            ):
+                raise
+            logging.info(
+                f"Unable to read {source_file} with the {engine} CSV engine ({e}), falling back"
+            )
+
+
 def FTP_to_DF(
     host: str,
     cwd: str,
@@ -1000,16 +1393,9 @@ def FTP_to_DF(
         source_url=source_url,
     )
     logging.info(f"Loading file {local_file} into DataFrame")
-    decompressed_source_file = local_file.replace(".gz", "")
-    gz_decompress(
-        infile=local_file,
-        tofile=decompressed_source_file,
-        delete_zipfile=False,
-    )
-    if "locations" in decompressed_source_file:
-        df = pd.read_csv(
-            decompressed_source_file,
-            engine="python",
+    if "locations" in local_file:
+        df = read_csv_file(
+            local_file,
             encoding="utf-8",
             quotechar='"',
             sep=sep,
@@ -1019,10 +1405,15 @@ def FTP_to_DF(
             na_values=[" "],
         )
     else:
+        decompressed_source_file = local_file.replace(".gz", "")
+        gz_decompress(
+            infile=local_file,
+            tofile=decompressed_source_file,
+            delete_zipfile=False,
+        )
         clean_source_file(decompressed_source_file)
-        df = pd.read_csv(
+        df = read_csv_file(
             decompressed_source_file,
-            engine="python",
             encoding="utf-8",
             quotechar='"',
             sep=sep,
@@ -1033,7 +1424,7 @@ def FTP_to_DF(
         for col in df:
             if str(df[col].dtype) == "object":
                 logging.info(f"Replacing values in column {col}")
-                df[col] = df[col].apply(lambda x: str(x).replace("|'", '"'))
+                df[col] = df[col].astype(str).str.replace("|'", '"', regex=False)
             else:
                 pass
     return df
@@ -1078,15 +1469,12 @@ def ftp_list_of_files(host: str, cwd: str, filter_expr: str = "") -> typing.List
     try_count = 0
     while True:
         try:
-            ftp = ftplib.FTP(host)
-            ftp.login()
-            ftp.cwd(cwd)
-            file_list = ftp.nlst()
+            with ftp_session_pool(host).session(cwd) as ftp:
+                file_list = ftp.nlst()
             if filter != "":
                 file_list = list(
                     filter(lambda x: str(x).find(filter_expr) >= 0, file_list)
                 )
-            ftp.quit()
             return file_list
         except TimeoutError as e:
             try_count += 1
@@ -1127,6 +1515,7 @@ def process_lightning_strikes_by_year(
     number_of_header_rows: int,
     int_date_list: typing.List[str],
     gen_location_list: dict,
+    download_cache: str = "",
 ) -> None:
     url_path = os.path.split(source_url)[0]
     file_pattern = str.split(os.path.split(source_url)[1], "*")[0]
@@ -1143,7 +1532,9 @@ def process_lightning_strikes_by_year(
                 source_file_zipped = f"{source_file_path}/{url_file_name}"
                 source_file_year = str.replace(str(source_file), ".csv", f"_{yr}.csv")
                 target_file_year = str.replace(str(target_file), ".csv", f"_{yr}.csv")
-                download_file_http(url, source_file_zipped)
+                download_file_http(
+                    url, source_file_zipped, download_cache=download_cache
+                )
                 gz_decompress(
                     infile=source_file_zipped,
                     tofile=source_file_year,
@@ -1223,6 +1614,7 @@ def process_and_load_table(
     gen_location_list: dict,
     truncate_table: bool = True,
     encoding: str = "utf-8",
+    manifest_path: str = "",
 ) -> None:
     process_source_file(
         source_url=source_url,
@@ -1257,6 +1649,7 @@ def process_and_load_table(
         drop_dest_table=drop_dest_table,
         delete_target_file=delete_target_file,
         truncate_table=truncate_table,
+        manifest_path=manifest_path,
     )
 
 
@@ -1272,9 +1665,23 @@ def post_processing(
     drop_dest_table: str,
     delete_target_file: bool,
     truncate_table: bool = True,
+    manifest_path: str = "",
+    content_hash: str = "",
+    target_uri: str = "",
 ) -> None:
+    # a target_uri means the file was already uploaded, and checked against
+    # the manifest, by upload_period_files
+    if os.path.exists(target_file) and manifest_path and not target_uri:
+        content_hash = content_hash or file_md5(target_file)
+        if unit_completed(manifest_path, source_url, content_hash):
+            logging.info(
+                f"{source_url} was already loaded into {destination_table}.  Skipping."
+            )
+            if delete_target_file:
+                os.remove(target_file)
+            return
     if os.path.exists(target_file):
-        upload_file_to_gcs(
+        target_uri = target_uri or upload_file_to_gcs(
             file_path=target_file,
             target_gcs_bucket=target_gcs_bucket,
             target_gcs_path=target_gcs_path,
@@ -1292,7 +1699,7 @@ def post_processing(
             drop_table=drop_table,
         )
         if table_exists:
-            load_data_to_bq(
+            load_job_id = load_data_to_bq(
                 project_id=project_id,
                 dataset_id=dataset_id,
                 table_id=destination_table,
@@ -1300,6 +1707,14 @@ def post_processing(
                 truncate_table=truncate_table,
                 source_url=source_url,
                 field_delimiter="|",
+                source_uris=target_uri,
+            )
+            record_unit(
+                manifest_path=manifest_path,
+                unit_key=source_url,
+                content_hash=content_hash,
+                destination_table=destination_table,
+                load_job_id=load_job_id,
             )
         else:
             error_msg = f"Error: Data was not loaded because the destination table {project_id}.{dataset_id}.{destination_table} does not exist and/or could not be created."
@@ -1313,6 +1728,93 @@ def post_processing(
         )
 
 
+def file_md5(file_path: str) -> str:
+    md5 = hashlib.md5()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            md5.update(block)
+    return md5.hexdigest()
+
+
+def read_manifest(manifest_path: str) -> dict:
+    return read_manifest_generation(manifest_path)[0]
+
+
+def read_manifest_generation(manifest_path: str) -> typing.Tuple[dict, int]:
+    # the generation is 0 while the manifest does not exist yet
+    if not manifest_path:
+        return {}, 0
+    if manifest_path.startswith("gs://"):
+        bucket_name, blob_name = manifest_path.replace("gs://", "", 1).split("/", 1)
+        blob = gcs_client().bucket(bucket_name).blob(blob_name)
+        try:
+            contents = blob.download_as_text()
+        except NotFound:
+            return {}, 0
+        return json.loads(contents), blob.generation
+    if not os.path.exists(manifest_path):
+        return {}, 0
+    with open(manifest_path, "r") as f:
+        return json.load(f), 0
+
+
+def write_manifest(
+    manifest_path: str, manifest: dict, if_generation_match: typing.Optional[int] = None
+) -> None:
+    contents = json.dumps(manifest, indent=2, sort_keys=True)
+    if manifest_path.startswith("gs://"):
+        bucket_name, blob_name = manifest_path.replace("gs://", "", 1).split("/", 1)
+        blob = gcs_client().bucket(bucket_name).blob(blob_name)
+        blob.upload_from_string(
+            contents,
+            content_type="application/json",
+            if_generation_match=if_generation_match,
+        )
+    else:
+        with open(manifest_path, "w") as f:
+            f.write(contents)
+
+
+# manifests already read by this process, kept current by record_unit
+LOADED_MANIFESTS: typing.Dict[str, dict] = {}
+MANIFEST_WRITE_ATTEMPTS = 5
+
+
+def unit_completed(manifest_path: str, unit_key: str, content_hash: str) -> bool:
+    if manifest_path not in LOADED_MANIFESTS:
+        LOADED_MANIFESTS[manifest_path] = read_manifest(manifest_path)
+    unit = LOADED_MANIFESTS[manifest_path].get(unit_key)
+    return unit is not None and unit["content_hash"] == content_hash
+
+
+def record_unit(
+    manifest_path: str, unit_key: str, content_hash: str, **details
+) -> None:
+    if not manifest_path:
+        return
+    logging.info(f"Recording {unit_key} as completed in {manifest_path}")
+    for attempt in range(1, MANIFEST_WRITE_ATTEMPTS + 1):
+        # re-read on every attempt so units recorded by another writer in the
+        # meantime are kept, the generation check rejects a stale manifest
+        manifest, generation = read_manifest_generation(manifest_path)
+        manifest[unit_key] = {
+            "content_hash": content_hash,
+            "completed_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            **details,
+        }
+        try:
+            write_manifest(manifest_path, manifest, if_generation_match=generation)
+        except PreconditionFailed:
+            if attempt == MANIFEST_WRITE_ATTEMPTS:
+                raise
+            logging.info(
+                f"{manifest_path} changed while recording {unit_key}, retrying"
+            )
+            continue
+        LOADED_MANIFESTS[manifest_path] = manifest
+        return
+
+
 def process_source_file(
     source_file: str,
     chunksize: str,
@@ -1339,11 +1841,9 @@ def process_source_file(
     csv.register_dialect(
         "TabDialect", quotechar='"', delimiter=input_field_delimiter, strict=True
     )
-    with open(
-        source_file,
-        encoding=encoding,
-        mode="r",
-    ) as reader:
+    with open_source_file(source_file, encoding=encoding) as reader, open_target_file(
+        target_file
+    ) as target_file_handle:
         data = []
         chunk_number = 1
         for index, line in enumerate(
@@ -1357,7 +1857,7 @@ def process_source_file(
                     input_csv_headers=input_csv_headers,
                     data_dtypes=data_dtypes,
                     source_url=source_url,
-                    target_file=target_file,
+                    target_file_handle=target_file_handle,
                     chunk_number=chunk_number,
                     reorder_headers_list=reorder_headers_list,
                     date_format_list=date_format_list,
@@ -1379,7 +1879,7 @@ def process_source_file(
                 input_csv_headers=input_csv_headers,
                 data_dtypes=data_dtypes,
                 source_url=source_url,
-                target_file=target_file,
+                target_file_handle=target_file_handle,
                 chunk_number=chunk_number,
                 reorder_headers_list=reorder_headers_list,
                 date_format_list=date_format_list,
@@ -1391,17 +1891,45 @@ def process_source_file(
                 int_date_list=int_date_list,
                 gen_location_list=gen_location_list,
             )
-        if remove_source_file:
+        if remove_source_file and not str(source_file).startswith("gs://"):
             os.remove(source_file)
 
 
+@contextlib.contextmanager
+def open_source_file(
+    source_file: str, encoding: str = "utf8"
+) -> typing.Iterator[typing.TextIO]:
+    # compressed files and gs:// objects are decoded as they are read, so
+    # they never have to be decompressed or copied to local disk first
+    source_file = str(source_file)
+    with contextlib.ExitStack() as stack:
+        if source_file.startswith("gs://"):
+            bucket_name, blob_name = source_file.replace("gs://", "", 1).split("/", 1)
+            blob = gcs_client().bucket(bucket_name).blob(blob_name)
+            stream = stack.enter_context(blob.open("rb"))
+        else:
+            stream = stack.enter_context(open(source_file, "rb"))
+        if source_file.endswith(".gz"):
+            stream = stack.enter_context(gzip.GzipFile(fileobj=stream))
+        elif source_file.endswith(".bz2"):
+            stream = stack.enter_context(bz2.BZ2File(stream))
+        elif source_file.endswith(".zst"):
+            stream = stack.enter_context(
+                zstandard.ZstdDecompressor().stream_reader(stream)
+            )
+        elif source_file.endswith(".zip"):
+            archive = stack.enter_context(zipfile.ZipFile(stream))
+            stream = stack.enter_context(archive.open(archive.namelist()[0]))
+        yield stack.enter_context(io.TextIOWrapper(stream, encoding=encoding))
+
+
 def process_dataframe_chunk(
     data: typing.List[str],
     pipeline_name: str,
     input_csv_headers: typing.List[str],
     data_dtypes: dict,
     source_url: str,
-    target_file: str,
+    target_file_handle: typing.TextIO,
     chunk_number: int,
     reorder_headers_list: typing.List[str],
     date_format_list: typing.List[typing.List[str]],
@@ -1416,15 +1944,11 @@ def process_dataframe_chunk(
     logging.info(f"Processing chunk #{chunk_number}")
     df = pd.DataFrame(data, columns=input_csv_headers)
     set_df_datatypes(df, data_dtypes)
-    target_file_batch = str(target_file).replace(
-        ".csv", "-" + str(chunk_number) + ".csv"
-    )
     process_chunk(
         df=df,
         source_url=source_url,
-        target_file_batch=target_file_batch,
-        target_file=target_file,
-        skip_header=(not chunk_number == 1),
+        target_file_handle=target_file_handle,
+        include_header=(chunk_number == 1),
         pipeline_name=pipeline_name,
         reorder_headers_list=reorder_headers_list,
         date_format_list=date_format_list,
@@ -1448,9 +1972,8 @@ def set_df_datatypes(df: pd.DataFrame, data_dtypes: dict) -> pd.DataFrame:
 def process_chunk(
     df: pd.DataFrame,
     source_url: str,
-    target_file_batch: str,
-    target_file: str,
-    skip_header: bool,
+    target_file_handle: typing.TextIO,
+    include_header: bool,
     pipeline_name: str,
     reorder_headers_list: dict,
     null_rows_list: typing.List[str],
@@ -1469,38 +1992,20 @@ def process_chunk(
         df = reorder_headers(df, reorder_headers_list=reorder_headers_list)
     if pipeline_name == "NOAA SPC Hail":
         df = rename_headers(df, rename_headers_list=rename_headers_list)
-        df["time"] = df["time"].apply(lambda x: str.zfill(x, 4))
-        df["month"] = df["month"].apply(lambda x: str.zfill(x, 2))
-        df["day"] = df["day"].apply(lambda x: str.zfill(x, 2))
-        logging.info("Creating Timestamp Column")
-        df["timestamp"] = df.apply(
-            lambda x: f"{x.year}-{x.month}-{x.day} {x.time}00", axis=1
-        )
+        df = create_spc_timestamp(df)
         df = source_convert_date_formats(df, date_format_list=date_format_list)
         df = generate_location(df, gen_location_list=gen_location_list)
         df = reorder_headers(df, reorder_headers_list=reorder_headers_list)
     if pipeline_name == "NOAA SPC Wind":
         df = rename_headers(df, rename_headers_list=rename_headers_list)
-        df["speed"] = df["speed"].apply(lambda x: re.sub(r"^UNK$", "", x))
-        df["time"] = df["time"].apply(lambda x: str.zfill(x, 4))
-        df["month"] = df["month"].apply(lambda x: str.zfill(x, 2))
-        df["day"] = df["day"].apply(lambda x: str.zfill(x, 2))
-        logging.info("Creating Timestamp Column")
-        df["timestamp"] = df.apply(
-            lambda x: f"{x.year}-{x.month}-{x.day} {x.time}00", axis=1
-        )
+        df["speed"] = df["speed"].str.replace(r"^UNK$", "", regex=True)
+        df = create_spc_timestamp(df)
         df = source_convert_date_formats(df, date_format_list=date_format_list)
         df = generate_location(df, gen_location_list=gen_location_list)
         df = reorder_headers(df, reorder_headers_list=reorder_headers_list)
     if pipeline_name == "NOAA SPC Tornado":
         df = rename_headers(df, rename_headers_list=rename_headers_list)
-        df["time"] = df["time"].apply(lambda x: str.zfill(x, 4))
-        df["month"] = df["month"].apply(lambda x: str.zfill(x, 2))
-        df["day"] = df["day"].apply(lambda x: str.zfill(x, 2))
-        logging.info("Creating Timestamp Column")
-        df["timestamp"] = df.apply(
-            lambda x: f"{x.year}-{x.month}-{x.day} {x.time}00", axis=1
-        )
+        df = create_spc_timestamp(df)
         df = source_convert_date_formats(df, date_format_list=date_format_list)
         df = generate_location(df, gen_location_list=gen_location_list)
         df = reorder_headers(df, reorder_headers_list=reorder_headers_list)
@@ -1517,19 +2022,7 @@ def process_chunk(
         df = rename_headers(df, rename_headers_list=rename_headers_list)
         df = reorder_headers(df, reorder_headers_list=reorder_headers_list)
     if pipeline_name == "NOAA GSOD By Year":
-        df["stn"] = df["STATION"].apply(lambda x: "" if x == "" else x[0:6])
-        df["wban"] = df["STATION"].apply(lambda x: "" if x == "" else x[6:11])
-        df["year"] = df["DATE"].apply(lambda x: "" if x == "" else x[0:4])
-        df["mo"] = df["DATE"].apply(lambda x: "" if x == "" else x[5:7])
-        df["da"] = df["DATE"].apply(lambda x: "" if x == "" else x[8:10])
-        df["fog"] = df["FRSHTT"].apply(lambda x: "" if x == "" else x[0:1])
-        df["rain_drizzle"] = df["FRSHTT"].apply(lambda x: "" if x == "" else x[1:2])
-        df["snow_ice_pellets"] = df["FRSHTT"].apply(lambda x: "" if x == "" else x[2:3])
-        df["hail"] = df["FRSHTT"].apply(lambda x: "" if x == "" else x[3:4])
-        df["thunder"] = df["FRSHTT"].apply(lambda x: "" if x == "" else x[4:5])
-        df["tornado_funnel_cloud"] = df["FRSHTT"].apply(
-            lambda x: "" if x == "" else x[5:6]
-        )
+        df = split_gsod_columns(df)
         df = rename_headers(df, rename_headers_list=rename_headers_list)
         df = trim_whitespace(df, trim_whitespace_list=trim_whitespace_list)
         df = reorder_headers(df, reorder_headers_list=reorder_headers_list)
@@ -1564,8 +2057,7 @@ def process_chunk(
         df = generate_location(df, gen_location_list=gen_location_list)
         df = add_metadata_cols(df, source_url=source_url)
         df = reorder_headers(df, reorder_headers_list=reorder_headers_list)
-    save_to_new_file(df, file_path=str(target_file_batch))
-    append_batch_file(target_file_batch, target_file, skip_header, not (skip_header))
+    append_to_target_file(df, target_file_handle, include_header)
 
 
 def trim_whitespace(
@@ -1574,7 +2066,40 @@ def trim_whitespace(
     logging.info("Trimming whitespace ...")
     for col in trim_whitespace_list:
         logging.info(f"    on {col} ...")
-        df[col] = df[col].apply(lambda x: str(x).strip())
+        df[col] = df[col].astype(str).str.strip()
+    return df
+
+
+def create_spc_timestamp(df: pd.DataFrame) -> pd.DataFrame:
+    df["time"] = df["time"].str.zfill(4)
+    df["month"] = df["month"].str.zfill(2)
+    df["day"] = df["day"].str.zfill(2)
+    logging.info("Creating Timestamp Column")
+    df["timestamp"] = (
+        df["year"].astype(str)
+        + "-"
+        + df["month"]
+        + "-"
+        + df["day"]
+        + " "
+        + df["time"]
+        + "00"
+    )
+    return df
+
+
+def split_gsod_columns(df: pd.DataFrame) -> pd.DataFrame:
+    df["stn"] = df["STATION"].str[0:6]
+    df["wban"] = df["STATION"].str[6:11]
+    df["year"] = df["DATE"].str[0:4]
+    df["mo"] = df["DATE"].str[5:7]
+    df["da"] = df["DATE"].str[8:10]
+    df["fog"] = df["FRSHTT"].str[0:1]
+    df["rain_drizzle"] = df["FRSHTT"].str[1:2]
+    df["snow_ice_pellets"] = df["FRSHTT"].str[2:3]
+    df["hail"] = df["FRSHTT"].str[3:4]
+    df["thunder"] = df["FRSHTT"].str[4:5]
+    df["tornado_funnel_cloud"] = df["FRSHTT"].str[5:6]
     return df
 
 
@@ -1592,6 +2117,36 @@ def convert_date_from_int(df: pd.DataFrame, int_date_list: dict) -> pd.DataFrame
     return df
 
 
+def directory_listing_hash(entries: typing.Dict[str, str]) -> str:
+    # the station files of a year grow every day without being renamed, so the
+    # listing only stands in for their content while it shows when each file
+    # was last modified; without that the loaded file itself is hashed instead
+    if not entries or not all(entries.values()):
+        return ""
+    listing = "\n".join(f"{url} {details}" for url, details in sorted(entries.items()))
+    return hashlib.md5(listing.encode("utf-8")).hexdigest()
+
+
+def url_directory_entries(
+    source_url_path: str, file_pattern: str = ""
+) -> typing.Dict[str, str]:
+    # maps each file to the rest of its listing row, e.g. "2024-01-05 13:22 45K"
+    entries = {}
+    url = source_url_path.replace(" ", "%20")
+    soup = BeautifulSoup(urlopen(Request(url)).read(), "html.parser")
+    for link in soup.find_all("a"):
+        file_name = link.get_text()
+        if file_pattern and not re.search(file_pattern, file_name):
+            continue
+        row = link.find_parent("tr")
+        if row:
+            details = row.get_text(" ", strip=True).replace(file_name, "", 1)
+        else:
+            details = str(link.next_sibling or "")
+        entries[(url + file_name).replace(" ", "%20")] = " ".join(details.split())
+    return entries
+
+
 def url_directory_list(
     source_url_path: str, file_pattern: str = ""
 ) -> typing.List[str]:
@@ -1654,9 +2209,8 @@ def reorder_headers(
 
 def gz_decompress(infile: str, tofile: str, delete_zipfile: bool = False) -> None:
     logging.info(f"Decompressing {infile}")
-    with open(infile, "rb") as inf, open(tofile, "w", encoding="utf8") as tof:
-        decom_str = gzip.decompress(inf.read()).decode("utf-8")
-        tof.write(decom_str)
+    with gzip.open(infile, "rb") as inf, open(tofile, "wb") as tof:
+        shutil.copyfileobj(inf, tof, length=16 * 1024 * 1024)
     if delete_zipfile:
         os.remove(infile)
 
@@ -1671,12 +2225,24 @@ def filter_null_rows(
 
 
 def convert_dt_format(
-    dt_str: str, from_format: str = "%Y%m%d", to_format: str = "%Y-%m-%d"
-) -> str:
-    if not dt_str or dt_str.lower() == "nan":
-        return dt_str
-    else:
-        return str(datetime.strptime(dt_str, from_format).strftime(to_format))
+    dt_values: pd.Series, from_format: str = "%Y%m%d", to_format: str = "%Y-%m-%d"
+) -> pd.Series:
+    has_value = (
+        dt_values.notna()
+        & (dt_values != "")
+        & (dt_values.astype(str).str.lower() != "nan")
+    )
+    converted = dt_values.copy()
+    try:
+        converted[has_value] = pd.to_datetime(
+            dt_values[has_value], format=from_format
+        ).dt.strftime(to_format)
+    except pd.errors.OutOfBoundsDatetime:
+        # dates outside pandas' nanosecond range, e.g. typos like year 2300
+        converted[has_value] = dt_values[has_value].map(
+            lambda x: datetime.strptime(x, from_format).strftime(to_format)
+        )
+    return converted
 
 
 def source_convert_date_formats(
@@ -1685,12 +2251,7 @@ def source_convert_date_formats(
 ) -> pd.DataFrame:
     logging.info("Converting Date Format..")
     for fld, from_format, to_format in date_format_list:
-        df[fld] = df[fld].apply(
-            lambda x, from_format, to_format: convert_dt_format(
-                x, from_format, to_format
-            ),
-            args=(from_format, to_format),
-        )
+        df[fld] = convert_dt_format(df[fld], from_format, to_format)
     return df
 
 
@@ -1703,32 +2264,18 @@ def slice_column(
         dest_col = key
         start_pos = values[1]
         end_pos = values[2]
-        if pipeline_name == "GHCND states":
-            if dest_col == "name":
-                # Work-around for Alabama - bad data
-                df[dest_col] = df[src_col].apply(
-                    lambda x: "ALABAMA"
-                    if str(x)[0:2] == "AL"
-                    else str(x)[int(start_pos) :].strip()
-                )
-            else:
-                if end_pos == "":
-                    df[dest_col] = df[src_col].apply(
-                        lambda x: str(x)[int(start_pos) :].strip()
-                    )
-                else:
-                    df[dest_col] = df[src_col].apply(
-                        lambda x: str(x)[int(start_pos) : int(end_pos)].strip()
-                    )
+        src_values = df[src_col].astype(str)
+        if pipeline_name == "GHCND states" and dest_col == "name":
+            # Work-around for Alabama - bad data
+            df[dest_col] = (
+                src_values.str[int(start_pos) :]
+                .str.strip()
+                .mask(src_values.str[0:2] == "AL", "ALABAMA")
+            )
+        elif end_pos == "":
+            df[dest_col] = src_values.str[int(start_pos) :].str.strip()
         else:
-            if end_pos == "":
-                df[dest_col] = df[src_col].apply(
-                    lambda x: str(x)[int(start_pos) :].strip()
-                )
-            else:
-                df[dest_col] = df[src_col].apply(
-                    lambda x: str(x)[int(start_pos) : int(end_pos)].strip()
-                )
+            df[dest_col] = src_values.str[int(start_pos) : int(end_pos)].str.strip()
     return df
 
 
@@ -1763,15 +2310,23 @@ def load_data_to_bq(
     source_url: str = "",
     field_delimiter: str = "|",
     quotechar: str = '"',
-) -> None:
+    source_uris: typing.Union[str, typing.List[str]] = "",
+    output_format: str = "csv",
+) -> str:
     logging.info(
         f"Loading data from {file_path} into {project_id}.{dataset_id}.{table_id} started"
     )
     client = bigquery.Client(project=project_id)
     table_ref = client.dataset(dataset_id).table(table_id)
     job_config = bigquery.LoadJobConfig()
-    job_config.source_format = bigquery.SourceFormat.CSV
-    job_config.field_delimiter = field_delimiter
+    if output_format == "parquet":
+        job_config.source_format = bigquery.SourceFormat.PARQUET
+    else:
+        job_config.source_format = bigquery.SourceFormat.CSV
+        job_config.field_delimiter = field_delimiter
+        job_config.skip_leading_rows = 1  # ignore the header
+        job_config.allow_quoted_newlines = True
+        job_config.quote_character = quotechar
     if truncate_table:
         job_config.write_disposition = "WRITE_TRUNCATE"
     else:
@@ -1785,16 +2340,19 @@ def load_data_to_bq(
                 source_url=source_url,
             )
         job_config.write_disposition = "WRITE_APPEND"
-    job_config.skip_leading_rows = 1  # ignore the header
     job_config.autodetect = False
-    job_config.allow_quoted_newlines = True
-    job_config.quote_character = quotechar
-    with open(file_path, "rb") as source_file:
-        job = client.load_table_from_file(source_file, table_ref, job_config=job_config)
+    if source_uris:
+        job = client.load_table_from_uri(source_uris, table_ref, job_config=job_config)
+    else:
+        with open(file_path, "rb") as source_file:
+            job = client.load_table_from_file(
+                source_file, table_ref, job_config=job_config
+            )
     job.result()
     logging.info(
         f"Loading data from {file_path} into {project_id}.{dataset_id}.{table_id} completed"
     )
+    return job.job_id
 
 
 def create_dest_table(
@@ -1844,7 +2402,7 @@ def create_dest_table(
 
 
 def check_gcs_file_exists(file_path: str, bucket_name: str) -> bool:
-    storage_client = storage.Client()
+    storage_client = gcs_client()
     bucket = storage_client.bucket(bucket_name)
     exists = storage.Blob(bucket=bucket, name=file_path).exists(storage_client)
     return exists
@@ -1882,7 +2440,7 @@ def create_table_schema(
     if not (schema_filepath):
         schema_struct = schema_structure
     else:
-        storage_client = storage.Client()
+        storage_client = gcs_client()
         bucket = storage_client.get_bucket(bucket_name)
         blob = bucket.blob(schema_filepath)
         schema_struct = json.loads(blob.download_as_bytes(client=None))
@@ -1903,31 +2461,102 @@ def create_table_schema(
 
 
 def save_to_new_file(
-    df: pd.DataFrame, file_path: str, sep: str = "|", quotechar: str = '"'
+    df: pd.DataFrame,
+    file_path: str,
+    sep: str = "|",
+    quotechar: str = '"',
+    output_format: str = "csv",
+    table_schema: typing.Optional[typing.List[bigquery.SchemaField]] = None,
+    parquet_compression: str = "snappy",
 ) -> None:
     logging.info(f"Saving data to target file.. {file_path} ...")
-    df.to_csv(file_path, index=False, sep=sep, quotechar=quotechar)
+    if output_format == "parquet":
+        df = convert_to_schema_types(df, table_schema or [])
+        df.to_parquet(
+            file_path,
+            index=False,
+            compression=parquet_compression,
+            coerce_timestamps="us",
+            allow_truncated_timestamps=True,
+        )
+    elif output_format == "csv":
+        df.to_csv(file_path, index=False, sep=sep, quotechar=quotechar)
+    else:
+        raise ValueError(f"Unsupported output format {output_format}")
+
+
+BOOLEAN_STRINGS = {
+    "true": True,
+    "t": True,
+    "yes": True,
+    "y": True,
+    "1": True,
+    "false": False,
+    "f": False,
+    "no": False,
+    "n": False,
+    "0": False,
+}
+
+
+def convert_to_schema_types(
+    df: pd.DataFrame, table_schema: typing.List[bigquery.SchemaField]
+) -> pd.DataFrame:
+    # values the csv path turned into empty fields (and so NULLs) via sed
+    null_strings = ["", "nan", "<NA>", "NaT", "None"]
+    for field in table_schema:
+        if field.name not in df.columns:
+            continue
+        col = df[field.name]
+        field_type = field.field_type.upper()
+        if field_type in ("INTEGER", "INT64"):
+            df[field.name] = pd.to_numeric(col, errors="coerce").astype("Int64")
+        elif field_type in ("FLOAT", "FLOAT64"):
+            df[field.name] = pd.to_numeric(col, errors="coerce").astype("float64")
+        elif field_type == "DATETIME":
+            df[field.name] = pd.to_datetime(col, errors="coerce")
+        elif field_type == "TIMESTAMP":
+            df[field.name] = pd.to_datetime(col, errors="coerce", utc=True)
+        elif field_type == "DATE":
+            df[field.name] = pd.to_datetime(col, errors="coerce").dt.date
+        elif field_type in ("BOOLEAN", "BOOL"):
+            # the literals BigQuery accepts in a CSV load; anything else is NULL
+            df[field.name] = (
+                col.astype("string")
+                .str.strip()
+                .str.lower()
+                .map(BOOLEAN_STRINGS)
+                .astype("boolean")
+            )
+        else:
+            df[field.name] = col.astype("string").replace(null_strings, pd.NA)
+    return df
+
 
+def open_target_file(target_file: str) -> typing.TextIO:
+    logging.info(f"Opening target file {target_file} for streaming output")
+    if str(target_file).endswith(".gz"):
+        return gzip.open(target_file, "wt", encoding="utf-8", newline="")
+    return open(target_file, "w", encoding="utf-8", newline="")
 
-def append_batch_file(
-    batch_file_path: str, target_file_path: str, skip_header: bool, truncate_file: bool
+
+def append_to_target_file(
+    df: pd.DataFrame,
+    target_file_handle: typing.TextIO,
+    include_header: bool,
+    sep: str = "|",
+    quotechar: str = '"',
 ) -> None:
-    with open(batch_file_path, "r") as data_file:
-        if truncate_file:
-            target_file = open(target_file_path, "w+").close()
-        with open(target_file_path, "a+") as target_file:
-            if skip_header:
-                logging.info(
-                    f"Appending batch file {batch_file_path} to {target_file_path} with skip header"
-                )
-                next(data_file)
-            else:
-                logging.info(
-                    f"Appending batch file {batch_file_path} to {target_file_path}"
-                )
-            target_file.write(data_file.read())
-            if os.path.exists(batch_file_path):
-                os.remove(batch_file_path)
+    logging.info(
+        f"Writing {len(df)} rows to {target_file_handle.name} with include_header={include_header}"
+    )
+    df.to_csv(
+        target_file_handle,
+        index=False,
+        sep=sep,
+        quotechar=quotechar,
+        header=include_header,
+    )
 
 
 def download_file_ftp(
@@ -1936,39 +2565,141 @@ def download_file_ftp(
     ftp_filename: str,
     local_file: pathlib.Path,
     source_url: str,
+    download_cache: str = "",
+    pool_size: int = 1,
 ) -> None:
     logging.info(f"Downloading {source_url} into {local_file}")
-    for retry in range(1, 3):
-        if not download_file_ftp_single_try(
-            ftp_host, ftp_dir, ftp_filename, local_file
+    # parallel periods share one pool per host, at most pool_size sessions
+    ftp_pool = ftp_session_pool(ftp_host, pool_size)
+    validators = {}
+    if download_cache:
+        # FTP has no conditional retrieval, so compare SIZE and MDTM instead
+        cache_entry = read_download_cache_entry(download_cache, source_url)
+        with ftp_pool.session(ftp_dir) as ftp_conn:
+            validators = ftp_cache_validators(ftp_conn, ftp_filename)
+        if (
+            cache_entry
+            and validators
+            and all(cache_entry.get(key) == value for key, value in validators.items())
         ):
-            logging.info(f"FTP file download failed.  Retrying #{retry} in 60 seconds")
-            time.sleep(60)
-        else:
-            break
+            restore_cached_download(
+                download_cache, source_url, cache_entry, str(local_file)
+            )
+            return
+    ftp_pool.retrieve(
+        ftp_dir=ftp_dir, ftp_filename=ftp_filename, local_file=str(local_file)
+    )
+    store_cached_download(download_cache, source_url, str(local_file), validators)
 
 
-def download_file_ftp_single_try(
-    ftp_host: str, ftp_dir: str, ftp_filename: str, local_file: pathlib.Path
-) -> bool:
-    try_count = 0
-    while True:
-        try:
-            with ftplib.FTP(ftp_host, timeout=60) as ftp_conn:
-                ftp_conn.login("", "")
-                ftp_conn.cwd(ftp_dir)
-                ftp_conn.encoding = "utf-8"
-                with open(local_file, "wb") as dest_file:
-                    ftp_conn.retrbinary("RETR %s" % ftp_filename, dest_file.write)
+def ftp_cache_validators(ftp_conn: ftplib.FTP, ftp_filename: str) -> dict:
+    try:
+        # many servers refuse SIZE in ASCII mode
+        ftp_conn.voidcmd("TYPE I")
+        return {
+            "ftp_size": ftp_conn.size(ftp_filename),
+            "ftp_modified": ftp_conn.sendcmd(f"MDTM {ftp_filename}").split()[-1],
+        }
+    except ftplib.error_perm:
+        return {}
+
+
+def gcs_client() -> storage.Client:
+    # like the FTP pools, a client is never carried across into a forked worker
+    return cached_gcs_client(os.getpid())
+
+
+@functools.lru_cache(maxsize=None)
+def cached_gcs_client(pid: int) -> storage.Client:
+    return storage.Client()
+
+
+def ftp_session_pool(ftp_host: str, pool_size: int = 1) -> "FTPSessionPool":
+    # keyed on the pid so forked period workers never reuse the parent's sockets
+    return cached_ftp_session_pool(os.getpid(), ftp_host, pool_size)
+
+
+@functools.lru_cache(maxsize=None)
+def cached_ftp_session_pool(
+    pid: int, ftp_host: str, pool_size: int
+) -> "FTPSessionPool":
+    return FTPSessionPool(ftp_host=ftp_host, pool_size=pool_size)
+
+
+class FTPSessionPool:
+    def __init__(
+        self,
+        ftp_host: str,
+        pool_size: int,
+        timeout: int = 60,
+        max_resume_attempts: int = 5,
+    ) -> None:
+        self.ftp_host = ftp_host
+        self.timeout = timeout
+        self.max_resume_attempts = max_resume_attempts
+        self.idle_sessions = queue.LifoQueue()
+        self.session_slots = threading.BoundedSemaphore(pool_size)
+
+    def connect(self) -> ftplib.FTP:
+        logging.info(f"Opening FTP session to {self.ftp_host}")
+        ftp_conn = ftplib.FTP(self.ftp_host, timeout=self.timeout)
+        ftp_conn.login("", "")
+        ftp_conn.encoding = "utf-8"
+        ftp_conn.home_dir = ftp_conn.pwd()
+        return ftp_conn
+
+    @contextlib.contextmanager
+    def session(self, ftp_dir: str = "") -> typing.Iterator[ftplib.FTP]:
+        with self.session_slots:
+            try:
+                ftp_conn = self.idle_sessions.get_nowait()
+                ftp_conn.voidcmd("NOOP")
+            except queue.Empty:
+                ftp_conn = self.connect()
+            except ftplib.all_errors:
+                ftp_conn.close()
+                ftp_conn = self.connect()
+            try:
+                # ftp_dir may be relative, so always start from the login directory
+                ftp_conn.cwd(ftp_conn.home_dir)
+                if ftp_dir:
+                    ftp_conn.cwd(ftp_dir)
+                yield ftp_conn
+            except BaseException:
+                ftp_conn.close()
+                raise
+            self.idle_sessions.put(ftp_conn)
+
+    def retrieve(self, ftp_dir: str, ftp_filename: str, local_file: str) -> None:
+        open(local_file, "wb").close()
+        for attempt in range(self.max_resume_attempts + 1):
+            offset = os.path.getsize(local_file)
+            try:
+                with self.session(ftp_dir) as ftp_conn, open(
+                    local_file, "ab"
+                ) as dest_file:
+                    ftp_conn.retrbinary(
+                        f"RETR {ftp_filename}",
+                        dest_file.write,
+                        blocksize=1024 * 1024,
+                        rest=offset or None,
+                    )
+                return
+            except (ftplib.error_temp, ftplib.error_reply, EOFError, OSError) as e:
+                if attempt == self.max_resume_attempts:
+                    raise
+                logging.info(
+                    f"Transfer of {ftp_filename} interrupted at {os.path.getsize(local_file)} bytes ({e}), resuming ..."
+                )
+                time.sleep(min(2**attempt, 60))
+
+    def close(self) -> None:
+        while not self.idle_sessions.empty():
+            ftp_conn = self.idle_sessions.get_nowait()
+            try:
                 ftp_conn.quit()
-                return True
-        except TimeoutError as e:
-            try_count += 1
-            if try_count > 3:
-                raise e
-            else:
-                logging.info(f"{e}, Retrying ...")
-                time.sleep(try_count * 30)
+            except ftplib.all_errors:
+                ftp_conn.close()
 
 
 def download_file_http(
@@ -1977,6 +2708,7 @@ def download_file_http(
     continue_on_error: bool = False,
     quiet_mode: bool = False,
     no_of_retries: int = 5,
+    download_cache: str = "",
 ) -> bool:
     for retries in (0, no_of_retries):
         if not download_file_http_exec(
@@ -1984,6 +2716,7 @@ def download_file_http(
             source_file=source_file,
             continue_on_error=continue_on_error,
             quiet_mode=quiet_mode,
+            download_cache=download_cache,
         ):
             logging.info(
                 f"Unable to download file {source_url}.  Retry {retries} of {no_of_retries}"
@@ -1999,13 +2732,22 @@ def download_file_http_exec(
     source_file: pathlib.Path,
     continue_on_error: bool = False,
     quiet_mode: bool = False,
+    download_cache: str = "",
 ) -> bool:
     if not quiet_mode:
         logging.info(f"Downloading {source_url} to {source_file}")
     try:
-        src_file = requests.get(source_url, stream=True)
+        cache_entry = read_download_cache_entry(download_cache, source_url)
+        src_file = requests.get(
+            source_url, stream=True, headers=conditional_request_headers(cache_entry)
+        )
         rtn_status_code = src_file.status_code
-        if 400 <= rtn_status_code <= 499:
+        if rtn_status_code == 304:
+            restore_cached_download(
+                download_cache, source_url, cache_entry, source_file
+            )
+            return True
+        elif 400 <= rtn_status_code <= 499:
             logging.info(
                 f"Unable to download file {source_url} (error code was {rtn_status_code})"
             )
@@ -2014,6 +2756,12 @@ def download_file_http_exec(
             with open(source_file, "wb") as f:
                 for chunk in src_file:
                     f.write(chunk)
+            store_cached_download(
+                download_cache,
+                source_url,
+                source_file,
+                http_cache_validators(src_file.headers),
+            )
             return True
     except requests.exceptions.RequestException as e:
         if e == requests.exceptions.HTTPError:
@@ -2030,21 +2778,276 @@ def download_file_http_exec(
         return False
 
 
+def read_download_cache_entry(download_cache: str, source_url: str) -> dict:
+    if not download_cache:
+        return {}
+    cache_entry = read_manifest(download_cache_entry_path(download_cache, source_url))
+    if cache_entry and not download_cache_object_exists(
+        download_cache_object_path(download_cache, cache_entry["md5"])
+    ):
+        return {}
+    return cache_entry
+
+
+def conditional_request_headers(cache_entry: dict) -> dict:
+    headers = {}
+    if cache_entry.get("etag"):
+        headers["If-None-Match"] = cache_entry["etag"]
+    if cache_entry.get("last_modified"):
+        headers["If-Modified-Since"] = cache_entry["last_modified"]
+    return headers
+
+
+def http_cache_validators(response_headers: typing.Mapping[str, str]) -> dict:
+    return {
+        "etag": response_headers.get("ETag", ""),
+        "last_modified": response_headers.get("Last-Modified", ""),
+    }
+
+
+def restore_cached_download(
+    download_cache: str, source_url: str, cache_entry: dict, source_file: str
+) -> None:
+    object_path = download_cache_object_path(download_cache, cache_entry["md5"])
+    if object_path.startswith("gs://"):
+        download_cache_blob(object_path).download_to_filename(str(source_file))
+    else:
+        shutil.copyfile(object_path, source_file)
+    with DOWNLOAD_CACHE_STATS_LOCK:
+        DOWNLOAD_CACHE_STATS["hits"] += 1
+    logging.info(f"Download cache hit for {source_url} ({download_cache_summary()})")
+
+
+def store_cached_download(
+    download_cache: str, source_url: str, source_file: str, validators: dict
+) -> None:
+    if not download_cache:
+        return
+    with DOWNLOAD_CACHE_STATS_LOCK:
+        DOWNLOAD_CACHE_STATS["misses"] += 1
+    logging.info(f"Download cache miss for {source_url} ({download_cache_summary()})")
+    if not any(validators.values()):
+        logging.info(f"{source_url} cannot be revalidated, not caching it")
+        return
+    content_hash = file_md5(source_file)
+    object_path = download_cache_object_path(download_cache, content_hash)
+    if not download_cache_object_exists(object_path):
+        if object_path.startswith("gs://"):
+            download_cache_blob(object_path).upload_from_filename(str(source_file))
+        else:
+            os.makedirs(os.path.dirname(object_path), exist_ok=True)
+            shutil.copyfile(source_file, f"{object_path}.tmp")
+            os.replace(f"{object_path}.tmp", object_path)
+    entry_path = download_cache_entry_path(download_cache, source_url)
+    if not entry_path.startswith("gs://"):
+        os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+    write_manifest(
+        entry_path,
+        {
+            "url": source_url,
+            "md5": content_hash,
+            "content_length": os.path.getsize(source_file),
+            **validators,
+        },
+    )
+
+
+def download_cache_entry_path(download_cache: str, source_url: str) -> str:
+    url_hash = hashlib.sha256(source_url.encode("utf-8")).hexdigest()
+    return f"{download_cache.rstrip('/')}/urls/{url_hash}.json"
+
+
+def download_cache_object_path(download_cache: str, content_hash: str) -> str:
+    return f"{download_cache.rstrip('/')}/objects/{content_hash}"
+
+
+def download_cache_object_exists(object_path: str) -> bool:
+    if object_path.startswith("gs://"):
+        return download_cache_blob(object_path).exists()
+    return os.path.exists(object_path)
+
+
+def download_cache_blob(object_path: str) -> storage.Blob:
+    bucket_name, blob_name = object_path.replace("gs://", "", 1).split("/", 1)
+    return gcs_client().bucket(bucket_name).blob(blob_name)
+
+
+def download_cache_summary() -> str:
+    return (
+        f"{DOWNLOAD_CACHE_STATS['hits']} hits, {DOWNLOAD_CACHE_STATS['misses']} misses"
+    )
+
+
+def download_files_http_combined(
+    source_urls: typing.List[str],
+    target_file: str,
+    max_concurrent_downloads: int,
+    downloads_per_second: float,
+    number_of_header_rows: int = 1,
+    continue_on_error: bool = False,
+    no_of_retries: int = 5,
+    timeout: int = 200,
+    download_cache: str = "",
+) -> None:
+    logging.info(
+        f"Downloading {len(source_urls)} files into {target_file} using {max_concurrent_downloads} connections"
+    )
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(
+        pool_connections=1, pool_maxsize=max_concurrent_downloads
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    fetch_file = functools.partial(
+        fetch_file_http,
+        session=session,
+        throttle=rate_limiter(downloads_per_second),
+        continue_on_error=continue_on_error,
+        no_of_retries=no_of_retries,
+        timeout=timeout,
+        download_cache=download_cache,
+    )
+    # each file is streamed to disk first, then appended to the year file
+    parts_dir = f"{target_file}.parts"
+    pathlib.Path(parts_dir).mkdir(parents=True, exist_ok=True)
+    file_cnt = len(source_urls)
+    with open(target_file, "wb") as fout, concurrent.futures.ThreadPoolExecutor(
+        max_workers=max_concurrent_downloads
+    ) as executor:
+        # a bounded window of downloads is kept in flight and written out in
+        # listing order, so disk use stays flat however many files the year has
+        in_flight = collections.deque()
+        for file_ptr, source_url in enumerate(source_urls, 1):
+            part_file = f"{parts_dir}/{file_ptr}"
+            in_flight.append(
+                (
+                    file_ptr,
+                    part_file,
+                    executor.submit(fetch_file, source_url, part_file),
+                )
+            )
+            if len(in_flight) >= 4 * max_concurrent_downloads:
+                append_file_body(fout, *in_flight.popleft(), number_of_header_rows)
+        while in_flight:
+            append_file_body(fout, *in_flight.popleft(), number_of_header_rows)
+        logging.info(f"Appended {file_cnt} files of total {file_cnt} files")
+    session.close()
+    shutil.rmtree(parts_dir, ignore_errors=True)
+
+
+def append_file_body(
+    fout: typing.BinaryIO,
+    file_ptr: int,
+    part_file: str,
+    future: concurrent.futures.Future,
+    number_of_header_rows: int,
+) -> None:
+    if not future.result():
+        return
+    with open(part_file, "rb") as fin:
+        if fout.tell() > 0:
+            # only the first file written keeps its header
+            for _ in range(number_of_header_rows):
+                fin.readline()
+        body_start = fin.tell()
+        ends_with_newline = True
+        if os.path.getsize(part_file) > body_start:
+            fin.seek(-1, os.SEEK_END)
+            ends_with_newline = fin.read(1) == b"\n"
+            fin.seek(body_start)
+        shutil.copyfileobj(fin, fout)
+    if not ends_with_newline:
+        fout.write(b"\n")
+    os.remove(part_file)
+    if (file_ptr % 100) == 0:
+        logging.info(f"Appended {file_ptr} files")
+
+
+def fetch_file_http(
+    source_url: str,
+    local_file: str,
+    session: requests.Session,
+    throttle: typing.Callable[[], None],
+    continue_on_error: bool = False,
+    no_of_retries: int = 5,
+    timeout: int = 200,
+    download_cache: str = "",
+) -> bool:
+    cache_entry = read_download_cache_entry(download_cache, source_url)
+    for retries in range(1, no_of_retries + 1):
+        throttle()
+        try:
+            with session.get(
+                source_url,
+                stream=True,
+                timeout=timeout,
+                headers=conditional_request_headers(cache_entry),
+            ) as response:
+                if response.status_code == 304:
+                    restore_cached_download(
+                        download_cache, source_url, cache_entry, local_file
+                    )
+                    return True
+                if 400 <= response.status_code <= 499:
+                    logging.info(
+                        f"Unable to download file {source_url} (error code was {response.status_code})"
+                    )
+                    return False
+                response.raise_for_status()
+                with open(local_file, "wb") as f:
+                    for chunk in response.iter_content(chunk_size=1024 * 1024):
+                        f.write(chunk)
+            store_cached_download(
+                download_cache,
+                source_url,
+                local_file,
+                http_cache_validators(response.headers),
+            )
+            return True
+        except requests.exceptions.RequestException as e:
+            logging.info(
+                f"{str(e)} Unable to download file {source_url}.  Retry {retries} of {no_of_retries}"
+            )
+            time.sleep(3)
+    if not continue_on_error:
+        raise SystemExit(f"Unable to obtain {source_url}")
+    return False
+
+
+def rate_limiter(requests_per_second: float) -> typing.Callable[[], None]:
+    lock = threading.Lock()
+    next_request = [time.monotonic()]
+
+    def throttle() -> None:
+        if requests_per_second <= 0:
+            return
+        with lock:
+            now = time.monotonic()
+            delay = next_request[0] - now
+            next_request[0] = max(now, next_request[0]) + 1 / requests_per_second
+        if delay > 0:
+            time.sleep(delay)
+
+    return throttle
+
+
 def upload_file_to_gcs(
     file_path: pathlib.Path, target_gcs_bucket: str, target_gcs_path: str
-) -> None:
+) -> str:
     if os.path.exists(file_path):
         logging.info(
             f"Uploading output file to gs://{target_gcs_bucket}/{target_gcs_path}"
         )
-        storage_client = storage.Client()
+        storage_client = gcs_client()
         bucket = storage_client.bucket(target_gcs_bucket)
         blob = bucket.blob(target_gcs_path)
         blob.upload_from_filename(file_path)
+        return f"gs://{target_gcs_bucket}/{target_gcs_path}"
     else:
         logging.info(
             f"Cannot upload file to gs://{target_gcs_bucket}/{target_gcs_path} as it does not exist."
         )
+    return ""
 
 
 if __name__ == "__main__":
@@ -2087,4 +3090,12 @@ if __name__ == "__main__":
         regex_list=json.loads(os.environ.get("REGEX_LIST", r"{}")),
         int_date_list=json.loads(os.environ.get("INT_DATE_LIST", r"[]")),
         gen_location_list=json.loads(os.environ.get("GEN_LOCATION_LIST", r"{}")),
+        max_parallel_periods=os.environ.get("MAX_PARALLEL_PERIODS", "1"),
+        manifest_path=os.environ.get("CHECKPOINT_MANIFEST", ""),
+        output_format=os.environ.get("OUTPUT_FORMAT", "csv"),
+        parquet_compression=os.environ.get("PARQUET_COMPRESSION", "snappy"),
+        max_concurrent_downloads=os.environ.get("MAX_CONCURRENT_DOWNLOADS", "8"),
+        downloads_per_second=os.environ.get("DOWNLOADS_PER_SECOND", "10"),
+        download_cache=os.environ.get("DOWNLOAD_CACHE", ""),
+        ftp_pool_size=os.environ.get("FTP_POOL_SIZE", "1"),
     )
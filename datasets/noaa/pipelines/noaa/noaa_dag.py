@@ -61,6 +61,9 @@ with DAG(
         image="{{ var.json.noaa.container_registry.run_csv_transform_kub }}",
         env_vars={
             "PIPELINE_NAME": "GHCND by year",
+            "DOWNLOAD_CACHE": "gs://{{ var.value.composer_bucket }}/data/noaa/download_cache",
+            "MAX_PARALLEL_PERIODS": "2",
+            "FTP_POOL_SIZE": "2",
             "SOURCE_URL": '{\n  "ghcnd_by_year": "http://www.ncei.noaa.gov/pub/data/ghcn/daily/by_year/.csv.gz"\n}',
             "SOURCE_FILE": "files/data_ghcnd_by_year.csv",
             "TARGET_FILE": "files/data_output_ghcnd_by_year.csv",
@@ -101,6 +104,7 @@ with DAG(
         image="{{ var.json.noaa.container_registry.run_csv_transform_kub }}",
         env_vars={
             "PIPELINE_NAME": "NOAA GHCN-M",
+            "DOWNLOAD_CACHE": "gs://{{ var.value.composer_bucket }}/data/noaa/download_cache",
             "SOURCE_URL": '{\n  "tmin": "ftp://ftp.ncdc.noaa.gov/pub/data/ghcn/v3/ghcnm.tmin.latest.qca.tar.gz",\n  "tavg": "ftp://ftp.ncdc.noaa.gov/pub/data/ghcn/v3/ghcnm.tavg.latest.qca.tar.gz",\n  "tmax": "ftp://ftp.ncdc.noaa.gov/pub/data/ghcn/v3/ghcnm.tmax.latest.qca.tar.gz"\n}',
             "SOURCE_FILE": "files/data_ghcn_m.csv",
             "TARGET_FILE": "files/data_output_ghcn_m.csv",
@@ -345,6 +349,7 @@ with DAG(
         image="{{ var.json.noaa.container_registry.run_csv_transform_kub }}",
         env_vars={
             "PIPELINE_NAME": "NOAA lightning strikes by year",
+            "DOWNLOAD_CACHE": "gs://{{ var.value.composer_bucket }}/data/noaa/download_cache",
             "SOURCE_URL": '{\n  "lightning_strikes_by_year": "https://www1.ncdc.noaa.gov/pub/data/swdi/database-csv/v2/nldn-tiles-*.csv.gz"\n}',
             "SOURCE_FILE": "files/data_lightning_strikes.csv",
             "TARGET_FILE": "files/data_output_lightning_strikes.csv",
@@ -385,6 +390,8 @@ with DAG(
         image="{{ var.json.noaa.container_registry.run_csv_transform_kub }}",
         env_vars={
             "PIPELINE_NAME": "NOAA Storms database by year",
+            "DOWNLOAD_CACHE": "gs://{{ var.value.composer_bucket }}/data/noaa/download_cache",
+            "MAX_PARALLEL_PERIODS": "4",
             "SOURCE_URL": '{\n    "root": "https://www.ncei.noaa.gov/pub/data/swdi/stormevents/csvfiles/",\n    "storms_details": "StormEvents_details-ftp_v1.0_d",\n    "storms_locations": "StormEvents_locations-ftp_v1.0_d"\n}',
             "SOURCE_FILE": "files/data_storms_database.csv",
             "TARGET_FILE": "files/data_output_storms_database.csv",
@@ -396,6 +403,7 @@ with DAG(
             "TARGET_GCS_PATH": "data/noaa/storms_db/data_output.csv",
             "SCHEMA_PATH": "data/noaa/schema/noaa_historic_severe_storms_schema.json",
             "DROP_DEST_TABLE": "N",
+            "OUTPUT_FORMAT": "parquet",
             "INPUT_FIELD_DELIMITER": ",",
             "FULL_DATA_LOAD": "N",
             "REMOVE_SOURCE_FILE": "Y",
@@ -808,6 +816,11 @@ with DAG(
             "TARGET_GCS_BUCKET": "{{ var.value.composer_bucket }}",
             "TARGET_GCS_PATH": "data/noaa/gsod_by_year/data_output.csv",
             "SCHEMA_PATH": "data/noaa/schema/noaa_gsod_by_year_schema.json",
+            "CHECKPOINT_MANIFEST": "gs://{{ var.value.composer_bucket }}/data/noaa/gsod_by_year/checkpoint_manifest.json",
+            "MAX_PARALLEL_PERIODS": "2",
+            "MAX_CONCURRENT_DOWNLOADS": "8",
+            "DOWNLOADS_PER_SECOND": "5",
+            "DOWNLOAD_CACHE": "gs://{{ var.value.composer_bucket }}/data/noaa/download_cache",
             "DROP_DEST_TABLE": "N",
             "INPUT_FIELD_DELIMITER": ",",
             "FULL_DATA_LOAD": "N",
@@ -13,7 +13,7 @@
 # limitations under the License.
 
 import datetime
-import gzip
+import hashlib
 import json
 import logging
 import os
@@ -47,6 +47,7 @@ def main(
     data_dtypes: dict,
     pipeline_name: str,
     chunk_size: int,
+    manifest_path: str,
 ) -> None:
     logging.info(
         f"{pipeline_name} load process started at {str(datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'))}"
@@ -78,6 +79,7 @@ def main(
                 csv_headers=csv_headers,
                 data_dtypes=data_dtypes,
                 chunk_size=chunk_size,
+                manifest_path=manifest_path,
             )
     else:
         logging.print("Failed: source zip file is invalid")
@@ -100,13 +102,19 @@ def process_source_file(
     csv_headers: typing.List[str],
     data_dtypes: dict,
     chunk_size: int,
+    manifest_path: str = "",
 ) -> None:
     logging.info(f"Found data file {fileName}, extracting and splitting ...")
     zip_path = os.path.dirname(input_zip)
+    # chunks are only reused while the downloaded archive is unchanged
+    download_hash = file_md5(input_zip) if manifest_path else ""
     cmd = f"unzip -p {input_zip} {fileName} | tail -n +2 | split -l {str(chunk_size)} --additional-suffix '.csv' -d --filter='gzip -v9 > {zip_path}/$FILE.gz'"
     subprocess.run(cmd, shell=True)
     logging.info("Copying zip files to GCS bucket ...")
     for zip_file in sorted(pathlib.Path(zip_path).glob("x*.csv.gz")):
+        chunk_key = f"{os.path.basename(input_zip)}/{fileName}/{zip_file.name}"
+        if unit_completed(manifest_path, chunk_key, download_hash):
+            continue
         gcs_zip_file_path = (
             f"{os.path.dirname(target_gcs_path)}/{os.path.basename(zip_file)}"
         )
@@ -116,74 +124,102 @@ def process_source_file(
             target_gcs_path=gcs_zip_file_path,
         )
     logging.info("Processing individual zip files ...")
+    chunk_uris = []
     for zip_file in sorted(pathlib.Path(zip_path).glob("x*.csv.gz")):
         logging.info(f" ... File {zip_file}")
+        chunk_key = f"{os.path.basename(input_zip)}/{fileName}/{zip_file.name}"
         extracted_chunk = str(zip_file).replace(".gz", "")
-        gz_decompress(infile=zip_file, tofile=extracted_chunk, delete_zipfile=True)
+        chunk_gcs_path = str.replace(
+            target_gcs_path, ".csv", os.path.basename(extracted_chunk)
+        )
+        chunk_uris += [f"gs://{target_gcs_bucket}/{chunk_gcs_path}"]
+        if unit_completed(manifest_path, chunk_key, download_hash):
+            logging.info(f" ... Chunk {chunk_key} was already uploaded.  Skipping.")
+            os.remove(zip_file)
+            continue
         transform_data(
-            fileName=extracted_chunk,
+            source_file=zip_file,
+            target_file=extracted_chunk,
             int_fields=int_fields,
             date_fields=date_fields,
             csv_headers=csv_headers,
             data_dtypes=data_dtypes,
         )
-        load_source_file_to_bq(
-            target_file=extracted_chunk,
+        upload_file_to_gcs(
+            file_path=extracted_chunk,
+            target_gcs_bucket=target_gcs_bucket,
+            target_gcs_path=chunk_gcs_path,
+        )
+        os.remove(extracted_chunk)
+        record_unit(
+            manifest_path=manifest_path,
+            unit_key=chunk_key,
+            content_hash=download_hash,
+            target_uri=chunk_uris[-1],
+        )
+    load_key = f"{os.path.basename(input_zip)}/{fileName}"
+    if not chunk_uris:
+        logging.info(f" ... No data chunks were extracted from {fileName}")
+    elif unit_completed(manifest_path, load_key, download_hash):
+        logging.info(f" ... {load_key} was already loaded.  Skipping.")
+    else:
+        # every chunk is loaded by a single job, so the table is truncated and
+        # refilled atomically instead of once per chunk
+        load_job_id = load_source_files_to_bq(
+            source_uris=chunk_uris,
             target_gcs_bucket=target_gcs_bucket,
-            target_gcs_path=target_gcs_path,
             project_id=project_id,
             dataset_id=dataset_id,
             table_id=table_id,
             schema_path=schema_path,
-            truncate_table=(
-                True if os.path.basename(extracted_chunk) == "x00.csv" else False
-            ),
+            truncate_table=True,
             field_delimiter="|",
         )
+        record_unit(
+            manifest_path=manifest_path,
+            unit_key=load_key,
+            content_hash=download_hash,
+            destination_table=table_id,
+            load_job_id=load_job_id,
+        )
 
 
 def transform_data(
-    fileName: str,
+    source_file: str,
+    target_file: str,
     int_fields: typing.List[str],
     date_fields: typing.List[str],
     csv_headers: typing.List[str],
     data_dtypes: dict,
 ) -> None:
     logging.info("Transforms ...")
-    logging.info(" ... Transform -> Adding header")
-    csv_header = ",".join(str(itm) for itm in csv_headers)
-    cmd = f"sed -i '1s/^/{csv_header}\\n/' {fileName}"
-    subprocess.run(cmd, shell=True)
     logging.info(" ... Transform -> Resolving date format")
-    df = pd.read_csv(fileName, sep=",", dtype=data_dtypes)
+    # the gzipped chunk is decoded as it is read and has no header row of its
+    # own, so the headers are supplied here
+    df = pd.read_csv(
+        source_file, sep=",", header=None, names=csv_headers, dtype=data_dtypes
+    )
     logging.info("Transforming int columns")
     for int_fld in int_fields:
         df[int_fld] = df[int_fld].astype(pd.Int64Dtype(), errors="ignore")
     logging.info("Transforming date format columns")
     for date_fld in date_fields:
         df[date_fld] = pd.to_datetime(df[date_fld], format="%m/%d/%Y", errors="ignore")
-    df.to_csv(fileName, sep="|", index=False)
+    df.to_csv(target_file, sep="|", index=False)
+    os.remove(source_file)
     logging.info("Transforms completed")
 
 
-def load_source_file_to_bq(
-    target_file: str,
+def load_source_files_to_bq(
+    source_uris: typing.List[str],
     target_gcs_bucket: str,
-    target_gcs_path: str,
     project_id: str,
     dataset_id: str,
     table_id: str,
     schema_path: str,
     truncate_table: bool,
     field_delimiter: str,
-):
-    fileName = os.path.basename(str(target_file))
-    if os.path.exists(target_file):
-        upload_file_to_gcs(
-            file_path=target_file,
-            target_gcs_bucket=target_gcs_bucket,
-            target_gcs_path=f"{str.replace(target_gcs_path, '.csv', fileName)}",
-        )
+) -> str:
     table_exists = create_dest_table(
         project_id=project_id,
         dataset_id=dataset_id,
@@ -193,27 +229,72 @@ def load_source_file_to_bq(
         drop_table=False,
     )
     if table_exists:
-        load_data_to_bq(
+        return load_data_to_bq(
             project_id=project_id,
             dataset_id=dataset_id,
             table_id=table_id,
-            file_path=target_file,
+            file_path="",
             truncate_table=truncate_table,
             field_delimiter=field_delimiter,
+            source_uris=source_uris,
         )
-        os.remove(target_file)
     else:
         error_msg = f"Error: Data was not loaded because the destination table {project_id}.{dataset_id}.{table_id} does not exist and/or could not be created."
         raise ValueError(error_msg)
 
 
-def gz_decompress(infile: str, tofile: str, delete_zipfile: bool = False) -> None:
-    logging.info(f"Decompressing {infile}")
-    with open(infile, "rb") as inf, open(tofile, "w", encoding="utf8") as tof:
-        decom_str = gzip.decompress(inf.read()).decode("utf-8")
-        tof.write(decom_str)
-    if delete_zipfile:
-        os.remove(infile)
+def file_md5(file_path: str) -> str:
+    md5 = hashlib.md5()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            md5.update(block)
+    return md5.hexdigest()
+
+
+def read_manifest(manifest_path: str) -> dict:
+    if not manifest_path:
+        return {}
+    if manifest_path.startswith("gs://"):
+        bucket_name, blob_name = manifest_path.replace("gs://", "", 1).split("/", 1)
+        blob = storage.Client().bucket(bucket_name).blob(blob_name)
+        if not blob.exists():
+            return {}
+        return json.loads(blob.download_as_text())
+    if not os.path.exists(manifest_path):
+        return {}
+    with open(manifest_path, "r") as f:
+        return json.load(f)
+
+
+def write_manifest(manifest_path: str, manifest: dict) -> None:
+    contents = json.dumps(manifest, indent=2, sort_keys=True)
+    if manifest_path.startswith("gs://"):
+        bucket_name, blob_name = manifest_path.replace("gs://", "", 1).split("/", 1)
+        blob = storage.Client().bucket(bucket_name).blob(blob_name)
+        blob.upload_from_string(contents, content_type="application/json")
+    else:
+        with open(manifest_path, "w") as f:
+            f.write(contents)
+
+
+def unit_completed(manifest_path: str, unit_key: str, content_hash: str) -> bool:
+    unit = read_manifest(manifest_path).get(unit_key)
+    return unit is not None and unit["content_hash"] == content_hash
+
+
+def record_unit(
+    manifest_path: str, unit_key: str, content_hash: str, **details
+) -> None:
+    if not manifest_path:
+        return
+    logging.info(f"Recording {unit_key} as completed in {manifest_path}")
+    manifest = read_manifest(manifest_path)
+    manifest[unit_key] = {
+        "content_hash": content_hash,
+        "completed_at": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        **details,
+    }
+    write_manifest(manifest_path, manifest)
 
 
 def download_source_file(source_url: str, source_file: str) -> str:
@@ -243,9 +324,10 @@ def load_data_to_bq(
     file_path: str,
     truncate_table: bool,
     field_delimiter: str = "|",
-) -> None:
+    source_uris: typing.Union[str, typing.List[str]] = "",
+) -> str:
     logging.info(
-        f"Loading data from {file_path} into {project_id}.{dataset_id}.{table_id} started"
+        f"Loading data from {source_uris or file_path} into {project_id}.{dataset_id}.{table_id} started"
     )
     client = bigquery.Client(project=project_id)
     table_ref = client.dataset(dataset_id).table(table_id)
@@ -258,12 +340,18 @@ def load_data_to_bq(
         job_config.write_disposition = "WRITE_APPEND"
     job_config.skip_leading_rows = 1  # ignore the header
     job_config.autodetect = False
-    with open(file_path, "rb") as source_file:
-        job = client.load_table_from_file(source_file, table_ref, job_config=job_config)
+    if source_uris:
+        job = client.load_table_from_uri(source_uris, table_ref, job_config=job_config)
+    else:
+        with open(file_path, "rb") as source_file:
+            job = client.load_table_from_file(
+                source_file, table_ref, job_config=job_config
+            )
     job.result()
     logging.info(
-        f"Loading data from {file_path} into {project_id}.{dataset_id}.{table_id} completed"
+        f"Loading data from {source_uris or file_path} into {project_id}.{dataset_id}.{table_id} completed"
     )
+    return job.job_id
 
 
 def create_dest_table(
@@ -362,7 +450,7 @@ def download_file(source_url: str, source_file: pathlib.Path) -> bool:
 
 def upload_file_to_gcs(
     file_path: pathlib.Path, target_gcs_bucket: str, target_gcs_path: str
-) -> None:
+) -> str:
     if os.path.exists(file_path):
         logging.info(
             f"Uploading output file to gs://{target_gcs_bucket}/{target_gcs_path}"
@@ -371,10 +459,12 @@ def upload_file_to_gcs(
         bucket = storage_client.bucket(target_gcs_bucket)
         blob = bucket.blob(target_gcs_path)
         blob.upload_from_filename(file_path)
+        return f"gs://{target_gcs_bucket}/{target_gcs_path}"
     else:
         logging.info(
             f"Cannot upload file to gs://{target_gcs_bucket}/{target_gcs_path} as it does not exist."
         )
+    return ""
 
 
 if __name__ == "__main__":
@@ -397,4 +487,5 @@ if __name__ == "__main__":
         data_dtypes=json.loads(os.environ.get("DATA_DTYPES", r"{}")),
         schema_path=os.environ.get("SCHEMA_PATH", ""),
         chunk_size=int(os.environ.get("CHUNKSIZE", "100000")),
+        manifest_path=os.environ.get("CHECKPOINT_MANIFEST", ""),
     )
@@ -72,6 +72,7 @@ with DAG(
             "DATASET_ID": "nppes",
             "TABLE_ID": "npi_raw",
             "SCHEMA_PATH": "data/nppes/schema/npi_raw_schema.json",
+            "CHECKPOINT_MANIFEST": "gs://{{ var.value.composer_bucket }}/data/nppes/checkpoint_manifest.json",
             "CHUNKSIZE": "1000000",
             "INT_FIELDS": '[\n  "entity_type_code",\n  "provider_other_organization_name_type_code",\n  "provider_other_last_name_type_code"\n]',
             "DATE_FIELDS": '[\n  "provider_enumeration_date",\n  "last_update_date",\n  "npi_deactivation_date",\n  "npi_reactivation_date",\n  "certification_date"\n]',
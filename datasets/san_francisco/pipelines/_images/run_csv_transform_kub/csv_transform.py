@@ -12,19 +12,21 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import contextlib
 import fnmatch
+import gzip
 import json
 import logging
 import os
 import pathlib
-import re
 import shutil
 import typing
 import zipfile as zip
-from datetime import datetime
 
 import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
 import requests
 from google.api_core.exceptions import NotFound
 from google.cloud import bigquery, storage
@@ -64,6 +66,7 @@ def main(
     date_format_list: dict,
     filter_headers_list: typing.List[str],
     reorder_headers_list: typing.List[str],
+    transform_steps: typing.List[typing.Union[str, dict]],
 ) -> None:
     logging.info(f"{pipeline_name} process started")
     pathlib.Path("./files").mkdir(parents=True, exist_ok=True)
@@ -100,6 +103,7 @@ def main(
         date_format_list=date_format_list,
         filter_headers_list=filter_headers_list,
         reorder_headers_list=reorder_headers_list,
+        transform_steps=transform_steps,
     )
     logging.info(f"{pipeline_name} process completed")
 
@@ -137,6 +141,7 @@ def execute_pipeline(
     date_format_list: dict,
     filter_headers_list: typing.List[str],
     reorder_headers_list: typing.List[str],
+    transform_steps: typing.List[typing.Union[str, dict]],
 ) -> None:
     if (
         destination_table == "311_service_requests"
@@ -346,9 +351,10 @@ def execute_pipeline(
             strip_whitespace_list=strip_whitespace_list,
             date_format_list=date_format_list,
             reorder_headers_list=reorder_headers_list,
+            transform_steps=transform_steps,
         )
     if os.path.exists(target_file):
-        upload_file_to_gcs(
+        target_uri = upload_file_to_gcs(
             file_path=target_file,
             target_gcs_bucket=target_gcs_bucket,
             target_gcs_path=target_gcs_path,
@@ -367,6 +373,7 @@ def execute_pipeline(
                 dataset_id=dataset_id,
                 table_id=destination_table,
                 file_path=target_file,
+                source_uris=target_uri,
                 truncate_table=True,
                 field_delimiter="|",
             )
@@ -432,24 +439,26 @@ def process_sf_calendar(
         indicator=False,
         validate=None,
     )
-    df["monday_str"] = df["monday"].apply(lambda x: "False" if x == 0 else "True")
-    df["tuesday_str"] = df["tuesday"].apply(lambda x: "False" if x == 0 else "True")
-    df["wednesday_str"] = df["wednesday"].apply(lambda x: "False" if x == 0 else "True")
-    df["thursday_str"] = df["thursday"].apply(lambda x: "False" if x == 0 else "True")
-    df["friday_str"] = df["friday"].apply(lambda x: "False" if x == 0 else "True")
-    df["saturday_str"] = df["saturday"].apply(lambda x: "False" if x == 0 else "True")
-    df["sunday_str"] = df["sunday"].apply(lambda x: "False" if x == 0 else "True")
-    df["exception_type_str"] = df["exception_type"].apply(
-        lambda x: "True" if x == 1 else "False"
-    )
+    for weekday in [
+        "monday",
+        "tuesday",
+        "wednesday",
+        "thursday",
+        "friday",
+        "saturday",
+        "sunday",
+    ]:
+        df[f"{weekday}_str"] = np.where(df[weekday] == 0, "False", "True")
+    df["exception_type_str"] = np.where(df["exception_type"] == 1, "True", "False")
     df = df[filter_headers_list]
     df = rename_headers(df=df, rename_headers_list=rename_headers_list)
-    df["exceptions"] = df["exceptions"].apply(
-        lambda x: f"{str(x).strip()[:4]}-{str(x).strip()[4:6]}-{str(x).strip()[6:8]}"
+    exceptions = df["exceptions"].astype(str).str.strip()
+    df["exceptions"] = (
+        exceptions.str[:4] + "-" + exceptions.str[4:6] + "-" + exceptions.str[6:8]
     )
     df = reorder_headers(df=df, output_headers_list=reorder_headers_list)
     save_to_new_file(df=df, file_path=target_file, sep="|")
-    upload_file_to_gcs(
+    target_uri = upload_file_to_gcs(
         file_path=target_file,
         target_gcs_bucket=target_gcs_bucket,
         target_gcs_path=target_gcs_path,
@@ -469,6 +478,7 @@ def process_sf_calendar(
             dataset_id=dataset_id,
             table_id=destination_table,
             file_path=target_file,
+            source_uris=target_uri,
             truncate_table=True,
             field_delimiter="|",
         )
@@ -493,7 +503,7 @@ def process_sf_muni_routes(
     )
     df_routes = reorder_headers(df=df_routes, output_headers_list=reorder_headers_list)
     save_to_new_file(df=df_routes, file_path=target_file, sep="|")
-    upload_file_to_gcs(
+    target_uri = upload_file_to_gcs(
         file_path=target_file,
         target_gcs_bucket=target_gcs_bucket,
         target_gcs_path=target_gcs_path,
@@ -513,6 +523,7 @@ def process_sf_muni_routes(
             dataset_id=dataset_id,
             table_id=destination_table,
             file_path=target_file,
+            source_uris=target_uri,
             truncate_table=True,
             field_delimiter="|",
         )
@@ -537,13 +548,12 @@ def process_sf_muni_shapes(
         target_file_path=str(target_file),
     )
     df_shapes = rename_headers(df=df_shapes, rename_headers_list=rename_headers_list)
-    df_shapes["shape_point_geom"] = df_shapes.apply(
-        lambda x: create_geometry_columns(x["shape_point_lon"], x["shape_point_lat"]),
-        axis=1,
+    df_shapes["shape_point_geom"] = create_geometry_columns(
+        df_shapes["shape_point_lon"], df_shapes["shape_point_lat"]
     )
     df_shapes = reorder_headers(df=df_shapes, output_headers_list=reorder_headers_list)
     save_to_new_file(df=df_shapes, file_path=target_file, sep="|")
-    upload_file_to_gcs(
+    target_uri = upload_file_to_gcs(
         file_path=target_file,
         target_gcs_bucket=target_gcs_bucket,
         target_gcs_path=target_gcs_path,
@@ -563,6 +573,7 @@ def process_sf_muni_shapes(
             dataset_id=dataset_id,
             table_id=destination_table,
             file_path=target_file,
+            source_uris=target_uri,
             truncate_table=True,
             field_delimiter="|",
         )
@@ -585,12 +596,12 @@ def process_sf_muni_stops(
         source_file_gcs_path=source_url_dict["stops"],
         target_file_path=str(target_file),
     )
-    df_stops["stop_geom"] = df_stops.apply(
-        lambda x: create_geometry_columns(x["stop_lon"], x["stop_lat"]), axis=1
+    df_stops["stop_geom"] = create_geometry_columns(
+        df_stops["stop_lon"], df_stops["stop_lat"]
     )
     df_stops = reorder_headers(df=df_stops, output_headers_list=reorder_headers_list)
     save_to_new_file(df=df_stops, file_path=target_file, sep="|")
-    upload_file_to_gcs(
+    target_uri = upload_file_to_gcs(
         file_path=target_file,
         target_gcs_bucket=target_gcs_bucket,
         target_gcs_path=target_gcs_path,
@@ -610,6 +621,7 @@ def process_sf_muni_stops(
             dataset_id=dataset_id,
             table_id=destination_table,
             file_path=target_file,
+            source_uris=target_uri,
             truncate_table=True,
             field_delimiter="|",
         )
@@ -650,7 +662,7 @@ def process_sf_muni_stop_times(
         df=df_stop_times, output_headers_list=reorder_headers_list
     )
     save_to_new_file(df=df_stop_times, file_path=target_file, sep="|")
-    upload_file_to_gcs(
+    target_uri = upload_file_to_gcs(
         file_path=target_file,
         target_gcs_bucket=target_gcs_bucket,
         target_gcs_path=target_gcs_path,
@@ -670,6 +682,7 @@ def process_sf_muni_stop_times(
             dataset_id=dataset_id,
             table_id=destination_table,
             file_path=target_file,
+            source_uris=target_uri,
             truncate_table=True,
             field_delimiter="|",
         )
@@ -729,7 +742,7 @@ def process_sf_muni_fares(
     )
     df_fares = reorder_headers(df=df_fares, output_headers_list=reorder_headers_list)
     save_to_new_file(df=df_fares, file_path=target_file, sep="|")
-    upload_file_to_gcs(
+    target_uri = upload_file_to_gcs(
         file_path=target_file,
         target_gcs_bucket=target_gcs_bucket,
         target_gcs_path=target_gcs_path,
@@ -749,6 +762,7 @@ def process_sf_muni_fares(
             dataset_id=dataset_id,
             table_id=destination_table,
             file_path=target_file,
+            source_uris=target_uri,
             truncate_table=True,
             field_delimiter="|",
         )
@@ -788,7 +802,7 @@ def process_sf_muni_trips(
     df = rename_headers(df=df, rename_headers_list=rename_headers_list)
     df = reorder_headers(df=df, output_headers_list=reorder_headers_list)
     save_to_new_file(df=df, file_path=target_file, sep="|")
-    upload_file_to_gcs(
+    target_uri = upload_file_to_gcs(
         file_path=target_file,
         target_gcs_bucket=target_gcs_bucket,
         target_gcs_path=target_gcs_path,
@@ -808,6 +822,7 @@ def process_sf_muni_trips(
             dataset_id=dataset_id,
             table_id=destination_table,
             file_path=target_file,
+            source_uris=target_uri,
             truncate_table=True,
             field_delimiter="|",
         )
@@ -843,8 +858,10 @@ def df_replace_values(
     return df
 
 
-def create_geometry_columns(long: float, lat: float) -> pd.DataFrame:
-    return f"POINT({str(long)} {str(lat)})".replace("POINT( )", "")
+def create_geometry_columns(long: pd.Series, lat: pd.Series) -> pd.Series:
+    return ("POINT(" + long.astype(str) + " " + lat.astype(str) + ")").str.replace(
+        "POINT( )", "", regex=False
+    )
 
 
 def rename_headers(df: pd.DataFrame, rename_headers_list: dict) -> pd.DataFrame:
@@ -938,11 +955,9 @@ def handle_tripdata(
     )
     df_trip_data.set_index("key", inplace=True)
     df = pd.concat([df_trip_data, df_tripdata], ignore_index=True, sort=True)
-    df["subscriber_type_new"] = df.apply(
-        lambda x: str(x.subscription_type)
-        if not str(x.subscriber_type)
-        else str(x.subscriber_type),
-        axis=1,
+    subscriber_type = df["subscriber_type"].astype(str)
+    df["subscriber_type_new"] = subscriber_type.where(
+        subscriber_type != "", df["subscription_type"].astype(str)
     )
     df = df.drop(columns=["subscriber_type"])
     df = resolve_datatypes(df=df, resolve_datatypes_list=resolve_datatypes_list)
@@ -1060,12 +1075,26 @@ def process_source_file(
     reorder_headers_list: typing.List[str],
     header_row_ordinal: str = "0",
     field_separator: str = ",",
+    transform_steps: typing.Optional[typing.List[typing.Union[str, dict]]] = None,
 ) -> None:
+    transform_plan = compile_transform_steps(
+        transform_steps=(transform_steps or []),
+        step_config={
+            "rename_headers_list": rename_headers_list,
+            "empty_key_list": empty_key_list,
+            "gen_location_list": gen_location_list,
+            "resolve_datatypes_list": resolve_datatypes_list,
+            "remove_paren_list": remove_paren_list,
+            "strip_newlines_list": strip_newlines_list,
+            "strip_whitespace_list": strip_whitespace_list,
+            "date_format_list": date_format_list,
+            "reorder_headers_list": reorder_headers_list,
+        },
+    )
     logging.info(f"Opening source file {source_file}")
     if header_row_ordinal is None or header_row_ordinal == "None":
-        with pd.read_csv(
+        with read_csv_chunks(
             source_file,
-            engine="python",
             encoding="utf-8",
             quotechar='"',
             chunksize=int(chunksize),  # size of batch data, in no. of records
@@ -1074,18 +1103,13 @@ def process_source_file(
             dtype=data_dtypes,
             keep_default_na=True,
             na_values=[" "],
-        ) as reader:
+        ) as reader, open_target_file(target_file) as target_file_handle:
             for chunk_number, chunk in enumerate(reader):
-                target_file_batch = str(target_file).replace(
-                    ".csv", "-" + str(chunk_number) + ".csv"
-                )
-                df = pd.DataFrame()
-                df = pd.concat([df, chunk])
                 process_chunk(
-                    df=df,
-                    target_file_batch=target_file_batch,
+                    df=chunk,
+                    target_file_handle=target_file_handle,
                     target_file=target_file,
-                    skip_header=(not chunk_number == 0),
+                    include_header=(chunk_number == 0),
                     destination_table=destination_table,
                     rename_headers_list=rename_headers_list,
                     empty_key_list=empty_key_list,
@@ -1096,13 +1120,13 @@ def process_source_file(
                     strip_whitespace_list=strip_whitespace_list,
                     date_format_list=date_format_list,
                     reorder_headers_list=reorder_headers_list,
+                    transform_plan=transform_plan,
                 )
     else:
         header = int(header_row_ordinal)
         if data_dtypes != "[]":
-            with pd.read_csv(
+            with read_csv_chunks(
                 source_file,
-                engine="python",
                 encoding="utf-8",
                 quotechar='"',
                 chunksize=int(chunksize),  # size of batch data, in no. of records
@@ -1111,18 +1135,13 @@ def process_source_file(
                 dtype=data_dtypes,
                 keep_default_na=True,
                 na_values=[" "],
-            ) as reader:
+            ) as reader, open_target_file(target_file) as target_file_handle:
                 for chunk_number, chunk in enumerate(reader):
-                    target_file_batch = str(target_file).replace(
-                        ".csv", "-" + str(chunk_number) + ".csv"
-                    )
-                    df = pd.DataFrame()
-                    df = pd.concat([df, chunk])
                     process_chunk(
-                        df=df,
-                        target_file_batch=target_file_batch,
+                        df=chunk,
+                        target_file_handle=target_file_handle,
                         target_file=target_file,
-                        skip_header=(not chunk_number == 0),
+                        include_header=(chunk_number == 0),
                         destination_table=destination_table,
                         rename_headers_list=rename_headers_list,
                         empty_key_list=empty_key_list,
@@ -1133,11 +1152,11 @@ def process_source_file(
                         strip_whitespace_list=strip_whitespace_list,
                         date_format_list=date_format_list,
                         reorder_headers_list=reorder_headers_list,
+                        transform_plan=transform_plan,
                     )
         else:
-            with pd.read_csv(
+            with read_csv_chunks(
                 source_file,
-                engine="python",
                 encoding="utf-8",
                 quotechar='"',
                 chunksize=int(chunksize),  # size of batch data, in no. of records
@@ -1145,18 +1164,13 @@ def process_source_file(
                 header=header,  # use when the data file does not contain a header
                 keep_default_na=True,
                 na_values=[" "],
-            ) as reader:
+            ) as reader, open_target_file(target_file) as target_file_handle:
                 for chunk_number, chunk in enumerate(reader):
-                    target_file_batch = str(target_file).replace(
-                        ".csv", "-" + str(chunk_number) + ".csv"
-                    )
-                    df = pd.DataFrame()
-                    df = pd.concat([df, chunk])
                     process_chunk(
-                        df=df,
-                        target_file_batch=target_file_batch,
+                        df=chunk,
+                        target_file_handle=target_file_handle,
                         target_file=target_file,
-                        skip_header=(not chunk_number == 0),
+                        include_header=(chunk_number == 0),
                         destination_table=destination_table,
                         rename_headers_list=rename_headers_list,
                         empty_key_list=empty_key_list,
@@ -1167,14 +1181,264 @@ def process_source_file(
                         strip_whitespace_list=strip_whitespace_list,
                         date_format_list=date_format_list,
                         reorder_headers_list=reorder_headers_list,
+                        transform_plan=transform_plan,
                     )
 
 
+@contextlib.contextmanager
+def read_csv_chunks(
+    source_file: str, chunksize: int, **read_csv_args
+) -> typing.Iterator[typing.Iterator[pd.DataFrame]]:
+    reader = iter_csv_chunks(source_file, chunksize, **read_csv_args)
+    try:
+        yield reader
+    finally:
+        reader.close()
+
+
+def iter_csv_chunks(
+    source_file: str, chunksize: int, **read_csv_args
+) -> typing.Iterator[pd.DataFrame]:
+    chunks_read = 0
+    engines = csv_engines(read_csv_args)
+    for engine in engines:
+        logging.info(f"Reading {source_file} with the {engine} CSV engine")
+        try:
+            if engine == "pyarrow":
+                reader = read_csv_chunks_pyarrow(source_file, chunksize, read_csv_args)
+            else:
+                reader = pd.read_csv(
+                    source_file,
+                    engine=engine,
+                    chunksize=chunksize,
+                    **read_csv_args,
+                    **({"float_precision": "round_trip"} if engine == "c" else {}),
+                )
+            with contextlib.closing(reader):
+                for chunk_number, chunk in enumerate(reader):
+                    # chunks already handed out by a previous engine are skipped
+                    if chunk_number >= chunks_read:
+                        chunks_read += 1
+                        yield chunk
+            return
+        except (pd.errors.ParserError, pa.ArrowInvalid, ValueError) as e:
+            if engine == engines[-1] or not is_csv_engine_error(e):
+                raise
+            logging.info(
+                f"Unable to read {source_file} with the {engine} CSV engine ({e}), falling back from chunk #{chunks_read}"
+            )
+
+
+def is_csv_engine_error(e: Exception) -> bool:
+    if isinstance(e, (pd.errors.ParserError, pa.ArrowInvalid)):
+        return True
+    # options an engine rejects before reading any data
+    return "not supported" in str(e) or "does not support" in str(e)
+
+
+def csv_engines(read_csv_args: dict) -> typing.List[str]:
+    engines = ["c", "python"]
+    if has_datetime_dtype(read_csv_args.get("dtype")):
+        # the C engine can't parse datetime dtypes, only the python engine can
+        engines = ["python"]
+    if pyarrow_csv_options(read_csv_args) is not None:
+        return ["pyarrow"] + engines
+    return engines
+
+
+def has_datetime_dtype(dtype: typing.Any) -> bool:
+    dtypes = dtype.values() if isinstance(dtype, dict) else [dtype]
+    return any(
+        col_type is not None and pd.api.types.is_datetime64_any_dtype(col_type)
+        for col_type in dtypes
+    )
+
+
+def pyarrow_csv_options(read_csv_args: dict) -> typing.Optional[dict]:
+    # Only a subset of read_csv options map onto pyarrow without changing the
+    # resulting dataframe, anything else is left to the pandas engines.
+    supported_args = {
+        "sep",
+        "quotechar",
+        "encoding",
+        "names",
+        "header",
+        "skiprows",
+        "dtype",
+        "keep_default_na",
+        "na_values",
+    }
+    if not set(read_csv_args).issubset(supported_args):
+        return None
+    sep = read_csv_args.get("sep", ",")
+    quotechar = read_csv_args.get("quotechar", '"')
+    names = read_csv_args.get("names")
+    header = read_csv_args.get("header", None if names else 0)
+    skiprows = read_csv_args.get("skiprows", 0)
+    dtype = read_csv_args.get("dtype")
+    if len(sep) != 1 or len(quotechar) != 1 or not isinstance(skiprows, int):
+        return None
+    if header is None and not names:
+        return None
+    if not (dtype in (str, "str", "object") or isinstance(dtype, dict)):
+        return None
+    null_values = list(read_csv_args.get("na_values") or [])
+    if read_csv_args.get("keep_default_na", True):
+        # the values pandas treats as missing by default
+        null_values += [
+            "",
+            "#N/A",
+            "#N/A N/A",
+            "#NA",
+            "-1.#IND",
+            "-1.#QNAN",
+            "-NaN",
+            "-nan",
+            "1.#IND",
+            "1.#QNAN",
+            "<NA>",
+            "N/A",
+            "NA",
+            "NULL",
+            "NaN",
+            "None",
+            "n/a",
+            "nan",
+            "null",
+        ]
+    return {
+        "read_options": pa_csv.ReadOptions(
+            column_names=names,
+            skip_rows=skiprows
+            + (0 if header is None else int(header) + (1 if names else 0)),
+            encoding=read_csv_args.get("encoding", "utf8"),
+        ),
+        "parse_options": pa_csv.ParseOptions(
+            delimiter=sep, quote_char=quotechar, newlines_in_values=True
+        ),
+        "null_values": null_values,
+        "dtype": dtype,
+    }
+
+
+def read_csv_chunks_pyarrow(
+    source_file: str, chunksize: int, read_csv_args: dict
+) -> typing.Iterator[pd.DataFrame]:
+    options = pyarrow_csv_options(read_csv_args)
+    with pa_csv.open_csv(
+        source_file,
+        read_options=options["read_options"],
+        parse_options=options["parse_options"],
+    ) as reader:
+        column_names = reader.schema.names
+    dtype = options["dtype"]
+    if isinstance(dtype, dict):
+        missing_columns = [col for col in column_names if col not in dtype]
+        if missing_columns:
+            raise ValueError(
+                f"The pyarrow engine does not support columns without a dtype: {missing_columns}"
+            )
+    else:
+        dtype = {col: dtype for col in column_names}
+    convert_options = pa_csv.ConvertOptions(
+        column_types={col: pa.string() for col in column_names},
+        null_values=options["null_values"],
+        strings_can_be_null=True,
+    )
+    row_number = 0
+    with pa_csv.open_csv(
+        source_file,
+        read_options=options["read_options"],
+        parse_options=options["parse_options"],
+        convert_options=convert_options,
+    ) as reader:
+        batches = []
+        batched_rows = 0
+        for batch in reader:
+            batches.append(batch)
+            batched_rows += batch.num_rows
+            while batched_rows >= chunksize:
+                table = pa.Table.from_batches(batches, schema=reader.schema)
+                df = arrow_table_to_df(table.slice(0, chunksize), dtype, row_number)
+                row_number += len(df)
+                yield df
+                remainder = table.slice(chunksize)
+                batches = remainder.to_batches()
+                batched_rows = remainder.num_rows
+        if batched_rows:
+            table = pa.Table.from_batches(batches, schema=reader.schema)
+            yield arrow_table_to_df(table, dtype, row_number)
+
+
+def arrow_table_to_df(table: pa.Table, dtype: dict, row_number: int) -> pd.DataFrame:
+    df = table.to_pandas().fillna(np.nan)
+    df.index = pd.RangeIndex(row_number, row_number + len(df))
+    converted_types = {
+        col: col_type
+        for col, col_type in dtype.items()
+        if col in df.columns and col_type not in (str, "str", "object")
+    }
+    if converted_types:
+        df = df.astype(converted_types)
+    return df
+
+
+def compile_transform_steps(
+    transform_steps: typing.List[typing.Union[str, dict]], step_config: dict
+) -> typing.List[typing.Callable[[pd.DataFrame], pd.DataFrame]]:
+    # Each step is either the name of a transform, which then uses the list
+    # passed to the pipeline for that transform (eg. RENAME_HEADERS_LIST), or
+    # a dict {"step": <name>, "args": <value>} which overrides that list.
+    transforms = {
+        "rename_headers": (rename_headers, "rename_headers_list", dict),
+        "remove_empty_key_rows": (remove_empty_key_rows, "empty_key_list", list),
+        "resolve_datatypes": (resolve_datatypes, "resolve_datatypes_list", dict),
+        "remove_parenthesis_long_lat": (
+            remove_parenthesis_long_lat,
+            "remove_paren_list",
+            list,
+        ),
+        "strip_whitespace": (strip_whitespace, "strip_whitespace_list", list),
+        "strip_newlines": (strip_newlines, "strip_newlines_list", list),
+        "resolve_date_format": (resolve_date_format, "date_format_list", dict),
+        "generate_location": (generate_location, "gen_location_list", dict),
+        "reorder_headers": (reorder_headers, "reorder_headers_list", list),
+        "add_key": (add_key, None, None),
+    }
+    transform_plan = []
+    for step in transform_steps:
+        if isinstance(step, str):
+            step = {"step": step}
+        step_name = step.get("step")
+        if step_name not in transforms:
+            raise ValueError(
+                f"Transform step {step_name} must be one of {list(transforms.keys())}"
+            )
+        logging.info(f"Adding transform step {step_name}")
+        transform, config_name, arg_type = transforms[step_name]
+        if config_name is None:
+            transform_plan.append(transform)
+            continue
+        step_arg = step.get("args", step_config.get(config_name))
+        if not isinstance(step_arg, arg_type):
+            raise ValueError(
+                f"Transform step {step_name} requires a {arg_type.__name__} argument, got {step_arg}"
+            )
+        transform_plan.append(bind_transform_step(transform, step_arg))
+    return transform_plan
+
+
+def bind_transform_step(
+    transform: typing.Callable, step_arg: typing.Union[list, dict]
+) -> typing.Callable[[pd.DataFrame], pd.DataFrame]:
+    return lambda df: transform(df, step_arg)
+
+
 def process_chunk(
     df: pd.DataFrame,
-    target_file_batch: str,
+    target_file_handle: typing.TextIO,
     target_file: str,
-    skip_header: bool,
+    include_header: bool,
     destination_table: str,
     rename_headers_list: typing.List[str],
     empty_key_list: typing.List[str],
@@ -1185,9 +1449,15 @@ def process_chunk(
     strip_newlines_list: typing.List[str],
     date_format_list: dict,
     reorder_headers_list: typing.List[str],
+    transform_plan: typing.Optional[
+        typing.List[typing.Callable[[pd.DataFrame], pd.DataFrame]]
+    ] = None,
 ) -> None:
-    logging.info(f"Processing batch file {target_file_batch}")
-    if destination_table == "311_service_requests":
+    logging.info(f"Processing batch of {len(df)} rows")
+    if transform_plan:
+        for transform_step in transform_plan:
+            df = transform_step(df)
+    elif destination_table == "311_service_requests":
         df = rename_headers(df, rename_headers_list)
         df = remove_empty_key_rows(df, empty_key_list)
         df = resolve_datatypes(df, resolve_datatypes_list)
@@ -1212,15 +1482,9 @@ def process_chunk(
     elif destination_table == "sfpd_incidents":
         df = rename_headers(df=df, rename_headers_list=rename_headers_list)
         df = remove_empty_key_rows(df, empty_key_list)
-        df["timestamp"] = df.apply(
-            lambda x: datetime.strftime(
-                datetime.strptime(
-                    (x["Date"][:10] + " " + x["Time"] + ":00"), "%m/%d/%Y %H:%M:%S"
-                ),
-                "%Y-%m-%d %H:%M:%S",
-            ),
-            axis=1,
-        )
+        df["timestamp"] = pd.to_datetime(
+            df["Date"].str[:10] + " " + df["Time"] + ":00", format="%m/%d/%Y %H:%M:%S"
+        ).dt.strftime("%Y-%m-%d %H:%M:%S")
         df = reorder_headers(df, reorder_headers_list)
     elif destination_table == "bikeshare_station_info":
         df = rename_headers(df, rename_headers_list)
@@ -1257,19 +1521,16 @@ def process_chunk(
         df = reorder_headers(df, reorder_headers_list)
     else:
         pass
-    save_to_new_file(df, file_path=str(target_file_batch), sep="|")
-    append_batch_file(target_file_batch, target_file, skip_header, not (skip_header))
-    logging.info(f"Processing batch file {target_file_batch} completed")
+    append_to_target_file(df, target_file_handle, include_header, sep="|")
+    logging.info(f"Processing batch of {len(df)} rows completed")
 
 
 def add_key(df: pd.DataFrame) -> pd.DataFrame:
     logging.info("Adding key column")
-    df["start_date_str"] = df["start_date"].apply(
-        lambda x: re.sub("[^0-9.]", "", str(x))
-    )
-    df["key"] = df.apply(
-        lambda x: str(x.start_date_str) + "-" + str(x.bike_number), axis=1
+    df["start_date_str"] = (
+        df["start_date"].astype(str).str.replace("[^0-9.]", "", regex=True)
     )
+    df["key"] = df["start_date_str"] + "-" + df["bike_number"].astype(str)
     df["key_val"] = df["key"].replace("-", "")
     return df
 
@@ -1305,6 +1566,7 @@ def load_data_to_bq(
     file_path: str,
     truncate_table: bool,
     field_delimiter: str = "|",
+    source_uris: typing.Union[str, typing.List[str]] = "",
 ) -> None:
     logging.info(
         f"Loading data from {file_path} into {project_id}.{dataset_id}.{table_id} started"
@@ -1321,8 +1583,13 @@ def load_data_to_bq(
         job_config.write_disposition = "WRITE_APPEND"
     job_config.skip_leading_rows = 1  # ignore the header
     job_config.autodetect = False
-    with open(file_path, "rb") as source_file:
-        job = client.load_table_from_file(source_file, table_ref, job_config=job_config)
+    if source_uris:
+        job = client.load_table_from_uri(source_uris, table_ref, job_config=job_config)
+    else:
+        with open(file_path, "rb") as source_file:
+            job = client.load_table_from_file(
+                source_file, table_ref, job_config=job_config
+            )
     job.result()
     logging.info(
         f"Loading data from {file_path} into {project_id}.{dataset_id}.{table_id} completed"
@@ -1445,10 +1712,12 @@ def extract_longitude_from_geom(
     lon_field_name: str,
 ) -> str:
     logging.info(f"Extracting longitude field {lon_field_name} from {geom_field_name}")
-    df[lon_field_name] = df[geom_field_name].apply(
-        lambda x: str(x).replace("POINT (", "").replace(")", "").split(" ", 1)[0]
-        if str(x) != ""
-        else "POINT (  )"
+    geom = df[geom_field_name].astype(str)
+    df[lon_field_name] = (
+        strip_point_geom(geom)
+        .str.split(" ", n=1)
+        .str[0]
+        .where(geom != "", "POINT (  )")
     )
     return df
 
@@ -1459,14 +1728,22 @@ def extract_latitude_from_geom(
     lat_field_name: str,
 ) -> str:
     logging.info(f"Extracting latitude field {lat_field_name} from {geom_field_name}")
-    df[lat_field_name] = df[geom_field_name].apply(
-        lambda x: str(x).replace("POINT (", "").replace(")", "").split(" ", 1)[-1]
-        if str(x) != ""
-        else "POINT (  )"
+    geom = df[geom_field_name].astype(str)
+    df[lat_field_name] = (
+        strip_point_geom(geom)
+        .str.split(" ", n=1)
+        .str[-1]
+        .where(geom != "", "POINT (  )")
     )
     return df
 
 
+def strip_point_geom(geom: pd.Series) -> pd.Series:
+    return geom.str.replace("POINT (", "", regex=False).str.replace(
+        ")", "", regex=False
+    )
+
+
 def generate_location(df: pd.DataFrame, gen_location_list: dict) -> pd.DataFrame:
     logging.info("Generating location data")
     for key, values in gen_location_list.items():
@@ -1486,7 +1763,7 @@ def strip_whitespace(
 ) -> pd.DataFrame:
     for ws_fld in strip_whitespace_list:
         logging.info(f"Stripping whitespaces in column {ws_fld}")
-        df[ws_fld] = df[ws_fld].apply(lambda x: str(x).strip())
+        df[ws_fld] = df[ws_fld].astype(str).str.strip()
     return df
 
 
@@ -1507,38 +1784,28 @@ def resolve_date_format(
     logging.info("Resolving date formats")
     for dt_fld in date_format_list.items():
         logging.info(f"Resolving date formats in field {dt_fld}")
-        df[dt_fld[0]] = df[dt_fld[0]].apply(convert_dt_format, from_format=dt_fld[1])
+        df[dt_fld[0]] = convert_dt_format(df[dt_fld[0]], from_format=dt_fld[1])
     return df
 
 
-def convert_dt_format(dt_str: str, from_format: str = '"%Y-%m-%d %H:%M:%S"') -> str:
-    if not dt_str or str(dt_str).lower() == "nan" or str(dt_str).lower() == "nat":
-        return ""
+def convert_dt_format(
+    dt_values: pd.Series, from_format: str = '"%Y-%m-%d %H:%M:%S"'
+) -> pd.Series:
+    dt_str = dt_values.astype(str)
+    has_value = dt_values.notna() & ~dt_str.str.lower().isin(["", "nan", "nat"])
+    if from_format.find(" ") > 0:
+        # Date and Time
+        source = dt_str if from_format[-2:] == "%p" else dt_str.str[:19]
+        to_format = "%Y-%m-%d %H:%M:%S"
     else:
-        if from_format.find(" ") > 0:
-            # Date and Time
-            return str(
-                datetime.strftime(
-                    pd.to_datetime(
-                        (dt_str if from_format[-2:] == "%p" else dt_str[:19]),
-                        format=f"{from_format}",
-                        errors="ignore",
-                    ),
-                    "%Y-%m-%d %H:%M:%S",
-                )
-            )
-        else:
-            # Date Only
-            return str(
-                datetime.strftime(
-                    pd.to_datetime(
-                        dt_str[:10],
-                        format=f"{from_format}",
-                        errors="ignore",
-                    ),
-                    "%Y-%m-%d",
-                )
-            )
+        # Date Only
+        source = dt_str.str[:10]
+        to_format = "%Y-%m-%d"
+    converted = pd.Series("", index=dt_values.index, dtype=object)
+    converted[has_value] = pd.to_datetime(
+        source[has_value], format=from_format
+    ).dt.strftime(to_format)
+    return converted
 
 
 def reorder_headers(
@@ -1553,30 +1820,28 @@ def save_to_new_file(df: pd.DataFrame, file_path: str, sep: str = "|") -> None:
     df.to_csv(file_path, index=False, sep=sep)
 
 
-def append_batch_file(
-    batch_file_path: str, target_file_path: str, skip_header: bool, truncate_file: bool
+def open_target_file(target_file: str) -> typing.TextIO:
+    logging.info(f"Opening target file {target_file} for streaming output")
+    if str(target_file).endswith(".gz"):
+        return gzip.open(target_file, "wt", encoding="utf-8", newline="")
+    return open(target_file, "w", encoding="utf-8", newline="")
+
+
+def append_to_target_file(
+    df: pd.DataFrame,
+    target_file_handle: typing.TextIO,
+    include_header: bool,
+    sep: str = "|",
 ) -> None:
-    with open(batch_file_path, "r") as data_file:
-        if truncate_file:
-            target_file = open(target_file_path, "w+").close()
-        with open(target_file_path, "a+") as target_file:
-            if skip_header:
-                logging.info(
-                    f"Appending batch file {batch_file_path} to {target_file_path} with skip header"
-                )
-                next(data_file)
-            else:
-                logging.info(
-                    f"Appending batch file {batch_file_path} to {target_file_path}"
-                )
-            target_file.write(data_file.read())
-            if os.path.exists(batch_file_path):
-                os.remove(batch_file_path)
+    logging.info(
+        f"Writing {len(df)} rows to {target_file_handle.name} with include_header={include_header}"
+    )
+    df.to_csv(target_file_handle, index=False, sep=sep, header=include_header)
 
 
 def upload_file_to_gcs(
     file_path: pathlib.Path, target_gcs_bucket: str, target_gcs_path: str
-) -> None:
+) -> str:
     if os.path.exists(file_path):
         logging.info(
             f"Uploading output file to gs://{target_gcs_bucket}/{target_gcs_path}"
@@ -1585,10 +1850,12 @@ def upload_file_to_gcs(
         bucket = storage_client.bucket(target_gcs_bucket)
         blob = bucket.blob(target_gcs_path)
         blob.upload_from_filename(file_path)
+        return f"gs://{target_gcs_bucket}/{target_gcs_path}"
     else:
         logging.info(
             f"Cannot upload file to gs://{target_gcs_bucket}/{target_gcs_path} as it does not exist."
         )
+    return ""
 
 
 if __name__ == "__main__":
@@ -1636,4 +1903,5 @@ if __name__ == "__main__":
         date_format_list=json.loads(os.environ.get("DATE_FORMAT_LIST", r"[]")),
         filter_headers_list=json.loads(os.environ.get("FILTER_HEADERS_LIST", r"[]")),
         reorder_headers_list=json.loads(os.environ.get("REORDER_HEADERS_LIST", r"[]")),
+        transform_steps=json.loads(os.environ.get("TRANSFORM_STEPS", r"[]")),
     )
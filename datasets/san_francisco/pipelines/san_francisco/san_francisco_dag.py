@@ -63,6 +63,7 @@ with DAG(
             "STRIP_NEWLINES_LIST": '[\n  "status_notes",\n  "descriptor"\n]',
             "STRIP_WHITESPACE_LIST": '[\n  "incident_address"\n]',
             "DATE_FORMAT_LIST": '{\n  "created_date": "%m/%d/%Y %H:%M:%S %p",\n  "closed_date": "%m/%d/%Y %H:%M:%S %p",\n  "resolution_action_updated_date": "%m/%d/%Y %H:%M:%S %p"\n}',
+            "TRANSFORM_STEPS": '[\n  "rename_headers",\n  "remove_empty_key_rows",\n  "resolve_datatypes",\n  "remove_parenthesis_long_lat",\n  "strip_whitespace",\n  "strip_newlines",\n  "resolve_date_format",\n  "reorder_headers"\n]',
             "REORDER_HEADERS_LIST": '[\n    "unique_key",\n    "created_date",\n    "closed_date",\n    "resolution_action_updated_date",\n    "status",\n    "status_notes",\n    "agency_name",\n    "category",\n    "complaint_type",\n    "descriptor",\n    "incident_address",\n    "supervisor_district",\n    "neighborhood",\n    "location",\n    "source",\n    "media_url",\n    "latitude",\n    "longitude",\n    "police_district"\n]',
         },
         resources={
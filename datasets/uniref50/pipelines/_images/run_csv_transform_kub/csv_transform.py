@@ -12,18 +12,26 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import bz2
+import collections
+import concurrent.futures
+import contextlib
+import functools
 import gc as garbage_collector
 import gzip
+import io
 import json
 import logging
 import os
 import pathlib
-import subprocess
 import typing
+import zipfile
 
 import pandas as pd
+import zstandard
 from google.api_core.exceptions import NotFound
 from google.cloud import bigquery, storage
+from google.cloud.storage import transfer_manager
 
 
 def main(
@@ -40,6 +48,7 @@ def main(
     reorder_headers_list: typing.List[str],
     field_separator: str,
     schema_path: str,
+    max_concurrent_transfers: str,
 ) -> None:
     logging.info(f"{pipeline_name} process started")
     pathlib.Path("./files").mkdir(parents=True, exist_ok=True)
@@ -56,6 +65,7 @@ def main(
         reorder_headers_list=reorder_headers_list,
         field_separator=field_separator,
         schema_path=schema_path,
+        max_concurrent_transfers=int(max_concurrent_transfers),
     )
     logging.info(f"{pipeline_name} process completed")
 
@@ -73,35 +83,34 @@ def execute_pipeline(
     reorder_headers_list: typing.List[str],
     field_separator: str,
     schema_path: str,
+    max_concurrent_transfers: int = 4,
 ) -> None:
     logging.info("Processing individual zip files ...")
-    for zip_file in sorted(
-        list_gcs_files(project_id, source_gcs_bucket, source_gcs_path, "x", ".txt.gz")
-    ):
-        source_location = f"gs://{source_gcs_bucket}/{source_gcs_path}/{zip_file}"
-        logging.info(
-            f" Downloading, processing and loading source data file {source_location} ..."
-        )
-        download_file_gcs(
-            project_id=project_id,
-            source_location=source_location,
-            destination_folder=destination_folder,
-        )
-        extracted_chunk = f"{destination_folder}/{str(zip_file).replace('.gz', '')}"
-        gz_decompress(
-            infile=f"{destination_folder}/{zip_file}",
-            tofile=f"{extracted_chunk}",
-            delete_zipfile=True,
-        )
-        df = transform_data(
-            source_filename=extracted_chunk,
-            csv_headers=csv_headers,
-            data_dtypes=data_dtypes,
-            reorder_headers_list=reorder_headers_list,
-            field_separator=field_separator,
+    source_locations = [
+        f"gs://{source_gcs_bucket}/{source_gcs_path}/{zip_file}"
+        for zip_file in sorted(
+            list_gcs_files(
+                project_id, source_gcs_bucket, source_gcs_path, "x", ".txt.gz"
+            )
         )
-        if os.path.exists(extracted_chunk):
-            os.remove(extracted_chunk)
+    ]
+    for source_chunk in prefetch_source_chunks(
+        project_id=project_id,
+        source_locations=source_locations,
+        destination_folder=destination_folder,
+        max_concurrent_transfers=max_concurrent_transfers,
+    ):
+        logging.info(f" Processing and loading source data file {source_chunk} ...")
+        if os.path.exists(source_chunk):
+            with open_source_file(source_chunk, encoding="utf-8") as source_stream:
+                df = transform_data(
+                    source_stream=source_stream,
+                    csv_headers=csv_headers,
+                    data_dtypes=data_dtypes,
+                    reorder_headers_list=reorder_headers_list,
+                    field_separator=field_separator,
+                )
+            os.remove(source_chunk)
             table_exists = create_dest_table(
                 project_id=project_id,
                 dataset_id=dataset_id,
@@ -118,7 +127,7 @@ def execute_pipeline(
                     schema_field_headers_list=reorder_headers_list,
                     truncate_table=(
                         True
-                        if os.path.basename(extracted_chunk) == "x000.txt"
+                        if os.path.basename(source_chunk) == "x000.txt.gz"
                         else False
                     ),
                 )
@@ -129,28 +138,25 @@ def execute_pipeline(
             garbage_collector.collect()
         else:
             logging.info(
-                f"Informational: The data file {extracted_chunk} was not generated because no data file was available.  Continuing."
+                f"Informational: The data file {source_chunk} was not generated because no data file was available.  Continuing."
             )
 
 
 def transform_data(
-    source_filename: str,
+    source_stream: typing.TextIO,
     csv_headers: typing.List[str],
     data_dtypes: dict,
     reorder_headers_list: typing.List[str],
     field_separator: str = "~",
 ) -> pd.DataFrame:
     logging.info("Transforms ...")
-    logging.info(" ... Transform -> Adding header")
-    csv_header = field_separator.join(str(itm) for itm in csv_headers)
-    cmd = f"sed -i '1s/^/{csv_header}\\n/' {source_filename}"
-    subprocess.run(cmd, shell=True)
     logging.info(" ... Transform -> Loading source file to pandas")
     df = pd.read_csv(
-        source_filename,
+        source_stream,
         engine="python",
-        encoding="utf-8",
         sep=field_separator,
+        header=None,
+        names=csv_headers,
         dtype=data_dtypes,
     )
     logging.info(" ... Transform -> Reordering columns")
@@ -168,7 +174,7 @@ def list_gcs_files(
     file_prefix: str,
     file_suffix: str,
 ) -> typing.List[str]:
-    storage_client = storage.Client(project_id)
+    storage_client = gcs_client(project_id)
     blobs = list(
         storage_client.list_blobs(
             source_gcs_bucket, prefix=source_gcs_path, fields="items(name)"
@@ -190,36 +196,93 @@ def list_gcs_files(
     return rtn_list
 
 
+@functools.lru_cache(maxsize=None)
+def gcs_client(project_id: str = "") -> storage.Client:
+    # the chunk downloads run in threads, so they share the client's pool of
+    # connections instead of each opening its own
+    return storage.Client(project_id or None)
+
+
 def download_file_gcs(
     project_id: str,
     source_location: str,
     destination_folder: str,
-    filename_override: str = "",
-) -> None:
+    sliced_download_threshold: int = 256 * 1024 * 1024,
+) -> str:
     object_name = os.path.basename(source_location)
-    if filename_override == "":
-        dest_object = f"{destination_folder}/{object_name}"
-    else:
-        dest_object = f"{destination_folder}/{filename_override}"
-    storage_client = storage.Client(project_id)
+    dest_object = f"{destination_folder}/{object_name}"
     bucket_name = str.split(source_location, "gs://")[1].split("/")[0]
-    bucket = storage_client.bucket(bucket_name)
+    bucket = gcs_client(project_id).bucket(bucket_name)
     source_object_path = str.split(source_location, f"gs://{bucket_name}/")[1]
     blob = bucket.blob(source_object_path)
-    blob.download_to_filename(dest_object)
+    blob.reload()
+    if blob.size >= sliced_download_threshold:
+        transfer_manager.download_chunks_concurrently(
+            blob,
+            dest_object,
+            chunk_size=32 * 1024 * 1024,
+            max_workers=8,
+            worker_type=transfer_manager.THREAD,
+        )
+    else:
+        blob.download_to_filename(dest_object)
+    return dest_object
 
 
-def gz_decompress(infile: str, tofile: str, delete_zipfile: bool = False) -> None:
-    logging.info(f"Decompressing {infile}")
-    with open(infile, "rb") as inf, open(tofile, "w", encoding="utf8") as tof:
-        decom_str = gzip.decompress(inf.read()).decode("utf-8")
-        tof.write(decom_str)
-    if delete_zipfile:
-        os.remove(infile)
+def prefetch_source_chunks(
+    project_id: str,
+    source_locations: typing.List[str],
+    destination_folder: str,
+    max_concurrent_transfers: int,
+) -> typing.Iterator[str]:
+    # chunks are loaded in name order, so they are handed over in that order
+    # while up to max_concurrent_transfers of the next ones download
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=max_concurrent_transfers
+    ) as executor:
+        in_flight = collections.deque()
+        for source_location in source_locations:
+            in_flight.append(
+                executor.submit(
+                    download_file_gcs, project_id, source_location, destination_folder
+                )
+            )
+            if len(in_flight) > max_concurrent_transfers:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
+
+
+@contextlib.contextmanager
+def open_source_file(
+    source_file: str, encoding: str = "utf8"
+) -> typing.Iterator[typing.TextIO]:
+    # compressed files and gs:// objects are decoded as they are read, so
+    # they never have to be decompressed or copied to local disk first
+    source_file = str(source_file)
+    with contextlib.ExitStack() as stack:
+        if source_file.startswith("gs://"):
+            bucket_name, blob_name = source_file.replace("gs://", "", 1).split("/", 1)
+            blob = gcs_client().bucket(bucket_name).blob(blob_name)
+            stream = stack.enter_context(blob.open("rb"))
+        else:
+            stream = stack.enter_context(open(source_file, "rb"))
+        if source_file.endswith(".gz"):
+            stream = stack.enter_context(gzip.GzipFile(fileobj=stream))
+        elif source_file.endswith(".bz2"):
+            stream = stack.enter_context(bz2.BZ2File(stream))
+        elif source_file.endswith(".zst"):
+            stream = stack.enter_context(
+                zstandard.ZstdDecompressor().stream_reader(stream)
+            )
+        elif source_file.endswith(".zip"):
+            archive = stack.enter_context(zipfile.ZipFile(stream))
+            stream = stack.enter_context(archive.open(archive.namelist()[0]))
+        yield stack.enter_context(io.TextIOWrapper(stream, encoding=encoding))
 
 
 def check_gcs_file_exists(file_path: str, bucket_name: str) -> bool:
-    storage_client = storage.Client()
+    storage_client = gcs_client()
     bucket = storage_client.bucket(bucket_name)
     exists = storage.Blob(bucket=bucket, name=file_path).exists(storage_client)
     return exists
@@ -308,7 +371,7 @@ def create_table_schema(
     if not (schema_filepath):
         schema_struct = schema_structure
     else:
-        storage_client = storage.Client()
+        storage_client = gcs_client()
         bucket = storage_client.get_bucket(bucket_name)
         blob = bucket.blob(schema_filepath)
         schema_struct = json.loads(blob.download_as_string(client=None))
@@ -345,4 +408,5 @@ if __name__ == "__main__":
         reorder_headers_list=json.loads(os.environ.get("REORDER_HEADERS_LIST", r"[]")),
         field_separator=os.environ["FIELD_SEPARATOR"],
         schema_path=os.environ["SCHEMA_PATH"],
+        max_concurrent_transfers=os.environ.get("MAX_CONCURRENT_TRANSFERS", "4"),
     )
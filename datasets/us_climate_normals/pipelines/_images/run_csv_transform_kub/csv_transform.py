@@ -13,6 +13,7 @@
 # limitations under the License.
 
 import datetime
+import functools
 import json
 import logging
 import os
@@ -105,12 +106,9 @@ def main(
                     local_file_path = f"{local_source_folder}/{filename}"
                     if fldr_ident != "access":
                         fldr_ident += "/access"
+                    # the load reads the object straight from GCS; a local copy
+                    # is only fetched if an extension schema has to be generated
                     source_file_gcs_full_path = f"gs://{target_gcs_bucket}/{root_gcs_folder}/{root_pipeline_gs_folder}/{fldr_ident}/{filename}"
-                    download_file_gcs(
-                        project_id=project_id,
-                        source_location=source_file_gcs_full_path,
-                        destination_folder=local_source_folder,
-                    )
                     load_data_gcs_to_bq(
                         project_id=project_id,
                         dataset_id=dataset_id,
@@ -165,7 +163,7 @@ def list_of_files_prefix(
     # p = re.compile(
     #     f"^{prefix}([0-9]*)*\\.csv"
     # )  # make sure the file has a numeric digit directly after the prefix e.g. USW0001109.csv where USW is the prefix
-    storage_client = storage.Client(project_id)
+    storage_client = gcs_client(project_id)
     bucket_file_list_blob = storage_client.list_blobs(
         gcs_bucket, prefix=f"{gcs_file_path}/", delimiter="/"
     )
@@ -199,7 +197,7 @@ def distinct_file_prefixes(
     filepath: str,
     file_ext: str,
 ) -> typing.List[str]:
-    storage_client = storage.Client(project_id)
+    storage_client = gcs_client(project_id)
     bucket_file_list_blob = storage_client.list_blobs(
         gcs_bucket, prefix=f"{filepath}/", delimiter="/"
     )
@@ -256,7 +254,7 @@ def create_schema_and_table(
 
 
 def gcs_file_exists(bucket: str, file_path: str) -> bool:
-    storage_client = storage.Client()
+    storage_client = gcs_client()
     bucket = storage_client.bucket(bucket)
     return storage.Blob(bucket=bucket, name=file_path).exists(storage_client)
 
@@ -530,7 +528,7 @@ def create_table_schema(
     if not (schema_filepath):
         schema_struct = schema_structure
     else:
-        storage_client = storage.Client()
+        storage_client = gcs_client()
         bucket = storage_client.get_bucket(bucket_name)
         blob = bucket.blob(schema_filepath)
         schema_struct = json.loads(blob.download_as_string(client=None))
@@ -550,6 +548,11 @@ def create_table_schema(
     return schema
 
 
+@functools.lru_cache(maxsize=None)
+def gcs_client(project_id: str = "") -> storage.Client:
+    return storage.Client(project_id or None)
+
+
 def download_file_gcs(
     project_id: str, source_location: str, destination_folder: str
 ) -> None:
@@ -557,7 +560,7 @@ def download_file_gcs(
     object_name = os.path.basename(source_location)
     dest_object = f"{destination_folder}/{object_name}"
     logging.info(f"   ... {source_location} -> {dest_object}")
-    storage_client = storage.Client(project_id)
+    storage_client = gcs_client(project_id)
     bucket_name = str.split(source_location, "gs://")[1].split("/")[0]
     bucket = storage_client.bucket(bucket_name)
     source_object_path = str.split(source_location, f"gs://{bucket_name}/")[1]
@@ -571,7 +574,7 @@ def download_folder_contents(
     destination_folder: str,
     file_type: str = "",
 ) -> None:
-    storage_client = storage.Client(project_id)
+    storage_client = gcs_client(project_id)
     bucket_name = str.split(source_gcs_folder_path, "gs://")[1].split("/")[0]
     gcs_folder_path = str.split(source_gcs_folder_path, f"gs://{bucket_name}/")[1]
     bucket = storage_client.bucket(bucket_name)
@@ -596,7 +599,7 @@ def upload_file_to_gcs(
         logging.info(
             f"Uploading output file {file_path} to gs://{target_gcs_bucket}/{target_gcs_path}"
         )
-        storage_client = storage.Client()
+        storage_client = gcs_client()
         bucket = storage_client.bucket(target_gcs_bucket)
         blob = bucket.blob(target_gcs_path)
         blob.upload_from_filename(file_path)
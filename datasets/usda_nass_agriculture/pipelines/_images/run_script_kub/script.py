@@ -1,36 +1,174 @@
+import concurrent.futures
+import contextlib
+import ftplib
 import logging
 import os
-from ftplib import FTP
+import queue
+import threading
+import time
+import typing
 
 from google.cloud import storage
 
 
-def main(directory, host, gcs_bucket, gcs_path):
-    ftp = FTP(host)
-    ftp.login()
-    ftp.cwd(directory)
-    gzfiles = ftp.nlst()
-    for file in gzfiles:
+def main(
+    directory,
+    host,
+    gcs_bucket,
+    gcs_path,
+    ftp_pool_size,
+    max_concurrent_uploads,
+    max_staged_files,
+):
+    ftp_pool = FTPSessionPool(host, pool_size=ftp_pool_size)
+    with ftp_pool.session(directory) as ftp:
+        gzfiles = ftp.nlst()
+    gzfiles = [
+        file
+        for file in gzfiles
         if (
             file.endswith("gz")
             and "zipcode" not in file
             and "crop" not in file
             and "census2017" not in file
             and "environment" not in file
-        ):
-            logging.info(f"Downloading file {file} ---->")
-            with open(file, "wb") as f:
-                ftp.retrbinary(f"RETR {file}", f.write)
-            upload_gcs(file, gcs_bucket, gcs_path)
-            os.remove(file)
+        )
+    ]
+    storage_client = storage.Client()
+    # a file is staged on local disk from the start of its download until its
+    # upload finishes, so a slow upload holds back further downloads instead of
+    # letting downloaded files pile up
+    staged_files = threading.BoundedSemaphore(max_staged_files)
+    pending_files = iter(gzfiles)
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=ftp_pool_size
+    ) as download_executor, concurrent.futures.ThreadPoolExecutor(
+        max_workers=max_concurrent_uploads
+    ) as upload_executor:
+        downloads = {}
+        in_flight = set()
+        file = next(pending_files, None)
+        try:
+            while file is not None or in_flight:
+                while file is not None and staged_files.acquire(blocking=False):
+                    future = download_executor.submit(
+                        ftp_pool.retrieve, directory, file, file
+                    )
+                    downloads[future] = file
+                    in_flight.add(future)
+                    file = next(pending_files, None)
+                done, in_flight = concurrent.futures.wait(
+                    in_flight, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                for future in done:
+                    future.result()
+                    if future in downloads:
+                        in_flight.add(
+                            upload_executor.submit(
+                                upload_gcs,
+                                downloads.pop(future),
+                                gcs_bucket,
+                                gcs_path,
+                                storage_client,
+                                staged_files,
+                            )
+                        )
+        except BaseException:
+            # drop the transfers still queued; the ones already running finish
+            # before the executors shut down
+            for future in in_flight:
+                future.cancel()
+            raise
+    ftp_pool.close()
 
 
-def upload_gcs(file, gcs_bucket, gcs_path):
-    storage_client = storage.Client()
-    bucket = storage_client.bucket(gcs_bucket)
-    blob = bucket.blob(gcs_path + file)
-    blob.upload_from_filename(file)
-    logging.info("Uploaded successfully")
+def upload_gcs(file, gcs_bucket, gcs_path, storage_client=None, staged_files=None):
+    try:
+        storage_client = storage_client or storage.Client()
+        bucket = storage_client.bucket(gcs_bucket)
+        blob = bucket.blob(gcs_path + file)
+        blob.upload_from_filename(file)
+        logging.info(f"Uploaded {file} successfully")
+        os.remove(file)
+    finally:
+        if staged_files:
+            staged_files.release()
+
+
+class FTPSessionPool:
+    def __init__(
+        self,
+        ftp_host: str,
+        pool_size: int,
+        timeout: int = 60,
+        max_resume_attempts: int = 5,
+    ) -> None:
+        self.ftp_host = ftp_host
+        self.timeout = timeout
+        self.max_resume_attempts = max_resume_attempts
+        self.idle_sessions = queue.LifoQueue()
+        self.session_slots = threading.BoundedSemaphore(pool_size)
+
+    def connect(self) -> ftplib.FTP:
+        logging.info(f"Opening FTP session to {self.ftp_host}")
+        ftp_conn = ftplib.FTP(self.ftp_host, timeout=self.timeout)
+        ftp_conn.login()
+        ftp_conn.home_dir = ftp_conn.pwd()
+        return ftp_conn
+
+    @contextlib.contextmanager
+    def session(self, ftp_dir: str = "") -> typing.Iterator[ftplib.FTP]:
+        with self.session_slots:
+            try:
+                ftp_conn = self.idle_sessions.get_nowait()
+                ftp_conn.voidcmd("NOOP")
+            except queue.Empty:
+                ftp_conn = self.connect()
+            except ftplib.all_errors:
+                ftp_conn.close()
+                ftp_conn = self.connect()
+            try:
+                # ftp_dir may be relative, so always start from the login directory
+                ftp_conn.cwd(ftp_conn.home_dir)
+                if ftp_dir:
+                    ftp_conn.cwd(ftp_dir)
+                yield ftp_conn
+            except BaseException:
+                ftp_conn.close()
+                raise
+            self.idle_sessions.put(ftp_conn)
+
+    def retrieve(self, ftp_dir: str, ftp_filename: str, local_file: str) -> None:
+        logging.info(f"Downloading file {ftp_filename} ---->")
+        open(local_file, "wb").close()
+        for attempt in range(self.max_resume_attempts + 1):
+            offset = os.path.getsize(local_file)
+            try:
+                with self.session(ftp_dir) as ftp_conn, open(
+                    local_file, "ab"
+                ) as dest_file:
+                    ftp_conn.retrbinary(
+                        f"RETR {ftp_filename}",
+                        dest_file.write,
+                        blocksize=1024 * 1024,
+                        rest=offset or None,
+                    )
+                return
+            except (ftplib.error_temp, ftplib.error_reply, EOFError, OSError) as e:
+                if attempt == self.max_resume_attempts:
+                    raise
+                logging.info(
+                    f"Transfer of {ftp_filename} interrupted at {os.path.getsize(local_file)} bytes ({e}), resuming ..."
+                )
+                time.sleep(min(2**attempt, 60))
+
+    def close(self) -> None:
+        while not self.idle_sessions.empty():
+            ftp_conn = self.idle_sessions.get_nowait()
+            try:
+                ftp_conn.quit()
+            except ftplib.all_errors:
+                ftp_conn.close()
 
 
 if __name__ == "__main__":
@@ -40,4 +178,7 @@ if __name__ == "__main__":
         host=os.environ.get("HOST"),
         gcs_bucket=os.environ.get("GCS_BUCKET"),
         gcs_path=os.environ.get("GCS_PATH"),
+        ftp_pool_size=int(os.environ.get("FTP_POOL_SIZE", "3")),
+        max_concurrent_uploads=int(os.environ.get("MAX_CONCURRENT_UPLOADS", "2")),
+        max_staged_files=int(os.environ.get("MAX_STAGED_FILES", "6")),
     )
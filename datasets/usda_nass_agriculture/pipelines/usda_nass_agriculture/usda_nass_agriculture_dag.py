@@ -20,7 +20,7 @@ from airflow.providers.cncf.kubernetes.operators import kubernetes_pod
 default_args = {
     "owner": "Google",
     "depends_on_past": False,
-    "start_date": "2022-12-06",
+    "start_date": "2022-12-12",
 }
 
 
@@ -45,8 +45,11 @@ with DAG(
         env_vars={
             "DIRECTORY": "quickstats",
             "HOST": "ftp.nass.usda.gov",
-            "GCS_BUCKET": "us-central1-dev-v2-cd7f5f38-bucket",
+            "GCS_BUCKET": "{{ var.value.composer_bucket }}",
             "GCS_PATH": "data/usda_nass_agriculture/raw_files/",
+            "FTP_POOL_SIZE": "3",
+            "MAX_CONCURRENT_UPLOADS": "2",
+            "MAX_STAGED_FILES": "6",
         },
         resources={
             "request_memory": "8G",
@@ -12,7 +12,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import io
 import json
 import logging
 import os
@@ -276,7 +275,7 @@ def load_target_file(
     source_url: str,
 ) -> None:
     if os.path.exists(target_file):
-        upload_file_to_gcs(
+        target_uri = upload_file_to_gcs(
             file_path=target_file,
             target_gcs_bucket=target_gcs_bucket,
             target_gcs_path=target_gcs_path,
@@ -300,6 +299,7 @@ def load_target_file(
                 dataset_id=dataset_id,
                 table_id=destination_table,
                 file_path=target_file,
+                source_uris=target_uri,
                 truncate_table=True,
                 field_delimiter="|",
             )
@@ -361,17 +361,17 @@ def zip_extract_in_gcs(bucketname: str, zipfilename_with_path: str) -> None:
     bucket = storage_client.get_bucket(bucketname)
     blob = bucket.blob(zipfilename_with_path)
     logging.info("        ... Reading zipfile data")
-    zipbytes = io.BytesIO(blob.download_as_string())
-    with ZipFile(zipbytes, "r") as myzip:
+    # the archive is read through a seekable blob stream and each member is
+    # streamed back to GCS, so neither is ever held in memory whole
+    with blob.open("rb") as zipstream, ZipFile(zipstream, "r") as myzip:
         file_count = len(myzip.infolist())
         logging.info(f"            ... Count of files to extract: {file_count} ")
         process_file_counter = 0
         for contentfilename in myzip.namelist():
             progress_bar(process_file_counter, file_count)
-            contentfile = myzip.read(contentfilename)
             contentzippath = f"{zipfilename_with_path}/{contentfilename}"
-            blob = bucket.blob(contentzippath)
-            blob.upload_from_string(contentfile)
+            with myzip.open(contentfilename) as contentfile:
+                bucket.blob(contentzippath).upload_from_file(contentfile)
             process_file_counter += 1
 
 
@@ -439,6 +439,7 @@ def load_data_to_bq(
     file_path: str,
     truncate_table: bool,
     field_delimiter: str = "|",
+    source_uris: typing.Union[str, typing.List[str]] = "",
 ) -> None:
     logging.info(
         f"Loading data from {file_path} into {project_id}.{dataset_id}.{table_id} started"
@@ -454,8 +455,13 @@ def load_data_to_bq(
         job_config.write_disposition = "WRITE_APPEND"
     job_config.skip_leading_rows = 1  # ignore the header
     job_config.autodetect = False
-    with open(file_path, "rb") as source_file:
-        job = client.load_table_from_file(source_file, table_ref, job_config=job_config)
+    if source_uris:
+        job = client.load_table_from_uri(source_uris, table_ref, job_config=job_config)
+    else:
+        with open(file_path, "rb") as source_file:
+            job = client.load_table_from_file(
+                source_file, table_ref, job_config=job_config
+            )
     job.result()
     logging.info(
         f"Loading data from {file_path} into {project_id}.{dataset_id}.{table_id} completed"
@@ -569,7 +575,7 @@ def create_table_schema(
 
 def upload_file_to_gcs(
     file_path: pathlib.Path, target_gcs_bucket: str, target_gcs_path: str
-) -> None:
+) -> str:
     if os.path.exists(file_path):
         target_path = os.path.split(target_gcs_path)[0]
         filename = os.path.split(file_path)[1]
@@ -579,10 +585,12 @@ def upload_file_to_gcs(
         bucket = storage_client.bucket(target_gcs_bucket)
         blob = bucket.blob(target_filepath)
         blob.upload_from_filename(file_path)
+        return f"gs://{target_gcs_bucket}/{target_filepath}"
     else:
         logging.info(
             f"Cannot upload file {file_path} to gs://{target_filepath} as it does not exist."
         )
+    return ""
 
 
 if __name__ == "__main__":
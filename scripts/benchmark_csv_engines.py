@@ -0,0 +1,116 @@
+# Copyright 2022 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import argparse
+import pathlib
+import time
+import typing
+
+import pandas as pd
+import pyarrow.csv as pa_csv
+
+ENGINES = ["python", "c", "pyarrow"]
+
+
+def main(
+    source_files: typing.List[pathlib.Path], chunksize: int, sep: str, repeat: int
+):
+    print(f"\n{'file':<50} {'engine':<10} {'rows':>12} {'seconds':>10}")
+    for source_file in source_files:
+        results = benchmark_file(source_file, chunksize, sep, repeat)
+        for engine, (rows, seconds) in results.items():
+            print(f"{source_file.name:<50} {engine:<10} {rows:>12} {seconds:>10.3f}")
+    print()
+
+
+def benchmark_file(
+    source_file: pathlib.Path, chunksize: int, sep: str, repeat: int = 1
+) -> typing.Dict[str, typing.Tuple[int, float]]:
+    results = {}
+    for engine in ENGINES:
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            rows = read_all_chunks(source_file, engine, chunksize, sep)
+            timings.append(time.perf_counter() - start)
+        results[engine] = (rows, min(timings))
+    return results
+
+
+def read_all_chunks(
+    source_file: pathlib.Path, engine: str, chunksize: int, sep: str
+) -> int:
+    rows = 0
+    if engine == "pyarrow":
+        header = pd.read_csv(source_file, sep=sep, nrows=0).columns
+        with pa_csv.open_csv(
+            source_file,
+            parse_options=pa_csv.ParseOptions(delimiter=sep, newlines_in_values=True),
+            convert_options=pa_csv.ConvertOptions(
+                column_types={col: "string" for col in header}
+            ),
+        ) as reader:
+            for batch in reader:
+                rows += len(batch.to_pandas())
+    else:
+        with pd.read_csv(
+            source_file, engine=engine, sep=sep, dtype=str, chunksize=chunksize
+        ) as reader:
+            for chunk in reader:
+                rows += len(chunk)
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare the python, C and pyarrow CSV engines on sample files"
+    )
+    parser.add_argument(
+        "-f",
+        "--file",
+        required=True,
+        type=pathlib.Path,
+        action="append",
+        dest="files",
+        help="A CSV file to read. Can be passed multiple times.",
+    )
+    parser.add_argument(
+        "-c",
+        "--chunksize",
+        type=int,
+        default=100000,
+        dest="chunksize",
+        help="The number of rows per chunk for the pandas engines",
+    )
+    parser.add_argument(
+        "-s",
+        "--sep",
+        type=str,
+        default=",",
+        dest="sep",
+        help="The field separator used in the files",
+    )
+    parser.add_argument(
+        "-r",
+        "--repeat",
+        type=int,
+        default=3,
+        dest="repeat",
+        help="The number of runs per engine, the fastest one is reported",
+    )
+
+    args = parser.parse_args()
+
+    main(args.files, args.chunksize, args.sep, args.repeat)
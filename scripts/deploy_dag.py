@@ -14,13 +14,15 @@
 
 
 import argparse
+import base64
+import concurrent.futures
+import functools
+import hashlib
 import json
 import pathlib
 import subprocess
 import typing
 
-import click
-from google.cloud.orchestration.airflow import service_v1beta1
 from ruamel import yaml
 
 yaml = yaml.YAML(typ="safe")
@@ -29,6 +31,8 @@ CURRENT_PATH = pathlib.Path(__file__).resolve().parent
 PROJECT_ROOT = CURRENT_PATH.parent
 DATASETS_PATH = PROJECT_ROOT / "datasets"
 DEFAULT_AIRFLOW_VERSION = 2
+EXPORTED_VARIABLES_FILENAME = "_exported_variables.json"
+BULK_VARIABLES_FILENAME = "_bulk_variables.json"
 
 
 class IncompatibilityError(Exception):
@@ -42,14 +46,18 @@ def main(
     composer_bucket: typing.Union[str, None],
     composer_region: str,
     pipeline: typing.Union[str, None],
+    incremental: bool = False,
+    max_workers: int = 8,
+    configure_variables: bool = True,
 ):
     if composer_bucket is None:
         composer_bucket = get_composer_bucket(composer_env, composer_region)
 
-    print("\n========== AIRFLOW VARIABLES ==========")
-    check_and_configure_airflow_variables(
-        env_path, dataset_id, composer_env, composer_bucket, composer_region
-    )
+    if configure_variables:
+        print("\n========== AIRFLOW VARIABLES ==========")
+        check_and_configure_airflow_variables(
+            env_path, dataset_id, composer_env, composer_bucket, composer_region
+        )
 
     print("========== AIRFLOW DAGS ==========")
     if pipeline:
@@ -62,6 +70,14 @@ def main(
     for pipeline_path in pipelines:
         check_airflow_version_compatibility(pipeline_path, runtime_airflow_version)
 
+    if incremental:
+        files = composer_bucket_files(
+            env_path, dataset_id, [pipeline_path.name for pipeline_path in pipelines]
+        )
+        sync_files_to_composer_bucket(files, composer_bucket, dataset_id, max_workers)
+        return
+
+    for pipeline_path in pipelines:
         data_folder = (
             DATASETS_PATH / dataset_id / "pipelines" / pipeline_path.name / "data"
         )
@@ -89,16 +105,52 @@ def main(
         )
 
 
+def deploy_datasets(
+    env_path: pathlib.Path,
+    dataset_ids: typing.List[str],
+    composer_env: str,
+    composer_bucket: typing.Union[str, None],
+    composer_region: str,
+    incremental: bool = False,
+    max_workers: int = 8,
+):
+    if composer_bucket is None:
+        composer_bucket = get_composer_bucket(composer_env, composer_region)
+
+    print("\n========== AIRFLOW VARIABLES ==========")
+    configure_airflow_variables_in_bulk(
+        env_path, dataset_ids, composer_env, composer_bucket, composer_region
+    )
+
+    for dataset_id in dataset_ids:
+        print(f"\n========== DATASET {dataset_id} ==========")
+        main(
+            env_path,
+            dataset_id,
+            composer_env,
+            composer_bucket,
+            composer_region,
+            pipeline=None,
+            incremental=incremental,
+            max_workers=max_workers,
+            configure_variables=False,
+        )
+
+
+@functools.lru_cache()
 def get_gcp_project() -> str:
     return subprocess.run(
         ["gcloud", "config", "get-value", "project"], text=True, capture_output=True
     ).stdout.strip()
 
 
+@functools.lru_cache()
 def get_composer_bucket(
     composer_env: str,
     composer_region: str,
 ) -> str:
+    from google.cloud.orchestration.airflow import service_v1beta1
+
     project_id = get_gcp_project()
 
     # Create a client
@@ -135,19 +187,8 @@ def check_and_configure_airflow_variables(
 
     Finally, upload the pipeline variables file to the Composer bucket.
     """
-    cwd = env_path / "datasets" / dataset_id / "pipelines"
-    vars_json_path = cwd / f"{dataset_id}_variables.json"
-    env_vars_file = DATASETS_PATH / dataset_id / f".vars{env_path.name}.yaml"
-    env_vars = yaml.load(open(env_vars_file)) if env_vars_file.exists() else None
-
-    if isinstance(env_vars, dict) and "pipelines" in env_vars:
-        local_vars = env_vars["pipelines"]
-    elif vars_json_path.exists() and vars_json_path.stat().st_size > 0:
-        with open(vars_json_path) as file_:
-            local_vars = json.load(file_)
-    else:
-        print("No local pipeline variables found.")
-        local_vars = None
+    vars_json_path = airflow_variables_json_path(env_path, dataset_id)
+    local_vars = load_local_airflow_variables(env_path, dataset_id)
 
     overwrite_remote_vars = compare_and_set_airflow_variables(
         local_vars,
@@ -162,6 +203,35 @@ def check_and_configure_airflow_variables(
         )
 
 
+def airflow_variables_json_path(
+    env_path: pathlib.Path, dataset_id: str
+) -> pathlib.Path:
+    return (
+        env_path
+        / "datasets"
+        / dataset_id
+        / "pipelines"
+        / f"{dataset_id}_variables.json"
+    )
+
+
+def load_local_airflow_variables(
+    env_path: pathlib.Path, dataset_id: str
+) -> typing.Union[dict, None]:
+    vars_json_path = airflow_variables_json_path(env_path, dataset_id)
+    env_vars_file = DATASETS_PATH / dataset_id / f".vars{env_path.name}.yaml"
+    env_vars = yaml.load(open(env_vars_file)) if env_vars_file.exists() else None
+
+    if isinstance(env_vars, dict) and "pipelines" in env_vars:
+        return env_vars["pipelines"]
+    elif vars_json_path.exists() and vars_json_path.stat().st_size > 0:
+        with open(vars_json_path) as file_:
+            return json.load(file_)
+    else:
+        print("No local pipeline variables found.")
+        return None
+
+
 def get_airflow_var_from_composer_env(
     composer_env: str,
     composer_region: str,
@@ -215,6 +285,22 @@ def compare_and_set_airflow_variables(
     remote_vars = get_airflow_var_from_composer_env(
         composer_env, composer_region, dataset_id
     )
+    return reconcile_airflow_variables(
+        local_vars, remote_vars, dataset_id, vars_json_path
+    )
+
+
+def reconcile_airflow_variables(
+    local_vars: typing.Union[dict, None],
+    remote_vars: typing.Union[dict, None],
+    dataset_id: str,
+    vars_json_path: pathlib.Path,
+) -> bool:
+    """Decides which of the local and remote variables to use, prompting the user
+    if they differ, and writes them to `vars_json_path`.
+
+    Returns whether the variables must be imported into Cloud Composer.
+    """
     if remote_vars is None and local_vars is None:
         print(
             "Airflow variables not defined locally and remotely. Cloud Composer variable import will be skipped.\n"
@@ -268,7 +354,52 @@ def compare_and_set_airflow_variables(
     return import_to_composer
 
 
+def configure_airflow_variables_in_bulk(
+    env_path: pathlib.Path,
+    dataset_ids: typing.List[str],
+    composer_env: str,
+    composer_bucket: str,
+    composer_region: str,
+):
+    """Same as `check_and_configure_airflow_variables`, but for many datasets at once.
+
+    All variables are exported from the Composer environment in one call, compared
+    against the local variables of every dataset, and the ones that need updating
+    are imported back in one call.
+    """
+    remote_variables = export_airflow_variables_from_cloud_composer(
+        env_path, composer_env, composer_bucket, composer_region
+    )
+
+    vars_to_import = {}
+    for dataset_id in dataset_ids:
+        print(f"\nAirflow variables for dataset `{dataset_id}`")
+        vars_json_path = airflow_variables_json_path(env_path, dataset_id)
+        local_vars = load_local_airflow_variables(env_path, dataset_id)
+        if dataset_id in remote_variables:
+            remote_vars = {dataset_id: remote_variables[dataset_id]}
+        else:
+            remote_vars = None
+
+        if reconcile_airflow_variables(
+            local_vars, remote_vars, dataset_id, vars_json_path
+        ):
+            vars_to_import.update(json.loads(vars_json_path.read_text()))
+
+    if not vars_to_import:
+        print(
+            "Remote Airflow variables are up to date. Cloud Composer variable import will be skipped.\n"
+        )
+        return
+
+    import_variables_to_cloud_composer_in_bulk(
+        env_path, vars_to_import, composer_env, composer_bucket, composer_region
+    )
+
+
 def prompt_strategy_for_local_and_remote_vars() -> str:
+    import click
+
     strategy = click.prompt(
         (
             "Remote and local Airflow variables are different.\n"
@@ -364,6 +495,79 @@ def import_variables_to_cloud_composer(
     run_cloud_composer_vars_import(composer_env, composer_region, airflow_path, cwd=cwd)
 
 
+def run_cloud_composer_vars_export(
+    composer_env: str,
+    composer_region: str,
+    airflow_path: str,
+):
+    subprocess.check_call(
+        [
+            "gcloud",
+            "composer",
+            "environments",
+            "run",
+            composer_env,
+            "--location",
+            composer_region,
+            "--project",
+            get_gcp_project(),
+            "variables",
+            "--",
+            "export",
+            airflow_path,
+        ]
+    )
+
+
+def read_gcs_file(gcs_uri: str) -> str:
+    return subprocess.run(
+        ["gsutil", "cat", gcs_uri], text=True, capture_output=True, check=True
+    ).stdout
+
+
+def export_airflow_variables_from_cloud_composer(
+    env_path: pathlib.Path,
+    composer_env: str,
+    composer_bucket: str,
+    composer_region: str,
+) -> dict:
+    """
+    gcloud composer environments run COMPOSER_ENV --location COMPOSER_REGION variables -- export /home/airflow/gcs/data/variables/_exported_variables.json
+    """
+    gcs_uri = f"gs://{composer_bucket}/data/variables/{EXPORTED_VARIABLES_FILENAME}"
+    airflow_path = f"/home/airflow/gcs/data/variables/{EXPORTED_VARIABLES_FILENAME}"
+
+    print(
+        f"\nExporting Airflow variables from Composer environment `{composer_env}` into {gcs_uri}...\n"
+    )
+    run_cloud_composer_vars_export(composer_env, composer_region, airflow_path)
+    exported_variables = json.loads(read_gcs_file(gcs_uri) or "{}")
+
+    # The export holds every variable of the environment, don't leave it around
+    run_gsutil_cmd(["-q", "rm", gcs_uri], cwd=env_path)
+    return exported_variables
+
+
+def import_variables_to_cloud_composer_in_bulk(
+    env_path: pathlib.Path,
+    variables: dict,
+    composer_env: str,
+    composer_bucket: str,
+    composer_region: str,
+):
+    cwd = env_path / "datasets"
+    cwd.mkdir(parents=True, exist_ok=True)
+    (cwd / BULK_VARIABLES_FILENAME).write_text(json.dumps(variables))
+    gcs_uri = f"gs://{composer_bucket}/data/variables/{BULK_VARIABLES_FILENAME}"
+    airflow_path = f"/home/airflow/gcs/data/variables/{BULK_VARIABLES_FILENAME}"
+
+    print(
+        f"\nImporting Airflow variables {sorted(variables)} from {gcs_uri} ({airflow_path})...\n"
+    )
+    run_gsutil_cmd(["cp", BULK_VARIABLES_FILENAME, gcs_uri], cwd=cwd)
+    run_cloud_composer_vars_import(composer_env, composer_region, airflow_path, cwd=cwd)
+
+
 def copy_generated_dag_to_airflow_dags_folder(
     env_path: pathlib.Path,
     dataset_id: str,
@@ -416,6 +620,116 @@ def copy_custom_callables_to_airflow_dags_folder(
     run_gsutil_cmd(["-m", "cp", "-r", "custom", target], cwd=cwd)
 
 
+def composer_bucket_files(
+    env_path: pathlib.Path, dataset_id: str, pipeline_ids: typing.List[str]
+) -> typing.Dict[str, pathlib.Path]:
+    """Maps the Composer bucket objects of the given pipelines to the local files
+    they are deployed from: the data folder, the custom callables and the DAG file.
+    """
+    files = {}
+    for pipeline_id in pipeline_ids:
+        pipeline_dir = env_path / "datasets" / dataset_id / "pipelines" / pipeline_id
+        files.update(
+            list_folder_files(
+                DATASETS_PATH / dataset_id / "pipelines" / pipeline_id / "data",
+                f"data/{dataset_id}/{pipeline_id}",
+            )
+        )
+        files.update(
+            list_folder_files(
+                pipeline_dir / "custom", f"dags/{dataset_id}/{pipeline_id}/custom"
+            )
+        )
+        files[f"dags/{dataset_id}__{pipeline_id}_dag.py"] = (
+            pipeline_dir / f"{pipeline_id}_dag.py"
+        )
+    return files
+
+
+def list_folder_files(
+    folder: pathlib.Path, prefix: str
+) -> typing.Dict[str, pathlib.Path]:
+    if not folder.is_dir():
+        return {}
+    return {
+        f"{prefix}/{path.relative_to(folder).as_posix()}": path
+        for path in sorted(folder.rglob("*"))
+        if path.is_file()
+    }
+
+
+def sync_files_to_composer_bucket(
+    files: typing.Dict[str, pathlib.Path],
+    composer_bucket: str,
+    dataset_id: str,
+    max_workers: int = 8,
+) -> typing.List[str]:
+    from google.cloud import storage
+
+    bucket = storage.Client(project=get_gcp_project()).bucket(composer_bucket)
+    return sync_files_to_bucket(
+        bucket, files, [f"dags/{dataset_id}", f"data/{dataset_id}/"], max_workers
+    )
+
+
+def sync_files_to_bucket(
+    bucket,
+    files: typing.Dict[str, pathlib.Path],
+    prefixes: typing.List[str],
+    max_workers: int = 8,
+) -> typing.List[str]:
+    """Uploads the files whose contents differ from their objects in the bucket.
+
+    The existing objects are fetched with one listing per prefix, instead of one
+    request per file, and compared by their MD5 or CRC32C checksums.
+    """
+    remote_blobs = {}
+    for prefix in prefixes:
+        for blob in bucket.list_blobs(
+            prefix=prefix, fields="items(name,md5Hash,crc32c),nextPageToken"
+        ):
+            remote_blobs[blob.name] = blob
+
+    changed_files = {
+        object_name: path
+        for object_name, path in files.items()
+        if not blob_matches_file(remote_blobs.get(object_name), path)
+    }
+    print(
+        f"\n{len(changed_files)} of {len(files)} files changed since the last deploy"
+        f" to gs://{bucket.name}\n"
+    )
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for object_name in executor.map(
+            lambda item: upload_file_to_bucket(bucket, *item), changed_files.items()
+        ):
+            print(f"  - gs://{bucket.name}/{object_name}")
+    return sorted(changed_files)
+
+
+def blob_matches_file(blob, path: pathlib.Path) -> bool:
+    if blob is None:
+        return False
+
+    contents = path.read_bytes()
+    # composite objects have no MD5 hash, but always have a CRC32C checksum
+    if blob.md5_hash:
+        return (
+            blob.md5_hash == base64.b64encode(hashlib.md5(contents).digest()).decode()
+        )
+
+    import google_crc32c
+
+    checksum = google_crc32c.value(contents).to_bytes(4, "big")
+    return blob.crc32c == base64.b64encode(checksum).decode()
+
+
+def upload_file_to_bucket(bucket, object_name: str, path: pathlib.Path) -> str:
+    bucket.blob(object_name).upload_from_filename(str(path))
+    return object_name
+
+
 def check_existence_of_variables_file(file_path: pathlib.Path):
     if not file_path:
         raise FileNotFoundError(f"Airflow variables file {file_path} does not exist.")
@@ -427,6 +741,7 @@ def list_subdirs(path: pathlib.Path) -> typing.List[pathlib.Path]:
     return subdirs
 
 
+@functools.lru_cache()
 def composer_airflow_version(
     composer_env: str, composer_region: str
 ) -> typing.Literal[1, 2]:
@@ -485,8 +800,12 @@ if __name__ == "__main__":
         "--dataset",
         required=True,
         type=str,
+        nargs="+",
         dest="dataset",
-        help="The directory name of the dataset.",
+        help=(
+            "The directory name of the dataset. When multiple datasets are given,"
+            " their Airflow variables are reconciled in bulk."
+        ),
     )
     parser.add_argument(
         "-e",
@@ -528,6 +847,20 @@ if __name__ == "__main__":
         dest="pipeline",
         help="The directory name of the pipeline",
     )
+    parser.add_argument(
+        "--incremental",
+        required=False,
+        dest="incremental",
+        action="store_true",
+        help="Only upload files that differ from the Composer bucket, in parallel",
+    )
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=8,
+        dest="max_workers",
+        help="Number of concurrent uploads used by --incremental",
+    )
 
     args = parser.parse_args()
     if not args.composer_env:
@@ -540,11 +873,26 @@ if __name__ == "__main__":
             "Argument `-r|--composer-region` (Composer environment region) not specified"
         )
 
-    main(
-        env_path=PROJECT_ROOT / f".{args.env}",
-        dataset_id=args.dataset,
-        pipeline=args.pipeline,
-        composer_env=args.composer_env,
-        composer_bucket=args.composer_bucket,
-        composer_region=args.composer_region,
-    )
+    if len(args.dataset) > 1:
+        if args.pipeline:
+            parser.error("-p/--pipeline can only be used with a single dataset")
+        deploy_datasets(
+            env_path=PROJECT_ROOT / f".{args.env}",
+            dataset_ids=args.dataset,
+            composer_env=args.composer_env,
+            composer_bucket=args.composer_bucket,
+            composer_region=args.composer_region,
+            incremental=args.incremental,
+            max_workers=args.max_workers,
+        )
+    else:
+        main(
+            env_path=PROJECT_ROOT / f".{args.env}",
+            dataset_id=args.dataset[0],
+            pipeline=args.pipeline,
+            composer_env=args.composer_env,
+            composer_bucket=args.composer_bucket,
+            composer_region=args.composer_region,
+            incremental=args.incremental,
+            max_workers=args.max_workers,
+        )
@@ -14,13 +14,20 @@
 
 
 import argparse
+import concurrent.futures
+import contextlib
+import fnmatch
+import functools
+import hashlib
+import io
 import json
 import pathlib
 import re
 import subprocess
+import sys
+import traceback
 import typing
 
-import google.auth
 import jinja2
 from ruamel import yaml
 
@@ -37,6 +44,14 @@ TEMPLATE_PATHS = {
     "default_args": AIRFLOW_TEMPLATES_PATH / "default_args.py.jinja2",
 }
 
+# Compiled once per process; the bytecode cache lets later runs skip compilation
+TEMPLATE_ENV = jinja2.Environment(
+    loader=jinja2.FileSystemLoader(str(AIRFLOW_TEMPLATES_PATH)),
+    bytecode_cache=jinja2.FileSystemBytecodeCache(),
+)
+
+DAG_MANIFEST_FILENAME = ".generate_dag_manifest.json"
+
 DEFAULT_AIRFLOW_VERSION = 2
 AIRFLOW_IMPORTS = json.load(open(CURRENT_PATH / "dag_imports.json"))
 AIRFLOW_VERSIONS = list(AIRFLOW_IMPORTS.keys())
@@ -50,45 +65,214 @@ def main(
     skip_builds: bool = False,
     async_builds: bool = False,
     format_code: bool = True,
+    force: bool = False,
 ):
     if not skip_builds:
         build_images(dataset_id, env, async_builds)
 
     if all_pipelines:
-        for pipeline_dir in list_subdirs(DATASETS_PATH / dataset_id / "pipelines"):
-            generate_pipeline_dag(dataset_id, pipeline_dir.name, env, format_code)
+        pipeline_ids = [
+            pipeline_dir.name
+            for pipeline_dir in list_subdirs(DATASETS_PATH / dataset_id / "pipelines")
+        ]
     else:
-        generate_pipeline_dag(dataset_id, pipeline_id, env, format_code)
+        pipeline_ids = [pipeline_id]
+
+    env_dir = PROJECT_ROOT / f".{env}"
+    # one manifest per dataset so datasets can be generated in parallel
+    manifest_path = env_dir / "datasets" / dataset_id / DAG_MANIFEST_FILENAME
+    manifest = {} if force else read_dag_manifest(manifest_path)
+
+    generated_dags = {}
+    for _pipeline_id in pipeline_ids:
+        dag_path = generate_pipeline_dag(
+            dataset_id, _pipeline_id, format_code, manifest
+        )
+        if dag_path:
+            generated_dags[_pipeline_id] = dag_path
+
+    if format_code and generated_dags:
+        format_python_code(list(generated_dags.values()))
+
+    for _pipeline_id, dag_path in generated_dags.items():
+        manifest[f"{dataset_id}/{_pipeline_id}"]["dag_hash"] = file_md5(dag_path)
+    write_dag_manifest(manifest_path, manifest)
+
+    for _pipeline_id in pipeline_ids:
+        copy_files_to_dot_dir(dataset_id, _pipeline_id, env_dir)
+        dag_path = pipeline_dag_path(dataset_id, _pipeline_id)
+        print_airflow_variables(dataset_id, dag_path.read_text(), env)
+
+
+def main_all_datasets(
+    dataset_glob: str,
+    env: str,
+    skip_builds: bool = False,
+    async_builds: bool = False,
+    format_code: bool = True,
+    force: bool = False,
+    max_workers: typing.Optional[int] = None,
+) -> typing.Dict[str, str]:
+    dataset_ids = list_datasets(dataset_glob)
+
+    # compile the templates before the pool forks so every worker shares them
+    for name in TEMPLATE_PATHS:
+        load_template(name)
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(
+                generate_dataset_dags,
+                dataset_id,
+                env,
+                skip_builds,
+                async_builds,
+                format_code,
+                force,
+            )
+            for dataset_id in dataset_ids
+        ]
+        results = [future.result() for future in futures]
+
+    return print_report(results)
+
+
+def generate_dataset_dags(
+    dataset_id: str,
+    env: str,
+    skip_builds: bool,
+    async_builds: bool,
+    format_code: bool,
+    force: bool,
+) -> typing.Tuple[str, str, str]:
+    output = io.StringIO()
+    error = ""
+    with contextlib.redirect_stdout(output):
+        try:
+            main(
+                dataset_id,
+                None,
+                env,
+                all_pipelines=True,
+                skip_builds=skip_builds,
+                async_builds=async_builds,
+                format_code=format_code,
+                force=force,
+            )
+        except Exception:
+            error = traceback.format_exc()
+    return dataset_id, output.getvalue(), error
+
+
+def list_datasets(dataset_glob: str = "*") -> typing.List[str]:
+    return sorted(
+        dataset_dir.name
+        for dataset_dir in list_subdirs(DATASETS_PATH)
+        if fnmatch.fnmatch(dataset_dir.name, dataset_glob)
+        and (dataset_dir / "pipelines").is_dir()
+    )
+
+
+def print_report(
+    results: typing.List[typing.Tuple[str, str, str]]
+) -> typing.Dict[str, str]:
+    errors = {}
+    for dataset_id, output, error in results:
+        print(f"\n===== {dataset_id} =====")
+        print(output, end="")
+        if error:
+            print(error, end="")
+            errors[dataset_id] = error
+
+    print(
+        f"\nGenerated DAGs for {len(results) - len(errors)} of {len(results)} datasets"
+    )
+    if errors:
+        print("\nThe following datasets failed:\n")
+        for dataset_id, error in errors.items():
+            print(f"  - {dataset_id}: {error.strip().splitlines()[-1]}")
+        print()
+    return errors
 
 
 def generate_pipeline_dag(
-    dataset_id: str, pipeline_id: str, env: str, format_code: bool
-):
-    CustomYAMLTags(dataset_id)
+    dataset_id: str, pipeline_id: str, format_code: bool, manifest: dict
+) -> typing.Optional[pathlib.Path]:
     pipeline_dir = DATASETS_PATH / dataset_id / "pipelines" / pipeline_id
-    config = yaml.load((pipeline_dir / "pipeline.yaml").read_text(), Loader=yaml.Loader)
+    pipeline_yaml = (pipeline_dir / "pipeline.yaml").read_text()
+    dag_path = pipeline_dag_path(dataset_id, pipeline_id)
+
+    manifest_key = f"{dataset_id}/{pipeline_id}"
+    source_hash = pipeline_source_hash(dataset_id, pipeline_yaml, format_code)
+    if dag_is_up_to_date(manifest.get(manifest_key), source_hash, dag_path):
+        print(f"Skipping {manifest_key}: pipeline.yaml is unchanged")
+        return None
+
+    CustomYAMLTags(dataset_id)
+    config = yaml.load(pipeline_yaml, Loader=yaml.Loader)
     validate_airflow_version_existence_and_value(config)
     validate_dag_id_existence_and_format(config)
     dag_contents = generate_dag(config, dataset_id)
 
-    dag_path = pipeline_dir / f"{pipeline_id}_dag.py"
     dag_path.touch()
     write_to_file(dag_contents, dag_path)
 
-    if format_code:
-        format_python_code(dag_path)
+    manifest[manifest_key] = {"source_hash": source_hash}
+    return dag_path
+
 
-    copy_files_to_dot_dir(
-        dataset_id,
-        pipeline_id,
-        PROJECT_ROOT / f".{env}",
+def pipeline_dag_path(dataset_id: str, pipeline_id: str) -> pathlib.Path:
+    return (
+        DATASETS_PATH / dataset_id / "pipelines" / pipeline_id / f"{pipeline_id}_dag.py"
     )
 
-    print_airflow_variables(dataset_id, dag_contents, env)
+
+def pipeline_source_hash(dataset_id: str, pipeline_yaml: str, format_code: bool) -> str:
+    md5 = hashlib.md5(generator_fingerprint().encode())
+    md5.update(f"{dataset_id}:{format_code}:".encode())
+    md5.update(pipeline_yaml.encode())
+    return md5.hexdigest()
+
+
+@functools.lru_cache()
+def generator_fingerprint() -> str:
+    """Hash of everything besides pipeline.yaml that affects the generated DAG"""
+    md5 = hashlib.md5()
+    for path in (
+        *sorted(TEMPLATE_PATHS.values()),
+        CURRENT_PATH / "dag_imports.json",
+        pathlib.Path(__file__).resolve(),
+    ):
+        md5.update(path.read_bytes())
+    return md5.hexdigest()
+
+
+def dag_is_up_to_date(
+    manifest_entry: typing.Optional[dict], source_hash: str, dag_path: pathlib.Path
+) -> bool:
+    if not manifest_entry or manifest_entry["source_hash"] != source_hash:
+        return False
+    # regenerate DAGs that were edited or deleted by hand since the last run
+    return dag_path.exists() and file_md5(dag_path) == manifest_entry.get("dag_hash")
+
+
+def file_md5(file_path: pathlib.Path) -> str:
+    return hashlib.md5(file_path.read_bytes()).hexdigest()
+
+
+def read_dag_manifest(manifest_path: pathlib.Path) -> dict:
+    if not manifest_path.exists():
+        return {}
+    return json.loads(manifest_path.read_text())
+
+
+def write_dag_manifest(manifest_path: pathlib.Path, manifest: dict):
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    manifest_path.write_text(json.dumps(manifest, indent=2, sort_keys=True))
 
 
 def generate_dag(config: dict, dataset_id: str) -> str:
-    return jinja2.Template(TEMPLATE_PATHS["dag"].read_text()).render(
+    return load_template("dag").render(
         package_imports=generate_package_imports(config),
         default_args=generate_default_args(config),
         dag_context=generate_dag_context(config, dataset_id),
@@ -114,14 +298,14 @@ def generate_tasks(config: dict) -> list:
 
 
 def generate_default_args(config: dict) -> str:
-    return jinja2.Template(TEMPLATE_PATHS["default_args"].read_text()).render(
+    return load_template("default_args").render(
         default_args=dag_init(config)["default_args"]
     )
 
 
 def generate_dag_context(config: dict, dataset_id: str) -> str:
     dag_params = dag_init(config)
-    return jinja2.Template(TEMPLATE_PATHS["dag_context"].read_text()).render(
+    return load_template("dag_context").render(
         dag_init=dag_params,
         namespaced_dag_id=namespaced_dag_id(dag_params["dag_id"], dataset_id),
     )
@@ -129,12 +313,16 @@ def generate_dag_context(config: dict, dataset_id: str) -> str:
 
 def generate_task_contents(task: dict, airflow_version: str) -> str:
     validate_task(task, airflow_version)
-    return jinja2.Template(TEMPLATE_PATHS["task"].read_text()).render(
+    return load_template("task").render(
         **task,
         namespaced_operator=AIRFLOW_IMPORTS[airflow_version][task["operator"]]["class"],
     )
 
 
+def load_template(name: str) -> jinja2.Template:
+    return TEMPLATE_ENV.get_template(TEMPLATE_PATHS[name].name)
+
+
 def dag_init(config: dict) -> dict:
     return config["dag"].get("initialize") or config["dag"].get("init")
 
@@ -192,11 +380,15 @@ def write_to_file(contents: str, filepath: pathlib.Path):
         file_.write(license_header + contents.replace(license_header, ""))
 
 
-def format_python_code(target_file: pathlib.Path):
-    subprocess.Popen(
-        f"black -q {target_file}", stdout=subprocess.PIPE, shell=True
-    ).wait()
-    subprocess.check_call(["isort", "--profile", "black", "."], cwd=PROJECT_ROOT)
+def format_python_code(target_files: typing.List[pathlib.Path]):
+    import black
+    import isort
+
+    black_mode = black.FileMode()
+    for target_file in target_files:
+        contents = black.format_str(target_file.read_text(), mode=black_mode)
+        contents = isort.code(contents, profile="black", file_path=target_file)
+        target_file.write_text(contents)
 
 
 def print_airflow_variables(dataset_id: str, dag_contents: str, env: str):
@@ -272,6 +464,8 @@ def build_and_push_image(
 
 
 def gcp_project_id() -> str:
+    import google.auth
+
     _, project_id = google.auth.default()
     return project_id
 
@@ -294,7 +488,6 @@ if __name__ == "__main__":
     parser.add_argument(
         "-d",
         "--dataset",
-        required=True,
         type=str,
         dest="dataset",
         help="The directory name of the dataset.",
@@ -317,15 +510,56 @@ if __name__ == "__main__":
     parser.add_argument(
         "--all-pipelines", required=False, dest="all_pipelines", action="store_true"
     )
+    parser.add_argument(
+        "--all-datasets",
+        required=False,
+        dest="all_datasets",
+        action="store_true",
+        help="Generate DAGs for all pipelines of every dataset, in parallel",
+    )
+    parser.add_argument(
+        "--dataset-filter",
+        type=str,
+        default="*",
+        dest="dataset_filter",
+        help="Glob pattern that limits the datasets used by --all-datasets",
+    )
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        dest="max_workers",
+        help="Number of datasets processed concurrently by --all-datasets",
+    )
     parser.add_argument(
         "--skip-builds", required=False, dest="skip_builds", action="store_true"
     )
     parser.add_argument(
         "--async-builds", required=False, dest="async_builds", action="store_false"
     )
+    parser.add_argument(
+        "--force",
+        required=False,
+        dest="force",
+        action="store_true",
+        help="Regenerate DAGs even if their pipeline.yaml files are unchanged",
+    )
 
     args = parser.parse_args()
 
+    if args.all_datasets:
+        errors = main_all_datasets(
+            args.dataset_filter,
+            args.env,
+            args.skip_builds,
+            args.async_builds,
+            force=args.force,
+            max_workers=args.max_workers,
+        )
+        sys.exit(1 if errors else 0)
+
+    if not args.dataset:
+        parser.error("either -d/--dataset or --all-datasets is required")
+
     main(
         args.dataset,
         args.pipeline,
@@ -333,4 +567,5 @@ if __name__ == "__main__":
         args.all_pipelines,
         args.skip_builds,
         args.async_builds,
+        force=args.force,
     )
@@ -14,8 +14,14 @@
 
 
 import argparse
+import concurrent.futures
+import contextlib
+import fnmatch
+import io
 import pathlib
 import subprocess
+import sys
+import traceback
 import typing
 
 import jinja2
@@ -37,6 +43,11 @@ TEMPLATE_PATHS = {
     "backend": TEMPLATES_PATH / "backend.tf.jinja2",
 }
 
+TEMPLATE_ENV = jinja2.Environment(
+    loader=jinja2.FileSystemLoader(str(TEMPLATES_PATH)),
+    bytecode_cache=jinja2.FileSystemBytecodeCache(),
+)
+
 yaml = yaml.YAML(typ="safe")
 
 
@@ -89,6 +100,91 @@ def main(
         actuate_terraform_resources(dataset_id, env_path)
 
 
+def main_all_datasets(
+    dataset_glob: str,
+    project_id: str,
+    bucket_name_prefix: str,
+    region: str,
+    impersonating_acct: str,
+    env: str,
+    tf_state_bucket: str,
+    tf_state_prefix: str,
+    format_code: bool = True,
+    max_workers: typing.Optional[int] = None,
+) -> typing.Dict[str, str]:
+    validate_bucket_name(bucket_name_prefix)
+    dataset_ids = list_datasets(dataset_glob)
+
+    # compile the templates before the pool forks so every worker shares them
+    for template_path in TEMPLATE_PATHS.values():
+        load_template(template_path)
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(
+                generate_dataset_tf_files,
+                dataset_id,
+                project_id,
+                bucket_name_prefix,
+                region,
+                impersonating_acct,
+                env,
+                tf_state_bucket,
+                tf_state_prefix,
+                tf_apply=False,
+                format_code=format_code,
+            )
+            for dataset_id in dataset_ids
+        ]
+        results = [future.result() for future in futures]
+
+    return print_report(results)
+
+
+def generate_dataset_tf_files(
+    dataset_id: str, *args, **kwargs
+) -> typing.Tuple[str, str, str]:
+    output = io.StringIO()
+    error = ""
+    with contextlib.redirect_stdout(output):
+        try:
+            main(dataset_id, *args, **kwargs)
+        except Exception:
+            error = traceback.format_exc()
+    return dataset_id, output.getvalue(), error
+
+
+def list_datasets(dataset_glob: str = "*") -> typing.List[str]:
+    return sorted(
+        dataset_dir.name
+        for dataset_dir in list_subdirs(DATASETS_PATH)
+        if fnmatch.fnmatch(dataset_dir.name, dataset_glob)
+        and (dataset_dir / "pipelines" / "dataset.yaml").exists()
+    )
+
+
+def print_report(
+    results: typing.List[typing.Tuple[str, str, str]]
+) -> typing.Dict[str, str]:
+    errors = {}
+    for dataset_id, output, error in results:
+        print(f"\n===== {dataset_id} =====")
+        print(output, end="")
+        if error:
+            print(error, end="")
+            errors[dataset_id] = error
+
+    print(
+        f"\nGenerated Terraform files for {len(results) - len(errors)} of {len(results)} datasets"
+    )
+    if errors:
+        print("\nThe following datasets failed:\n")
+        for dataset_id, error in errors.items():
+            print(f"  - {dataset_id}: {error.strip().splitlines()[-1]}")
+        print()
+    return errors
+
+
 def load_env_vars(dataset_id: str, env: str) -> dict:
     env_vars_file = PROJECT_ROOT / "datasets" / dataset_id / f".vars.{env}.yaml"
     return yaml.load(open(env_vars_file)) if env_vars_file.exists() else {}
@@ -348,9 +444,14 @@ def actuate_terraform_resources(dataset_id: str, env_path: pathlib.Path):
     subprocess.check_call(["terraform", "apply"], cwd=cwd)
 
 
+def load_template(template: pathlib.Path) -> jinja2.Template:
+    return TEMPLATE_ENV.get_template(
+        pathlib.Path(template).relative_to(TEMPLATES_PATH).as_posix()
+    )
+
+
 def apply_substitutions_to_template(template: pathlib.Path, subs: dict) -> str:
-    j2_template = jinja2.Template(pathlib.Path(template).read_text())
-    return j2_template.render(**subs)
+    return load_template(template).render(**subs)
 
 
 if __name__ == "__main__":
@@ -360,11 +461,30 @@ if __name__ == "__main__":
     parser.add_argument(
         "-d",
         "--dataset",
-        required=True,
         type=str,
         dest="dataset",
         help="The directory name of the dataset",
     )
+    parser.add_argument(
+        "--all-datasets",
+        required=False,
+        dest="all_datasets",
+        action="store_true",
+        help="Generate Terraform files for every dataset, in parallel",
+    )
+    parser.add_argument(
+        "--dataset-filter",
+        type=str,
+        default="*",
+        dest="dataset_filter",
+        help="Glob pattern that limits the datasets used by --all-datasets",
+    )
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        dest="max_workers",
+        help="Number of datasets processed concurrently by --all-datasets",
+    )
     parser.add_argument(
         "--gcp-project-id",
         type=str,
@@ -418,6 +538,26 @@ if __name__ == "__main__":
 
     # Usage: python scripts/generate_terraform.py -d covid19_staging -i sa@projectiam.gserviceaccount.com
     args = parser.parse_args()
+
+    if args.all_datasets:
+        if args.tf_apply:
+            parser.error("--tf-apply cannot be used with --all-datasets")
+        errors = main_all_datasets(
+            args.dataset_filter,
+            args.project_id,
+            args.bucket_name_prefix,
+            args.region,
+            args.impersonating_acct,
+            args.env,
+            args.tf_state_bucket,
+            args.tf_state_prefix,
+            max_workers=args.max_workers,
+        )
+        sys.exit(1 if errors else 0)
+
+    if not args.dataset:
+        parser.error("either -d/--dataset or --all-datasets is required")
+
     main(
         args.dataset,
         args.project_id,
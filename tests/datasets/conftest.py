@@ -0,0 +1,73 @@
+# Copyright 2022 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import importlib.util
+import pathlib
+
+import pytest
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parent.parent.parent
+DATASETS_PATH = PROJECT_ROOT / "datasets"
+
+IMAGE_DEPENDENCIES = {
+    "chicago_crime": ["pandas", "requests", "google.cloud.storage"],
+    "noaa": [
+        "bs4",
+        "pandas",
+        "dateutil.relativedelta",
+        "geopandas",
+        "google.cloud.bigquery",
+        "google.cloud.storage",
+        "pyarrow",
+        "requests",
+        "sh",
+        "zstandard",
+    ],
+    "san_francisco": ["pandas", "pyarrow", "requests", "google.cloud.storage"],
+}
+
+
+def load_image_module(dataset_id: str):
+    for dependency in IMAGE_DEPENDENCIES[dataset_id]:
+        pytest.importorskip(dependency)
+    module_path = (
+        DATASETS_PATH
+        / dataset_id
+        / "pipelines"
+        / "_images"
+        / "run_csv_transform_kub"
+        / "csv_transform.py"
+    )
+    spec = importlib.util.spec_from_file_location(
+        f"{dataset_id}_csv_transform", module_path
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="module")
+def chicago_crime():
+    return load_image_module("chicago_crime")
+
+
+@pytest.fixture(scope="module")
+def noaa():
+    return load_image_module("noaa")
+
+
+@pytest.fixture(scope="module")
+def san_francisco():
+    return load_image_module("san_francisco")
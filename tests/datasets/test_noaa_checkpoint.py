@@ -0,0 +1,155 @@
+# Copyright 2022 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import io
+import json
+import pathlib
+
+import pytest
+
+SOURCE_URL = {"noaa_gsod_by_year": "https://example.com/access/"}
+STATION_URL = "https://example.com/access/2026/01001099999.csv"
+
+LISTING_HTML = b"""
+<table>
+  <tr><th>Name</th><th>Last modified</th><th>Size</th></tr>
+  <tr><td><a href="../">Parent Directory</a></td><td></td><td>-</td></tr>
+  <tr>
+    <td><a href="01001099999.csv">01001099999.csv</a></td>
+    <td align="right">2026-10-17 06:02  </td>
+    <td align="right">45K</td>
+  </tr>
+</table>
+"""
+
+
+@pytest.fixture
+def gsod(noaa, monkeypatch, tmp_path: pathlib.Path):
+    monkeypatch.setattr(noaa, "LOADED_MANIFESTS", {})
+    downloads = []
+    monkeypatch.setattr(
+        noaa,
+        "download_files_http_combined",
+        lambda source_urls, target_file, **kwargs: downloads.append(source_urls),
+    )
+    listing = {STATION_URL: "2026-10-17 06:02 45K"}
+    monkeypatch.setattr(
+        noaa, "url_directory_entries", lambda source_url_path, file_pattern: listing
+    )
+    manifest_path = str(tmp_path / "checkpoint_manifest.json")
+
+    def download_year() -> dict:
+        return noaa.download_gsod_year(
+            year_to_process=2026,
+            source_url=SOURCE_URL,
+            pipeline_name="NOAA GSOD By Year",
+            source_file=str(tmp_path / "data_gsod_.csv"),
+            manifest_path=manifest_path,
+        )
+
+    return download_year, listing, downloads, manifest_path
+
+
+def test_gsod_year_is_skipped_while_listing_is_unchanged(noaa, gsod):
+    download_year, _, downloads, manifest_path = gsod
+    downloaded = download_year()
+    noaa.record_unit(
+        manifest_path, downloaded["source_url"], downloaded["content_hash"]
+    )
+
+    assert download_year() is None
+    assert len(downloads) == 1
+
+
+def test_gsod_year_is_reloaded_when_a_station_file_grows(noaa, gsod):
+    download_year, listing, downloads, manifest_path = gsod
+    downloaded = download_year()
+    noaa.record_unit(
+        manifest_path, downloaded["source_url"], downloaded["content_hash"]
+    )
+
+    # same file names, but a day's observations were appended to the station
+    listing[STATION_URL] = "2026-10-18 06:01 46K"
+    reloaded = download_year()
+
+    assert reloaded is not None
+    assert reloaded["content_hash"] != downloaded["content_hash"]
+    assert len(downloads) == 2
+
+
+def test_gsod_year_without_listing_details_is_never_skipped(noaa, gsod):
+    download_year, listing, downloads, manifest_path = gsod
+    listing[STATION_URL] = ""
+    downloaded = download_year()
+    noaa.record_unit(manifest_path, downloaded["source_url"], "")
+
+    assert downloaded["content_hash"] == ""
+    assert download_year() is not None
+    assert len(downloads) == 2
+
+
+def test_url_directory_entries_keeps_last_modified_and_size(noaa, monkeypatch):
+    pytest.importorskip("bs4")
+    monkeypatch.setattr(noaa, "urlopen", lambda request: io.BytesIO(LISTING_HTML))
+
+    entries = noaa.url_directory_entries(
+        "https://example.com/access/2026/", file_pattern=".csv"
+    )
+
+    assert entries == {STATION_URL: "2026-10-17 06:02 45K"}
+
+
+class FakeManifestBlob:
+    def __init__(self, concurrent_unit: dict):
+        self.contents = "{}"
+        self.generation = 1
+        self.concurrent_unit = concurrent_unit
+
+    def download_as_text(self) -> str:
+        return self.contents
+
+    def upload_from_string(self, contents, content_type, if_generation_match):
+        if self.concurrent_unit:
+            # another task records its unit between our read and our write
+            manifest = json.loads(self.contents)
+            manifest.update(self.concurrent_unit)
+            self.contents = json.dumps(manifest)
+            self.generation += 1
+            self.concurrent_unit = {}
+        if if_generation_match != self.generation:
+            raise PreconditionFailedError("generation mismatch")
+        self.contents = contents
+        self.generation += 1
+
+
+class PreconditionFailedError(Exception):
+    pass
+
+
+def test_record_unit_keeps_units_recorded_concurrently(noaa, monkeypatch, mocker):
+    blob = FakeManifestBlob({"other_unit": {"content_hash": "abc"}})
+    client = mocker.MagicMock()
+    client.bucket.return_value.blob.return_value = blob
+    monkeypatch.setattr(noaa, "gcs_client", lambda: client)
+    monkeypatch.setattr(noaa, "PreconditionFailed", PreconditionFailedError)
+    monkeypatch.setattr(noaa, "LOADED_MANIFESTS", {})
+
+    noaa.record_unit("gs://bucket/manifest.json", "this_unit", "def")
+
+    manifest = json.loads(blob.contents)
+    assert manifest["other_unit"] == {"content_hash": "abc"}
+    assert manifest["this_unit"]["content_hash"] == "def"
+    assert noaa.unit_completed("gs://bucket/manifest.json", "this_unit", "def")
+    assert client.bucket.return_value.blob.call_count == 4
@@ -0,0 +1,57 @@
+# Copyright 2022 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import collections
+import pathlib
+
+
+def prepare_period(period: int, downloaded: str) -> str:
+    return downloaded
+
+
+def test_download_cache_stats_count_every_parallel_period(
+    noaa, monkeypatch, tmp_path: pathlib.Path
+):
+    monkeypatch.setattr(noaa, "DOWNLOAD_CACHE_STATS", collections.Counter())
+    download_cache = str(tmp_path / "download_cache")
+    periods = list(range(12))
+
+    def download_period(period: int) -> str:
+        source_url = f"https://example.com/{period}.csv"
+        source_file = tmp_path / f"{period}.csv"
+        source_file.write_text(f"{period}\n")
+        noaa.store_cached_download(
+            download_cache, source_url, str(source_file), {"etag": str(period)}
+        )
+        entry = noaa.read_manifest(
+            noaa.download_cache_entry_path(download_cache, source_url)
+        )
+        noaa.restore_cached_download(
+            download_cache, source_url, entry, str(source_file)
+        )
+        return str(source_file)
+
+    loaded = []
+    noaa.run_periods(
+        periods,
+        download_period,
+        prepare_period,
+        lambda period, prepared: prepared,
+        lambda period, uploaded: loaded.append(period),
+        max_parallel_periods=4,
+    )
+
+    assert sorted(loaded) == periods
+    assert noaa.DOWNLOAD_CACHE_STATS == {"hits": 12, "misses": 12}
@@ -0,0 +1,65 @@
+# Copyright 2022 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Years processed in parallel are uploaded while earlier years are still being
+# loaded from GCS, so no two years may share an object.
+
+import pathlib
+
+
+def test_gsod_years_upload_to_their_own_objects(noaa, tmp_path: pathlib.Path):
+    source_file = tmp_path / "data_gsod_.csv"
+    gcs_paths = []
+    for year in (2025, 2026):
+        source_file.write_text('"STATION","DATE"\n"01001099999","2026-01-01"\n')
+        prepared = noaa.prepare_gsod_year(
+            year,
+            {"source_file": str(source_file), "source_url": "", "content_hash": ""},
+            target_file=str(tmp_path / "data_output_gsod_.csv"),
+            destination_table="gsod",
+            target_gcs_path="data/noaa/gsod_by_year/data_output.csv",
+            number_of_header_rows=1,
+            process_file=lambda **kwargs: None,
+        )
+        gcs_paths.append(prepared["target_gcs_path"])
+
+    assert gcs_paths == [
+        "data/noaa/gsod_by_year/data_output_2025.csv",
+        "data/noaa/gsod_by_year/data_output_2026.csv",
+    ]
+
+
+def test_storms_years_upload_to_their_own_objects(noaa, monkeypatch):
+    gcs_paths = []
+    monkeypatch.setattr(
+        noaa,
+        "upload_file_to_gcs",
+        lambda file_path, target_gcs_bucket, target_gcs_path: gcs_paths.append(
+            target_gcs_path
+        ),
+    )
+
+    for year in (2025, 2026):
+        noaa.upload_storms_year(
+            year,
+            f"files/data_output_storms_database_{year}.parquet",
+            target_gcs_bucket="bucket",
+            target_gcs_path="data/noaa/storms_db/data_output.csv",
+            output_format="parquet",
+        )
+
+    assert gcs_paths == [
+        "data/noaa/storms_db/data_output_2025.parquet",
+        "data/noaa/storms_db/data_output_2026.parquet",
+    ]
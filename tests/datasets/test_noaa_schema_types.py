@@ -0,0 +1,43 @@
+# Copyright 2022 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import types
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+
+def test_boolean_strings_are_converted_for_parquet(noaa):
+    df = pd.DataFrame(
+        {"flag": ["true", "False", "", "1", "0", " T ", "nan", "maybe", None]},
+        dtype=object,
+    )
+    schema = [types.SimpleNamespace(name="flag", field_type="BOOLEAN")]
+
+    df = noaa.convert_to_schema_types(df, schema)
+
+    assert str(df["flag"].dtype) == "boolean"
+    assert df["flag"].tolist() == [
+        True,
+        False,
+        pd.NA,
+        True,
+        False,
+        True,
+        pd.NA,
+        pd.NA,
+        pd.NA,
+    ]
@@ -0,0 +1,301 @@
+# Copyright 2022 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Parity checks between the column-wise transform helpers in the noaa,
+# san_francisco and chicago_crime images and the per-row implementations they
+# replaced. The old implementations are kept below verbatim as the reference.
+
+import datetime
+import math
+import typing
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+
+# Per-row reference implementations
+
+
+def old_resolve_nan(input: typing.Union[str, float]) -> str:
+    if not input or (math.isnan(input)):
+        return ""
+    return str(input).replace("None", "")
+
+
+def old_convert_to_integer_string(input: typing.Union[str, float]) -> str:
+    str_val = ""
+    if not input or (math.isnan(input)):
+        str_val = ""
+    else:
+        str_val = str(int(round(input, 0)))
+    return str_val
+
+
+def old_chicago_convert_dt_format(dt_str: str) -> str:
+    if not dt_str:
+        return dt_str
+    else:
+        return datetime.datetime.strptime(dt_str, "%m/%d/%Y %H:%M:%S %p").strftime(
+            "%Y-%m-%d %H:%M:%S"
+        )
+
+
+def old_noaa_convert_dt_format(
+    dt_str: str, from_format: str = "%Y%m%d", to_format: str = "%Y-%m-%d"
+) -> str:
+    if not dt_str or dt_str.lower() == "nan":
+        return dt_str
+    else:
+        return str(datetime.datetime.strptime(dt_str, from_format).strftime(to_format))
+
+
+def old_san_francisco_convert_dt_format(
+    dt_str: str, from_format: str = '"%Y-%m-%d %H:%M:%S"'
+) -> str:
+    if not dt_str or str(dt_str).lower() == "nan" or str(dt_str).lower() == "nat":
+        return ""
+    else:
+        if from_format.find(" ") > 0:
+            # Date and Time
+            return str(
+                datetime.datetime.strftime(
+                    pd.to_datetime(
+                        (dt_str if from_format[-2:] == "%p" else dt_str[:19]),
+                        format=f"{from_format}",
+                        errors="ignore",
+                    ),
+                    "%Y-%m-%d %H:%M:%S",
+                )
+            )
+        else:
+            # Date Only
+            return str(
+                datetime.datetime.strftime(
+                    pd.to_datetime(
+                        dt_str[:10],
+                        format=f"{from_format}",
+                        errors="ignore",
+                    ),
+                    "%Y-%m-%d",
+                )
+            )
+
+
+def old_create_geometry_columns(long: float, lat: float) -> str:
+    return f"POINT({str(long)} {str(lat)})".replace("POINT( )", "")
+
+
+def old_create_spc_timestamp(df: pd.DataFrame) -> pd.DataFrame:
+    df["time"] = df["time"].apply(lambda x: str.zfill(x, 4))
+    df["month"] = df["month"].apply(lambda x: str.zfill(x, 2))
+    df["day"] = df["day"].apply(lambda x: str.zfill(x, 2))
+    df["timestamp"] = df.apply(
+        lambda x: f"{x.year}-{x.month}-{x.day} {x.time}00", axis=1
+    )
+    return df
+
+
+def old_split_gsod_columns(df: pd.DataFrame) -> pd.DataFrame:
+    df["stn"] = df["STATION"].apply(lambda x: "" if x == "" else x[0:6])
+    df["wban"] = df["STATION"].apply(lambda x: "" if x == "" else x[6:11])
+    df["year"] = df["DATE"].apply(lambda x: "" if x == "" else x[0:4])
+    df["mo"] = df["DATE"].apply(lambda x: "" if x == "" else x[5:7])
+    df["da"] = df["DATE"].apply(lambda x: "" if x == "" else x[8:10])
+    df["fog"] = df["FRSHTT"].apply(lambda x: "" if x == "" else x[0:1])
+    df["rain_drizzle"] = df["FRSHTT"].apply(lambda x: "" if x == "" else x[1:2])
+    df["snow_ice_pellets"] = df["FRSHTT"].apply(lambda x: "" if x == "" else x[2:3])
+    df["hail"] = df["FRSHTT"].apply(lambda x: "" if x == "" else x[3:4])
+    df["thunder"] = df["FRSHTT"].apply(lambda x: "" if x == "" else x[4:5])
+    df["tornado_funnel_cloud"] = df["FRSHTT"].apply(lambda x: "" if x == "" else x[5:6])
+    return df
+
+
+def as_csv(values) -> str:
+    if isinstance(values, pd.Series):
+        values = values.to_frame()
+    return values.reset_index(drop=True).to_csv(index=False)
+
+
+def assert_same_output(new_values, old_values) -> None:
+    assert as_csv(new_values) == as_csv(old_values)
+
+
+# Fixtures
+
+NUMERIC_VALUES = [
+    1.0,
+    2.5,
+    3.5,
+    -2.5,
+    -7.4,
+    0.0,
+    float("nan"),
+    None,
+    12345678901.0,
+    1e20,
+    -(2.0**63),
+    2.0**63,
+]
+
+CHICAGO_DATES = [
+    "01/15/2020 01:30:00 PM",
+    "12/31/1999 11:59:59 AM",
+    "",
+    None,
+    "02/29/2020 12:00:00 AM",
+    "01/01/2300 01:00:00 PM",
+]
+
+NOAA_DATES = ["20200115", "19991231", "", "nan", "NaN", "20200229", "23000101"]
+
+
+def test_convert_to_integer_string_matches_per_row_version(chicago_crime, noaa):
+    values = pd.Series(NUMERIC_VALUES, dtype=float)
+    expected = values.apply(old_convert_to_integer_string)
+
+    assert_same_output(chicago_crime.convert_to_integer_string(values), expected)
+    assert_same_output(noaa.convert_to_integer_string(values), expected)
+
+
+@pytest.mark.parametrize("value", [float("inf"), float("-inf")])
+def test_convert_to_integer_string_raises_on_infinity_like_per_row_version(
+    chicago_crime, noaa, value
+):
+    values = pd.Series([1.0, value])
+
+    with pytest.raises(OverflowError):
+        values.apply(old_convert_to_integer_string)
+    with pytest.raises(OverflowError):
+        chicago_crime.convert_to_integer_string(values)
+    with pytest.raises(OverflowError):
+        noaa.convert_to_integer_string(values)
+
+
+def test_resolve_nan_matches_per_row_version(chicago_crime):
+    values = pd.Series(NUMERIC_VALUES, dtype=float)
+
+    assert_same_output(chicago_crime.resolve_nan(values), values.apply(old_resolve_nan))
+
+
+def test_chicago_convert_dt_format_matches_per_row_version(chicago_crime):
+    values = pd.Series(CHICAGO_DATES, dtype=object)
+
+    assert_same_output(
+        chicago_crime.convert_dt_format(values),
+        values.apply(old_chicago_convert_dt_format),
+    )
+
+
+@pytest.mark.parametrize(
+    "value", ["2020-01-15 01:30:00", "13/45/2020 01:00:00 PM", "not a date"]
+)
+def test_chicago_convert_dt_format_rejects_malformed_dates(chicago_crime, value):
+    values = pd.Series(["01/15/2020 01:30:00 PM", value], dtype=object)
+
+    with pytest.raises(ValueError):
+        values.apply(old_chicago_convert_dt_format)
+    with pytest.raises(ValueError):
+        chicago_crime.convert_dt_format(values)
+
+
+def test_noaa_convert_dt_format_matches_per_row_version(noaa):
+    values = pd.Series(NOAA_DATES, dtype=object)
+
+    assert_same_output(
+        noaa.convert_dt_format(values, "%Y%m%d", "%Y-%m-%d"),
+        values.apply(old_noaa_convert_dt_format, args=("%Y%m%d", "%Y-%m-%d")),
+    )
+
+
+@pytest.mark.parametrize("value", ["20201301", "2020-01-15", "garbage"])
+def test_noaa_convert_dt_format_rejects_malformed_dates(noaa, value):
+    values = pd.Series(["20200115", value], dtype=object)
+
+    with pytest.raises(ValueError):
+        values.apply(old_noaa_convert_dt_format)
+    with pytest.raises(ValueError):
+        noaa.convert_dt_format(values)
+
+
+@pytest.mark.parametrize(
+    "from_format, values",
+    [
+        (
+            "%Y-%m-%d %H:%M:%S",
+            ["2020-01-15 01:30:00.000", "1999-12-31 23:59:59", "", "nan", "NaT"],
+        ),
+        (
+            "%m/%d/%Y %I:%M:%S %p",
+            ["01/15/2020 01:30:00 PM", "12/31/1999 11:59:59 AM", "", "NaN"],
+        ),
+        ("%Y-%m-%d", ["2020-01-15T00:00:00", "1999-12-31", "", "nan"]),
+    ],
+)
+def test_san_francisco_convert_dt_format_matches_per_row_version(
+    san_francisco, from_format, values
+):
+    values = pd.Series(values + [None], dtype=object)
+
+    assert_same_output(
+        san_francisco.convert_dt_format(values, from_format),
+        values.apply(old_san_francisco_convert_dt_format, args=(from_format,)),
+    )
+
+
+def test_san_francisco_create_geometry_columns_matches_per_row_version(
+    san_francisco,
+):
+    df = pd.DataFrame(
+        {
+            "long": ["-122.41", "", "-122.5", None, "abc"],
+            "lat": ["37.77", "", float("nan"), None, ""],
+        }
+    )
+    expected = df.apply(
+        lambda x: old_create_geometry_columns(x["long"], x["lat"]), axis=1
+    )
+
+    assert_same_output(
+        san_francisco.create_geometry_columns(df["long"], df["lat"]), expected
+    )
+
+
+def test_noaa_create_spc_timestamp_matches_per_row_version(noaa):
+    df = pd.DataFrame(
+        {
+            "year": ["2020", "1999", "2021", ""],
+            "month": ["1", "12", "07", ""],
+            "day": ["5", "31", "", "1"],
+            "time": ["930", "2359", "5", ""],
+        }
+    )
+
+    assert_same_output(
+        noaa.create_spc_timestamp(df.copy()), old_create_spc_timestamp(df.copy())
+    )
+
+
+def test_noaa_split_gsod_columns_matches_per_row_version(noaa):
+    df = pd.DataFrame(
+        {
+            "STATION": ["01001099999", "72250012919", "", "0100"],
+            "DATE": ["2020-01-15", "1999-12-31", "", "2020"],
+            "FRSHTT": ["010010", "111111", "", "01"],
+        }
+    )
+
+    assert_same_output(
+        noaa.split_gsod_columns(df.copy()), old_split_gsod_columns(df.copy())
+    )
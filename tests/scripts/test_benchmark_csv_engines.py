@@ -0,0 +1,48 @@
+# Copyright 2022 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import pathlib
+
+import pytest
+
+from scripts import benchmark_csv_engines
+
+
+@pytest.fixture
+def csv_file(tmp_path: pathlib.Path) -> pathlib.Path:
+    source_file = tmp_path / "sample.csv"
+    lines = ["id|name|comment"]
+    for i in range(250):
+        lines.append(f'{i}|name {i}|"multi\nline | {i}"')
+    source_file.write_text("\n".join(lines) + "\n")
+    return source_file
+
+
+def test_all_engines_read_the_same_number_of_rows(csv_file: pathlib.Path):
+    results = benchmark_csv_engines.benchmark_file(csv_file, chunksize=100, sep="|")
+
+    assert set(results.keys()) == set(benchmark_csv_engines.ENGINES)
+    for rows, seconds in results.values():
+        assert rows == 250
+        assert seconds >= 0
+
+
+def test_main_prints_a_row_per_file_and_engine(csv_file: pathlib.Path, capsys):
+    benchmark_csv_engines.main([csv_file], chunksize=100, sep="|", repeat=1)
+
+    output = capsys.readouterr().out
+    assert "sample.csv" in output
+    for engine in benchmark_csv_engines.ENGINES:
+        assert f" {engine} " in output
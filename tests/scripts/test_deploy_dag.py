@@ -13,6 +13,8 @@
 # limitations under the License.
 
 
+import base64
+import hashlib
 import json
 import pathlib
 import shutil
@@ -817,3 +819,243 @@ def test_script_without_composer_env_or_region_fails(env: str):
             ],
             cwd=deploy_dag.PROJECT_ROOT,
         )
+
+
+def test_composer_bucket_files_maps_data_custom_and_dag_files(
+    dataset_path: pathlib.Path,
+    pipeline_path: pathlib.Path,
+    env: str,
+    mocker,
+):
+    setup_dag_and_variables(
+        dataset_path,
+        pipeline_path,
+        env,
+        f"{dataset_path.name}_variables.json",
+        mocker,
+    )
+    (pipeline_path / "data" / "nested").mkdir(parents=True)
+    (pipeline_path / "data" / "nested" / "test_file.txt").touch()
+    env_pipeline_path = (
+        ENV_DATASETS_PATH / dataset_path.name / "pipelines" / pipeline_path.name
+    )
+    (env_pipeline_path / "custom").mkdir()
+    (env_pipeline_path / "custom" / "callable.py").touch()
+
+    files = deploy_dag.composer_bucket_files(
+        ENV_PATH, dataset_path.name, [pipeline_path.name]
+    )
+
+    assert files == {
+        f"data/{dataset_path.name}/{pipeline_path.name}/nested/test_file.txt": pipeline_path
+        / "data"
+        / "nested"
+        / "test_file.txt",
+        f"dags/{dataset_path.name}/{pipeline_path.name}/custom/callable.py": env_pipeline_path
+        / "custom"
+        / "callable.py",
+        f"dags/{dataset_path.name}__{pipeline_path.name}_dag.py": env_pipeline_path
+        / f"{pipeline_path.name}_dag.py",
+    }
+
+
+def test_sync_files_to_bucket_uploads_only_changed_files(
+    tmp_path: pathlib.Path, mocker
+):
+    unchanged_file = tmp_path / "unchanged.py"
+    unchanged_file.write_text("unchanged")
+    changed_file = tmp_path / "changed.py"
+    changed_file.write_text("changed")
+    new_file = tmp_path / "new.py"
+    new_file.write_text("new")
+
+    def remote_blob(name: str, contents: bytes):
+        md5_hash = base64.b64encode(hashlib.md5(contents).digest()).decode()
+        blob = mocker.Mock(md5_hash=md5_hash)
+        blob.name = name
+        return blob
+
+    remote_blobs = {
+        "dags/": [
+            remote_blob("dags/unchanged.py", b"unchanged"),
+            remote_blob("dags/changed.py", b"outdated"),
+        ],
+        "data/": [],
+    }
+    bucket = mocker.MagicMock()
+    bucket.name = "test-bucket"
+    bucket.list_blobs.side_effect = lambda prefix, fields: remote_blobs[prefix]
+
+    uploaded = deploy_dag.sync_files_to_bucket(
+        bucket,
+        {
+            "dags/unchanged.py": unchanged_file,
+            "dags/changed.py": changed_file,
+            "data/new.py": new_file,
+        },
+        ["dags/", "data/"],
+    )
+
+    assert uploaded == ["dags/changed.py", "data/new.py"]
+    assert bucket.list_blobs.call_count == 2
+    bucket.blob.assert_any_call("dags/changed.py")
+    bucket.blob.assert_any_call("data/new.py")
+    assert bucket.blob.call_count == 2
+
+
+def test_blob_without_md5_hash_is_compared_by_crc32c(tmp_path: pathlib.Path, mocker):
+    google_crc32c = pytest.importorskip("google_crc32c")
+    target_file = tmp_path / "composite.csv"
+    target_file.write_text("a,b\n1,2\n")
+    crc32c = base64.b64encode(
+        google_crc32c.value(target_file.read_bytes()).to_bytes(4, "big")
+    ).decode()
+
+    assert deploy_dag.blob_matches_file(
+        mocker.Mock(md5_hash=None, crc32c=crc32c), target_file
+    )
+    assert not deploy_dag.blob_matches_file(
+        mocker.Mock(md5_hash=None, crc32c="AAAAAA=="), target_file
+    )
+
+
+def test_incremental_deploy_syncs_files_instead_of_copying_them(
+    dataset_path: pathlib.Path,
+    pipeline_path: pathlib.Path,
+    env: str,
+    mocker,
+):
+    setup_dag_and_variables(
+        dataset_path,
+        pipeline_path,
+        env,
+        f"{dataset_path.name}_variables.json",
+        mocker,
+    )
+
+    mocker.patch("scripts.deploy_dag.check_and_configure_airflow_variables")
+    mocker.patch("scripts.deploy_dag.composer_airflow_version", return_value=2)
+    mocker.patch("scripts.deploy_dag.copy_generated_dag_to_airflow_dags_folder")
+    mocker.patch("scripts.deploy_dag.sync_files_to_composer_bucket")
+
+    deploy_dag.main(
+        env_path=ENV_PATH,
+        dataset_id=dataset_path.name,
+        pipeline=pipeline_path.name,
+        composer_env="test-env",
+        composer_bucket="test-bucket",
+        composer_region="test-region",
+        incremental=True,
+        max_workers=4,
+    )
+
+    deploy_dag.copy_generated_dag_to_airflow_dags_folder.assert_not_called()
+    deploy_dag.sync_files_to_composer_bucket.assert_called_once_with(
+        deploy_dag.composer_bucket_files(
+            ENV_PATH, dataset_path.name, [pipeline_path.name]
+        ),
+        "test-bucket",
+        dataset_path.name,
+        4,
+    )
+
+
+def write_local_variables(
+    env_path: pathlib.Path, dataset_id: str, variables: dict
+) -> pathlib.Path:
+    vars_json_path = deploy_dag.airflow_variables_json_path(env_path, dataset_id)
+    vars_json_path.parent.mkdir(parents=True, exist_ok=True)
+    vars_json_path.write_text(json.dumps(variables))
+    return vars_json_path
+
+
+def test_bulk_variables_are_exported_and_imported_once_for_all_datasets(
+    tmp_path: pathlib.Path, mocker
+):
+    env_path = tmp_path / ".test"
+    unchanged_vars = {"unchanged_dataset": {"bucket": "same-bucket"}}
+    new_vars = {"new_dataset": {"bucket": "new-bucket"}}
+    write_local_variables(env_path, "unchanged_dataset", unchanged_vars)
+    write_local_variables(env_path, "new_dataset", new_vars)
+
+    mocker.patch("scripts.deploy_dag.run_cloud_composer_vars_export")
+    mocker.patch(
+        "scripts.deploy_dag.read_gcs_file",
+        return_value=json.dumps({**unchanged_vars, "other_dataset": {"a": 1}}),
+    )
+    mocker.patch("scripts.deploy_dag.run_gsutil_cmd")
+    mocker.patch("scripts.deploy_dag.run_cloud_composer_vars_import")
+    mocker.patch("scripts.deploy_dag.get_airflow_var_from_composer_env")
+
+    deploy_dag.configure_airflow_variables_in_bulk(
+        env_path,
+        ["unchanged_dataset", "new_dataset"],
+        "test-env",
+        "test-bucket",
+        "test-region",
+    )
+
+    deploy_dag.run_cloud_composer_vars_export.assert_called_once()
+    deploy_dag.run_cloud_composer_vars_import.assert_called_once()
+    assert not deploy_dag.get_airflow_var_from_composer_env.called
+
+    bulk_vars_path = env_path / "datasets" / deploy_dag.BULK_VARIABLES_FILENAME
+    assert json.loads(bulk_vars_path.read_text()) == new_vars
+
+
+def test_bulk_variables_import_skipped_when_remote_vars_are_up_to_date(
+    tmp_path: pathlib.Path, mocker
+):
+    env_path = tmp_path / ".test"
+    local_vars = {"test_dataset_1": {"bucket": "same-bucket"}}
+    write_local_variables(env_path, "test_dataset_1", local_vars)
+    remote_only_vars_path = deploy_dag.airflow_variables_json_path(
+        env_path, "test_dataset_2"
+    )
+    remote_only_vars_path.parent.mkdir(parents=True)
+
+    mocker.patch("scripts.deploy_dag.run_cloud_composer_vars_export")
+    mocker.patch(
+        "scripts.deploy_dag.read_gcs_file",
+        return_value=json.dumps({**local_vars, "test_dataset_2": {"a": 1}}),
+    )
+    mocker.patch("scripts.deploy_dag.run_gsutil_cmd")
+    mocker.patch("scripts.deploy_dag.run_cloud_composer_vars_import")
+
+    deploy_dag.configure_airflow_variables_in_bulk(
+        env_path,
+        ["test_dataset_1", "test_dataset_2"],
+        "test-env",
+        "test-bucket",
+        "test-region",
+    )
+
+    assert not deploy_dag.run_cloud_composer_vars_import.called
+    assert json.loads(remote_only_vars_path.read_text()) == {"test_dataset_2": {"a": 1}}
+
+
+def test_deploy_datasets_configures_variables_in_bulk_before_deploying_dags(
+    tmp_path: pathlib.Path, mocker
+):
+    mocker.patch("scripts.deploy_dag.configure_airflow_variables_in_bulk")
+    mocker.patch("scripts.deploy_dag.check_and_configure_airflow_variables")
+    mocker.patch("scripts.deploy_dag.composer_airflow_version", return_value=2)
+    mocker.patch("scripts.deploy_dag.list_subdirs", return_value=[])
+
+    deploy_dag.deploy_datasets(
+        env_path=tmp_path,
+        dataset_ids=["test_dataset_1", "test_dataset_2"],
+        composer_env="test-env",
+        composer_bucket="test-bucket",
+        composer_region="test-region",
+    )
+
+    deploy_dag.configure_airflow_variables_in_bulk.assert_called_once_with(
+        tmp_path,
+        ["test_dataset_1", "test_dataset_2"],
+        "test-env",
+        "test-bucket",
+        "test-region",
+    )
+    assert not deploy_dag.check_and_configure_airflow_variables.called
+    assert deploy_dag.list_subdirs.call_count == 2
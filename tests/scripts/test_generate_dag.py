@@ -488,3 +488,147 @@ def test_build_and_push_image_not_called_when_no_image_dirs_exist(
     mocker.patch("scripts.generate_dag.build_and_push_image")
     generate_dag.main(dataset_path.name, pipeline_path.name, env, format_code=False)
     assert not generate_dag.build_and_push_image.called
+
+
+def test_main_skips_unchanged_pipeline_yaml(
+    dataset_path: pathlib.Path, pipeline_path: pathlib.Path, env: str, mocker
+):
+    copy_config_files_and_set_tmp_folder_names_as_ids(dataset_path, pipeline_path)
+    generate_dag.main(
+        dataset_path.name, pipeline_path.name, env, skip_builds=True, format_code=False
+    )
+
+    mocker.patch("scripts.generate_dag.generate_dag", wraps=generate_dag.generate_dag)
+    generate_dag.main(
+        dataset_path.name, pipeline_path.name, env, skip_builds=True, format_code=False
+    )
+    assert not generate_dag.generate_dag.called
+
+    generate_dag.main(
+        dataset_path.name,
+        pipeline_path.name,
+        env,
+        skip_builds=True,
+        format_code=False,
+        force=True,
+    )
+    assert generate_dag.generate_dag.call_count == 1
+
+
+def test_main_regenerates_dag_when_pipeline_yaml_changes(
+    dataset_path: pathlib.Path, pipeline_path: pathlib.Path, env: str
+):
+    copy_config_files_and_set_tmp_folder_names_as_ids(dataset_path, pipeline_path)
+    generate_dag.main(
+        dataset_path.name, pipeline_path.name, env, skip_builds=True, format_code=False
+    )
+
+    pipeline_yaml = (pipeline_path / "pipeline.yaml").read_text()
+    (pipeline_path / "pipeline.yaml").write_text(
+        pipeline_yaml.replace(
+            f"dag_id: {pipeline_path.name}", f"dag_id: {pipeline_path.name}_renamed"
+        )
+    )
+    generate_dag.main(
+        dataset_path.name, pipeline_path.name, env, skip_builds=True, format_code=False
+    )
+
+    for path_prefix in (
+        pipeline_path,
+        ENV_DATASETS_PATH / dataset_path.name / "pipelines" / pipeline_path.name,
+    ):
+        assert (
+            f"{pipeline_path.name}_renamed"
+            in (path_prefix / f"{pipeline_path.name}_dag.py").read_text()
+        )
+
+
+def test_main_regenerates_dag_file_edited_since_last_run(
+    dataset_path: pathlib.Path, pipeline_path: pathlib.Path, env: str
+):
+    copy_config_files_and_set_tmp_folder_names_as_ids(dataset_path, pipeline_path)
+    generate_dag.main(
+        dataset_path.name, pipeline_path.name, env, skip_builds=True, format_code=False
+    )
+    dag_path = pipeline_path / f"{pipeline_path.name}_dag.py"
+    dag_contents = dag_path.read_text()
+
+    dag_path.write_text(dag_contents + "\n# edited by hand\n")
+    generate_dag.main(
+        dataset_path.name, pipeline_path.name, env, skip_builds=True, format_code=False
+    )
+
+    assert dag_path.read_text() == dag_contents
+
+
+def test_main_formats_only_generated_dags_in_one_batch(
+    dataset_path: pathlib.Path, pipeline_path: pathlib.Path, env: str, mocker
+):
+    copy_config_files_and_set_tmp_folder_names_as_ids(dataset_path, pipeline_path)
+    mocker.patch("scripts.generate_dag.format_python_code")
+
+    generate_dag.main(dataset_path.name, pipeline_path.name, env, skip_builds=True)
+    generate_dag.format_python_code.assert_called_once_with(
+        [pipeline_path / f"{pipeline_path.name}_dag.py"]
+    )
+
+    generate_dag.format_python_code.reset_mock()
+    generate_dag.main(dataset_path.name, pipeline_path.name, env, skip_builds=True)
+    assert not generate_dag.format_python_code.called
+
+
+def test_format_python_code_applies_black_and_isort(tmp_path: pathlib.Path):
+    target_file = tmp_path / "unformatted_dag.py"
+    target_file.write_text("import os\nimport datetime\nx = {'a':1}\n")
+
+    generate_dag.format_python_code([target_file])
+
+    assert target_file.read_text() == 'import datetime\nimport os\n\nx = {"a": 1}\n'
+
+
+def test_templates_are_compiled_once(mocker):
+    generate_dag.load_template("task")
+    mocker.patch.object(
+        generate_dag.TEMPLATE_ENV.loader,
+        "get_source",
+        side_effect=AssertionError("template was recompiled"),
+    )
+
+    for _ in range(3):
+        generate_dag.load_template("task")
+
+
+def test_list_datasets_filters_by_glob(dataset_path: pathlib.Path):
+    (dataset_path / "pipelines").mkdir()
+
+    assert generate_dag.list_datasets(dataset_path.name) == [dataset_path.name]
+    assert dataset_path.name in generate_dag.list_datasets("*_dataset")
+    assert dataset_path.name not in generate_dag.list_datasets("*_no_match")
+
+
+def test_main_all_datasets_generates_dags_and_reports_errors(
+    dataset_path: pathlib.Path, pipeline_path: pathlib.Path, env: str, capsys
+):
+    copy_config_files_and_set_tmp_folder_names_as_ids(dataset_path, pipeline_path)
+    with tempfile.TemporaryDirectory(
+        dir=generate_dag.DATASETS_PATH, prefix=dataset_path.name
+    ) as broken_dir:
+        broken_dataset_path = pathlib.Path(broken_dir)
+        (broken_dataset_path / "pipelines" / "broken_pipeline").mkdir(parents=True)
+
+        errors = generate_dag.main_all_datasets(
+            f"{dataset_path.name}*",
+            env,
+            skip_builds=True,
+            format_code=False,
+            max_workers=2,
+        )
+
+    assert list(errors) == [broken_dataset_path.name]
+    assert "FileNotFoundError" in errors[broken_dataset_path.name]
+    assert (pipeline_path / f"{pipeline_path.name}_dag.py").exists()
+
+    report = capsys.readouterr().out
+    assert f"===== {dataset_path.name} =====" in report
+    assert f"===== {broken_dataset_path.name} =====" in report
+    assert "Generated DAGs for 1 of 2 datasets" in report
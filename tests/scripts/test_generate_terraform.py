@@ -13,6 +13,7 @@
 # limitations under the License.
 
 
+import concurrent.futures
 import pathlib
 import random
 import re
@@ -1155,3 +1156,97 @@ def test_validation_on_generated_tf_files_in_project_dir(
     subprocess.check_call(
         ["terraform", "validate"], cwd=(project_dataset_path / "infra")
     )
+
+
+def test_main_all_datasets_generates_tf_files_and_reports_errors(
+    dataset_path,
+    pipeline_path,
+    project_id,
+    bucket_name_prefix,
+    region,
+    impersonating_acct,
+    env,
+    tf_state_bucket,
+    tf_state_prefix,
+    capsys,
+):
+    set_dataset_ids_in_config_files(dataset_path, pipeline_path)
+    with tempfile.TemporaryDirectory(
+        dir=generate_terraform.DATASETS_PATH, prefix=dataset_path.name
+    ) as broken_dir:
+        broken_dataset_path = pathlib.Path(broken_dir)
+        (broken_dataset_path / "pipelines").mkdir()
+        (broken_dataset_path / "pipelines" / "dataset.yaml").write_text(
+            "resources:\n  - type: unknown_resource\n"
+        )
+
+        assert generate_terraform.list_datasets(f"{dataset_path.name}*") == [
+            dataset_path.name,
+            broken_dataset_path.name,
+        ]
+
+        errors = generate_terraform.main_all_datasets(
+            f"{dataset_path.name}*",
+            project_id,
+            bucket_name_prefix,
+            region,
+            impersonating_acct,
+            env,
+            tf_state_bucket,
+            tf_state_prefix,
+            format_code=False,
+            max_workers=2,
+        )
+
+    assert list(errors) == [broken_dataset_path.name]
+    assert "ValueError" in errors[broken_dataset_path.name]
+    assert (
+        generate_terraform.DATASETS_PATH
+        / dataset_path.name
+        / "infra"
+        / f"{pipeline_path.name}_pipeline.tf"
+    ).exists()
+
+    report = capsys.readouterr().out
+    assert "Generated Terraform files for 1 of 2 datasets" in report
+
+
+def test_main_all_datasets_formats_code_without_applying_terraform(
+    dataset_path,
+    pipeline_path,
+    project_id,
+    bucket_name_prefix,
+    region,
+    impersonating_acct,
+    env,
+    tf_state_bucket,
+    tf_state_prefix,
+    mocker,
+):
+    set_dataset_ids_in_config_files(dataset_path, pipeline_path)
+    # run the workers in this process so the mocks below see their calls
+    mocker.patch.object(
+        generate_terraform.concurrent.futures,
+        "ProcessPoolExecutor",
+        concurrent.futures.ThreadPoolExecutor,
+    )
+    terraform_fmt = mocker.patch("scripts.generate_terraform.terraform_fmt")
+    actuate_terraform_resources = mocker.patch(
+        "scripts.generate_terraform.actuate_terraform_resources"
+    )
+
+    errors = generate_terraform.main_all_datasets(
+        dataset_path.name,
+        project_id,
+        bucket_name_prefix,
+        region,
+        impersonating_acct,
+        env,
+        tf_state_bucket,
+        tf_state_prefix,
+        format_code=True,
+    )
+
+    assert errors == {}
+    terraform_fmt.assert_called()
+    actuate_terraform_resources.assert_not_called()
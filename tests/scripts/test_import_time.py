@@ -0,0 +1,79 @@
+# Copyright 2022 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import pathlib
+import subprocess
+import sys
+
+import pytest
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[2]
+
+SCRIPT_MODULES = [
+    "scripts.deploy_dag",
+    "scripts.generate_dag",
+    "scripts.generate_terraform",
+]
+
+# Only imported on the code paths that need them, never at startup
+LAZY_MODULES = [
+    "black",
+    "click",
+    "google.auth",
+    "google.cloud.orchestration",
+    "google.cloud.storage",
+    "isort",
+]
+
+# Generous enough to absorb slow CI machines, but far below the cost of
+# importing the cloud SDKs up front
+IMPORT_TIME_BUDGET_US = 200_000
+
+
+def import_times(module: str) -> dict:
+    """Returns the cumulative import time in microseconds of every module
+    imported by `import <module>`, as reported by `python -X importtime`"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+@pytest.mark.parametrize("module", SCRIPT_MODULES)
+def test_script_does_not_import_heavy_modules_at_startup(module: str):
+    imported = import_times(module)
+
+    for lazy_module in LAZY_MODULES:
+        assert not [
+            name
+            for name in imported
+            if name == lazy_module or name.startswith(f"{lazy_module}.")
+        ], f"{module} imports {lazy_module} at startup"
+
+
+@pytest.mark.parametrize("module", SCRIPT_MODULES)
+def test_script_import_time_is_within_budget(module: str):
+    assert import_times(module)[module] < IMPORT_TIME_BUDGET_US